@@ -132,7 +132,7 @@ def format_analytics_response(analytics_list: List[Dict], db: Session) -> List[B
 
 
 @router.get("", response_model=AnalyticsResponse)
-async def get_analytics(response: Response, db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
+def get_analytics(response: Response, db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
     """
     Get cached analytics data for all brands.
     
@@ -178,7 +178,7 @@ async def get_analytics(response: Response, db: Session = Depends(get_db), user:
 
 
 @router.post("/refresh", response_model=RefreshResponse)
-async def refresh_analytics(db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
+def refresh_analytics(db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
     """
     Refresh analytics data for all brands in the background.
     
@@ -239,7 +239,7 @@ async def refresh_analytics(db: Session = Depends(get_db), user: dict = Depends(
 
 
 @router.get("/refresh-status", response_model=RefreshStatusResponse)
-async def get_refresh_status(db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
+def get_refresh_status(db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
     """
     Check if an analytics refresh is currently in progress for this user.
     The frontend polls this endpoint to track background refresh state.
@@ -267,7 +267,7 @@ async def get_refresh_status(db: Session = Depends(get_db), user: dict = Depends
 
 
 @router.get("/rate-limit", response_model=RateLimitInfo)
-async def get_rate_limit_status(db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
+def get_rate_limit_status(db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
     """
     Get current rate limit status for analytics refresh.
     No limits applied - always returns can_refresh=True.
@@ -281,7 +281,7 @@ async def get_rate_limit_status(db: Session = Depends(get_db), user: dict = Depe
 
 
 @router.get("/brand/{brand}")
-async def get_brand_analytics(brand: str, db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
+def get_brand_analytics(brand: str, db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
     """
     Get analytics for a specific brand.
     
@@ -325,7 +325,7 @@ class SnapshotsResponse(BaseModel):
 
 
 @router.get("/snapshots", response_model=SnapshotsResponse)
-async def get_snapshots(
+def get_snapshots(
     brand: Optional[str] = None,
     platform: Optional[str] = None,
     days: int = 30,
@@ -386,7 +386,7 @@ class ClearResponse(BaseModel):
 
 
 @router.delete("/snapshots", response_model=ClearResponse)
-async def clear_snapshots(
+def clear_snapshots(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
@@ -406,7 +406,7 @@ async def clear_snapshots(
 
 
 @router.post("/backfill", response_model=BackfillResponse)
-async def backfill_historical_data(
+def backfill_historical_data(
     days: int = 28,
     clear_existing: bool = True,
     db: Session = Depends(get_db),
@@ -31,7 +31,7 @@ router = APIRouter(prefix="/analytics/v2", tags=["analytics-v2"])
 # ────────────────────────────────────────────────────────────
 
 @router.get("/overview")
-async def analytics_overview(
+def analytics_overview(
     response: Response,
     brand: Optional[str] = None,
     platform: Optional[str] = None,
@@ -359,7 +359,7 @@ async def analytics_overview(
 # ────────────────────────────────────────────────────────────
 
 @router.get("/posts")
-async def analytics_posts(
+def analytics_posts(
     brand: Optional[str] = None,
     content_type: Optional[str] = None,
     sort_by: str = Query("views", pattern="^(views|likes|comments|saves|shares|reach|engagement_rate|performance_score|published_at)$"),
@@ -436,7 +436,7 @@ async def analytics_posts(
 # ────────────────────────────────────────────────────────────
 
 @router.get("/answers")
-async def analytics_answers(
+def analytics_answers(
     brand: Optional[str] = None,
     days: int = Query(90, ge=30, le=365),
     db: Session = Depends(get_db),
@@ -644,7 +644,7 @@ async def analytics_answers(
 # ────────────────────────────────────────────────────────────
 
 @router.get("/audience")
-async def analytics_audience(
+def analytics_audience(
     brand: Optional[str] = None,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -666,7 +666,7 @@ async def analytics_audience(
 
 
 @router.post("/audience/refresh")
-async def refresh_audience(
+def refresh_audience(
     brand: Optional[str] = None,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -820,7 +820,7 @@ async def refresh_audience(
 # ────────────────────────────────────────────────────────────
 
 @router.get("/cumulative")
-async def analytics_cumulative(
+def analytics_cumulative(
     brand: Optional[str] = None,
     platform: Optional[str] = None,
     months: int = Query(12, ge=1, le=24),
@@ -903,7 +903,7 @@ async def analytics_cumulative(
 # ────────────────────────────────────────────────────────────
 
 @router.post("/aggregate")
-async def run_aggregation(
+def run_aggregation(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
@@ -8,7 +8,7 @@ router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
 @router.get("/me")
-async def get_me(user: dict = Depends(get_current_user)):
+def get_me(user: dict = Depends(get_current_user)):
     """Return the currently authenticated user."""
     return {
         "status": "authenticated",
@@ -32,7 +32,7 @@ class VerifyLogsPasswordRequest(BaseModel):
 
 
 @router.post("/verify-logs")
-async def verify_logs_password(request: VerifyLogsPasswordRequest):
+def verify_logs_password(request: VerifyLogsPasswordRequest):
     """Verify the logs dashboard password."""
     if not LOGS_PASSWORD:
         raise HTTPException(status_code=503, detail="Logs password not configured")
@@ -25,7 +25,7 @@ scheduler_service = DatabaseSchedulerService()
 
 
 @router.post("/users")
-async def create_user(request: UserCreateRequest):
+def create_user(request: UserCreateRequest):
     """
     Create or update a user profile with Instagram/Facebook credentials.
     
@@ -53,7 +53,7 @@ async def create_user(request: UserCreateRequest):
 
 
 @router.get("/users/{user_id}")
-async def get_user(user_id: str):
+def get_user(user_id: str):
     """Get user profile information (without tokens)."""
     try:
         from app.db_connection import get_db_session
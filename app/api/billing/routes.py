@@ -9,6 +9,7 @@ Endpoints:
   POST /api/billing/reactivate-subscription — reactivate pending cancellation
   POST /api/billing/webhook             — Stripe webhook (no auth, sig-verified)
 """
+import asyncio
 import os
 import logging
 import time
@@ -65,7 +66,7 @@ class BrandIdBody(BaseModel):
 # GET /status
 # ═════════════════════════════════════════════════════════════════════════════
 @router.get("/status")
-async def billing_status(
+def billing_status(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
@@ -127,7 +128,7 @@ async def billing_status(
 # POST /checkout-session
 # ═════════════════════════════════════════════════════════════════════════════
 @router.post("/checkout-session")
-async def create_checkout_session(
+def create_checkout_session(
     body: BrandIdBody,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -200,7 +201,7 @@ async def create_checkout_session(
 # POST /portal-session
 # ═════════════════════════════════════════════════════════════════════════════
 @router.post("/portal-session")
-async def create_portal_session(
+def create_portal_session(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
@@ -221,7 +222,7 @@ async def create_portal_session(
 # POST /cancel-subscription
 # ═════════════════════════════════════════════════════════════════════════════
 @router.post("/cancel-subscription")
-async def cancel_subscription(
+def cancel_subscription(
     body: BrandIdBody,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -254,7 +255,7 @@ async def cancel_subscription(
 # POST /reactivate-subscription
 # ═════════════════════════════════════════════════════════════════════════════
 @router.post("/reactivate-subscription")
-async def reactivate_subscription(
+def reactivate_subscription(
     body: BrandIdBody,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -288,7 +289,11 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
     """
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
+    # Signature check, DB writes and Stripe lookups are blocking — keep them off the event loop
+    return await asyncio.to_thread(_process_webhook, payload, sig_header, db)
 
+
+def _process_webhook(payload: bytes, sig_header: str | None, db: Session) -> dict:
     if not sig_header:
         raise HTTPException(400, "Missing stripe-signature header")
 
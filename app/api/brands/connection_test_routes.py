@@ -31,7 +31,7 @@ META_REQUIRED_SCOPES = {
 
 
 @router.post("/{brand_id}/test-connection/meta")
-async def test_meta_connection(
+def test_meta_connection(
     brand_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -168,7 +168,7 @@ async def test_meta_connection(
 
 
 @router.post("/{brand_id}/test-connection/youtube")
-async def test_youtube_connection(
+def test_youtube_connection(
     brand_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -104,7 +104,7 @@ def _verify_dna_ownership(db: Session, dna_id: str, user_id: str) -> ContentDNAP
 # --- Routes ---
 
 @router.get("")
-async def list_dna_profiles(
+def list_dna_profiles(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -133,7 +133,7 @@ async def list_dna_profiles(
 
 
 @router.post("", status_code=201)
-async def create_dna_profile(
+def create_dna_profile(
     body: ContentDNACreate,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -163,7 +163,7 @@ async def create_dna_profile(
 
 
 @router.get("/{dna_id}")
-async def get_dna_profile(
+def get_dna_profile(
     dna_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -183,7 +183,7 @@ async def get_dna_profile(
 
 
 @router.put("/{dna_id}")
-async def update_dna_profile(
+def update_dna_profile(
     dna_id: str,
     body: ContentDNAUpdate,
     db: Session = Depends(get_db),
@@ -219,7 +219,7 @@ async def update_dna_profile(
 
 
 @router.delete("/{dna_id}")
-async def delete_dna_profile(
+def delete_dna_profile(
     dna_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -249,7 +249,7 @@ async def delete_dna_profile(
 
 
 @router.post("/{dna_id}/assign-brand")
-async def assign_brand_to_dna(
+def assign_brand_to_dna(
     dna_id: str,
     body: BrandAssignment,
     db: Session = Depends(get_db),
@@ -300,7 +300,7 @@ async def assign_brand_to_dna(
 
 
 @router.post("/{dna_id}/unassign-brand")
-async def unassign_brand_from_dna(
+def unassign_brand_from_dna(
     dna_id: str,
     body: BrandAssignment,
     db: Session = Depends(get_db),
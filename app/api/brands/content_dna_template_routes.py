@@ -20,7 +20,7 @@ router = APIRouter(prefix="/content-dna/templates", tags=["content-dna-templates
 
 
 @router.get("")
-async def list_templates(
+def list_templates(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -38,7 +38,7 @@ async def list_templates(
 
 
 @router.post("/{template_id}/use", status_code=201)
-async def create_from_template(
+def create_from_template(
     template_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
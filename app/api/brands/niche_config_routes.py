@@ -229,7 +229,7 @@ def _infer_from_content_brief(content_brief: str) -> tuple[list[str], str]:
 # --- Routes ---
 
 @router.get("")
-async def get_niche_config(
+def get_niche_config(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -288,7 +288,7 @@ async def get_niche_config(
 
 
 @router.put("")
-async def update_niche_config(
+def update_niche_config(
     request: NicheConfigUpdate,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -391,10 +391,12 @@ async def import_from_instagram(
     user_id = user["id"]
 
     # Find brand & verify ownership
-    brand = db.query(Brand).filter(
-        Brand.id == request.brand_id,
-        Brand.user_id == user_id,
-    ).first()
+    brand = await asyncio.to_thread(
+        lambda: db.query(Brand).filter(
+            Brand.id == request.brand_id,
+            Brand.user_id == user_id,
+        ).first()
+    )
     if not brand:
         raise HTTPException(status_code=404, detail="Brand not found")
 
@@ -510,7 +512,7 @@ async def get_ai_understanding(
     user_id = user["id"]
     rate_limit(user_id, "ai-understanding", max_requests=5, window_seconds=60)
     service = get_niche_config_service()
-    ctx = service.get_context(user_id=user_id, db=db)
+    ctx = await asyncio.to_thread(service.get_context, user_id=user_id, db=db)
 
     config_summary = []
     if ctx.niche_name:
@@ -628,7 +630,7 @@ async def generate_post_example(
     """Generate a single post example via DeepSeek based on brand config."""
     user_id = user["id"]
     service = get_niche_config_service()
-    ctx = service.get_context(user_id=user_id, db=db)
+    ctx = await asyncio.to_thread(service.get_context, user_id=user_id, db=db)
 
     api_key = os.getenv("DEEPSEEK_API_KEY")
     if not api_key:
@@ -709,7 +711,7 @@ async def generate_post_examples_batch(
     user_id = user["id"]
     rate_limit(user_id, "generate-post-examples-batch", max_requests=3, window_seconds=60)
     service = get_niche_config_service()
-    ctx = service.get_context(user_id=user_id, db=db)
+    ctx = await asyncio.to_thread(service.get_context, user_id=user_id, db=db)
 
     api_key = os.getenv("DEEPSEEK_API_KEY")
     if not api_key:
@@ -846,7 +848,7 @@ async def generate_reel_examples_batch(
     user_id = user["id"]
     rate_limit(user_id, "generate-reel-examples-batch", max_requests=3, window_seconds=60)
     service = get_niche_config_service()
-    ctx = service.get_context(user_id=user_id, db=db)
+    ctx = await asyncio.to_thread(service.get_context, user_id=user_id, db=db)
 
     # Require General section to be filled
     if not ctx.content_brief and not ctx.niche_name:
@@ -997,7 +999,7 @@ async def generate_format_b_examples_batch(
     user_id = user["id"]
     rate_limit(user_id, "generate-format-b-examples-batch", max_requests=3, window_seconds=60)
     service = get_niche_config_service()
-    ctx = service.get_context(user_id=user_id, db=db)
+    ctx = await asyncio.to_thread(service.get_context, user_id=user_id, db=db)
 
     # Require General section to be filled
     if not ctx.content_brief and not ctx.niche_name:
@@ -1107,7 +1109,7 @@ async def suggest_yt_titles(
     user_id = user["id"]
     rate_limit(user_id, "suggest-yt-titles", max_requests=5, window_seconds=60)
     service = get_niche_config_service()
-    ctx = service.get_context(user_id=user_id, db=db)
+    ctx = await asyncio.to_thread(service.get_context, user_id=user_id, db=db)
 
     api_key = os.getenv("DEEPSEEK_API_KEY")
     if not api_key:
@@ -1165,7 +1167,7 @@ class ReelPreviewRequest(BaseModel):
 
 
 @router.post("/preview-reel")
-async def preview_reel_images(
+def preview_reel_images(
     request: ReelPreviewRequest,
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -21,7 +21,7 @@ from app.models import Brand, YouTubeChannel
 from app.services.brands.manager import get_brand_manager, BrandManager
 from app.services.brands.resolver import brand_resolver
 from app.services.storage.supabase_storage import (
-    upload_bytes, storage_path, StorageError,
+    upload_bytes, storage_path, versioned_url, StorageError,
 )
 from app.api.auth.middleware import get_current_user
 
@@ -151,7 +151,7 @@ def _ensure_rendering_colors(colors: Dict[str, Any]) -> Dict[str, Any]:
 # ============================================================================
 
 @router.get("")
-async def list_brands(
+def list_brands(
     include_inactive: bool = False,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -172,7 +172,7 @@ async def list_brands(
 
 
 @router.get("/list")
-async def list_brands_legacy(db: Session = Depends(get_db), user: dict = Depends(get_current_user)) -> Dict[str, Any]:
+def list_brands_legacy(db: Session = Depends(get_db), user: dict = Depends(get_current_user)) -> Dict[str, Any]:
     """
     Legacy endpoint for listing brands.
 
@@ -196,7 +196,7 @@ async def list_brands_legacy(db: Session = Depends(get_db), user: dict = Depends
 
 
 @router.get("/ids")
-async def get_brand_ids(db: Session = Depends(get_db), user: dict = Depends(get_current_user)) -> Dict[str, Any]:
+def get_brand_ids(db: Session = Depends(get_db), user: dict = Depends(get_current_user)) -> Dict[str, Any]:
     """
     Get just the IDs of all active brands.
 
@@ -217,7 +217,7 @@ async def get_brand_ids(db: Session = Depends(get_db), user: dict = Depends(get_
 # ============================================================================
 
 @router.get("/connections")
-async def get_brand_connections(db: Session = Depends(get_db), user: dict = Depends(get_current_user)) -> Dict[str, Any]:
+def get_brand_connections(db: Session = Depends(get_db), user: dict = Depends(get_current_user)) -> Dict[str, Any]:
     """
     Get connection status for all platforms for all brands.
 
@@ -337,7 +337,7 @@ async def get_brand_connections(db: Session = Depends(get_db), user: dict = Depe
 
 
 @router.post("/seed")
-async def seed_brands(db: Session = Depends(get_db), user: dict = Depends(get_current_user)) -> Dict[str, Any]:
+def seed_brands(db: Session = Depends(get_db), user: dict = Depends(get_current_user)) -> Dict[str, Any]:
     """
     Seed default brands if none exist.
 
@@ -362,7 +362,7 @@ async def seed_brands(db: Session = Depends(get_db), user: dict = Depends(get_cu
 
 
 @router.get("/credentials")
-async def get_all_brand_credentials(
+def get_all_brand_credentials(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -410,7 +410,7 @@ class UpdatePromptsRequest(BaseModel):
 
 
 @router.get("/prompts")
-async def get_prompts(
+def get_prompts(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -438,7 +438,7 @@ async def get_prompts(
 
 
 @router.put("/prompts")
-async def update_prompts(
+def update_prompts(
     request: UpdatePromptsRequest,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -469,7 +469,7 @@ async def update_prompts(
 # ============================================================================
 
 @router.get("/settings/layout")
-async def get_layout_settings(
+def get_layout_settings(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -483,7 +483,7 @@ async def get_layout_settings(
 
 
 @router.put("/settings/layout")
-async def update_layout_settings(
+def update_layout_settings(
     settings: Dict[str, Any],
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -506,7 +506,7 @@ async def update_layout_settings(
 
 
 @router.get("/{brand_id}")
-async def get_brand(
+def get_brand(
     brand_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -522,7 +522,7 @@ async def get_brand(
 
 
 @router.get("/{brand_id}/colors")
-async def get_brand_colors(
+def get_brand_colors(
     brand_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -541,7 +541,7 @@ async def get_brand_colors(
 
 
 @router.post("")
-async def create_brand(
+def create_brand(
     request: CreateBrandRequest,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -612,7 +612,7 @@ async def create_brand(
 
 
 @router.put("/{brand_id}")
-async def update_brand(
+def update_brand(
     brand_id: str,
     request: UpdateBrandRequest,
     db: Session = Depends(get_db),
@@ -646,7 +646,7 @@ async def update_brand(
 
 
 @router.put("/{brand_id}/credentials")
-async def update_brand_credentials(
+def update_brand_credentials(
     brand_id: str,
     request: UpdateCredentialsRequest,
     db: Session = Depends(get_db),
@@ -682,7 +682,7 @@ async def update_brand_credentials(
 
 
 @router.delete("/{brand_id}")
-async def delete_brand(
+def delete_brand(
     brand_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -727,7 +727,7 @@ async def delete_brand(
 
 
 @router.post("/{brand_id}/reactivate")
-async def reactivate_brand(
+def reactivate_brand(
     brand_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -752,7 +752,7 @@ async def reactivate_brand(
 # ============================================================================
 
 @router.get("/{brand_id}/theme")
-async def get_brand_theme(
+def get_brand_theme(
     brand_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -800,7 +800,7 @@ async def get_brand_theme(
 
 
 @router.post("/{brand_id}/theme")
-async def update_brand_theme(
+def update_brand_theme(
     brand_id: str,
     brand_color: str = Form(...),
     light_title_color: str = Form(...),
@@ -872,12 +872,12 @@ async def update_brand_theme(
         extension = Path(logo.filename).suffix.lower() or '.png'
         ext = extension.lstrip('.')
         logo_filename = f"{brand_id}_logo.{ext}"
-        content = await logo.read()
+        content = logo.file.read()
 
         user_id = user["id"]
         remote_path = storage_path(user_id, brand_id, "logos", logo_filename)
         try:
-            logo_url = upload_bytes("brand-assets", remote_path, content, f"image/{ext}")
+            logo_url = versioned_url(upload_bytes("brand-assets", remote_path, content, f"image/{ext}"), content)
         except StorageError as e:
             print(f"Logo upload failed: {e}"); logo_url = logo_filename
 
@@ -888,12 +888,12 @@ async def update_brand_theme(
         extension = Path(reel_divider_logo.filename).suffix.lower() or '.png'
         ext = extension.lstrip('.')
         divider_logo_filename = f"{brand_id}_reel_divider_logo.{ext}"
-        content = await reel_divider_logo.read()
+        content = reel_divider_logo.file.read()
 
         user_id = user["id"]
         remote_path = storage_path(user_id, brand_id, "logos", divider_logo_filename)
         try:
-            divider_logo_url = upload_bytes("brand-assets", remote_path, content, f"image/{ext}")
+            divider_logo_url = versioned_url(upload_bytes("brand-assets", remote_path, content, f"image/{ext}"), content)
         except StorageError as e:
             print(f"Reel divider logo upload failed: {e}"); divider_logo_url = divider_logo_filename
 
@@ -924,7 +924,7 @@ async def update_brand_theme(
 
 
 @router.post("/{brand_id}/divider-logo")
-async def upload_divider_logo(
+def upload_divider_logo(
     brand_id: str,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -944,11 +944,11 @@ async def upload_divider_logo(
     if ext not in ("png", "jpg", "jpeg", "webp", "svg"):
         raise HTTPException(status_code=400, detail="Invalid image format")
 
-    content = await file.read()
+    content = file.file.read()
     filename = f"{brand_id}_reel_divider_logo.{ext}"
     remote_path = storage_path(user["id"], brand_id, "logos", filename)
     try:
-        logo_url = upload_bytes("brand-assets", remote_path, content, f"image/{ext}")
+        logo_url = versioned_url(upload_bytes("brand-assets", remote_path, content, f"image/{ext}"), content)
     except StorageError as e:
         logger.error("Divider logo upload failed for %s: %s", brand_id, e)
         raise HTTPException(status_code=500, detail="Logo upload failed")
@@ -962,7 +962,7 @@ async def upload_divider_logo(
 
 
 @router.post("/{brand_id}/content-logo")
-async def upload_content_logo(
+def upload_content_logo(
     brand_id: str,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -982,11 +982,11 @@ async def upload_content_logo(
     if ext not in ("png", "jpg", "jpeg", "webp", "svg"):
         raise HTTPException(status_code=400, detail="Invalid image format")
 
-    content = await file.read()
+    content = file.file.read()
     filename = f"{brand_id}_reel_content_logo.{ext}"
     remote_path = storage_path(user["id"], brand_id, "logos", filename)
     try:
-        logo_url = upload_bytes("brand-assets", remote_path, content, f"image/{ext}")
+        logo_url = versioned_url(upload_bytes("brand-assets", remote_path, content, f"image/{ext}"), content)
     except StorageError as e:
         logger.error("Content logo upload failed for %s: %s", brand_id, e)
         raise HTTPException(status_code=500, detail="Logo upload failed")
@@ -1000,7 +1000,7 @@ async def upload_content_logo(
 
 
 @router.put("/{brand_id}/divider-logo-text")
-async def set_divider_logo_text(
+def set_divider_logo_text(
     brand_id: str,
     body: Dict[str, Any] = Body(...),
     db: Session = Depends(get_db),
@@ -1023,7 +1023,7 @@ async def set_divider_logo_text(
 
 
 @router.post("/{brand_id}/apply-design-to-all")
-async def apply_design_to_all_brands(
+def apply_design_to_all_brands(
     brand_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -28,7 +28,7 @@ router = APIRouter()
 
 
 @router.post("/rejection-feedback")
-async def save_rejection_feedback(request: RejectionFeedbackRequest):
+def save_rejection_feedback(request: RejectionFeedbackRequest):
     """Save rejection feedback to Supabase Storage (feedback bucket).
     Stores JSON metadata + PNG image for later manual review."""
     import json
@@ -77,7 +77,7 @@ async def save_rejection_feedback(request: RejectionFeedbackRequest):
 
 
 @router.get("/rejection-feedback")
-async def list_rejection_feedback():
+def list_rejection_feedback():
     """List all stored rejection feedback entries from Supabase Storage."""
     import json
     try:
@@ -66,7 +66,7 @@ class DesignUpdate(BaseModel):
 
 
 @router.get("")
-async def get_design(
+def get_design(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
@@ -83,7 +83,7 @@ async def get_design(
 
 
 @router.put("")
-async def update_design(
+def update_design(
     request: DesignUpdate,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -14,7 +14,7 @@ from app.api.auth.middleware import get_current_user
 from app.models.jobs import GenerationJob
 from app.models.story_pool import StoryPool
 from app.services.content.job_manager import JobManager
-from app.services.content.job_processor import JobProcessor
+from app.services.content.job_queue import enqueue_job
 
 logger = logging.getLogger(__name__)
 
@@ -75,7 +75,7 @@ MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10 MB
 
 
 @router.post("/upload-images")
-async def upload_images(
+def upload_images(
     files: List[UploadFile] = File(...),
     user: dict = Depends(get_current_user),
 ):
@@ -88,7 +88,7 @@ async def upload_images(
     for f in files:
         if f.content_type not in ALLOWED_IMAGE_TYPES:
             raise HTTPException(status_code=400, detail=f"Unsupported file type: {f.content_type}")
-        data = await f.read()
+        data = f.file.read()
         if len(data) > MAX_IMAGE_SIZE:
             raise HTTPException(status_code=400, detail=f"File too large: {f.filename} (max 10 MB)")
         ext = Path(f.filename or "img.jpg").suffix or ".jpg"
@@ -100,7 +100,7 @@ async def upload_images(
 
 
 @router.post("/discover")
-async def discover_stories(
+def discover_stories(
     request: DiscoverRequest,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -127,7 +127,7 @@ async def discover_stories(
 
 
 @router.post("/polish")
-async def polish_story(
+def polish_story(
     request: PolishRequest,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -145,7 +145,7 @@ async def polish_story(
 
 
 @router.post("/source-images")
-async def source_images(
+def source_images(
     request: SourceImagesRequest,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -179,7 +179,7 @@ async def source_images(
 
 
 @router.post("/generate")
-async def generate_format_b_reel(
+def generate_format_b_reel(
     request: FormatBGenerateRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
@@ -286,9 +286,9 @@ async def generate_format_b_reel(
         )
         jobs_created.append((job.job_id, job.to_dict()))
 
-    # Process each job in background
+    # Hand each job to the generation work queue
     for job_id, _ in jobs_created:
-        background_tasks.add_task(_process_format_b_job_async, job_id)
+        enqueue_job(job_id)
 
     first_id, first_dict = jobs_created[0]
     return {
@@ -373,12 +373,10 @@ def _process_full_auto_format_b_async(job_id: str, niche: str, category: str):
 
             print(f"   ✓ Generated Format B content", flush=True)
 
-            # Step 3: Process (generate images via DeAPI, compose video, upload)
-            processor = JobProcessor(db)
-            result = processor.process_job(job_id)
+            # Step 3: Queue media processing (images via DeAPI, compose video, upload)
+            enqueue_job(job_id)
 
-            print(f"\n✅ Format B FULL-AUTO COMPLETED: {job_id}", flush=True)
-            print(f"   Result: {result}", flush=True)
+            print(f"\n✅ Format B FULL-AUTO content ready, queued: {job_id}", flush=True)
             sys.stdout.flush()
 
     except Exception as e:
@@ -397,48 +395,8 @@ def _process_full_auto_format_b_async(job_id: str, niche: str, category: str):
         _tv_job_semaphore.release()
 
 
-def _process_format_b_job_async(job_id: str):
-    """Background task to process a format-b job."""
-    import traceback
-    import sys
-
-    print(f"\n{'='*60}", flush=True)
-    print(f"📹 Format B BACKGROUND TASK STARTED", flush=True)
-    print(f"   Job ID: {job_id}", flush=True)
-    print(f"{'='*60}", flush=True)
-    sys.stdout.flush()
-
-    _tv_job_semaphore.acquire()
-    try:
-        with get_db_session() as db:
-            processor = JobProcessor(db)
-            result = processor.process_job(job_id)
-
-            print(f"\n{'='*60}", flush=True)
-            print(f"✅ Format B JOB COMPLETED", flush=True)
-            print(f"   Job ID: {job_id}", flush=True)
-            print(f"   Result: {result}", flush=True)
-            print(f"{'='*60}\n", flush=True)
-            sys.stdout.flush()
-
-    except Exception as e:
-        error_msg = f"{type(e).__name__}: {str(e)}"
-        print(f"\n❌ Format B JOB FAILED: {error_msg}", flush=True)
-        traceback.print_exc()
-        sys.stdout.flush()
-
-        try:
-            with get_db_session() as db:
-                manager = JobManager(db)
-                manager.update_job_status(job_id, "failed", error_message=error_msg)
-        except Exception:
-            pass
-    finally:
-        _tv_job_semaphore.release()
-
-
 @router.get("/story-pool")
-async def get_story_pool(
+def get_story_pool(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
@@ -13,6 +13,7 @@ from sqlalchemy.dialects.postgresql import JSONB
 from app.db_connection import get_db_session
 from app.services.content.job_manager import JobManager
 from app.services.content.job_processor import JobProcessor
+from app.services.content.job_queue import enqueue_job, is_job_leased
 from app.services.brands.resolver import brand_resolver
 from app.api.auth.middleware import get_current_user
 
@@ -121,7 +122,7 @@ def process_job_async(job_id: str):
     summary="Create a new generation job",
     description="Creates a job and starts processing in the background. Returns job ID immediately."
 )
-async def create_job(request: JobCreateRequest, background_tasks: BackgroundTasks, user: dict = Depends(get_current_user)):
+def create_job(request: JobCreateRequest, background_tasks: BackgroundTasks, user: dict = Depends(get_current_user)):
     """
     Create a new generation job.
 
@@ -152,9 +153,9 @@ async def create_job(request: JobCreateRequest, background_tasks: BackgroundTask
                 )
                 jobs_created.append((job.job_id, job.to_dict()))
 
-        # Start processing each job in background
+        # Hand each job to the generation work queue
         for job_id, _ in jobs_created:
-            background_tasks.add_task(process_job_async, job_id)
+            enqueue_job(job_id)
 
         first_id, first_dict = jobs_created[0]
         return {
@@ -175,7 +176,7 @@ async def create_job(request: JobCreateRequest, background_tasks: BackgroundTask
     "/{job_id}",
     summary="Get job details and status"
 )
-async def get_job(job_id: str, user: dict = Depends(get_current_user)):
+def get_job(job_id: str, user: dict = Depends(get_current_user)):
     """
     Get full job details including status, progress, and outputs.
 
@@ -207,7 +208,7 @@ async def get_job(job_id: str, user: dict = Depends(get_current_user)):
     "/{job_id}/status",
     summary="Get job status (lightweight)"
 )
-async def get_job_status(job_id: str, user: dict = Depends(get_current_user)):
+def get_job_status(job_id: str, user: dict = Depends(get_current_user)):
     """
     Get just the job status - useful for polling during generation.
     """
@@ -244,7 +245,7 @@ async def get_job_status(job_id: str, user: dict = Depends(get_current_user)):
     summary="Update job inputs",
     description="Update title/content without regenerating. Use regenerate endpoints to apply changes."
 )
-async def update_job(job_id: str, request: JobUpdateRequest, user: dict = Depends(get_current_user)):
+def update_job(job_id: str, request: JobUpdateRequest, user: dict = Depends(get_current_user)):
     """
     Update job inputs (title, content, CTA).
 
@@ -290,7 +291,7 @@ async def update_job(job_id: str, request: JobUpdateRequest, user: dict = Depend
     summary="Regenerate single brand",
     description="Regenerate images/video for one brand only. Can optionally override title/content."
 )
-async def regenerate_brand(
+def regenerate_brand(
     job_id: str,
     brand: str,
     request: Optional[BrandRegenerateRequest] = None,
@@ -380,7 +381,7 @@ async def regenerate_brand(
     summary="Regenerate all brands",
     description="Regenerate all brand outputs with current (or updated) inputs"
 )
-async def regenerate_all(
+def regenerate_all(
     job_id: str,
     request: Optional[JobUpdateRequest] = None,
     background_tasks: BackgroundTasks = None,
@@ -413,12 +414,17 @@ async def regenerate_all(
                     detail=f"Job not found: {job_id}"
                 )
 
+            # A worker still running it would otherwise be joined by a second one
+            if is_job_leased(job_id):
+                raise HTTPException(status_code=409, detail="Job is already running")
+
             # Reset status
             manager.update_job_status(job_id, "pending", "Queued for regeneration", 0)
 
-        # Run in background
+        # Run on a generation worker
         if background_tasks:
-            background_tasks.add_task(process_job_async, job_id)
+            if not enqueue_job(job_id):
+                raise HTTPException(status_code=409, detail="Job is already running")
             return {
                 "status": "queued",
                 "job_id": job_id,
@@ -441,39 +447,12 @@ async def regenerate_all(
         )
 
 
-def _resume_job_async(job_id: str):
-    """Background task to resume an interrupted job (only incomplete brands)."""
-    import traceback
-    import sys
-
-    print(f"\n🔄 RESUME TASK STARTED for {job_id}", flush=True)
-    sys.stdout.flush()
-
-    _job_semaphore.acquire()
-    try:
-        with get_db_session() as db:
-            processor = JobProcessor(db)
-            result = processor.resume_job(job_id)
-            ok = result.get("success", False)
-            print(f"{'✅' if ok else '❌'} Resume {job_id}: {result}", flush=True)
-    except Exception as e:
-        print(f"❌ Resume {job_id} failed: {e}", flush=True)
-        traceback.print_exc()
-        try:
-            with get_db_session() as db:
-                JobManager(db).update_job_status(job_id, "failed", error_message=f"Resume failed: {e}")
-        except Exception:
-            pass
-    finally:
-        _job_semaphore.release()
-
-
 @router.post(
     "/{job_id}/retry",
     summary="Retry incomplete brands",
     description="Resume a failed/interrupted job — only re-processes brands that didn't complete."
 )
-async def retry_job(
+def retry_job(
     job_id: str,
     background_tasks: BackgroundTasks,
     user: dict = Depends(get_current_user),
@@ -511,7 +490,8 @@ async def retry_job(
             # Prepare for resume
             manager.update_job_status(job_id, "generating", f"Retrying {len(incomplete)} brand(s)...", 0)
 
-        background_tasks.add_task(_resume_job_async, job_id)
+        if not enqueue_job(job_id, "resume"):
+            raise HTTPException(status_code=409, detail="Job is already running")
 
         return {
             "status": "queued",
@@ -530,7 +510,7 @@ async def retry_job(
     "/",
     summary="List all jobs (history)"
 )
-async def list_jobs(
+def list_jobs(
     limit: int = 100,
     user: dict = Depends(get_current_user),
 ):
@@ -606,7 +586,7 @@ async def list_jobs(
     "/bulk/by-status",
     summary="Delete all jobs matching a status"
 )
-async def delete_jobs_by_status(job_status: str = "completed", user: dict = Depends(get_current_user)):
+def delete_jobs_by_status(job_status: str = "completed", user: dict = Depends(get_current_user)):
     """Delete all jobs matching a given status (completed, failed, etc.).
     Also deletes the corresponding scheduled_reels entries."""
     from app.db_connection import SessionLocal
@@ -659,7 +639,7 @@ class BulkDeleteByIdsRequest(BaseModel):
     "/bulk/delete-by-ids",
     summary="Delete multiple jobs by their IDs"
 )
-async def delete_jobs_by_ids(request: BulkDeleteByIdsRequest, user: dict = Depends(get_current_user)):
+def delete_jobs_by_ids(request: BulkDeleteByIdsRequest, user: dict = Depends(get_current_user)):
     """Delete multiple jobs by their IDs in a single operation.
     Also deletes associated scheduled_reels entries and cleans up files."""
     from app.models import ScheduledReel
@@ -723,7 +703,7 @@ async def delete_jobs_by_ids(request: BulkDeleteByIdsRequest, user: dict = Depen
     "/{job_id}",
     summary="Delete a job"
 )
-async def delete_job(job_id: str, user: dict = Depends(get_current_user)):
+def delete_job(job_id: str, user: dict = Depends(get_current_user)):
     """Delete a job and its associated files and scheduled reels."""
     from app.models import ScheduledReel
 
@@ -782,7 +762,7 @@ async def delete_job(job_id: str, user: dict = Depends(get_current_user)):
     "/{job_id}/cancel",
     summary="Cancel a running job"
 )
-async def cancel_job(job_id: str, user: dict = Depends(get_current_user)):
+def cancel_job(job_id: str, user: dict = Depends(get_current_user)):
     """
     Cancel a job that's pending or generating.
 
@@ -837,7 +817,7 @@ async def cancel_job(job_id: str, user: dict = Depends(get_current_user)):
     "/{job_id}/next-slots",
     summary="Get next available schedule slots for all brands in a job"
 )
-async def get_next_slots(job_id: str, user: dict = Depends(get_current_user)):
+def get_next_slots(job_id: str, user: dict = Depends(get_current_user)):
     """
     Get the next available scheduling slots for all brands in a job.
 
@@ -895,7 +875,7 @@ class BrandStatusUpdate(BaseModel):
     "/{job_id}/brand/{brand}/status",
     summary="Update a brand's status (e.g., mark as scheduled)"
 )
-async def update_brand_status(job_id: str, brand: str, request: BrandStatusUpdate, user: dict = Depends(get_current_user)):
+def update_brand_status(job_id: str, brand: str, request: BrandStatusUpdate, user: dict = Depends(get_current_user)):
     """
     Update a brand's status within a job.
     Used to mark brands as 'scheduled' after scheduling, preventing re-scheduling.
@@ -964,7 +944,7 @@ class BrandContentUpdate(BaseModel):
     "/{job_id}/brand/{brand}/content",
     summary="Update a brand's title and/or caption"
 )
-async def update_brand_content(job_id: str, brand: str, request: BrandContentUpdate, user: dict = Depends(get_current_user)):
+def update_brand_content(job_id: str, brand: str, request: BrandContentUpdate, user: dict = Depends(get_current_user)):
     """Update the per-brand title and/or caption stored in brand_outputs."""
     try:
         with get_db_session() as db:
@@ -1025,7 +1005,7 @@ class BrandImageRegenRequest(BaseModel):
     "/{job_id}/brand/{brand}/regenerate-image",
     summary="Regenerate a single brand's background image"
 )
-async def regenerate_brand_image(
+def regenerate_brand_image(
     job_id: str,
     brand: str,
     request: Optional[BrandImageRegenRequest] = None,
@@ -1082,7 +1062,7 @@ class ChangeMusicRequest(BaseModel):
     summary="Change music track and regenerate videos",
     description="Update the music source for a job. Supports 'none', 'trending_random', 'trending_pick'. Regenerates all brand videos.",
 )
-async def change_job_music(
+def change_job_music(
     job_id: str,
     request: ChangeMusicRequest,
     background_tasks: BackgroundTasks,
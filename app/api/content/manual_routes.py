@@ -21,6 +21,7 @@ from app.db_connection import get_db
 from app.models.scheduling import ScheduledReel
 from app.models.brands import Brand
 from app.models.youtube import YouTubeChannel
+from app.services.publishing.publish_wakeup import notify_publish_wakeup
 from app.services.storage.supabase_storage import (
     upload_bytes, storage_path, StorageError,
 )
@@ -165,7 +166,7 @@ def _detect_content_type(filename: str) -> str:
 # ============================================================================
 
 @router.get("/connected-platforms")
-async def get_connected_platforms(
+def get_connected_platforms(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user)
 ) -> List[GetConnectedPlatformsResponse]:
@@ -196,7 +197,7 @@ async def get_connected_platforms(
 
 
 @router.post("/upload-and-schedule")
-async def upload_and_schedule(
+def upload_and_schedule(
     brand_id: str = Form(...),
     caption: str = Form(...),
     platforms: str = Form(...),  # JSON array as string
@@ -303,7 +304,7 @@ async def upload_and_schedule(
                 )
 
             # Read file content
-            file_content = await file.read()
+            file_content = file.file.read()
             if not file_content:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -364,6 +365,7 @@ async def upload_and_schedule(
         # text-only posts have no file paths
 
         db.add(scheduled_entry)
+        notify_publish_wakeup(db, scheduled_dt)
         db.commit()
 
         return {
@@ -388,7 +390,7 @@ async def upload_and_schedule(
 
 
 @router.get("/manual/{schedule_id}")
-async def get_manual_schedule(
+def get_manual_schedule(
     schedule_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user)
@@ -431,7 +433,7 @@ async def get_manual_schedule(
 
 
 @router.patch("/manual/{schedule_id}")
-async def edit_manual_schedule(
+def edit_manual_schedule(
     schedule_id: str,
     request: ManualEditRequest,
     db: Session = Depends(get_db),
@@ -557,7 +559,7 @@ async def edit_manual_schedule(
 
 
 @router.delete("/manual/{schedule_id}")
-async def delete_manual_schedule(
+def delete_manual_schedule(
     schedule_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user)
@@ -595,7 +597,7 @@ async def delete_manual_schedule(
 
 
 @router.get("/manual")
-async def list_manual_schedules(
+def list_manual_schedules(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user)
 ):
@@ -29,7 +29,7 @@ router = APIRouter(prefix="/api/music", tags=["music"])
 
 
 @router.get("", response_model=None)
-async def list_music(
+def list_music(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -48,7 +48,7 @@ async def list_music(
 
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=None)
-async def upload_music(
+def upload_music(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -74,7 +74,7 @@ async def upload_music(
         )
 
     # Read and check size
-    data = await file.read()
+    data = file.file.read()
     if len(data) > MAX_FILE_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -108,7 +108,7 @@ async def upload_music(
 
 
 @router.delete("/{track_id}", response_model=None)
-async def delete_music(
+def delete_music(
     track_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -141,7 +141,7 @@ async def delete_music(
 
 
 @router.patch("/{track_id}/weight", response_model=None)
-async def update_weight(
+def update_weight(
     track_id: str,
     weight: int = Body(..., ge=0, le=100, embed=True),
     db: Session = Depends(get_db),
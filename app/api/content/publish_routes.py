@@ -50,7 +50,7 @@ scheduler_service = DatabaseSchedulerService()
 
 
 @router.post("/publish")
-async def publish_reel(request: PublishRequest):
+def publish_reel(request: PublishRequest):
     """
     Publish a reel immediately or schedule for later.
     
@@ -55,7 +55,7 @@ scheduler_service = DatabaseSchedulerService()
         500: {"model": ErrorResponse, "description": "Internal server error"},
     }
 )
-async def create_reel(request: ReelCreateRequest, user: dict = Depends(get_current_user)) -> ReelCreateResponse:
+def create_reel(request: ReelCreateRequest, user: dict = Depends(get_current_user)) -> ReelCreateResponse:
     """
     Create a complete Instagram Reel package.
 
@@ -220,7 +220,7 @@ async def create_reel(request: ReelCreateRequest, user: dict = Depends(get_curre
     summary="Generate reel (simple interface)",
     description="Simplified endpoint for web interface - generates thumbnail, reel image, and video"
 )
-async def generate_reel(request: SimpleReelRequest, db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
+def generate_reel(request: SimpleReelRequest, db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
     """
     Generate reel images and video from title and content lines.
 
@@ -383,7 +383,7 @@ async def generate_reel(request: SimpleReelRequest, db: Session = Depends(get_db
     summary="Download reel (deprecated)",
     description="This endpoint is deprecated. Reel files are stored in Supabase Storage."
 )
-async def download_reel(request: DownloadRequest):
+def download_reel(request: DownloadRequest):
     """Deprecated: Reels are now stored exclusively in Supabase Storage."""
     raise HTTPException(
         status_code=status.HTTP_410_GONE,
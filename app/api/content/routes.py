@@ -54,6 +54,14 @@ class GenerateBackgroundRequest(BaseModel):
 # Create router
 router = APIRouter()
 
+
+def _png_base64(image) -> str:
+    """PNG-encode a PIL image as base64 (CPU-bound — call via asyncio.to_thread)."""
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
 # Initialize services
 caption_generator = CaptionGenerator()
 content_generator = ContentGenerator()
@@ -188,9 +196,7 @@ async def generate_post_background(request: GeneratePostBgRequest):
         elapsed = _time.time() - t0
         print(f"🔱 [GOD] image generated in {elapsed:.1f}s for {request.brand} ({image.size[0]}x{image.size[1]})", flush=True)
 
-        buf = BytesIO()
-        image.save(buf, format="PNG")
-        b64 = base64.b64encode(buf.getvalue()).decode("utf-8")
+        b64 = await asyncio.to_thread(_png_base64, image)
 
         return {"background_data": f"data:image/png;base64,{b64}"}
     except Exception as e:
@@ -255,10 +261,7 @@ async def generate_background(request: GenerateBackgroundRequest):
         )
         
         # Convert to base64
-        buffer = BytesIO()
-        image.save(buffer, format="PNG")
-        buffer.seek(0)
-        base64_image = base64.b64encode(buffer.getvalue()).decode('utf-8')
+        base64_image = await asyncio.to_thread(_png_base64, image)
         
         return {
             "success": True,
@@ -279,7 +282,7 @@ async def generate_background(request: GenerateBackgroundRequest):
     summary="Get available content topics",
     description="Get list of available topic categories for content generation"
 )
-async def get_content_topics():
+def get_content_topics():
     """Get available topic categories for auto content generation."""
     return {
         "topics": content_generator.get_available_topics(),
@@ -292,7 +295,7 @@ async def get_content_topics():
     summary="Rate content performance",
     description="Submit performance metrics for generated content to improve AI"
 )
-async def rate_content(request: ContentRatingRequest):
+def rate_content(request: ContentRatingRequest):
     """
     Submit performance metrics for generated content.
     
@@ -324,7 +327,7 @@ async def rate_content(request: ContentRatingRequest):
     summary="Get content performance analytics",
     description="Get analytics on which topics and formats perform best"
 )
-async def get_content_analytics():
+def get_content_analytics():
     """Get analytics on content performance."""
     return {
         "top_performing": content_rating.get_top_performing(10),
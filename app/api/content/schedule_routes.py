@@ -6,8 +6,6 @@ import base64
 from typing import List, Optional
 from pydantic import BaseModel
 from fastapi import APIRouter, HTTPException, status, Depends, Request
-from sqlalchemy import type_coerce
-from sqlalchemy.dialects.postgresql import JSONB
 from app.services.publishing.scheduler import DatabaseSchedulerService
 from app.services.brands.resolver import brand_resolver
 from app.services.storage.supabase_storage import (
@@ -66,7 +64,7 @@ scheduler_service = DatabaseSchedulerService()
     summary="Schedule a reel for publication",
     description="Schedule an existing reel to be published on Instagram at a specific date and time"
 )
-async def schedule_reel(request: ScheduleRequest, user: dict = Depends(get_current_user)):
+def schedule_reel(request: ScheduleRequest, user: dict = Depends(get_current_user)):
     """
     Schedule a reel for future publication on Instagram.
 
@@ -191,7 +189,7 @@ async def schedule_reel(request: ScheduleRequest, user: dict = Depends(get_curre
     summary="Auto-schedule a reel to next available slot",
     description="Automatically schedule a reel to the next available time slot based on brand and variant"
 )
-async def schedule_auto(request: AutoScheduleRequest, user: dict = Depends(get_current_user)):
+def schedule_auto(request: AutoScheduleRequest, user: dict = Depends(get_current_user)):
     """
     Auto-schedule a reel for future publication.
 
@@ -315,7 +313,7 @@ async def schedule_auto(request: AutoScheduleRequest, user: dict = Depends(get_c
 
 
 @router.get("/scheduled")
-async def get_scheduled_posts(
+def get_scheduled_posts(
     user: dict = Depends(get_current_user),
     from_date: Optional[str] = None,
     to_date: Optional[str] = None,
@@ -415,7 +413,7 @@ async def get_scheduled_posts(
 
 
 @router.delete("/scheduled/bulk/from-date")
-async def delete_scheduled_from_date(from_date: str, user: dict = Depends(get_current_user)):
+def delete_scheduled_from_date(from_date: str, user: dict = Depends(get_current_user)):
     """Delete all scheduled reels from a given date onwards (inclusive).
     from_date format: YYYY-MM-DD"""
     from app.db_connection import SessionLocal
@@ -461,12 +459,13 @@ async def delete_scheduled_from_date(from_date: str, user: dict = Depends(get_cu
 
 
 @router.delete("/scheduled/bulk/day/{date}")
-async def delete_scheduled_for_day(date: str, variant: Optional[str] = None, user: dict = Depends(get_current_user)):
+def delete_scheduled_for_day(date: str, variant: Optional[str] = None, user: dict = Depends(get_current_user)):
     """Delete scheduled entries for a specific day, optionally filtered by variant.
     date format: YYYY-MM-DD
     variant: 'reel' (only reels), 'post' (only posts), or omit for all."""
     from app.db_connection import SessionLocal
     from app.models import ScheduledReel, GenerationJob
+    from app.models.scheduling import scheduled_variant
     from datetime import datetime, timedelta
     from sqlalchemy.orm.attributes import flag_modified
 
@@ -481,13 +480,9 @@ async def delete_scheduled_for_day(date: str, variant: Optional[str] = None, use
             .filter(ScheduledReel.user_id == user["id"])
         )
         if variant == "post":
-            query = query.filter(
-                type_coerce(ScheduledReel.extra_data, JSONB)["variant"].astext == "post"
-            )
+            query = query.filter(scheduled_variant() == "post")
         elif variant == "reel":
-            query = query.filter(
-                type_coerce(ScheduledReel.extra_data, JSONB)["variant"].astext != "post"
-            )
+            query = query.filter(scheduled_variant() != "post")
 
         entries = query.all()
 
@@ -519,7 +514,7 @@ async def delete_scheduled_for_day(date: str, variant: Optional[str] = None, use
 
 
 @router.delete("/scheduled/{schedule_id}")
-async def delete_scheduled_post(schedule_id: str, user: dict = Depends(get_current_user)):
+def delete_scheduled_post(schedule_id: str, user: dict = Depends(get_current_user)):
     """
     Delete a scheduled post and mark the job brand output as cancelled
     so it won't be re-scheduled.
@@ -567,7 +562,7 @@ async def delete_scheduled_post(schedule_id: str, user: dict = Depends(get_curre
 
 
 @router.post("/scheduled/{schedule_id}/retry")
-async def retry_failed_post(schedule_id: str, user: dict = Depends(get_current_user)):
+def retry_failed_post(schedule_id: str, user: dict = Depends(get_current_user)):
     """
     Retry a failed scheduled post by resetting its status to 'scheduled'.
 
@@ -596,7 +591,7 @@ async def retry_failed_post(schedule_id: str, user: dict = Depends(get_current_u
 
 
 @router.patch("/scheduled/{schedule_id}/reschedule")
-async def reschedule_post(schedule_id: str, request: RescheduleRequest, user: dict = Depends(get_current_user)):
+def reschedule_post(schedule_id: str, request: RescheduleRequest, user: dict = Depends(get_current_user)):
     """
     Reschedule a scheduled post to a new date/time.
 
@@ -649,7 +644,7 @@ async def reschedule_post(schedule_id: str, request: RescheduleRequest, user: di
 
 
 @router.post("/scheduled/{schedule_id}/publish-now")
-async def publish_scheduled_now(schedule_id: str, request: Request, user: dict = Depends(get_current_user)):
+def publish_scheduled_now(schedule_id: str, request: Request, user: dict = Depends(get_current_user)):
     """
     Immediately publish a scheduled post (bypass the scheduled time).
 
@@ -695,7 +690,7 @@ async def publish_scheduled_now(schedule_id: str, request: Request, user: dict =
 
 
 @router.get("/next-slot/{brand}/{variant}")
-async def get_next_available_slot(brand: str, variant: str, user: dict = Depends(get_current_user)):
+def get_next_available_slot(brand: str, variant: str, user: dict = Depends(get_current_user)):
     """
     Get the next available scheduling slot for a brand+variant combination.
 
@@ -744,7 +739,7 @@ async def get_next_available_slot(brand: str, variant: str, user: dict = Depends
 
 
 @router.get("/next-slots")
-async def get_all_next_slots(user: dict = Depends(get_current_user)):
+def get_all_next_slots(user: dict = Depends(get_current_user)):
     """
     Get the next available slots for all brand+variant combinations.
 
@@ -787,7 +782,7 @@ async def get_all_next_slots(user: dict = Depends(get_current_user)):
 
 
 @router.post("/schedule-post-image")
-async def schedule_post_image(request: SchedulePostImageRequest, user: dict = Depends(get_current_user)):
+def schedule_post_image(request: SchedulePostImageRequest, user: dict = Depends(get_current_user)):
     """Schedule a single post image for a specific brand at a given time."""
     try:
         from datetime import datetime
@@ -903,24 +898,21 @@ async def schedule_post_image(request: SchedulePostImageRequest, user: dict = De
 
 
 @router.get("/scheduled/occupied-post-slots")
-async def get_occupied_post_slots(user: dict = Depends(get_current_user)):
+def get_occupied_post_slots(user: dict = Depends(get_current_user)):
     """
     Return all occupied post slots (variant='post') grouped by brand.
     Frontend uses this to avoid scheduling collisions.
     """
     try:
-        all_scheduled = scheduler_service.get_all_scheduled(user_id=user["id"])
+        all_scheduled = scheduler_service.get_all_scheduled(
+            user_id=user["id"], statuses=["scheduled", "publishing"], variant="post",
+        )
 
         # Build dict of brand -> list of ISO datetime strings
         occupied: dict[str, list[str]] = {}
 
         for schedule in all_scheduled:
             metadata = schedule.get("metadata", {})
-            if metadata.get("variant") != "post":
-                continue
-            status = schedule.get("status", "")
-            if status not in ("scheduled", "publishing"):
-                continue
             brand = metadata.get("brand", "unknown").lower()
             sched_time = schedule.get("scheduled_time")
             if sched_time:
@@ -938,7 +930,7 @@ async def get_occupied_post_slots(user: dict = Depends(get_current_user)):
 
 
 @router.post("/scheduled/clean-reel-slots")
-async def clean_reel_slots(user: dict = Depends(get_current_user)):
+def clean_reel_slots(user: dict = Depends(get_current_user)):
     """
     Reel Scheduler Cleaner: ensures every scheduled reel sits on its correct
     brand slot (brand offset + base 4-hour pattern, alternating light/dark).
@@ -1003,19 +995,10 @@ async def clean_reel_slots(user: dict = Depends(get_current_user)):
             tomorrow = after + timedelta(days=1)
             return tomorrow.replace(hour=matching_hours[0], minute=0, second=0, microsecond=0)
 
-        all_scheduled = scheduler_service.get_all_scheduled(user_id=user_id)
-
-        # Collect only reel-type scheduled entries (variant != 'post')
-        reels: list[dict] = []
-        for schedule in all_scheduled:
-            metadata = schedule.get("metadata", {})
-            variant = metadata.get("variant", "light")
-            if variant == "post":
-                continue
-            status = schedule.get("status", "")
-            if status not in ("scheduled", "publishing"):
-                continue
-            reels.append(schedule)
+        # Only pending reel-type entries (variant != 'post')
+        reels: list[dict] = scheduler_service.get_all_scheduled(
+            user_id=user_id, statuses=["scheduled", "publishing"], exclude_variant="post",
+        )
 
         # Track all occupied slots per brand
         brand_occupied: dict[str, set[str]] = {}
@@ -1181,7 +1164,7 @@ async def clean_reel_slots(user: dict = Depends(get_current_user)):
 
 
 @router.post("/scheduled/clean-post-slots")
-async def clean_post_slots(posts_per_day: int = 6, user: dict = Depends(get_current_user)):
+def clean_post_slots(posts_per_day: int = 6, user: dict = Depends(get_current_user)):
     """
     Post Schedule Cleaner: find collisions (multiple posts at exact same
     time for any brand) and re-schedule the duplicates to the next valid
@@ -1233,19 +1216,15 @@ async def clean_post_slots(posts_per_day: int = 6, user: dict = Depends(get_curr
             h, m = slots[0]
             return tomorrow.replace(hour=h, minute=m, second=0, microsecond=0)
 
-        all_scheduled = scheduler_service.get_all_scheduled(user_id=user_id)
+        all_scheduled = scheduler_service.get_all_scheduled(
+            user_id=user_id, statuses=["scheduled", "publishing"], variant="post",
+        )
 
         # Collect only post-type scheduled entries that are still pending
         posts_by_slot: dict[str, list[dict]] = {}  # key = "brand|datetime"
 
         for schedule in all_scheduled:
             metadata = schedule.get("metadata", {})
-            if metadata.get("variant") != "post":
-                continue
-            status = schedule.get("status", "")
-            if status not in ("scheduled", "publishing"):
-                continue
-
             brand = metadata.get("brand", "unknown").lower()
             sched_time = schedule.get("scheduled_time")
             if not sched_time:
@@ -24,7 +24,7 @@ router = APIRouter(prefix="/api/trending-music", tags=["trending-music"])
 
 
 @router.get("", response_model=None)
-async def list_trending_music(
+def list_trending_music(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -38,7 +38,7 @@ async def list_trending_music(
 
 
 @router.get("/all", response_model=None)
-async def list_all_trending(
+def list_all_trending(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -52,7 +52,7 @@ async def list_all_trending(
 
 
 @router.get("/{track_id}", response_model=None)
-async def get_trending_track(
+def get_trending_track(
     track_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -65,7 +65,7 @@ async def get_trending_track(
 
 
 @router.post("/fetch", response_model=None)
-async def trigger_fetch(
+def trigger_fetch(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -98,7 +98,7 @@ def _serialize_pipeline_item(job: GenerationJob) -> dict:
 
 
 @router.get("")
-async def list_pipeline_items(
+def list_pipeline_items(
     status: Optional[str] = Query(
         "generating",
         pattern="^(pending_review|generating|scheduled|published|rejected|failed|all)$",
@@ -150,7 +150,7 @@ async def list_pipeline_items(
 
 
 @router.get("/stats")
-async def get_pipeline_stats(
+def get_pipeline_stats(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
@@ -393,7 +393,7 @@ def _approve_single_job(
 
 
 @router.post("/{job_id}/approve")
-async def approve_pipeline_item(
+def approve_pipeline_item(
     job_id: str,
     body: ApproveRequest,
     db: Session = Depends(get_db),
@@ -416,7 +416,7 @@ async def approve_pipeline_item(
 
 
 @router.post("/{job_id}/reject")
-async def reject_pipeline_item(
+def reject_pipeline_item(
     job_id: str,
     body: RejectRequest,
     db: Session = Depends(get_db),
@@ -523,7 +523,7 @@ def _bulk_schedule_background(job_ids: list[str], user: dict):
 
 
 @router.post("/bulk-approve")
-async def bulk_approve_pipeline_items(
+def bulk_approve_pipeline_items(
     body: BulkApproveRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
@@ -560,7 +560,7 @@ async def bulk_approve_pipeline_items(
 
 
 @router.post("/bulk-reject")
-async def bulk_reject_pipeline_items(
+def bulk_reject_pipeline_items(
     body: BulkRejectRequest,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -584,7 +584,7 @@ async def bulk_reject_pipeline_items(
 
 
 @router.patch("/{job_id}/edit")
-async def edit_pipeline_item(
+def edit_pipeline_item(
     job_id: str,
     body: EditRequest,
     db: Session = Depends(get_db),
@@ -610,7 +610,7 @@ async def edit_pipeline_item(
 
 
 @router.delete("/{job_id}")
-async def delete_pipeline_item(
+def delete_pipeline_item(
     job_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -639,7 +639,7 @@ async def delete_pipeline_item(
 
 
 @router.post("/regenerate")
-async def regenerate_pipeline_items(
+def regenerate_pipeline_items(
     body: RegenerateRequest,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -9,6 +9,15 @@ Endpoints:
 - GET  /api/admin/users/{id}/logs                Get system logs for a specific user
 - GET  /api/admin/supabase-usage                 Supabase usage metrics (super admin only)
 - GET  /api/admin/error-digest                   Condensed error summary (last 48h)
+- GET  /api/admin/publish-queue                  Publish queue diagnostics (status counts, due/stuck rows)
+- GET  /api/admin/job-queue                      Generation work queue metrics (depth, lease ages)
+- GET  /api/admin/scheduler-leader               Which process holds background-job leadership
+- GET  /api/admin/toby-ticks                     Slowest Toby tenants by last tick duration, shard layout
+- GET  /api/admin/analytics-refresh              Analytics refresh progress, last runs and slowest units
+- GET  /api/admin/embedding-cache                Toby embedding cache and memory vector index counters
+- GET  /api/admin/http-clients                   Outbound HTTP latency histograms per host
+- GET  /api/admin/brand-assets                   Brand logo/icon cache hit rates
+- GET  /api/admin/event-loop                     Event-loop lag histogram and handler threadpool usage
 - GET  /api/admin/format-violations              Proactive format pattern violation check
 - GET  /api/admin/music                          List music library tracks
 - POST /api/admin/music/upload                   Upload MP3 files to music library
@@ -189,7 +198,7 @@ def get_user_niche_config(
 # ─── Get User Brands ──────────────────────────────────────────────────────────
 
 @router.get("/api/admin/users/{target_user_id}/brands", summary="Get brands for a user (super admin only)")
-async def get_user_brands(
+def get_user_brands(
     target_user_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -289,7 +298,7 @@ def get_user_scheduled(
 # ─── Delete User ─────────────────────────────────────────────────────────────
 
 @router.delete("/api/admin/users/{target_user_id}", summary="Delete a user permanently (super admin only)")
-async def delete_user(
+def delete_user(
     target_user_id: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -304,9 +313,7 @@ async def delete_user(
     # and their data remains consistent.
     supabase = get_supabase_client()
     try:
-        await asyncio.to_thread(
-            lambda: supabase.auth.admin.delete_user(target_user_id)
-        )
+        supabase.auth.admin.delete_user(target_user_id)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -603,7 +610,7 @@ class ImageSourceToggleRequest(BaseModel):
 
 
 @router.put("/api/admin/image-source", summary="Toggle Format B image source (super admin only)")
-async def set_image_source(
+def set_image_source(
     request: ImageSourceToggleRequest,
     user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -646,21 +653,10 @@ def _extract_project_ref(supabase_url: str) -> str | None:
     return m.group(1) if m else None
 
 
-@router.get("/api/admin/supabase-usage", summary="Supabase usage metrics (super admin only)")
-async def get_supabase_usage(
-    user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    """Return Supabase project usage metrics: DB size, storage, egress, MAU, realtime, etc."""
-    _require_super_admin(user)
-
-    import os
-    import httpx
+def _direct_db_stats(db: Session) -> dict:
+    """Database size, connection counts and largest tables (blocking queries)."""
     from sqlalchemy import text
 
-    result: dict = {"db_stats": {}, "usage": None, "error": None}
-
-    # ── Direct DB stats (always available) ───────────────────────────
     try:
         row = db.execute(text(
             "SELECT pg_database_size(current_database()) AS db_bytes"
@@ -680,7 +676,7 @@ async def get_supabase_usage(
             "SELECT count(*) FROM pg_stat_activity"
         )).fetchone()
 
-        result["db_stats"] = {
+        return {
             "database_size_bytes": db_bytes,
             "database_size_mb": round(db_bytes / (1024 * 1024), 2) if db_bytes else 0,
             "active_connections": active_conns[0] if active_conns else 0,
@@ -691,7 +687,24 @@ async def get_supabase_usage(
             ],
         }
     except Exception as exc:
-        result["db_stats"] = {"error": str(exc)}
+        return {"error": str(exc)}
+
+
+@router.get("/api/admin/supabase-usage", summary="Supabase usage metrics (super admin only)")
+async def get_supabase_usage(
+    user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Return Supabase project usage metrics: DB size, storage, egress, MAU, realtime, etc."""
+    _require_super_admin(user)
+
+    import os
+    import httpx
+
+    result: dict = {"db_stats": {}, "usage": None, "error": None}
+
+    # ── Direct DB stats (always available) ───────────────────────────
+    result["db_stats"] = await asyncio.to_thread(_direct_db_stats, db)
 
     # ── Supabase Management API (requires SUPABASE_MANAGEMENT_KEY) ───
     mgmt_key = os.getenv("SUPABASE_MANAGEMENT_KEY")
@@ -789,7 +802,7 @@ async def get_supabase_usage(
 # ─── User Cost Tracking ──────────────────────────────────────────────────────
 
 @router.get("/api/admin/users/{user_id}/costs", summary="Get per-user cost data (super admin only)")
-async def get_user_costs_endpoint(
+def get_user_costs_endpoint(
     user_id: str,
     period: str = Query("month", regex="^(day|week|month|all)$"),
     user: dict = Depends(get_current_user),
@@ -802,7 +815,7 @@ async def get_user_costs_endpoint(
 
 
 @router.post("/api/admin/costs/aggregate", summary="Aggregate old daily cost records (super admin only)")
-async def aggregate_costs_endpoint(user: dict = Depends(get_current_user)):
+def aggregate_costs_endpoint(user: dict = Depends(get_current_user)):
     """Aggregate daily cost records older than 30 days into monthly summaries."""
     _require_super_admin(user)
 
@@ -913,6 +926,110 @@ def _classify_priority(
     return "low"
 
 
+@router.get("/api/admin/publish-queue", summary="Publish queue diagnostics (super admin only)")
+def get_publish_queue_diagnostics(
+    sample_size: int = Query(10, ge=1, le=100),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Status counts plus the next scheduled, in-flight and recently failed rows.
+    Replaces the per-tick debug dump that get_pending_publications() used to print.
+    """
+    _require_super_admin(user)
+
+    from app.services.publishing.scheduler import DatabaseSchedulerService
+    return DatabaseSchedulerService().get_queue_diagnostics(sample_size=sample_size)
+
+
+@router.get("/api/admin/job-queue", summary="Generation work queue metrics (super admin only)")
+def get_job_queue_metrics(user: dict = Depends(get_current_user)):
+    """Queue depth, in-flight jobs, expired leases and the oldest wait / lease age."""
+    _require_super_admin(user)
+
+    from app.services.content.job_queue import queue_metrics
+    return queue_metrics()
+
+
+@router.get("/api/admin/scheduler-leader", summary="Background-job leadership (super admin only)")
+def get_scheduler_leader(
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """SCHEDULER_MODE, this worker's role and the process currently holding the leader lock."""
+    _require_super_admin(user)
+
+    from app.services.publishing.scheduler_leader import leadership_status
+    return leadership_status(db)
+
+
+@router.get("/api/admin/toby-ticks", summary="Per-user Toby tick durations (super admin only)")
+def get_toby_ticks(
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """Slowest tenants by their last recorded tick, plus this process's pool and last tick."""
+    _require_super_admin(user)
+
+    from app.services.toby.tick_executor import tick_status
+    return tick_status(db, limit=limit)
+
+
+@router.get("/api/admin/analytics-refresh", summary="Analytics refresh runs (super admin only)")
+def get_analytics_refresh(user: dict = Depends(get_current_user)):
+    """Live progress and the last analytics / demographics runs of this process, slowest units first."""
+    _require_super_admin(user)
+
+    from app.services.analytics.refresh_engine import refresh_status
+    return refresh_status()
+
+
+@router.get("/api/admin/embedding-cache", summary="Toby embedding cache counters (super admin only)")
+def get_embedding_cache_stats(user: dict = Depends(get_current_user)):
+    """Embedding cache hits / API calls and this process's per-user memory vector indexes."""
+    _require_super_admin(user)
+
+    from app.services.toby.memory.embeddings import embedding_cache_stats
+    from app.services.toby.memory.vector_index import vector_index_stats
+    return {"embeddings": embedding_cache_stats(), "vector_index": vector_index_stats()}
+
+
+@router.get("/api/admin/llm-cache", summary="LLM response cache counters (super admin only)")
+def get_llm_cache_stats(user: dict = Depends(get_current_user)):
+    """Hits, misses, tokens and USD saved per cached DeepSeek callsite."""
+    _require_super_admin(user)
+
+    from app.utils.llm_cache import llm_cache_stats
+    return llm_cache_stats()
+
+
+@router.get("/api/admin/http-clients", summary="Outbound HTTP latency per host (super admin only)")
+def get_http_client_stats(user: dict = Depends(get_current_user)):
+    """Request counts, 5xx/transport errors and latency histograms for each external host."""
+    _require_super_admin(user)
+
+    from app.utils.http_client import http_client_stats
+    return http_client_stats()
+
+
+@router.get("/api/admin/brand-assets", summary="Brand asset cache counters (super admin only)")
+def get_brand_asset_stats(user: dict = Depends(get_current_user)):
+    """Logo downloads / 304 revalidations and decoded-image LRU hit rates for this process."""
+    _require_super_admin(user)
+
+    from app.services.media.asset_cache import brand_asset_stats
+    return brand_asset_stats()
+
+
+@router.get("/api/admin/event-loop", summary="Event-loop lag and threadpool usage (super admin only)")
+async def get_event_loop_stats(user: dict = Depends(get_current_user)):
+    """Loop lag histogram plus busy/waiting sync-handler threads. Async so it reads the live limiter."""
+    _require_super_admin(user)
+
+    from app.services.monitoring.event_loop import event_loop_stats
+    return event_loop_stats()
+
+
 @router.get("/api/admin/error-digest", summary="Condensed error summary for last 48h (super admin only)")
 def get_error_digest(
     hours: int = Query(48, ge=1, le=168),
@@ -1253,7 +1370,7 @@ def get_format_violations(
 
 
 @router.get("/api/admin/music", summary="List music library (super admin only)")
-async def list_music_library(
+def list_music_library(
     user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -1269,7 +1386,7 @@ async def list_music_library(
 
 
 @router.post("/api/admin/music/upload", summary="Upload MP3 to music library (super admin only)")
-async def upload_music_track(
+def upload_music_track(
     file: UploadFile = File(...),
     user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -1290,7 +1407,7 @@ async def upload_music_track(
     if ext not in ALLOWED_EXTENSIONS:
         raise HTTPException(status_code=400, detail=f"Unsupported file type '{ext}'. Allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}")
 
-    data = await file.read()
+    data = file.file.read()
     if len(data) > MAX_FILE_SIZE:
         raise HTTPException(status_code=400, detail=f"File too large ({len(data) / 1024 / 1024:.1f} MB). Max 30 MB.")
 
@@ -1316,7 +1433,7 @@ async def upload_music_track(
 
 
 @router.delete("/api/admin/music/{track_id}", summary="Delete a music track (super admin only)")
-async def delete_music_track(
+def delete_music_track(
     track_id: str,
     user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -1350,7 +1467,7 @@ async def delete_music_track(
 
 
 @router.get("/api/admin/music/{track_id}/stream", summary="Stream a music track (super admin only)")
-async def stream_music_track(
+def stream_music_track(
     track_id: str,
     user: dict = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -10,7 +10,7 @@ router = APIRouter(prefix="/api/admin/api-usage", tags=["admin-api-usage"])
 
 
 @router.get("")
-async def get_api_usage(
+def get_api_usage(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
@@ -67,7 +67,7 @@ def _check_supabase_auth():
 
 
 @router.get("/health-check")
-async def deep_health_check():
+def deep_health_check():
     """
     Deep health check — tests database, auth, and key tables.
     Returns per-subsystem latency and overall status.
@@ -104,7 +104,7 @@ async def deep_health_check():
 
 # ── AI Service Health (polls recent error logs) ─────────────────────
 @router.get("/ai-health")
-async def ai_service_health():
+def ai_service_health():
     """
     Return degraded AI services based on recent Toby error logs.
     Checks the last 30 min for patterns indicating image-gen or
@@ -165,7 +165,7 @@ async def ai_service_health():
 
 # ── Social Platform API Health ───────────────────────────────────────
 @router.get("/social-health")
-async def social_api_health():
+def social_api_health():
     """
     Check for recent social platform API errors (Meta/IG, YouTube, TikTok).
     Scans Toby error logs and publishing failures in the last 60 minutes.
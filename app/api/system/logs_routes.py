@@ -283,6 +283,7 @@ def get_log_stats(
         "period_minutes": since_minutes,
         "current_deployment": DEPLOYMENT_ID,
         "total_logs_in_db": total_logs,
+        "pipeline": get_logging_service().pipeline_stats(),
         "levels": {level: count for level, count in level_counts},
         "categories": {cat: count for cat, count in category_counts},
         "recent_errors": [e.to_dict() for e in recent_errors],
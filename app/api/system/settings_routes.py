@@ -292,7 +292,7 @@ def seed_settings_if_needed(db: Session) -> int:
 
 
 @router.get("")
-async def list_settings(
+def list_settings(
     category: Optional[str] = None,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -365,7 +365,7 @@ async def list_settings(
 
 
 @router.get("/categories")
-async def get_categories(
+def get_categories(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -380,7 +380,7 @@ async def get_categories(
 
 
 @router.get("/{key}")
-async def get_setting(
+def get_setting(
     key: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -414,7 +414,7 @@ async def get_setting(
 
 
 @router.put("/{key}")
-async def update_setting(
+def update_setting(
     key: str,
     request: UpdateSettingRequest,
     db: Session = Depends(get_db),
@@ -462,7 +462,7 @@ async def update_setting(
 
 
 @router.post("/bulk")
-async def bulk_update_settings(
+def bulk_update_settings(
     request: BulkUpdateSettingsRequest,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -502,7 +502,7 @@ async def bulk_update_settings(
 
 
 @router.post("/seed")
-async def seed_settings(
+def seed_settings(
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -529,7 +529,7 @@ async def seed_settings(
 
 
 @router.delete("/{key}")
-async def delete_setting(
+def delete_setting(
     key: str,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -13,7 +13,7 @@ router = APIRouter()
 
 
 @router.get("/status")
-async def get_status(db: Session = Depends(get_db)):
+def get_status(db: Session = Depends(get_db)):
     """Get current generation status."""
     active = db.query(GenerationJob).filter(
         GenerationJob.status.in_(["pending", "generating"])
@@ -31,7 +31,7 @@ async def get_status(db: Session = Depends(get_db)):
 
 
 @router.get("/history")
-async def get_history(limit: int = 10, db: Session = Depends(get_db)):
+def get_history(limit: int = 10, db: Session = Depends(get_db)):
     """Get recent generation history."""
     jobs = db.query(GenerationJob).order_by(
         GenerationJob.created_at.desc()
@@ -42,7 +42,7 @@ async def get_history(limit: int = 10, db: Session = Depends(get_db)):
 
 
 @router.get("/generation/{generation_id}")
-async def get_generation(generation_id: str, db: Session = Depends(get_db)):
+def get_generation(generation_id: str, db: Session = Depends(get_db)):
     """Get specific generation details."""
     job = db.query(GenerationJob).filter(
         GenerationJob.job_id == generation_id
@@ -64,7 +64,7 @@ async def get_generation(generation_id: str, db: Session = Depends(get_db)):
     summary="Health check",
     description="Check if the service and its dependencies are healthy"
 )
-async def health_check():
+def health_check():
     """
     Health check endpoint.
     
@@ -17,6 +17,7 @@ from app.api.auth.middleware import get_current_user
 from app.db_connection import get_db
 from app.models.brands import Brand
 from app.models.scheduling import ScheduledReel
+from app.services.publishing.publish_wakeup import notify_publish_wakeup
 
 
 router = APIRouter(prefix="/api/threads", tags=["threads"])
@@ -113,8 +114,8 @@ async def generate_single_post(
     user: dict = Depends(get_current_user),
 ):
     """Generate a single Threads text post using AI."""
-    _get_user_brand(db, user["id"], request.brand_id)
-    ctx = _get_prompt_context(user["id"])
+    await asyncio.to_thread(_get_user_brand, db, user["id"], request.brand_id)
+    ctx = await asyncio.to_thread(_get_prompt_context, user["id"])
 
     from app.services.content.threads_generator import ThreadsGenerator
     generator = ThreadsGenerator()
@@ -142,8 +143,8 @@ async def generate_chain(
     user: dict = Depends(get_current_user),
 ):
     """Generate a multi-post thread chain using AI."""
-    _get_user_brand(db, user["id"], request.brand_id)
-    ctx = _get_prompt_context(user["id"])
+    await asyncio.to_thread(_get_user_brand, db, user["id"], request.brand_id)
+    ctx = await asyncio.to_thread(_get_prompt_context, user["id"])
 
     from app.services.content.threads_generator import ThreadsGenerator
     generator = ThreadsGenerator()
@@ -171,8 +172,8 @@ async def generate_bulk(
     user: dict = Depends(get_current_user),
 ):
     """Generate multiple Threads posts at once."""
-    _get_user_brand(db, user["id"], request.brand_id)
-    ctx = _get_prompt_context(user["id"])
+    await asyncio.to_thread(_get_user_brand, db, user["id"], request.brand_id)
+    ctx = await asyncio.to_thread(_get_prompt_context, user["id"])
 
     from app.services.content.threads_generator import ThreadsGenerator
     generator = ThreadsGenerator()
@@ -197,7 +198,7 @@ async def publish_single(
     user: dict = Depends(get_current_user),
 ):
     """Publish a single text post to Threads immediately."""
-    brand = _get_user_brand(db, user["id"], request.brand_id)
+    brand = await asyncio.to_thread(_get_user_brand, db, user["id"], request.brand_id)
 
     if not brand.threads_access_token or not brand.threads_user_id:
         raise HTTPException(
@@ -205,7 +206,7 @@ async def publish_single(
             detail="Threads is not connected for this brand. Connect it in Brand settings.",
         )
 
-    publisher = _get_publisher(brand)
+    publisher = await asyncio.to_thread(_get_publisher, brand)
     result = await asyncio.to_thread(
         publisher.publish_threads_post,
         caption=request.text,
@@ -228,7 +229,7 @@ async def publish_chain(
     user: dict = Depends(get_current_user),
 ):
     """Publish a multi-post thread chain to Threads immediately."""
-    brand = _get_user_brand(db, user["id"], request.brand_id)
+    brand = await asyncio.to_thread(_get_user_brand, db, user["id"], request.brand_id)
 
     if not brand.threads_access_token or not brand.threads_user_id:
         raise HTTPException(
@@ -244,7 +245,7 @@ async def publish_chain(
                 detail=f"Part {i + 1} exceeds 500 character limit ({len(part)} chars)",
             )
 
-    publisher = _get_publisher(brand)
+    publisher = await asyncio.to_thread(_get_publisher, brand)
     result = await asyncio.to_thread(
         publisher.publish_threads_chain,
         parts=request.parts,
@@ -267,7 +268,7 @@ async def publish_chain(
 # ── Scheduling endpoints ─────────────────────────────────────────────
 
 @router.post("/schedule")
-async def schedule_thread(
+def schedule_thread(
     request: ScheduleThreadRequest,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -328,6 +329,7 @@ async def schedule_thread(
     )
 
     db.add(entry)
+    notify_publish_wakeup(db, scheduled_dt)
     db.commit()
 
     return {
@@ -338,7 +340,7 @@ async def schedule_thread(
 
 
 @router.post("/auto-schedule")
-async def auto_schedule_thread(
+def auto_schedule_thread(
     request: AutoScheduleRequest,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -436,6 +438,7 @@ async def auto_schedule_thread(
     )
 
     db.add(entry)
+    notify_publish_wakeup(db, next_slot)
     db.commit()
 
     return {
@@ -448,7 +451,7 @@ async def auto_schedule_thread(
 # ── Format types endpoint ────────────────────────────────────────────
 
 @router.get("/format-types")
-async def get_format_types(user: dict = Depends(get_current_user)):
+def get_format_types(user: dict = Depends(get_current_user)):
     """Return available Threads post format types."""
     from app.services.content.threads_generator import THREAD_FORMAT_TYPES
     return {
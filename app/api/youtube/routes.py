@@ -37,7 +37,7 @@ youtube_publisher = YouTubePublisher()
 
 
 @router.get("/connect")
-async def youtube_connect(
+def youtube_connect(
     brand: str = Query(..., description="Brand to connect YouTube for"),
     return_to: str = Query(None, description="Where to redirect after OAuth (e.g. 'onboarding')"),
     user: dict = Depends(get_current_user),
@@ -86,7 +86,7 @@ async def youtube_connect(
 
 
 @router.get("/callback")
-async def youtube_callback(
+def youtube_callback(
     code: Optional[str] = None,
     state: Optional[str] = None,
     error: Optional[str] = None,
@@ -437,7 +437,7 @@ async def youtube_callback(
 
 
 @router.get("/status")
-async def youtube_status(db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
+def youtube_status(db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
     """
     Get the connection status for all brands' YouTube channels.
     
@@ -480,7 +480,7 @@ async def youtube_status(db: Session = Depends(get_db), user: dict = Depends(get
 
 
 @router.get("/quota")
-async def youtube_quota(user: dict = Depends(get_current_user)):
+def youtube_quota(user: dict = Depends(get_current_user)):
     """
     Get current YouTube API quota usage and status.
     
@@ -492,7 +492,7 @@ async def youtube_quota(user: dict = Depends(get_current_user)):
 
 
 @router.post("/disconnect/{brand}")
-async def youtube_disconnect(brand: str, db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
+def youtube_disconnect(brand: str, db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
     """
     Disconnect a YouTube channel from a brand.
     
@@ -18,11 +18,18 @@ if not DATABASE_URL:
 
 print("✅ Connected to PostgreSQL database (Supabase)")
 
-# PostgreSQL connection — conservative pool for Supabase session mode
+# PostgreSQL connection — conservative pool for Supabase session mode.
+# The publish engine caps its schedule workers from DB_POOL_CAPACITY, so
+# raise DB_POOL_SIZE / DB_MAX_OVERFLOW together with the database's
+# connection limit to publish more schedules at once.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "3"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_CAPACITY = DB_POOL_SIZE + DB_MAX_OVERFLOW
+
 engine = create_engine(
     DATABASE_URL,
-    pool_size=3,
-    max_overflow=5,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
     pool_timeout=30,
     pool_recycle=1800,
     pool_pre_ping=True,
@@ -79,6 +86,73 @@ def run_migrations():
             conn.execute(text(sql))
         # Toby: add created_by column to scheduled_reels
         conn.execute(text("ALTER TABLE scheduled_reels ADD COLUMN IF NOT EXISTS created_by VARCHAR(20) DEFAULT 'user'"))
+        # Publish dedup fingerprint (index + backfill: migrations/add_scheduled_reels_title_fingerprint.sql)
+        conn.execute(text("ALTER TABLE scheduled_reels ADD COLUMN IF NOT EXISTS title_fingerprint VARCHAR(32)"))
+        # brand/variant/content_type promoted out of extra_data (backfill + indexes run
+        # online after startup: backfill_scheduled_reel_columns / migrations/add_scheduled_reels_brand_columns.sql)
+        for col, coltype in [("brand", "VARCHAR(50)"), ("variant", "VARCHAR(20)"), ("content_type", "VARCHAR(20)")]:
+            conn.execute(text(f"ALTER TABLE scheduled_reels ADD COLUMN IF NOT EXISTS {col} {coltype}"))
+        # Per-user Toby tick duration (written by app/services/toby/tick_executor.py)
+        conn.execute(text("ALTER TABLE toby_state ADD COLUMN IF NOT EXISTS last_tick_ms INTEGER"))
+        conn.execute(text("ALTER TABLE toby_state ADD COLUMN IF NOT EXISTS last_tick_at TIMESTAMPTZ"))
+        # Generation work queue (index: migrations/add_generation_jobs_queue.sql)
+        for col, coltype in [
+            ("queue_action", "VARCHAR(20)"),
+            ("queued_at", "TIMESTAMPTZ"),
+            ("lease_owner", "VARCHAR(100)"),
+            ("leased_at", "TIMESTAMPTZ"),
+            ("lease_expires_at", "TIMESTAMPTZ"),
+            ("queue_attempts", "INTEGER NOT NULL DEFAULT 0"),
+        ]:
+            conn.execute(text(f"ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS {col} {coltype}"))
+        # Cost tracker upserts on (user_id, date) (details: migrations/add_user_cost_daily_unique.sql)
+        conn.execute(text("""
+            DO $$
+            BEGIN
+                IF to_regclass('uq_user_cost_daily_user_date') IS NULL THEN
+                    WITH dupes AS (
+                        SELECT id, row_number() OVER (PARTITION BY user_id, date ORDER BY created_at, id) AS rn,
+                               first_value(id) OVER (PARTITION BY user_id, date ORDER BY created_at, id) AS keep_id
+                        FROM user_cost_daily
+                    ), sums AS (
+                        SELECT d.keep_id,
+                               sum(COALESCE(c.deepseek_calls, 0)) AS deepseek_calls,
+                               sum(COALESCE(c.deepseek_input_tokens, 0)) AS deepseek_input_tokens,
+                               sum(COALESCE(c.deepseek_output_tokens, 0)) AS deepseek_output_tokens,
+                               sum(COALESCE(c.deepseek_cost_usd, 0)) AS deepseek_cost_usd,
+                               sum(COALESCE(c.deapi_calls, 0)) AS deapi_calls,
+                               sum(COALESCE(c.deapi_cost_usd, 0)) AS deapi_cost_usd,
+                               sum(COALESCE(c.freepik_calls, 0)) AS freepik_calls,
+                               sum(COALESCE(c.freepik_cost_usd, 0)) AS freepik_cost_usd,
+                               sum(COALESCE(c.searchapi_calls, 0)) AS searchapi_calls,
+                               sum(COALESCE(c.searchapi_cost_usd, 0)) AS searchapi_cost_usd,
+                               sum(COALESCE(c.reels_generated, 0)) AS reels_generated,
+                               sum(COALESCE(c.carousels_generated, 0)) AS carousels_generated
+                        FROM dupes d JOIN user_cost_daily c ON c.id = d.id
+                        WHERE d.keep_id IN (SELECT keep_id FROM dupes WHERE rn > 1)
+                        GROUP BY d.keep_id
+                    ), merged AS (
+                        UPDATE user_cost_daily u SET
+                            deepseek_calls = s.deepseek_calls,
+                            deepseek_input_tokens = s.deepseek_input_tokens,
+                            deepseek_output_tokens = s.deepseek_output_tokens,
+                            deepseek_cost_usd = s.deepseek_cost_usd,
+                            deapi_calls = s.deapi_calls,
+                            deapi_cost_usd = s.deapi_cost_usd,
+                            freepik_calls = s.freepik_calls,
+                            freepik_cost_usd = s.freepik_cost_usd,
+                            searchapi_calls = s.searchapi_calls,
+                            searchapi_cost_usd = s.searchapi_cost_usd,
+                            reels_generated = s.reels_generated,
+                            carousels_generated = s.carousels_generated
+                        FROM sums s WHERE u.id = s.keep_id
+                    )
+                    DELETE FROM user_cost_daily WHERE id IN (SELECT id FROM dupes WHERE rn > 1);
+                    CREATE UNIQUE INDEX IF NOT EXISTS uq_user_cost_daily_user_date
+                        ON user_cost_daily (user_id, date);
+                END IF;
+            END $$
+        """))
         # Seed global prompt settings if they don't exist
         for key, desc in [
             ("reels_prompt", "Global prompt describing topics/ideas for reel content"),
@@ -154,6 +228,59 @@ def run_migrations():
         """))
         conn.commit()
 
+    import threading
+    threading.Thread(target=backfill_scheduled_reel_columns, name="scheduled-reels-backfill", daemon=True).start()
+
+
+_SCHEDULED_REELS_BACKFILL_BATCH = """
+    UPDATE scheduled_reels s
+    SET brand = left(NULLIF(lower(trim(s.extra_data->>'brand')), ''), 50),
+        variant = left(NULLIF(s.extra_data->>'variant', ''), 20),
+        content_type = left(NULLIF(s.extra_data->>'content_type', ''), 20)
+    WHERE s.schedule_id IN (
+        SELECT schedule_id FROM scheduled_reels
+        WHERE (brand IS NULL AND NULLIF(trim(extra_data->>'brand'), '') IS NOT NULL)
+           OR (variant IS NULL AND NULLIF(extra_data->>'variant', '') IS NOT NULL)
+           OR (content_type IS NULL AND NULLIF(extra_data->>'content_type', '') IS NOT NULL)
+        ORDER BY scheduled_time DESC
+        LIMIT :batch
+        FOR UPDATE SKIP LOCKED
+    )
+"""
+
+
+def backfill_scheduled_reel_columns(batch_size: int = 5000) -> int:
+    """Fill scheduled_reels.brand/variant/content_type from extra_data, then build their indexes.
+
+    Runs in the background after run_migrations(): one short transaction per
+    batch and CREATE INDEX CONCURRENTLY, so the API keeps serving (and
+    writing scheduled_reels) meanwhile. Newest rows first — the buffer and
+    dedup windows only look at recent/upcoming slots. A no-op once filled.
+    Same SQL as migrations/add_scheduled_reels_brand_columns.sql.
+    """
+    total = 0
+    try:
+        while True:
+            with engine.begin() as conn:
+                filled = conn.execute(text(_SCHEDULED_REELS_BACKFILL_BATCH), {"batch": batch_size}).rowcount
+            total += filled
+            if filled < batch_size:
+                break
+        if total:
+            print(f"✅ Backfilled brand/variant/content_type on {total} scheduled_reels rows", flush=True)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scheduled_reels_user_brand_time "
+                "ON scheduled_reels (user_id, brand, scheduled_time)"
+            ))
+            conn.execute(text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scheduled_reels_user_brand_published "
+                "ON scheduled_reels (user_id, brand, published_at) WHERE status IN ('published', 'partial')"
+            ))
+    except Exception as e:
+        print(f"⚠️ scheduled_reels column backfill failed: {e}", flush=True)
+    return total
+
 
 def get_db() -> Session:
     """
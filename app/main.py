@@ -46,6 +46,7 @@ from app.api.billing.routes import router as billing_router
 from app.api.threads.routes import router as threads_router
 from app.api.pipeline.routes import router as pipeline_router
 from app.services.publishing.scheduler import DatabaseSchedulerService
+from app.services.publishing.publish_engine import get_publish_engine
 from app.services.logging.service import get_logging_service, DEPLOYMENT_ID, set_user_id as set_logging_user_id, clear_user_id as clear_logging_user_id
 from app.services.logging.middleware import RequestLoggingMiddleware
 from app.db_connection import init_db
@@ -178,7 +179,7 @@ app.include_router(pipeline_router)  # Pipeline approval gate
 
 
 @app.get("/health", tags=["system"])
-async def health_check():
+def health_check():
     """Health check for Railway — always 200 so deployment doesn't stall on DB ping."""
     from app.db_connection import SessionLocal
     from sqlalchemy import text as sa_text
@@ -392,87 +393,24 @@ def recover_approved_unscheduled_jobs():
         db.close()
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Run startup tasks."""
-    import sys
-
-    # Initialize persistent logging service FIRST (captures everything from here on)
-    logging_service = get_logging_service()
-    logging_service.log_system_event(
-        'startup',
-        f'Application starting - Deployment: {DEPLOYMENT_ID}',
-        details={
-            'python_version': sys.version,
-            'port': os.getenv('PORT', 'not set'),
-            'deployment_id': DEPLOYMENT_ID,
-            'database_url': 'set' if os.getenv('DATABASE_URL') else 'NOT SET',
-        }
-    )
-
-    print("🚀 Starting Instagram Reels Automation API...", flush=True)
-    print(f"📍 Python: {sys.version}", flush=True)
-    print(f"📍 PORT: {os.getenv('PORT', 'not set')}", flush=True)
-    print(f"📍 Deployment: {DEPLOYMENT_ID}", flush=True)
-    print("📝 Documentation available at: /docs", flush=True)
-    print("🔍 Health check available at: /health", flush=True)
-    print("📋 Logs dashboard available at: /logs", flush=True)
-
-    # Initialize database
-    print("💾 Initializing database...", flush=True)
-    try:
-        init_db()
-        print("✅ Database initialized", flush=True)
-
-        # Seed brands and settings if needed
-        print("🌱 Checking for brand/settings seeds...", flush=True)
-        from app.db_connection import SessionLocal
-        from app.services.brands.manager import seed_brands_if_needed
-        from app.api.system.settings_routes import seed_settings_if_needed
-
-        db = SessionLocal()
-        try:
-            default_user_id = os.getenv("DEFAULT_USER_ID")
-            brands_seeded = seed_brands_if_needed(db, user_id=default_user_id)
-            settings_seeded = seed_settings_if_needed(db)
-
-            if brands_seeded > 0:
-                print(f"   🏷️ Seeded {brands_seeded} default brands", flush=True)
-            else:
-                print(f"   🏷️ Brands already exist", flush=True)
-
-            if settings_seeded > 0:
-                print(f"   ⚙️ Seeded {settings_seeded} default settings", flush=True)
-            else:
-                print(f"   ⚙️ Settings already exist", flush=True)
-        finally:
-            db.close()
-
-    except Exception as e:
-        print(f"❌ Database init failed: {e}", flush=True)
-        # Continue anyway - don't block startup
-
-    # Log brand credentials status at startup (CRITICAL for debugging cross-posting)
-    print("\n🏷️ Brand Credentials Status:", flush=True)
-    from app.services.brands.resolver import brand_resolver
-    for brand in brand_resolver.get_all_brands():
-        ig_status = "✅" if brand.instagram_business_account_id else "❌ MISSING"
-        fb_status = "✅" if brand.facebook_page_id else "❌ MISSING"
-        token_status = "✅" if brand.meta_access_token else "❌ MISSING"
-        print(f"   {brand.display_name}:", flush=True)
-        print(f"      Instagram ID: {ig_status} ({brand.instagram_business_account_id or 'None'})", flush=True)
-        print(f"      Facebook ID:  {fb_status} ({brand.facebook_page_id or 'None'})", flush=True)
-        print(f"      Token:        {token_status}", flush=True)
-    print("", flush=True)
+def resume_interrupted_generating_jobs():
+    """Re-enqueue "generating" jobs left behind by a crash or deploy.
 
-    # Resume any interrupted "generating" jobs from previous crashes/deploys
+    Leader-only (called from start_background_jobs) so that a multi-worker
+    deploy resumes each job once rather than once per booting worker.
+    Jobs already owned by the work queue are skipped — lease expiry
+    resumes those.
+    """
     print("🔄 Checking for interrupted generating jobs...", flush=True)
     try:
+        from app.db_connection import SessionLocal
         from app.models import GenerationJob
         db_stuck = SessionLocal()
         try:
+            # Jobs owned by the work queue are resumed by lease expiry instead
             stuck_jobs = db_stuck.query(GenerationJob).filter(
-                GenerationJob.status == "generating"
+                GenerationJob.status == "generating",
+                GenerationJob.queue_action.is_(None),
             ).all()
             if stuck_jobs:
                 resume_ids = []
@@ -498,36 +436,12 @@ async def startup_event():
 
                 db_stuck.commit()
 
-                # Launch resume threads after committing status updates
+                # Hand resumes to the work queue after committing status updates
                 if resume_ids:
-                    import threading
-                    def _resume_jobs(job_ids):
-                        """Resume interrupted jobs in background."""
-                        import time
-                        time.sleep(5)  # Give the server a moment to finish startup
-                        for jid in job_ids:
-                            try:
-                                print(f"\n🔄 Resuming interrupted job {jid}...", flush=True)
-                                from app.db_connection import get_db_session
-                                from app.services.content.job_processor import JobProcessor
-                                with get_db_session() as db:
-                                    processor = JobProcessor(db)
-                                    result = processor.resume_job(jid)
-                                    ok = result.get("success", False)
-                                    print(f"   {'✅' if ok else '❌'} Resume {jid}: {result}", flush=True)
-                            except Exception as e:
-                                print(f"   ❌ Resume {jid} failed: {e}", flush=True)
-                                try:
-                                    from app.db_connection import get_db_session
-                                    from app.services.content.job_manager import JobManager
-                                    with get_db_session() as db2:
-                                        JobManager(db2).update_job_status(jid, "failed", error_message=f"Resume failed: {e}")
-                                except Exception:
-                                    pass
-
-                    t = threading.Thread(target=_resume_jobs, args=(resume_ids,), daemon=True)
-                    t.start()
-                    print(f"⏳ {len(resume_ids)} job(s) queued for background resume", flush=True)
+                    from app.services.content.job_queue import enqueue_job
+                    for jid in resume_ids:
+                        enqueue_job(jid, "resume")
+                    print(f"⏳ {len(resume_ids)} job(s) queued for resume", flush=True)
                 else:
                     print(f"✅ All {len(stuck_jobs)} interrupted job(s) recovered without re-processing", flush=True)
             else:
@@ -537,6 +451,413 @@ async def startup_event():
     except Exception as e:
         print(f"⚠️ Could not check interrupted jobs: {e}", flush=True)
 
+
+def _run_platform_calls(scheduler_service, schedule_id: str, brand: str, calls: dict) -> dict:
+    """Run per-platform publish calls concurrently, saving each result as it lands."""
+    calls = {
+        platform: scheduler_service._saving_platform_result(schedule_id, platform, fn)
+        for platform, fn in calls.items()
+    }
+    return get_publish_engine().run_platform_calls(calls, account=brand)
+
+
+def _publish_due_schedule(scheduler_service: DatabaseSchedulerService, schedule: dict) -> str:
+    """Publish one due schedule to all of its platforms.
+
+    Runs on a PublishEngine worker thread. Marks the schedule as
+    published/partial/failed and returns that final status.
+    """
+    schedule_id = schedule.get('schedule_id')
+    reel_id = schedule.get('reel_id')
+    try:
+        caption = schedule.get('caption', 'CHANGE ME')
+        metadata = schedule.get('metadata', {})
+
+        # Set user context so all logs (including print captures)
+        # are attributed to the correct user in the log viewer.
+        _sched_user_id = schedule.get('user_id', '')
+        if _sched_user_id:
+            set_logging_user_id(_sched_user_id)
+
+        print(f"\n   📋 [PUBLISH] Processing schedule: {schedule_id}", flush=True)
+        print(f"   📋 [PUBLISH] Metadata keys: {list(metadata.keys())}", flush=True)
+
+        # --- PLATFORM SELECTION (RETRY-AWARE) ---
+        # retry_platforms is set by retry_failed() and auto_retry_failed_toby_posts()
+        # when a post has "partial" status (some platforms succeeded, others failed).
+        # If set, we ONLY publish to the failed platforms to avoid duplicates.
+        # If not set, this is a fresh publish — use the full platform list.
+        retry_platforms = metadata.get('retry_platforms')
+        succeeded_platforms = metadata.get('succeeded_platforms', [])
+
+        print(f"   📋 [PUBLISH] retry_platforms from metadata: {retry_platforms}", flush=True)
+        print(f"   📋 [PUBLISH] succeeded_platforms from metadata: {succeeded_platforms}", flush=True)
+
+        if retry_platforms:
+            platforms = retry_platforms
+            print(f"   🔄 PARTIAL RETRY: Only retrying {platforms} (skipping already successful: {succeeded_platforms})", flush=True)
+        else:
+            platforms = metadata.get('platforms', ['instagram'])
+            print(f"   📋 [PUBLISH] Using platforms from metadata: {platforms}", flush=True)
+
+        # All paths in metadata are now Supabase URLs
+        video_path_str = metadata.get('video_path')
+        thumbnail_path_str = metadata.get('thumbnail_path')
+        brand = metadata.get('brand', '')
+        variant = metadata.get('variant', 'light')
+        content_type = metadata.get('content_type', '')
+
+        # ── TEXT-ONLY PLATFORM GUARD ──
+        # Threads (and future X) are text-only — strip them from
+        # any publish that carries media (reels, posts, carousels).
+        # Only allow them through for text-only content types.
+        if content_type not in ('text', 'threads_post'):
+            from app.core.platforms import TEXT_ONLY_PLATFORMS
+            text_only_in_list = [p for p in platforms if p in TEXT_ONLY_PLATFORMS]
+            if text_only_in_list:
+                platforms = [p for p in platforms if p not in TEXT_ONLY_PLATFORMS]
+                print(f"   🧵 Stripped text-only platforms {text_only_in_list} from media publish", flush=True)
+
+        print(f"      📦 Metadata: video={video_path_str}, thumbnail={thumbnail_path_str}, brand={brand}, variant={variant}")
+
+        # ── POST (image) vs REEL (video) vs THREADS (text) publishing ──
+        is_post = (variant == 'post')
+        is_threads_text = (variant == 'threads' or content_type == 'threads_post')
+
+        if is_threads_text:
+            # ── THREADS TEXT-ONLY PUBLISHING ──
+            print(f"      🧵 Threads text-only publish for {brand}", flush=True)
+
+            from app.services.publishing.social_publisher import SocialPublisher
+            from app.services.brands.resolver import brand_resolver
+
+            resolved_config = brand_resolver.get_brand_config(brand)
+            if not resolved_config:
+                raise ValueError(f"No brand config found for '{brand}'")
+
+            publisher = SocialPublisher(brand_config=resolved_config)
+
+            is_chain = metadata.get('is_chain', False)
+            chain_parts = metadata.get('chain_parts') or []
+
+            result = {}
+            if is_chain and len(chain_parts) >= 2:
+                result["threads"] = publisher.publish_threads_chain(parts=chain_parts)
+            else:
+                result["threads"] = publisher.publish_threads_post(
+                    caption=caption,
+                    media_type="TEXT",
+                )
+
+            scheduler_service.mark_as_published(
+                schedule_id,
+                publish_results=result,
+            )
+            print(f"      ✅ Threads text published: {schedule_id}", flush=True)
+
+        elif is_post:
+            # ── IMAGE POST PUBLISHING ──
+            # thumbnail_path_str is a Supabase URL
+            image_url = thumbnail_path_str
+            if not image_url:
+                raise ValueError(f"No thumbnail/cover URL found in metadata for post {reel_id}")
+
+            print(f"      🖼️  Image post cover URL: {image_url}")
+
+            # Check for pre-rendered carousel images (cover + text slides)
+            pre_rendered = metadata.get('carousel_paths') or []
+            post_title = metadata.get('title', '')
+            slide_texts = metadata.get('slide_texts') or []
+            supabase_slide_urls = []
+
+            if pre_rendered:
+                # Use stored pre-rendered images — no JIT needed
+                image_url = pre_rendered[0]  # composed cover
+                supabase_slide_urls = pre_rendered[1:]  # text slides
+                print(f"      ✅ Using {len(pre_rendered)} pre-rendered carousel images")
+            elif (post_title or slide_texts) and image_url.startswith("https://"):
+                try:
+                    import tempfile
+                    import requests as _req
+                    # Download background image to temp file for node renderer
+                    resp = _req.get(image_url, timeout=60)
+                    resp.raise_for_status()
+                    tmp_bg = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
+                    tmp_bg.write(resp.content)
+                    tmp_bg.close()
+
+                    composed = _render_slides_node(
+                        brand=brand,
+                        title=post_title,
+                        background_image=tmp_bg.name,
+                        slide_texts=slide_texts,
+                        reel_id=reel_id,
+                        user_id=schedule.get('user_id', 'system'),
+                    )
+                    if composed:
+                        if composed.get("coverUrl"):
+                            image_url = composed["coverUrl"]
+                        supabase_slide_urls = composed.get("slideUrls", [])
+                        print(f"      ✅ Konva rendered: cover + {len(supabase_slide_urls)} slides")
+                    else:
+                        print(f"      ⚠️ Node renderer returned no result", flush=True)
+
+                    # Clean up temp file
+                    try:
+                        os.unlink(tmp_bg.name)
+                    except Exception:
+                        pass
+                except Exception as comp_err:
+                    import traceback
+                    print(f"      ⚠️ JIT composition failed: {comp_err}", flush=True)
+                    traceback.print_exc()
+
+            print(f"      🌐 Cover image URL: {image_url}")
+            print(f"      🏷️ Publishing IMAGE POST with brand: {brand}")
+
+            # Resolve brand credentials
+            from app.services.publishing.social_publisher import SocialPublisher
+            from app.services.brands.resolver import brand_resolver
+
+            publisher = None
+            resolved_config = brand_resolver.get_brand_config(brand)
+            if resolved_config:
+                publisher = SocialPublisher(brand_config=resolved_config)
+            else:
+                publisher = SocialPublisher()
+
+            # Check for carousel slides — prefer JIT-composed, fall back to metadata
+            if supabase_slide_urls:
+                carousel_image_urls = supabase_slide_urls
+            else:
+                carousel_paths_raw = metadata.get('carousel_paths') or []
+                carousel_image_urls = [url for url in carousel_paths_raw if url]
+
+            result = {}
+            if carousel_image_urls:
+                # ── CAROUSEL PUBLISH (cover + text slides) ──
+                all_urls = [image_url] + carousel_image_urls
+                print(f"      📚 Carousel with {len(all_urls)} slides")
+
+                calls = {}
+                if "instagram" in platforms:
+                    def _publish_instagram():
+                        print("📸 Publishing carousel to Instagram...")
+                        return publisher.publish_instagram_carousel(
+                            image_urls=all_urls,
+                            caption=caption,
+                        )
+                    calls["instagram"] = _publish_instagram
+                if "facebook" in platforms:
+                    def _publish_facebook():
+                        print("📘 Publishing carousel to Facebook...")
+                        return publisher.publish_facebook_carousel(
+                            image_urls=all_urls,
+                            caption=caption,
+                        )
+                    calls["facebook"] = _publish_facebook
+                result.update(_run_platform_calls(scheduler_service, schedule_id, brand, calls))
+                # Threads is text-only — never publish media to Threads.
+                # The TEXT_ONLY_PLATFORMS guard above strips threads from platforms,
+                # but this comment documents the intentional exclusion.
+                if "tiktok" in platforms:
+                    # TikTok doesn't support image carousels via API — skip gracefully
+                    result["tiktok"] = {
+                        "success": False,
+                        "not_connected": True,
+                        "error": "TikTok does not support image carousel publishing via API",
+                        "platform": "tiktok",
+                    }
+            else:
+                # ── SINGLE IMAGE PUBLISH ──
+                calls = {}
+                if "instagram" in platforms:
+                    def _publish_instagram():
+                        print("📸 Publishing image post to Instagram...")
+                        return publisher.publish_instagram_image_post(
+                            image_url=image_url,
+                            caption=caption,
+                        )
+                    calls["instagram"] = _publish_instagram
+                if "facebook" in platforms:
+                    def _publish_facebook():
+                        print("📘 Publishing image post to Facebook...")
+                        return publisher.publish_facebook_image_post(
+                            image_url=image_url,
+                            caption=caption,
+                        )
+                    calls["facebook"] = _publish_facebook
+                result.update(_run_platform_calls(scheduler_service, schedule_id, brand, calls))
+                # Threads is text-only — never publish media to Threads.
+                if "tiktok" in platforms:
+                    # TikTok doesn't support single image publishing via API — skip gracefully
+                    result["tiktok"] = {
+                        "success": False,
+                        "not_connected": True,
+                        "error": "TikTok does not support image publishing via API",
+                        "platform": "tiktok",
+                    }
+        else:
+            # ── REEL (VIDEO) PUBLISHING ──
+            # All paths are now Supabase URLs
+            if not video_path_str:
+                raise ValueError(f"No video URL found in metadata for reel {reel_id}")
+            if not thumbnail_path_str:
+                raise ValueError(f"No thumbnail URL found in metadata for reel {reel_id}")
+
+            print(f"      🎬 Video URL: {video_path_str}")
+            print(f"      🖼️  Thumbnail URL: {thumbnail_path_str}")
+
+            # Publish now - pass URLs directly
+            print(f"      🏷️ Publishing REEL with brand: {brand}")
+
+            # Look up share_to_feed preference from TobyBrandConfig
+            _reel_share_to_feed = True
+            if brand and _sched_user_id:
+                try:
+                    from app.db_connection import get_db_session
+                    from app.models.toby import TobyBrandConfig as _TBC
+                    with get_db_session() as _stf_db:
+                        _tbc = _stf_db.query(_TBC).filter(
+                            _TBC.user_id == _sched_user_id,
+                            _TBC.brand_id == brand,
+                        ).first()
+                        if _tbc and _tbc.reels_share_to_feed is not None:
+                            _reel_share_to_feed = _tbc.reels_share_to_feed
+                            if not _reel_share_to_feed:
+                                print(f"      📌 Reels-only mode: share_to_feed=false for {brand}")
+                except Exception as _stf_err:
+                    print(f"      ⚠️ Could not look up share_to_feed: {_stf_err}")
+
+            result = scheduler_service.publish_now(
+                video_url=video_path_str,
+                thumbnail_url=thumbnail_path_str,
+                caption=caption,
+                platforms=platforms,
+                brand_name=brand,
+                metadata=metadata,
+                schedule_id=schedule_id,
+                share_to_feed=_reel_share_to_feed
+            )
+
+        print(f"      📊 Publish result: {result}")
+
+        # Check for credential errors first
+        if result.get('credential_error'):
+            # Build a specific error message from the platform results
+            platform_errors = [
+                v.get('error', '') for k, v in result.items()
+                if isinstance(v, dict) and not v.get('success') and v.get('error')
+            ]
+            error_detail = platform_errors[0] if platform_errors else "Missing platform credentials"
+            error_msg = f"Credential error for brand {result.get('brand', brand)}: {error_detail}"
+            scheduler_service.mark_as_failed(schedule_id, error_msg)
+            print(f"   ❌ {error_msg}")
+            return "failed"
+
+        # Check if publishing actually succeeded
+        failed_platforms = []
+        success_platforms = []
+        not_connected_platforms = []  # Skipped — not an error
+
+        for platform, platform_result in result.items():
+            # Skip non-platform keys
+            if platform in ('credential_error', 'brand'):
+                continue
+            # Skip if not a dict (safety check)
+            if not isinstance(platform_result, dict):
+                continue
+            if platform_result.get('success'):
+                success_platforms.append(platform)
+                print(f"      ✅ {platform}: {platform_result.get('post_id', 'Published')}")
+            elif platform_result.get('not_connected'):
+                # Platform not configured for this brand — graceful skip, not failure
+                not_connected_platforms.append(platform)
+                print(f"      ⚠️  {platform}: not configured for this brand — skipped")
+            else:
+                failed_platforms.append(platform)
+                error = platform_result.get('error', 'Unknown error')
+                print(f"      ❌ {platform}: {error}")
+
+        # Only mark as published if at least one platform succeeded
+        if success_platforms:
+            # Collect detailed publish results for storage
+            publish_results = {}
+
+            # Include previously succeeded platforms from partial retry
+            prev_publish_results = metadata.get('publish_results', {})
+            for platform in succeeded_platforms:
+                if platform in prev_publish_results:
+                    publish_results[platform] = prev_publish_results[platform]
+                    print(f"      ✅ {platform}: (previously succeeded)")
+
+            # Add newly succeeded platforms
+            for platform in success_platforms:
+                platform_data = result[platform]
+                publish_results[platform] = {
+                    "post_id": str(platform_data.get('post_id') or platform_data.get('video_id', '')),
+                    "account_id": platform_data.get('account_id') or platform_data.get('page_id', ''),
+                    "brand_used": platform_data.get('brand_used', 'unknown'),
+                    "url": platform_data.get('url'),
+                    "success": True
+                }
+
+            # Also include failed platforms info
+            for platform in failed_platforms:
+                if platform in result:
+                    publish_results[platform] = {
+                        "success": False,
+                        "error": result[platform].get('error', 'Unknown error')
+                    }
+
+            # Include not-connected platforms (shows amber ⚠ warning in UI)
+            for platform in not_connected_platforms:
+                if platform in result:
+                    publish_results[platform] = {
+                        "success": False,
+                        "error": result[platform].get('error', 'Platform not connected')
+                    }
+
+            # Clear retry tracking since we're updating results
+            if 'retry_platforms' in metadata:
+                del metadata['retry_platforms']
+            if 'succeeded_platforms' in metadata:
+                del metadata['succeeded_platforms']
+
+            scheduler_service.mark_as_published(schedule_id, publish_results=publish_results)
+            print(f"   ✅ Successfully published {reel_id} to {', '.join(success_platforms)}")
+
+            if failed_platforms:
+                print(f"   ⚠️  Failed on {', '.join(failed_platforms)}")
+                return "partial"
+            return "published"
+        else:
+            # All platforms failed
+            error_details = ', '.join([f"{p}: {result[p].get('error', 'Unknown')}" for p in failed_platforms])
+            error_msg = f"All platforms failed - {error_details}"
+            scheduler_service.mark_as_failed(schedule_id, error_msg)
+            print(f"   ❌ Failed to publish {reel_id}: {error_msg}")
+            return "failed"
+
+    except Exception as e:
+        # Mark as failed
+        error_msg = f"Publishing failed: {str(e)}"
+        scheduler_service.mark_as_failed(schedule_id, error_msg)
+        print(f"   ❌ Failed to publish {reel_id}: {error_msg}")
+        return "failed"
+    finally:
+        # Clear user context after each schedule so it doesn't
+        # bleed into the next schedule handled by this worker thread.
+        clear_logging_user_id()
+
+
+def start_background_jobs() -> BackgroundScheduler:
+    """Run leader-only startup recovery and start every background job.
+
+    Called when this process wins scheduler leadership (see
+    app/services/publishing/scheduler_leader.py), either inside a web worker
+    or in the dedicated `python -m app.scheduler_process`.
+    """
     # Reset any stuck "publishing" posts from previous crashes
     print("🔄 Checking for stuck publishing posts...", flush=True)
     try:
@@ -548,6 +869,9 @@ async def startup_event():
     except Exception as e:
         print(f"⚠️ Could not check stuck posts: {e}", flush=True)
 
+    # Resume interrupted "generating" jobs from previous crashes/deploys
+    resume_interrupted_generating_jobs()
+
     # Recover approved-but-unscheduled jobs (e.g. server crashed during background scheduling)
     print("🔄 Checking for approved-but-unscheduled jobs...", flush=True)
     recovered = recover_approved_unscheduled_jobs()
@@ -574,383 +898,33 @@ async def startup_event():
             # Get service instance
             scheduler_service = DatabaseSchedulerService()
 
-            # Get pending publications
-            pending = scheduler_service.get_pending_publications()
+            # Claim due posts in batches; each claim is one UPDATE ... SKIP LOCKED
+            # RETURNING, so the tick never scans the whole table.
+            batch_size = scheduler_service.CLAIM_BATCH_SIZE
+            while True:
+                pending = scheduler_service.get_pending_publications(limit=batch_size)
+                if not pending:
+                    break
 
-            if pending:
                 print(f"\n📅 Found {len(pending)} post(s) ready to publish")
 
-                for schedule in pending:
-                    try:
-                        schedule_id = schedule['schedule_id']
-                        reel_id = schedule['reel_id']
-                        caption = schedule.get('caption', 'CHANGE ME')
-                        metadata = schedule.get('metadata', {})
-
-                        # Set user context so all logs (including print captures)
-                        # are attributed to the correct user in the log viewer.
-                        _sched_user_id = schedule.get('user_id', '')
-                        if _sched_user_id:
-                            set_logging_user_id(_sched_user_id)
-
-                        print(f"\n   📋 [PUBLISH] Processing schedule: {schedule_id}", flush=True)
-                        print(f"   📋 [PUBLISH] Metadata keys: {list(metadata.keys())}", flush=True)
-
-                        # --- PLATFORM SELECTION (RETRY-AWARE) ---
-                        # retry_platforms is set by retry_failed() and auto_retry_failed_toby_posts()
-                        # when a post has "partial" status (some platforms succeeded, others failed).
-                        # If set, we ONLY publish to the failed platforms to avoid duplicates.
-                        # If not set, this is a fresh publish — use the full platform list.
-                        retry_platforms = metadata.get('retry_platforms')
-                        succeeded_platforms = metadata.get('succeeded_platforms', [])
-
-                        print(f"   📋 [PUBLISH] retry_platforms from metadata: {retry_platforms}", flush=True)
-                        print(f"   📋 [PUBLISH] succeeded_platforms from metadata: {succeeded_platforms}", flush=True)
-
-                        if retry_platforms:
-                            platforms = retry_platforms
-                            print(f"   🔄 PARTIAL RETRY: Only retrying {platforms} (skipping already successful: {succeeded_platforms})", flush=True)
-                        else:
-                            platforms = metadata.get('platforms', ['instagram'])
-                            print(f"   📋 [PUBLISH] Using platforms from metadata: {platforms}", flush=True)
-
-                        # All paths in metadata are now Supabase URLs
-                        video_path_str = metadata.get('video_path')
-                        thumbnail_path_str = metadata.get('thumbnail_path')
-                        brand = metadata.get('brand', '')
-                        variant = metadata.get('variant', 'light')
-                        content_type = metadata.get('content_type', '')
-
-                        # ── TEXT-ONLY PLATFORM GUARD ──
-                        # Threads (and future X) are text-only — strip them from
-                        # any publish that carries media (reels, posts, carousels).
-                        # Only allow them through for text-only content types.
-                        if content_type not in ('text', 'threads_post'):
-                            from app.core.platforms import TEXT_ONLY_PLATFORMS
-                            text_only_in_list = [p for p in platforms if p in TEXT_ONLY_PLATFORMS]
-                            if text_only_in_list:
-                                platforms = [p for p in platforms if p not in TEXT_ONLY_PLATFORMS]
-                                print(f"   🧵 Stripped text-only platforms {text_only_in_list} from media publish", flush=True)
-
-                        print(f"      📦 Metadata: video={video_path_str}, thumbnail={thumbnail_path_str}, brand={brand}, variant={variant}")
-
-                        # ── POST (image) vs REEL (video) vs THREADS (text) publishing ──
-                        is_post = (variant == 'post')
-                        is_threads_text = (variant == 'threads' or content_type == 'threads_post')
-
-                        if is_threads_text:
-                            # ── THREADS TEXT-ONLY PUBLISHING ──
-                            print(f"      🧵 Threads text-only publish for {brand}", flush=True)
-
-                            from app.services.publishing.social_publisher import SocialPublisher
-                            from app.services.brands.resolver import brand_resolver
-
-                            resolved_config = brand_resolver.get_brand_config(brand)
-                            if not resolved_config:
-                                raise ValueError(f"No brand config found for '{brand}'")
-
-                            publisher = SocialPublisher(brand_config=resolved_config)
-
-                            is_chain = metadata.get('is_chain', False)
-                            chain_parts = metadata.get('chain_parts') or []
-
-                            result = {}
-                            if is_chain and len(chain_parts) >= 2:
-                                result["threads"] = publisher.publish_threads_chain(parts=chain_parts)
-                            else:
-                                result["threads"] = publisher.publish_threads_post(
-                                    caption=caption,
-                                    media_type="TEXT",
-                                )
-
-                            scheduler_service.mark_as_published(
-                                schedule_id,
-                                publish_results=result,
-                            )
-                            print(f"      ✅ Threads text published: {schedule_id}", flush=True)
-
-                        elif is_post:
-                            # ── IMAGE POST PUBLISHING ──
-                            # thumbnail_path_str is a Supabase URL
-                            image_url = thumbnail_path_str
-                            if not image_url:
-                                raise ValueError(f"No thumbnail/cover URL found in metadata for post {reel_id}")
-
-                            print(f"      🖼️  Image post cover URL: {image_url}")
-
-                            # Check for pre-rendered carousel images (cover + text slides)
-                            pre_rendered = metadata.get('carousel_paths') or []
-                            post_title = metadata.get('title', '')
-                            slide_texts = metadata.get('slide_texts') or []
-                            supabase_slide_urls = []
-
-                            if pre_rendered:
-                                # Use stored pre-rendered images — no JIT needed
-                                image_url = pre_rendered[0]  # composed cover
-                                supabase_slide_urls = pre_rendered[1:]  # text slides
-                                print(f"      ✅ Using {len(pre_rendered)} pre-rendered carousel images")
-                            elif (post_title or slide_texts) and image_url.startswith("https://"):
-                                try:
-                                    import tempfile
-                                    import requests as _req
-                                    # Download background image to temp file for node renderer
-                                    resp = _req.get(image_url, timeout=60)
-                                    resp.raise_for_status()
-                                    tmp_bg = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-                                    tmp_bg.write(resp.content)
-                                    tmp_bg.close()
-
-                                    composed = _render_slides_node(
-                                        brand=brand,
-                                        title=post_title,
-                                        background_image=tmp_bg.name,
-                                        slide_texts=slide_texts,
-                                        reel_id=reel_id,
-                                        user_id=schedule.get('user_id', 'system'),
-                                    )
-                                    if composed:
-                                        if composed.get("coverUrl"):
-                                            image_url = composed["coverUrl"]
-                                        supabase_slide_urls = composed.get("slideUrls", [])
-                                        print(f"      ✅ Konva rendered: cover + {len(supabase_slide_urls)} slides")
-                                    else:
-                                        print(f"      ⚠️ Node renderer returned no result", flush=True)
-
-                                    # Clean up temp file
-                                    try:
-                                        os.unlink(tmp_bg.name)
-                                    except Exception:
-                                        pass
-                                except Exception as comp_err:
-                                    import traceback
-                                    print(f"      ⚠️ JIT composition failed: {comp_err}", flush=True)
-                                    traceback.print_exc()
-
-                            print(f"      🌐 Cover image URL: {image_url}")
-                            print(f"      🏷️ Publishing IMAGE POST with brand: {brand}")
-
-                            # Resolve brand credentials
-                            from app.services.publishing.social_publisher import SocialPublisher
-                            from app.services.brands.resolver import brand_resolver
-
-                            publisher = None
-                            resolved_config = brand_resolver.get_brand_config(brand)
-                            if resolved_config:
-                                publisher = SocialPublisher(brand_config=resolved_config)
-                            else:
-                                publisher = SocialPublisher()
-
-                            # Check for carousel slides — prefer JIT-composed, fall back to metadata
-                            if supabase_slide_urls:
-                                carousel_image_urls = supabase_slide_urls
-                            else:
-                                carousel_paths_raw = metadata.get('carousel_paths') or []
-                                carousel_image_urls = [url for url in carousel_paths_raw if url]
-
-                            result = {}
-                            if carousel_image_urls:
-                                # ── CAROUSEL PUBLISH (cover + text slides) ──
-                                all_urls = [image_url] + carousel_image_urls
-                                print(f"      📚 Carousel with {len(all_urls)} slides")
-
-                                if "instagram" in platforms:
-                                    print("📸 Publishing carousel to Instagram...")
-                                    result["instagram"] = publisher.publish_instagram_carousel(
-                                        image_urls=all_urls,
-                                        caption=caption,
-                                    )
-                                    scheduler_service.save_platform_result(schedule_id, "instagram", result["instagram"])
-                                if "facebook" in platforms:
-                                    print("📘 Publishing carousel to Facebook...")
-                                    result["facebook"] = publisher.publish_facebook_carousel(
-                                        image_urls=all_urls,
-                                        caption=caption,
-                                    )
-                                    scheduler_service.save_platform_result(schedule_id, "facebook", result["facebook"])
-                                # Threads is text-only — never publish media to Threads.
-                                # The TEXT_ONLY_PLATFORMS guard above strips threads from platforms,
-                                # but this comment documents the intentional exclusion.
-                                if "tiktok" in platforms:
-                                    # TikTok doesn't support image carousels via API — skip gracefully
-                                    result["tiktok"] = {
-                                        "success": False,
-                                        "not_connected": True,
-                                        "error": "TikTok does not support image carousel publishing via API",
-                                        "platform": "tiktok",
-                                    }
-                            else:
-                                # ── SINGLE IMAGE PUBLISH ──
-                                if "instagram" in platforms:
-                                    print("📸 Publishing image post to Instagram...")
-                                    result["instagram"] = publisher.publish_instagram_image_post(
-                                        image_url=image_url,
-                                        caption=caption,
-                                    )
-                                    scheduler_service.save_platform_result(schedule_id, "instagram", result["instagram"])
-                                if "facebook" in platforms:
-                                    print("📘 Publishing image post to Facebook...")
-                                    result["facebook"] = publisher.publish_facebook_image_post(
-                                        image_url=image_url,
-                                        caption=caption,
-                                    )
-                                    scheduler_service.save_platform_result(schedule_id, "facebook", result["facebook"])
-                                # Threads is text-only — never publish media to Threads.
-                                if "tiktok" in platforms:
-                                    # TikTok doesn't support single image publishing via API — skip gracefully
-                                    result["tiktok"] = {
-                                        "success": False,
-                                        "not_connected": True,
-                                        "error": "TikTok does not support image publishing via API",
-                                        "platform": "tiktok",
-                                    }
-                        else:
-                            # ── REEL (VIDEO) PUBLISHING ──
-                            # All paths are now Supabase URLs
-                            if not video_path_str:
-                                raise ValueError(f"No video URL found in metadata for reel {reel_id}")
-                            if not thumbnail_path_str:
-                                raise ValueError(f"No thumbnail URL found in metadata for reel {reel_id}")
-
-                            print(f"      🎬 Video URL: {video_path_str}")
-                            print(f"      🖼️  Thumbnail URL: {thumbnail_path_str}")
-
-                            # Publish now - pass URLs directly
-                            print(f"      🏷️ Publishing REEL with brand: {brand}")
-
-                            # Look up share_to_feed preference from TobyBrandConfig
-                            _reel_share_to_feed = True
-                            if brand and _sched_user_id:
-                                try:
-                                    from app.db_connection import get_db_session
-                                    from app.models.toby import TobyBrandConfig as _TBC
-                                    with get_db_session() as _stf_db:
-                                        _tbc = _stf_db.query(_TBC).filter(
-                                            _TBC.user_id == _sched_user_id,
-                                            _TBC.brand_id == brand,
-                                        ).first()
-                                        if _tbc and _tbc.reels_share_to_feed is not None:
-                                            _reel_share_to_feed = _tbc.reels_share_to_feed
-                                            if not _reel_share_to_feed:
-                                                print(f"      📌 Reels-only mode: share_to_feed=false for {brand}")
-                                except Exception as _stf_err:
-                                    print(f"      ⚠️ Could not look up share_to_feed: {_stf_err}")
-
-                            result = scheduler_service.publish_now(
-                                video_url=video_path_str,
-                                thumbnail_url=thumbnail_path_str,
-                                caption=caption,
-                                platforms=platforms,
-                                brand_name=brand,
-                                metadata=metadata,
-                                schedule_id=schedule_id,
-                                share_to_feed=_reel_share_to_feed
-                            )
-
-                        print(f"      📊 Publish result: {result}")
-
-                        # Check for credential errors first
-                        if result.get('credential_error'):
-                            # Build a specific error message from the platform results
-                            platform_errors = [
-                                v.get('error', '') for k, v in result.items()
-                                if isinstance(v, dict) and not v.get('success') and v.get('error')
-                            ]
-                            error_detail = platform_errors[0] if platform_errors else "Missing platform credentials"
-                            error_msg = f"Credential error for brand {result.get('brand', brand)}: {error_detail}"
-                            scheduler_service.mark_as_failed(schedule_id, error_msg)
-                            print(f"   ❌ {error_msg}")
-                            continue
-
-                        # Check if publishing actually succeeded
-                        failed_platforms = []
-                        success_platforms = []
-                        not_connected_platforms = []  # Skipped — not an error
-
-                        for platform, platform_result in result.items():
-                            # Skip non-platform keys
-                            if platform in ('credential_error', 'brand'):
-                                continue
-                            # Skip if not a dict (safety check)
-                            if not isinstance(platform_result, dict):
-                                continue
-                            if platform_result.get('success'):
-                                success_platforms.append(platform)
-                                print(f"      ✅ {platform}: {platform_result.get('post_id', 'Published')}")
-                            elif platform_result.get('not_connected'):
-                                # Platform not configured for this brand — graceful skip, not failure
-                                not_connected_platforms.append(platform)
-                                print(f"      ⚠️  {platform}: not configured for this brand — skipped")
-                            else:
-                                failed_platforms.append(platform)
-                                error = platform_result.get('error', 'Unknown error')
-                                print(f"      ❌ {platform}: {error}")
-
-                        # Only mark as published if at least one platform succeeded
-                        if success_platforms:
-                            # Collect detailed publish results for storage
-                            publish_results = {}
-
-                            # Include previously succeeded platforms from partial retry
-                            prev_publish_results = metadata.get('publish_results', {})
-                            for platform in succeeded_platforms:
-                                if platform in prev_publish_results:
-                                    publish_results[platform] = prev_publish_results[platform]
-                                    print(f"      ✅ {platform}: (previously succeeded)")
-
-                            # Add newly succeeded platforms
-                            for platform in success_platforms:
-                                platform_data = result[platform]
-                                publish_results[platform] = {
-                                    "post_id": str(platform_data.get('post_id') or platform_data.get('video_id', '')),
-                                    "account_id": platform_data.get('account_id') or platform_data.get('page_id', ''),
-                                    "brand_used": platform_data.get('brand_used', 'unknown'),
-                                    "url": platform_data.get('url'),
-                                    "success": True
-                                }
-
-                            # Also include failed platforms info
-                            for platform in failed_platforms:
-                                if platform in result:
-                                    publish_results[platform] = {
-                                        "success": False,
-                                        "error": result[platform].get('error', 'Unknown error')
-                                    }
-
-                            # Include not-connected platforms (shows amber ⚠ warning in UI)
-                            for platform in not_connected_platforms:
-                                if platform in result:
-                                    publish_results[platform] = {
-                                        "success": False,
-                                        "error": result[platform].get('error', 'Platform not connected')
-                                    }
-
-                            # Clear retry tracking since we're updating results
-                            if 'retry_platforms' in metadata:
-                                del metadata['retry_platforms']
-                            if 'succeeded_platforms' in metadata:
-                                del metadata['succeeded_platforms']
-
-                            scheduler_service.mark_as_published(schedule_id, publish_results=publish_results)
-                            print(f"   ✅ Successfully published {reel_id} to {', '.join(success_platforms)}")
-
-                            if failed_platforms:
-                                print(f"   ⚠️  Failed on {', '.join(failed_platforms)}")
-                        else:
-                            # All platforms failed
-                            error_details = ', '.join([f"{p}: {result[p].get('error', 'Unknown')}" for p in failed_platforms])
-                            error_msg = f"All platforms failed - {error_details}"
-                            scheduler_service.mark_as_failed(schedule_id, error_msg)
-                            print(f"   ❌ Failed to publish {reel_id}: {error_msg}")
+                report = get_publish_engine().publish_batch(
+                    pending,
+                    lambda schedule: _publish_due_schedule(scheduler_service, schedule),
+                )
+                summary = report.to_dict()
+                print(
+                    f"\n📊 Publish batch: {summary['schedules']} schedule(s) in {summary['wall_s']}s "
+                    f"(sum of latencies {summary['sum_latency_s']}s, slowest {summary['max_latency_s']}s) "
+                    f"— {summary['by_status']}",
+                    flush=True,
+                )
+                for slow in summary["slowest"]:
+                    print(f"      🐢 {slow['schedule_id']} ({slow['brand']}): {slow['latency_s']}s", flush=True)
+                get_logging_service().log_scheduler_event("Publish batch complete", details=summary)
 
-                    except Exception as e:
-                        # Mark as failed
-                        error_msg = f"Publishing failed: {str(e)}"
-                        scheduler_service.mark_as_failed(schedule_id, error_msg)
-                        print(f"   ❌ Failed to publish {reel_id}: {error_msg}")
-                    finally:
-                        # Clear user context after each schedule so it doesn't
-                        # bleed into the next iteration or unrelated log entries.
-                        clear_logging_user_id()
+                if len(pending) < batch_size:
+                    break
 
         except Exception as e:
             print(f"❌ Auto-publish check failed: {str(e)}")
@@ -975,8 +949,14 @@ async def startup_event():
         except Exception as e:
             print(f"❌ Auto-refresh analytics failed: {str(e)}")
 
-    # Run check every 5 minutes (300s is fine for social media publishing)
-    scheduler.add_job(check_and_publish, 'interval', seconds=300, id='auto_publish')
+    # Publish on LISTEN/NOTIFY wakeups at each row's scheduled_time. The
+    # interval job stays as a safety sweep for missed notifications, and
+    # falls back to the old 5-minute poll when wakeups are disabled.
+    from app.services.publishing.publish_wakeup import start_publish_wakeups
+    publish_wakeups = start_publish_wakeups(check_and_publish)
+    sweep_seconds = int(os.getenv("PUBLISH_SWEEP_SECONDS", "900")) if publish_wakeups else 300
+    scheduler.add_job(check_and_publish, 'interval', seconds=sweep_seconds, id='auto_publish')
+    print(f"📬 Publish wakeups {'enabled' if publish_wakeups else 'disabled'} (sweep every {sweep_seconds}s)", flush=True)
 
     # Run analytics refresh every 6 hours
     scheduler.add_job(refresh_analytics, 'interval', hours=6, id='analytics_refresh')
@@ -988,128 +968,16 @@ async def startup_event():
     def refresh_audience_demographics():
         """Fetch audience demographics from Instagram for all users."""
         try:
+            from app.services.analytics.analytics_service import AnalyticsService
             from app.db_connection import get_db_session
-            from app.models.brands import Brand
-            from app.models.analytics import AudienceDemographics
 
             print(f"\n👥 Auto-refresh audience demographics at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
             with get_db_session() as db:
-                # Get all active brands with IG business accounts
-                brands = db.query(Brand).filter(
-                    Brand.active == True,
-                    Brand.instagram_business_account_id.isnot(None),
-                ).all()
-
-                updated = 0
-                for b in brands:
-                    try:
-                        token = b.meta_access_token or b.instagram_access_token
-                        ig_id = b.instagram_business_account_id
-                        if not token or not ig_id:
-                            continue
-
-                        import requests as http_requests
-                        url = f"https://graph.instagram.com/v21.0/{ig_id}/insights"
-                        params = {
-                            "metric": "follower_demographics",
-                            "period": "lifetime",
-                            "metric_type": "total_value",
-                            "access_token": token,
-                        }
-                        resp = http_requests.get(url, params=params, timeout=15)
-                        if resp.status_code != 200:
-                            continue
-
-                        data = resp.json().get("data", [])
-                        gender_age = {}
-                        top_cities = {}
-                        top_countries = {}
-
-                        for metric in data:
-                            name = metric.get("name", "")
-                            total_value = metric.get("total_value", {}).get("breakdowns", [])
-                            if not total_value:
-                                continue
-                            results = total_value[0].get("results", [])
-                            for result in results:
-                                dims = result.get("dimension_values", [])
-                                val = result.get("value", 0)
-                                if name == "follower_demographics" and len(dims) >= 2:
-                                    gender_age[f"{dims[0]}.{dims[1]}"] = val
-
-                        for breakdown_type in ["city", "country"]:
-                            params2 = {**params, "breakdown": breakdown_type}
-                            resp2 = http_requests.get(url, params=params2, timeout=15)
-                            if resp2.status_code == 200:
-                                for metric in resp2.json().get("data", []):
-                                    tv = metric.get("total_value", {}).get("breakdowns", [])
-                                    if not tv:
-                                        continue
-                                    for result in tv[0].get("results", []):
-                                        dims = result.get("dimension_values", [])
-                                        val = result.get("value", 0)
-                                        if dims:
-                                            if breakdown_type == "city":
-                                                top_cities[dims[0]] = val
-                                            else:
-                                                top_countries[dims[0]] = val
-
-                        if not gender_age:
-                            continue
-
-                        total_audience = sum(gender_age.values())
-                        gender_totals = {}
-                        age_totals = {}
-                        for k, v in gender_age.items():
-                            g = k.split(".")[0] if "." in k else k
-                            gender_totals[g] = gender_totals.get(g, 0) + v
-                            parts = k.split(".")
-                            age = parts[1] if len(parts) > 1 else parts[0]
-                            age_totals[age] = age_totals.get(age, 0) + v
-
-                        gender_map = {"M": "Male", "F": "Female", "U": "Undisclosed"}
-                        top_g = max(gender_totals, key=gender_totals.get) if gender_totals else None
-                        top_gender = gender_map.get(top_g, top_g)
-                        top_age = max(age_totals, key=age_totals.get) if age_totals else None
-                        top_city_name = max(top_cities, key=top_cities.get) if top_cities else None
-
-                        existing = db.query(AudienceDemographics).filter(
-                            AudienceDemographics.user_id == b.user_id,
-                            AudienceDemographics.brand == b.id,
-                            AudienceDemographics.platform == "instagram",
-                        ).first()
-
-                        if existing:
-                            existing.gender_age = gender_age
-                            existing.top_cities = top_cities
-                            existing.top_countries = top_countries
-                            existing.top_gender = top_gender
-                            existing.top_age_range = top_age
-                            existing.top_city = top_city_name
-                            existing.total_audience = total_audience
-                            existing.fetched_at = datetime.now()
-                        else:
-                            db.add(AudienceDemographics(
-                                user_id=b.user_id,
-                                brand=b.id,
-                                platform="instagram",
-                                gender_age=gender_age,
-                                top_cities=top_cities,
-                                top_countries=top_countries,
-                                top_gender=top_gender,
-                                top_age_range=top_age,
-                                top_city=top_city_name,
-                                total_audience=total_audience,
-                                fetched_at=datetime.now(),
-                            ))
-                        db.commit()
-                        updated += 1
-                    except Exception as e:
-                        print(f"⚠️ Audience refresh error for brand {b.id}: {e}")
-                        db.rollback()
-
-                print(f"   ✅ Audience demographics refreshed for {updated} brands")
+                result = AnalyticsService(db).refresh_all_demographics()
+                for error in result["errors"] or []:
+                    print(f"⚠️ Audience refresh error for brand {error}")
+                print(f"   ✅ Audience demographics refreshed for {result['updated_count']} brands")
 
         except Exception as e:
             print(f"❌ Auto-refresh audience demographics failed: {str(e)}")
@@ -1407,9 +1275,11 @@ async def startup_event():
             threshold = datetime.utcnow() - timedelta(minutes=10)
 
             with get_db_session() as db:
+                # Queued/leased jobs are recovered by the work queue's lease expiry
                 stuck = db.query(GenerationJob).filter(
                     GenerationJob.status == "generating",
                     GenerationJob.updated_at < threshold,
+                    GenerationJob.queue_action.is_(None),
                 ).all()
 
                 if not stuck:
@@ -1484,9 +1354,6 @@ async def startup_event():
     print("✅ YouTube token validation scheduled (every 24 hours)", flush=True)
     print("✅ TikTok trending music scheduled (every 7 days)", flush=True)
 
-    # Store scheduler for shutdown
-    app.state.scheduler = scheduler
-
     # Register Toby orchestrator (5-minute ticks)
     print("🤖 Initializing Toby autonomous agent...", flush=True)
     try:
@@ -1496,6 +1363,131 @@ async def startup_event():
     except Exception as e:
         print(f"⚠️ Toby init failed: {e}", flush=True)
 
+    return scheduler
+
+
+def stop_background_jobs(scheduler: BackgroundScheduler | None) -> None:
+    """Stop the jobs started by start_background_jobs() (demotion or shutdown)."""
+    from app.services.publishing.publish_wakeup import stop_publish_wakeups
+    stop_publish_wakeups()
+    # Stop dispatching analytics refresh units so a running refresh job
+    # returns; units not started resume on the next leader's run
+    from app.services.analytics.refresh_engine import shutdown_refresh_engine
+    shutdown_refresh_engine()
+    if scheduler is not None and scheduler.running:
+        scheduler.shutdown()  # let running jobs finish before re-entering the election
+        print("⏰ Background scheduler stopped", flush=True)
+    # Toby users still running past their tick budget
+    from app.services.toby.tick_executor import shutdown_tick_executor
+    shutdown_tick_executor()
+    from app.services.toby.agents.critic import shutdown_critic_pool
+    shutdown_critic_pool()
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Run startup tasks."""
+    import sys
+
+    # Bound the handler threadpools and start measuring event-loop lag
+    from app.services.monitoring.event_loop import configure_threadpools, start_loop_lag_monitor
+    configure_threadpools()
+    start_loop_lag_monitor()
+
+    # Initialize persistent logging service FIRST (captures everything from here on)
+    logging_service = get_logging_service()
+    logging_service.log_system_event(
+        'startup',
+        f'Application starting - Deployment: {DEPLOYMENT_ID}',
+        details={
+            'python_version': sys.version,
+            'port': os.getenv('PORT', 'not set'),
+            'deployment_id': DEPLOYMENT_ID,
+            'database_url': 'set' if os.getenv('DATABASE_URL') else 'NOT SET',
+        }
+    )
+
+    print("🚀 Starting Instagram Reels Automation API...", flush=True)
+    print(f"📍 Python: {sys.version}", flush=True)
+    print(f"📍 PORT: {os.getenv('PORT', 'not set')}", flush=True)
+    print(f"📍 Deployment: {DEPLOYMENT_ID}", flush=True)
+    print("📝 Documentation available at: /docs", flush=True)
+    print("🔍 Health check available at: /health", flush=True)
+    print("📋 Logs dashboard available at: /logs", flush=True)
+
+    # Initialize database
+    print("💾 Initializing database...", flush=True)
+    try:
+        init_db()
+        print("✅ Database initialized", flush=True)
+
+        # Seed brands and settings if needed
+        print("🌱 Checking for brand/settings seeds...", flush=True)
+        from app.db_connection import SessionLocal
+        from app.services.brands.manager import seed_brands_if_needed
+        from app.api.system.settings_routes import seed_settings_if_needed
+
+        db = SessionLocal()
+        try:
+            default_user_id = os.getenv("DEFAULT_USER_ID")
+            brands_seeded = seed_brands_if_needed(db, user_id=default_user_id)
+            settings_seeded = seed_settings_if_needed(db)
+
+            if brands_seeded > 0:
+                print(f"   🏷️ Seeded {brands_seeded} default brands", flush=True)
+            else:
+                print(f"   🏷️ Brands already exist", flush=True)
+
+            if settings_seeded > 0:
+                print(f"   ⚙️ Seeded {settings_seeded} default settings", flush=True)
+            else:
+                print(f"   ⚙️ Settings already exist", flush=True)
+        finally:
+            db.close()
+
+    except Exception as e:
+        print(f"❌ Database init failed: {e}", flush=True)
+        # Continue anyway - don't block startup
+
+    # Log brand credentials status at startup (CRITICAL for debugging cross-posting)
+    print("\n🏷️ Brand Credentials Status:", flush=True)
+    from app.services.brands.resolver import brand_resolver
+    for brand in brand_resolver.get_all_brands():
+        ig_status = "✅" if brand.instagram_business_account_id else "❌ MISSING"
+        fb_status = "✅" if brand.facebook_page_id else "❌ MISSING"
+        token_status = "✅" if brand.meta_access_token else "❌ MISSING"
+        print(f"   {brand.display_name}:", flush=True)
+        print(f"      Instagram ID: {ig_status} ({brand.instagram_business_account_id or 'None'})", flush=True)
+        print(f"      Facebook ID:  {fb_status} ({brand.facebook_page_id or 'None'})", flush=True)
+        print(f"      Token:        {token_status}", flush=True)
+    print("", flush=True)
+
+    # Consume the generation work queue in this process (JOB_QUEUE_IN_PROCESS=0
+    # when dedicated `python -m app.worker` containers are deployed)
+    try:
+        from app.services.content.job_queue import start_in_process_worker
+        if not start_in_process_worker():
+            print("👷 In-process generation worker disabled (JOB_QUEUE_IN_PROCESS=0)", flush=True)
+    except Exception as e:
+        print(f"⚠️ Could not start generation worker: {e}", flush=True)
+
+    # Background jobs (auto-publish, analytics, token refresh, Toby) must run in
+    # exactly one process. Workers compete for a Postgres advisory lock and the
+    # holder runs them; SCHEDULER_MODE=off keeps this worker API-only.
+    from app.services.publishing.scheduler_leader import start_scheduler_leadership
+
+    def _on_elected():
+        app.state.scheduler = start_background_jobs()
+
+    def _on_demoted():
+        stop_background_jobs(getattr(app.state, "scheduler", None))
+        app.state.scheduler = None
+
+    if start_scheduler_leadership(_on_elected, _on_demoted):
+        print("🗳️ Competing for scheduler leadership (SCHEDULER_MODE=auto)", flush=True)
+    else:
+        print("⏸️ Background jobs disabled in this process (SCHEDULER_MODE=off)", flush=True)
+
     print("🎉 Startup complete! App is ready.", flush=True)
 
 
@@ -1512,8 +1504,38 @@ async def shutdown_event():
     except Exception:
         pass
 
-    # Shutdown scheduler
-    if hasattr(app.state, 'scheduler'):
-        app.state.scheduler.shutdown()
-        print("⏰ Auto-publishing scheduler stopped")
+    # Stop background jobs (if leading) and release scheduler leadership
+    from app.services.publishing.scheduler_leader import stop_scheduler_leadership
+    stop_scheduler_leadership()
+
+    # Stop claiming generation jobs; running ones keep their lease for resume
+    from app.services.content.job_queue import stop_in_process_worker
+    stop_in_process_worker()
+
+    # Release publish worker pools
+    get_publish_engine().shutdown()
+
+    # Stop in-flight brand generation (killing ffmpeg children)
+    from app.services.content.brand_executor import get_brand_executor
+    get_brand_executor().shutdown()
+
+    # Stop carousel render processes
+    from app.services.media.carousel_pipeline import shutdown_carousel_pipeline
+    shutdown_carousel_pipeline()
+
+    # Persist buffered cost-tracking deltas
+    from app.services.monitoring.cost_tracker import shutdown_cost_tracker
+    shutdown_cost_tracker()
+
+    # Persist buffered Toby memory retrieval counters
+    from app.services.toby.memory.vector_index import shutdown_vector_index
+    shutdown_vector_index()
+
+    # Close pooled outbound HTTP connections
+    from app.utils.http_client import close_http_clients
+    close_http_clients()
+
+    # Stop the loop-lag probe and release the offload threads
+    from app.services.monitoring.event_loop import stop_loop_lag_monitor
+    stop_loop_lag_monitor()
 
@@ -36,6 +36,7 @@ from app.models.toby_cognitive import (
     TobyRawSignal,
     TobyMetaReport,
     TobyReasoningTrace,
+    TobyEmbeddingCache,
 )
 from app.models.billing import BrandSubscription
 from app.models.trending_music import TrendingMusic, TrendingMusicFetch
@@ -44,6 +45,7 @@ from app.models.format_b_design import FormatBDesign
 from app.models.story_pool import StoryPool
 from app.models.api_usage import APIUsageLog
 from app.models.user_costs import UserCostDaily, UserCostMonthly
+from app.models.llm_cache import LLMResponseCache
 from app.models.content_dna_template import ContentDNATemplate
 
 __all__ = [
@@ -78,6 +80,7 @@ __all__ = [
     "TobyRawSignal",
     "TobyMetaReport",
     "TobyReasoningTrace",
+    "TobyEmbeddingCache",
     "TrendingMusic",
     "TrendingMusicFetch",
     "MusicLibrary",
@@ -86,5 +89,6 @@ __all__ = [
     "APIUsageLog",
     "UserCostDaily",
     "UserCostMonthly",
+    "LLMResponseCache",
     "ContentDNATemplate",
 ]
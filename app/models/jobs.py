@@ -4,6 +4,7 @@ Generation job model.
 from datetime import datetime
 from typing import Any, Dict, List
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Index, text
 from app.models.base import Base, Column, String, DateTime, Text, Boolean, Integer, JSON
 from app.core.platforms import LEGACY_DEFAULT_PLATFORMS
 
@@ -11,6 +12,14 @@ from app.core.platforms import LEGACY_DEFAULT_PLATFORMS
 class GenerationJob(Base):
     """Model for tracking reel generation jobs."""
     __tablename__ = "generation_jobs"
+    __table_args__ = (
+        # Work-queue claim order (see app/services/content/job_queue.py)
+        Index(
+            "ix_generation_jobs_queue",
+            "queued_at",
+            postgresql_where=text("queue_action IS NOT NULL"),
+        ),
+    )
 
     # Primary key - short readable ID (e.g., "GEN-001234")
     job_id = Column(String(20), primary_key=True)
@@ -80,6 +89,15 @@ class GenerationJob(Base):
     # Error tracking
     error_message = Column(Text, nullable=True)
 
+    # Work queue — set while the job waits for / is held by a generation worker.
+    # queue_action: 'process' (full run) | 'resume' (incomplete brands only) | NULL (not queued)
+    queue_action = Column(String(20), nullable=True)
+    queued_at = Column(DateTime(timezone=True), nullable=True)
+    lease_owner = Column(String(100), nullable=True)  # "<host>:<pid>:<slot>" of the worker holding it
+    leased_at = Column(DateTime(timezone=True), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)  # extended by heartbeats
+    queue_attempts = Column(Integer, default=0, nullable=False, server_default="0")
+
     # ── Multi-content helpers ──────────────────────────────────────────
 
     @property
@@ -0,0 +1,23 @@
+"""
+LLM response cache — deterministic DeepSeek completions shared by every
+process, user and brand.
+
+cache_key = sha256 of model, temperature, max_tokens and the normalized
+messages, see app/utils/llm_cache.py.
+"""
+from sqlalchemy import Column, String, Integer, Text
+from app.models.base import Base, DateTime
+
+
+class LLMResponseCache(Base):
+    __tablename__ = "llm_response_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    callsite = Column(String(64), nullable=False)
+    model = Column(String(50), nullable=False)
+    content = Column(Text, nullable=False)
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    # Size-bounded eviction drops the oldest rows first
+    created_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
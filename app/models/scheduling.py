@@ -1,8 +1,10 @@
 """
 Scheduled reel model.
 """
+import hashlib
 from datetime import datetime, timezone
-from sqlalchemy import Index
+from typing import Optional
+from sqlalchemy import Index, and_, event, func, or_, text
 from app.models.base import Base, Column, String, DateTime, Text, JSON
 
 
@@ -10,12 +12,67 @@ def _utc_now():
     return datetime.now(timezone.utc)
 
 
+def normalize_brand_key(brand: Optional[str]) -> Optional[str]:
+    """Brand id as stored in scheduled_reels.brand: trimmed, lower-cased, None if empty.
+
+    Every brand comparison on scheduled reels is case-insensitive, so the
+    column holds the normalized key and queries compare it to
+    ``normalize_brand_key(brand)``. Matches the backfill in
+    migrations/add_scheduled_reels_brand_columns.sql.
+    """
+    if brand is None:
+        return None
+    key = str(brand).strip().lower()
+    return key[:50] or None
+
+
+def _short_str(value, length: int) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    return str(value)[:length]
+
+
+# Characters stripped before fingerprinting. The SQL backfill passes the
+# same set to btrim(); bare .strip() (all Unicode whitespace) would not match it.
+_FINGERPRINT_STRIP = " \t\n\r"
+
+
+def compute_title_fingerprint(brand: Optional[str], title: Optional[str], caption: Optional[str]) -> Optional[str]:
+    """Publish-dedup fingerprint of (brand, title, caption prefix).
+
+    Matches the backfill in migrations/add_scheduled_reels_title_fingerprint.sql:
+    md5(lower(btrim(brand)) || '|' || lower(btrim(title)) || '|' || lower(btrim(left(caption, 100)))),
+    with btrim over _FINGERPRINT_STRIP.
+    Returns None when brand or title is missing — those rows are never deduped.
+    """
+    brand_key = (brand or "").strip(_FINGERPRINT_STRIP).lower()
+    title_key = (title or "").strip(_FINGERPRINT_STRIP).lower()
+    if not brand_key or not title_key:
+        return None
+    caption_key = (caption or "")[:100].strip(_FINGERPRINT_STRIP).lower()
+    return hashlib.md5(f"{brand_key}|{title_key}|{caption_key}".encode("utf-8")).hexdigest()
+
+
 class ScheduledReel(Base):
     """Model for scheduled reels with user support."""
     __tablename__ = "scheduled_reels"
     
     __table_args__ = (
         Index("ix_scheduled_reels_status_time", "status", "scheduled_time"),
+        Index(
+            "ix_scheduled_reels_fingerprint_published",
+            "title_fingerprint", "scheduled_time",
+            postgresql_where=text(
+                "title_fingerprint IS NOT NULL AND status IN ('published', 'partial', 'publishing')"
+            ),
+        ),
+        # Per-brand windows (buffer, slot search, dedup) and per-brand metrics
+        Index("ix_scheduled_reels_user_brand_time", "user_id", "brand", "scheduled_time"),
+        Index(
+            "ix_scheduled_reels_user_brand_published",
+            "user_id", "brand", "published_at",
+            postgresql_where=text("status IN ('published', 'partial')"),
+        ),
     )
     
     # Primary key
@@ -47,6 +104,21 @@ class ScheduledReel(Base):
     # DEFAULT is "toby" because all existing content was Toby-generated before manual feature
     # Only new manual uploads explicitly set created_by="user"
     created_by = Column(String(20), default="toby", nullable=False)
+
+    # md5 of (brand, title, caption[:100]) — kept in sync by the listeners
+    # below so the publish-time dedup check is a single indexed lookup.
+    # Listeners only see ORM flushes: raw SQL or Query.update() that changes
+    # caption or extra_data leaves it (and brand/variant/content_type) stale
+    # unless the statement sets them too.
+    title_fingerprint = Column(String(32), nullable=True)
+
+    # Copies of extra_data["brand"/"variant"/"content_type"] (brand normalized
+    # by normalize_brand_key) so brand/variant filters run in SQL against
+    # the composite indexes above. Kept in sync by the listeners below;
+    # extra_data stays the API-facing source of truth.
+    brand = Column(String(50), nullable=True)
+    variant = Column(String(20), nullable=True)
+    content_type = Column(String(20), nullable=True)
     
     def to_dict(self):
         """Convert to dictionary for API responses."""
@@ -64,3 +136,54 @@ class ScheduledReel(Base):
             "created_by": self.created_by or "toby",  # Default to toby for legacy entries
             "metadata": self.extra_data or {}  # Return as "metadata" for API compatibility
         }
+
+
+@event.listens_for(ScheduledReel, "before_insert")
+@event.listens_for(ScheduledReel, "before_update")
+def _sync_denormalized_columns(mapper, connection, target: ScheduledReel):
+    """Recompute the extra_data-derived columns whenever caption or extra_data may have changed."""
+    ed = target.extra_data or {}
+    target.brand = normalize_brand_key(ed.get("brand"))
+    target.variant = _short_str(ed.get("variant"), 20)
+    target.content_type = _short_str(ed.get("content_type"), 20)
+    target.title_fingerprint = compute_title_fingerprint(ed.get("brand"), ed.get("title"), target.caption)
+
+
+# ── SQL brand/variant keys with an extra_data fallback ──────────────
+# backfill_scheduled_reel_columns() fills brand/variant/content_type for
+# legacy rows in the background, so right after a deploy those rows still
+# have NULL there. Filters go through these helpers, which read extra_data
+# for rows the backfill hasn't reached yet (same normalization as the
+# backfill SQL). The brand filter is "brand = :key OR (brand IS NULL AND
+# <extra_data key> = :key)" so the (user_id, brand, ...) indexes stay usable.
+
+def _extra_data_text(field: str):
+    return func.nullif(ScheduledReel.extra_data[field].as_string(), "")
+
+
+def _legacy_brand_key():
+    return func.left(func.nullif(func.lower(func.trim(ScheduledReel.extra_data["brand"].as_string())), ""), 50)
+
+
+def scheduled_brand_key():
+    """SQL expression: normalized brand key, from extra_data while the column is NULL."""
+    return func.coalesce(ScheduledReel.brand, _legacy_brand_key())
+
+
+def scheduled_variant():
+    """SQL expression: variant, from extra_data while the column is NULL."""
+    return func.coalesce(ScheduledReel.variant, func.left(_extra_data_text("variant"), 20))
+
+
+def scheduled_content_type():
+    """SQL expression: content_type, from extra_data while the column is NULL."""
+    return func.coalesce(ScheduledReel.content_type, func.left(_extra_data_text("content_type"), 20))
+
+
+def brand_key_in(brands):
+    """Filter: rows whose normalized brand is one of ``brands`` (raw ids, normalized here)."""
+    keys = sorted({k for k in (normalize_brand_key(b) for b in brands) if k})
+    return or_(
+        ScheduledReel.brand.in_(keys),
+        and_(ScheduledReel.brand.is_(None), _legacy_brand_key().in_(keys)),
+    )
@@ -47,6 +47,8 @@ class TobyState(Base):
     last_metrics_check_at = Column(DateTime(timezone=True), nullable=True)
     last_analysis_at = Column(DateTime(timezone=True), nullable=True)
     last_discovery_at = Column(DateTime(timezone=True), nullable=True)
+    last_tick_ms = Column(Integer, nullable=True)  # duration of this user's last orchestrator tick
+    last_tick_at = Column(DateTime(timezone=True), nullable=True)
 
     # Future: spending limits
     daily_budget_cents = Column(Integer, nullable=True)
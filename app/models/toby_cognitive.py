@@ -8,6 +8,7 @@ Toby v3.0 cognitive memory models:
   - TobyRawSignal
   - TobyMetaReport
   - TobyReasoningTrace
+  - TobyEmbeddingCache
 """
 from datetime import datetime, timezone
 from app.models.base import Base, Column, String, DateTime, Text, Boolean, Integer, JSON, Float, Index
@@ -351,3 +352,18 @@ class ContentDNARecommendation(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "resolved_at": self.resolved_at.isoformat() if self.resolved_at else None,
         }
+
+
+class TobyEmbeddingCache(Base):
+    """Content-addressed embedding cache shared by every memory type and user.
+
+    content_hash = sha256 of model, dimensions and the (truncated) input text,
+    see app/services/toby/memory/embeddings.py.
+    """
+    __tablename__ = "toby_embedding_cache"
+    __table_args__ = {"extend_existing": True}
+
+    content_hash = Column(String(64), primary_key=True)
+    model = Column(String(50), nullable=False)
+    embedding = Column(Vector(1536), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=_utc_now, nullable=False, index=True)
@@ -31,6 +31,8 @@ class UserCostDaily(Base):
 
     __table_args__ = (
         Index("idx_user_cost_daily_date", "date"),
+        # One row per user per day — target of the cost tracker's batched upsert
+        Index("uq_user_cost_daily_user_date", "user_id", "date", unique=True),
     )
 
 
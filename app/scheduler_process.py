@@ -0,0 +1,124 @@
+"""
+Standalone background-job process.
+
+Runs the APScheduler jobs (auto-publish, analytics refresh, token refresh,
+cleanups, Toby ticks) and the publish wakeup listener outside the web
+process, so API workers can scale freely:
+
+    python -m app.scheduler_process
+
+Set SCHEDULER_MODE=off on the web service. The process joins the same
+Postgres advisory-lock election as web workers
+(app/services/publishing/scheduler_leader.py), so you can run two for
+failover — only the lock holder runs jobs; the other takes over when the
+holder dies. On SIGTERM it finishes running jobs and releases the lock.
+
+With TOBY_SHARD_COUNT=N > 1 the leader skips Toby; run one Toby-only
+process per shard instead (same TOBY_SHARD_COUNT everywhere):
+
+    python -m app.scheduler_process --toby-shard 0   # ... up to N-1
+
+Each shard has its own advisory lock, so a second process for the same
+shard stands by for failover instead of double-ticking its users.
+"""
+import argparse
+import logging
+import signal
+import threading
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+env_path = Path(__file__).resolve().parent.parent / ".env"
+if env_path.exists():
+    load_dotenv(env_path)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(levelname)s:%(name)s: %(message)s",
+)
+
+
+def _toby_shard_jobs(shard_index: int):
+    """Start/stop callbacks that run only Toby ticks for one shard."""
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from app.services.toby.orchestrator import start_toby_scheduler
+    from app.services.toby.agents.critic import shutdown_critic_pool
+    from app.services.toby.tick_executor import shutdown_tick_executor
+
+    def start():
+        scheduler = BackgroundScheduler()
+        start_toby_scheduler(scheduler, shard_index=shard_index)
+        scheduler.start()
+        return scheduler
+
+    def stop(scheduler):
+        if scheduler is not None and scheduler.running:
+            scheduler.shutdown()
+        shutdown_tick_executor()
+        shutdown_critic_pool()
+
+    return start, stop
+
+
+def main() -> None:
+    from app.services.publishing.scheduler_leader import (
+        LEADER_LOCK_KEY,
+        TOBY_SHARD_LOCK_BASE,
+        SchedulerLeadership,
+    )
+    from app.services.toby.tick_executor import shard_count
+
+    parser = argparse.ArgumentParser(description="Run background jobs outside the web process")
+    parser.add_argument("--toby-shard", type=int, default=None,
+                        help="Only run Toby ticks for this shard (0..TOBY_SHARD_COUNT-1)")
+    args = parser.parse_args()
+
+    if args.toby_shard is None:
+        from app.main import start_background_jobs, stop_background_jobs
+        start_jobs, stop_jobs = start_background_jobs, stop_background_jobs
+        lock_key, role = LEADER_LOCK_KEY, "scheduler-leader"
+    else:
+        shards = shard_count()
+        if not 0 <= args.toby_shard < shards:
+            parser.error(f"--toby-shard must be in 0..{shards - 1} (TOBY_SHARD_COUNT={shards})")
+        start_jobs, stop_jobs = _toby_shard_jobs(args.toby_shard)
+        lock_key, role = TOBY_SHARD_LOCK_BASE + args.toby_shard, f"toby-shard-{args.toby_shard}"
+
+    state = {"scheduler": None}
+
+    def _on_elected():
+        state["scheduler"] = start_jobs()
+
+    def _on_demoted():
+        stop_jobs(state["scheduler"])
+        state["scheduler"] = None
+
+    leadership = SchedulerLeadership(_on_elected, _on_demoted, lock_key=lock_key, role=role)
+    stopped = threading.Event()
+
+    def _shutdown(signum, _frame):
+        print(f"👋 [SchedulerProcess] Signal {signum} — stopping", flush=True)
+        stopped.set()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    print(f"🗳️ [SchedulerProcess] {leadership.identity} joining election", flush=True)
+    leadership.start()
+    stopped.wait()
+
+    leadership.stop()
+    from app.services.publishing.publish_engine import get_publish_engine
+    get_publish_engine().shutdown()
+    from app.services.media.carousel_pipeline import shutdown_carousel_pipeline
+    shutdown_carousel_pipeline()
+    from app.services.monitoring.cost_tracker import shutdown_cost_tracker
+    shutdown_cost_tracker()
+    from app.services.toby.memory.vector_index import shutdown_vector_index
+    shutdown_vector_index()
+    print("✅ [SchedulerProcess] Stopped", flush=True)
+
+
+if __name__ == "__main__":
+    main()
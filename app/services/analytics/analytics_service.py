@@ -6,17 +6,21 @@ Fetches followers, views (last 7 days), and likes for each brand on:
 - Facebook (via Meta Graph API)  
 - YouTube (via YouTube Data API)
 
-Auto-refreshes every 12 hours via scheduler. No rate limits.
+Auto-refreshes every 6 hours via scheduler. The scheduled refresh runs
+every (user, brand, platform) as a unit on AnalyticsRefreshEngine — in
+parallel, rate-budgeted per access token (see refresh_engine.py).
 """
 import os
 import logging
 import threading
-import requests
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import func, distinct
 
+from app.utils.http_client import get_http_session
+from app.services.analytics.graph_batch import GraphBatchClient
+from app.services.analytics.refresh_engine import RefreshUnit, is_rate_limited
 from app.models import BrandAnalytics, AnalyticsRefreshLog, YouTubeChannel, AnalyticsSnapshot
 from app.models.brands import Brand
 from app.services.brands.resolver import brand_resolver
@@ -33,6 +37,8 @@ _refresh_lock = threading.Lock()
 _refresh_in_progress: Dict[str, datetime] = {}
 _REFRESH_TIMEOUT_SECONDS = 300  # 5 minutes
 
+_PLATFORM_LABELS = {"instagram": "Instagram", "facebook": "Facebook", "youtube": "YouTube"}
+
 
 class AnalyticsService:
     """Service for fetching and managing brand analytics."""
@@ -112,28 +118,110 @@ class AnalyticsService:
     def refresh_all_users(self) -> Dict[str, Any]:
         """
         Auto-refresh analytics for ALL users. Called by the scheduler.
-        Iterates each user and refreshes their analytics individually.
+        
+        Every user's (brand, platform) pairs run as units on the shared
+        AnalyticsRefreshEngine — in parallel, rate-budgeted per access
+        token, stalest first. Units refreshed within
+        ANALYTICS_REFRESH_FRESH_MINUTES are skipped, so a run cut short
+        resumes where it stopped.
         """
+        from app.services.analytics.refresh_engine import FRESH_MINUTES, get_refresh_engine
+        
         user_ids = self.get_all_user_ids()
-        total_updated = 0
         all_errors = []
+        units: List[RefreshUnit] = []
+        planned_users = []
         
         for user_id in user_ids:
             try:
-                result = self.refresh_all_analytics(user_id=user_id)
-                total_updated += result.get("updated_count", 0)
-                if result.get("errors"):
-                    all_errors.extend(result["errors"])
+                self.cleanup_disconnected_platforms(user_id)
+            except Exception as e:
+                logger.warning(f"Cleanup disconnected platforms failed: {e}")
+            try:
+                units.extend(self._plan_user_units(user_id))
+                planned_users.append(user_id)
             except Exception as e:
                 logger.error(f"Failed to refresh analytics for user {user_id}: {e}")
                 all_errors.append(f"User {user_id}: {str(e)}")
         
+        units, skipped = self._stalest_first(units, FRESH_MINUTES)
+        summary = get_refresh_engine().run(
+            "analytics", units, self._run_unit_in_session, skipped_fresh=skipped,
+        )
+        
+        errors_by_user: Dict[str, List[str]] = {}
+        processed_users = set()
+        total_updated = 0
+        for result in summary.pop("results").values():
+            unit = result["unit"]
+            processed_users.add(unit.user_id)
+            if result["error"]:
+                message = f"{_PLATFORM_LABELS.get(unit.platform, unit.platform)}/{unit.brand}: {result['error']}"
+                errors_by_user.setdefault(unit.user_id, []).append(message)
+                all_errors.append(message)
+            else:
+                total_updated += 1
+        
+        # Units the budget or a shutdown left unfetched: "partial", not "success"
+        deferred_by_user: Dict[str, int] = {}
+        for unit in summary.pop("deferred_units"):
+            deferred_by_user[unit.user_id] = deferred_by_user.get(unit.user_id, 0) + 1
+        
+        for user_id in planned_users:
+            errors = list(errors_by_user.get(user_id, []))
+            if deferred_by_user.get(user_id):
+                errors.append(f"{deferred_by_user[user_id]} unit(s) deferred to the next run")
+            try:
+                self.log_refresh(
+                    status="success" if not errors else "partial",
+                    error_message="; ".join(errors) if errors else None,
+                    user_id=user_id,
+                )
+            except Exception as e:
+                self.db.rollback()
+                logger.warning(f"Could not log analytics refresh for {user_id}: {e}")
+        
         return {
             "success": True,
             "updated_count": total_updated,
-            "users_refreshed": len(user_ids),
-            "errors": all_errors if all_errors else None
+            "users_refreshed": len(processed_users),
+            "errors": all_errors if all_errors else None,
+            "report": summary,
+        }
+    
+    def _stalest_first(self, units: List[RefreshUnit], fresh_minutes: float) -> Tuple[List[RefreshUnit], int]:
+        """Drop units fetched within ``fresh_minutes``; order the rest never-fetched, then oldest."""
+        fetched_at = {
+            (brand, platform): at
+            for brand, platform, at in self.db.query(
+                BrandAnalytics.brand, BrandAnalytics.platform, BrandAnalytics.last_fetched_at
+            ).all()
         }
+        fresh_after = datetime.now(timezone.utc) - timedelta(minutes=fresh_minutes)
+        never = datetime.min.replace(tzinfo=timezone.utc)
+        keyed = []
+        for unit in units:
+            at = fetched_at.get((unit.brand, unit.platform))
+            if at is not None and at.tzinfo is None:
+                at = at.replace(tzinfo=timezone.utc)
+            keyed.append((at or never, unit))
+        stale = [(at, unit) for at, unit in keyed if at < fresh_after]
+        stale.sort(key=lambda pair: pair[0])
+        return [unit for _, unit in stale], len(keyed) - len(stale)
+    
+    @staticmethod
+    def _run_unit_in_session(unit: RefreshUnit) -> None:
+        """Engine work function: one unit on its own session."""
+        from app.db_connection import SessionLocal
+        
+        db = SessionLocal()
+        try:
+            AnalyticsService(db)._refresh_unit(unit)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
     
     def cleanup_disconnected_platforms(self, user_id: str = None) -> int:
         """
@@ -262,66 +350,14 @@ class AnalyticsService:
             except Exception as e:
                 logger.warning(f"Cleanup disconnected platforms failed: {e}")
         
-        # Fetch Instagram and Facebook analytics for all brands
-        brand_ids = brand_resolver.get_all_brand_ids(user_id)
-        for brand_name in brand_ids:
-            config = brand_resolver.get_brand_config(brand_name, user_id)
-            if not config:
-                continue
-            
-            # Instagram
+        for unit in self._plan_user_units(user_id):
             try:
-                if config.instagram_business_account_id and config.meta_access_token:
-                    ig_data = self._fetch_instagram_analytics(
-                        config.instagram_business_account_id,
-                        config.meta_access_token
-                    )
-                    self._update_analytics(brand_name, "instagram", ig_data, user_id=user_id)
-                    updated_count += 1
-            except Exception as e:
-                logger.error(f"Failed to fetch Instagram analytics for {brand_name}: {e}")
-                errors.append(f"Instagram/{brand_name}: {str(e)}")
-            
-            # Facebook
-            try:
-                fb_token = config.facebook_access_token or config.meta_access_token
-                if config.facebook_page_id and fb_token:
-                    fb_data = self._fetch_facebook_analytics(
-                        config.facebook_page_id,
-                        fb_token
-                    )
-                    self._update_analytics(brand_name, "facebook", fb_data, user_id=user_id)
-                    updated_count += 1
-            except Exception as e:
-                logger.error(f"Failed to fetch Facebook analytics for {brand_name}: {e}")
-                errors.append(f"Facebook/{brand_name}: {str(e)}")
-        
-        # Fetch YouTube analytics for connected channels
-        # Look up by brand ownership (brand_ids) rather than YT user_id,
-        # since YouTube OAuth stores brand name as user_id fallback.
-        yt_query = self.db.query(YouTubeChannel).filter(
-            YouTubeChannel.status == "connected"
-        )
-        if user_id and brand_ids:
-            yt_query = yt_query.filter(YouTubeChannel.brand.in_(brand_ids))
-        youtube_channels = yt_query.all()
-        
-        for channel in youtube_channels:
-            try:
-                yt_data = self._fetch_youtube_analytics(channel)
-                self._update_analytics(channel.brand, "youtube", yt_data, user_id=user_id or channel.user_id)
+                self._refresh_unit(unit)
                 updated_count += 1
             except Exception as e:
-                logger.error(f"Failed to fetch YouTube analytics for {channel.brand}: {e}")
-                errors.append(f"YouTube/{channel.brand}: {str(e)}")
-                # Mark channel as error if token issue
-                if "access token" in str(e).lower() or "401" in str(e) or "403" in str(e):
-                    try:
-                        channel.status = "error"
-                        channel.last_error = str(e)
-                        self.db.commit()
-                    except Exception:
-                        pass
+                label = _PLATFORM_LABELS.get(unit.platform, unit.platform)
+                logger.error(f"Failed to fetch {label} analytics for {unit.brand}: {e}")
+                errors.append(f"{label}/{unit.brand}: {str(e)}")
         
         # Log the refresh
         self.log_refresh(
@@ -344,6 +380,69 @@ class AnalyticsService:
             "analytics": self.get_all_analytics(user_id=user_id)
         }
     
+    def _plan_user_units(self, user_id: str = None) -> List[RefreshUnit]:
+        """One RefreshUnit per connected (brand, platform) of a user."""
+        units = []
+        brand_ids = brand_resolver.get_all_brand_ids(user_id)
+        for brand_name in brand_ids:
+            config = brand_resolver.get_brand_config(brand_name, user_id)
+            if not config:
+                continue
+            if config.instagram_business_account_id and config.meta_access_token:
+                units.append(RefreshUnit(
+                    user_id, brand_name, "instagram", config.meta_access_token,
+                    {"account_id": config.instagram_business_account_id},
+                ))
+            fb_token = config.facebook_access_token or config.meta_access_token
+            if config.facebook_page_id and fb_token:
+                units.append(RefreshUnit(
+                    user_id, brand_name, "facebook", fb_token,
+                    {"page_id": config.facebook_page_id},
+                ))
+        
+        # YouTube: look up by brand ownership (brand_ids) rather than YT user_id,
+        # since YouTube OAuth stores brand name as user_id fallback.
+        yt_query = self.db.query(YouTubeChannel).filter(
+            YouTubeChannel.status == "connected"
+        )
+        if user_id and brand_ids:
+            yt_query = yt_query.filter(YouTubeChannel.brand.in_(brand_ids))
+        for channel in yt_query.all():
+            # Google's quota is per project; budget per channel keeps tenants apart
+            units.append(RefreshUnit(
+                user_id, channel.brand, "youtube", f"youtube:{channel.channel_id}",
+                {"analytics_user_id": user_id or channel.user_id},
+            ))
+        return units
+    
+    def _refresh_unit(self, unit: RefreshUnit) -> None:
+        """Fetch one (brand, platform) and store it. Raises on failure."""
+        if unit.platform == "instagram":
+            data = self._fetch_instagram_analytics(unit.payload["account_id"], unit.token)
+        elif unit.platform == "facebook":
+            data = self._fetch_facebook_analytics(unit.payload["page_id"], unit.token)
+        elif unit.platform == "youtube":
+            channel = self.db.get(YouTubeChannel, unit.brand)
+            if channel is None or channel.status != "connected":
+                return
+            try:
+                data = self._fetch_youtube_analytics(channel)
+            except Exception as e:
+                # Mark channel as error if token issue
+                if "access token" in str(e).lower() or "401" in str(e) or "403" in str(e):
+                    try:
+                        channel.status = "error"
+                        channel.last_error = str(e)
+                        self.db.commit()
+                    except Exception:
+                        self.db.rollback()
+                raise
+            self._update_analytics(unit.brand, "youtube", data, user_id=unit.payload["analytics_user_id"])
+            return
+        else:
+            raise ValueError(f"Unknown analytics platform: {unit.platform}")
+        self._update_analytics(unit.brand, unit.platform, data, user_id=unit.user_id)
+    
     def _fetch_instagram_analytics(self, account_id: str, access_token: str) -> Dict[str, Any]:
         """
         Fetch Instagram analytics from Meta Graph API.
@@ -362,7 +461,7 @@ class AnalyticsService:
             "access_token": access_token
         }
         
-        response = requests.get(account_url, params=params)
+        response = get_http_session().get(account_url, params=params)
         response.raise_for_status()
         account_data = response.json()
         
@@ -395,7 +494,7 @@ class AnalyticsService:
             }
             
             logger.info(f"Fetching IG insights: metric=views, since={since_ts}, until={until_ts}")
-            insights_resp = requests.get(insights_url, params=insights_params)
+            insights_resp = get_http_session().get(insights_url, params=insights_params)
             
             if insights_resp.status_code == 200:
                 insights_data = insights_resp.json()
@@ -418,7 +517,7 @@ class AnalyticsService:
                     "access_token": access_token
                 }
                 
-                fallback_resp = requests.get(insights_url, params=fallback_params)
+                fallback_resp = get_http_session().get(insights_url, params=fallback_params)
                 logger.info(f"IG fallback period=day response: {fallback_resp.status_code}")
                 
                 if fallback_resp.status_code == 200:
@@ -443,7 +542,7 @@ class AnalyticsService:
                         "access_token": access_token
                     }
                     
-                    total_resp = requests.get(insights_url, params=total_params)
+                    total_resp = get_http_session().get(insights_url, params=total_params)
                     if total_resp.status_code == 200:
                         total_data = total_resp.json()
                         logger.info(f"Instagram total_value data: {total_data}")
@@ -475,7 +574,7 @@ class AnalyticsService:
                 "limit": 50,
                 "access_token": access_token
             }
-            media_response = requests.get(media_url, params=media_params)
+            media_response = get_http_session().get(media_url, params=media_params)
             
             if media_response.status_code == 200:
                 media_data = media_response.json()
@@ -525,7 +624,7 @@ class AnalyticsService:
                 "limit": 50,
                 "access_token": access_token
             }
-            media_response = requests.get(media_url, params=media_params)
+            media_response = get_http_session().get(media_url, params=media_params)
             
             if media_response.status_code != 200:
                 logger.error(f"Failed to get media list: {media_response.text}")
@@ -533,6 +632,7 @@ class AnalyticsService:
             
             media_data = media_response.json()
             
+            videos, images = [], []
             for post in media_data.get("data", []):
                 timestamp = post.get("timestamp")
                 if not timestamp:
@@ -545,63 +645,32 @@ class AnalyticsService:
                 except Exception:
                     continue
                 
-                media_id = post.get("id")
-                media_type = post.get("media_type", "")
-                media_product_type = post.get("media_product_type", "")
-                
-                # Determine which metrics to fetch based on media type
-                if media_type == "VIDEO" or media_product_type == "REELS":
-                    # For videos/reels, try to get plays
-                    try:
-                        insights_url = f"{self.META_API_BASE}/{media_id}/insights"
-                        
-                        # Try video_views first (for regular videos)
-                        insights_params = {
-                            "metric": "plays",
-                            "access_token": access_token
-                        }
-                        
-                        insights_resp = requests.get(insights_url, params=insights_params)
-                        
-                        if insights_resp.status_code == 200:
-                            insights_data = insights_resp.json()
-                            for metric in insights_data.get("data", []):
-                                if metric.get("name") == "plays":
-                                    views += metric.get("values", [{}])[0].get("value", 0)
-                                    break
-                        else:
-                            # Try reach as fallback
-                            insights_params["metric"] = "reach"
-                            insights_resp = requests.get(insights_url, params=insights_params)
-                            if insights_resp.status_code == 200:
-                                insights_data = insights_resp.json()
-                                for metric in insights_data.get("data", []):
-                                    if metric.get("name") == "reach":
-                                        views += metric.get("values", [{}])[0].get("value", 0)
-                                        break
-                                        
-                    except Exception as e:
-                        logger.debug(f"Could not get insights for media {media_id}: {e}")
-                        
+                # Determine which metric to fetch based on media type:
+                # plays for videos/reels, reach for images
+                if post.get("media_type", "") == "VIDEO" or post.get("media_product_type", "") == "REELS":
+                    videos.append(post.get("id"))
                 else:
-                    # For images, try reach
-                    try:
-                        insights_url = f"{self.META_API_BASE}/{media_id}/insights"
-                        insights_params = {
-                            "metric": "reach",
-                            "access_token": access_token
-                        }
-                        
-                        insights_resp = requests.get(insights_url, params=insights_params)
-                        if insights_resp.status_code == 200:
-                            insights_data = insights_resp.json()
-                            for metric in insights_data.get("data", []):
-                                if metric.get("name") == "reach":
-                                    views += metric.get("values", [{}])[0].get("value", 0)
-                                    break
-                    except Exception as e:
-                        logger.debug(f"Could not get insights for media {media_id}: {e}")
+                    images.append(post.get("id"))
+            
+            # All insights go out as batch requests (up to 50 per call), not one GET per media
+            client = GraphBatchClient(self.META_API_BASE, access_token)
+            plays = client.get_batch([f"{media_id}/insights?metric=plays" for media_id in videos])
+            # Videos without plays fall back to reach, like images
+            reach_ids = [m for m, res in zip(videos, plays) if not res.ok] + images
+            reach = client.get_batch([f"{media_id}/insights?metric=reach" for media_id in reach_ids])
             
+            for metric_name, results in (("plays", plays), ("reach", reach)):
+                for res in results:
+                    if not res.ok:
+                        continue
+                    for metric in res.body.get("data", []):
+                        if metric.get("name") == metric_name:
+                            views += metric.get("values", [{}])[0].get("value", 0)
+                            break
+            
+            failed = sum(1 for res in reach if not res.ok)
+            if failed:
+                logger.debug(f"Could not get insights for {failed} media item(s)")
             logger.info(f"Instagram views from media items: {views}")
             
         except Exception as e:
@@ -620,7 +689,7 @@ class AnalyticsService:
             "access_token": access_token
         }
 
-        response = requests.get(page_url, params=params)
+        response = get_http_session().get(page_url, params=params)
         if response.status_code == 400:
             # Some pages/tokens reject followers_count on the page node.
             # Retry with fan_count only to avoid noisy hard failures.
@@ -628,7 +697,7 @@ class AnalyticsService:
                 "fields": "fan_count,name",
                 "access_token": access_token
             }
-            fallback_response = requests.get(page_url, params=fallback_params)
+            fallback_response = get_http_session().get(page_url, params=fallback_params)
             if fallback_response.status_code == 200:
                 response = fallback_response
             else:
@@ -649,7 +718,7 @@ class AnalyticsService:
         
         views = 0
         try:
-            insights_response = requests.get(insights_url, params=insights_params)
+            insights_response = get_http_session().get(insights_url, params=insights_params)
             if insights_response.status_code == 200:
                 insights_data = insights_response.json()
                 for metric in insights_data.get("data", []):
@@ -669,7 +738,7 @@ class AnalyticsService:
                 "limit": 25,
                 "access_token": access_token
             }
-            posts_response = requests.get(posts_url, params=posts_params)
+            posts_response = get_http_session().get(posts_url, params=posts_params)
             if posts_response.status_code == 200:
                 posts_data = posts_response.json()
                 seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
@@ -712,7 +781,7 @@ class AnalyticsService:
         }
         headers = {"Authorization": f"Bearer {access_token}"}
         
-        response = requests.get(channels_url, params=params, headers=headers)
+        response = get_http_session().get(channels_url, params=params, headers=headers)
         response.raise_for_status()
         data = response.json()
         
@@ -744,7 +813,7 @@ class AnalyticsService:
                 "publishedAfter": (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
             }
             
-            search_response = requests.get(search_url, params=search_params, headers=headers)
+            search_response = get_http_session().get(search_url, params=search_params, headers=headers)
             if search_response.status_code == 200:
                 search_data = search_response.json()
                 video_ids = [item["id"]["videoId"] for item in search_data.get("items", []) if "videoId" in item.get("id", {})]
@@ -756,7 +825,7 @@ class AnalyticsService:
                         "part": "statistics",
                         "id": ",".join(video_ids)
                     }
-                    videos_response = requests.get(videos_url, params=videos_params, headers=headers)
+                    videos_response = get_http_session().get(videos_url, params=videos_params, headers=headers)
                     if videos_response.status_code == 200:
                         videos_data = videos_response.json()
                         for video in videos_data.get("items", []):
@@ -786,7 +855,7 @@ class AnalyticsService:
             return None
         
         try:
-            response = requests.post("https://oauth2.googleapis.com/token", data={
+            response = get_http_session().post("https://oauth2.googleapis.com/token", data={
                 "client_id": client_id,
                 "client_secret": client_secret,
                 "refresh_token": refresh_token,
@@ -844,6 +913,172 @@ class AnalyticsService:
         
         self.db.commit()
     
+    # ── Audience demographics ────────────────────────────────
+    
+    def refresh_all_demographics(self) -> Dict[str, Any]:
+        """
+        Fetch Instagram audience demographics for every active brand.
+        Called by the scheduler; runs one unit per brand on the shared
+        AnalyticsRefreshEngine (budgeted against the same per-token rates
+        as refresh_all_users) and skips brands fetched recently.
+        """
+        from app.models.analytics import AudienceDemographics
+        from app.services.analytics.refresh_engine import FRESH_MINUTES, get_refresh_engine
+        
+        brands = self.db.query(Brand).filter(
+            Brand.active == True,
+            Brand.instagram_business_account_id.isnot(None),
+        ).all()
+        fetched_at = {
+            (user_id, brand): at
+            for user_id, brand, at in self.db.query(
+                AudienceDemographics.user_id, AudienceDemographics.brand, AudienceDemographics.fetched_at
+            ).filter(AudienceDemographics.platform == "instagram").all()
+        }
+        fresh_after = datetime.now(timezone.utc) - timedelta(minutes=FRESH_MINUTES)
+        never = datetime.min.replace(tzinfo=timezone.utc)
+        
+        keyed = []
+        for b in brands:
+            token = b.meta_access_token or b.instagram_access_token
+            if not token or not b.instagram_business_account_id:
+                continue
+            at = fetched_at.get((b.user_id, b.id))
+            if at is not None and at.tzinfo is None:
+                at = at.replace(tzinfo=timezone.utc)
+            unit = RefreshUnit(b.user_id, b.id, "demographics", token, {"ig_id": b.instagram_business_account_id})
+            keyed.append((at or never, unit))
+        stale = sorted((pair for pair in keyed if pair[0] < fresh_after), key=lambda pair: pair[0])
+        
+        summary = get_refresh_engine().run(
+            "demographics", [unit for _, unit in stale], self._run_demographics_in_session,
+            skipped_fresh=len(keyed) - len(stale),
+        )
+        results = summary.pop("results")
+        summary.pop("deferred_units")
+        return {
+            "updated_count": sum(1 for r in results.values() if r["value"]),
+            "errors": [f"{r['unit'].brand}: {r['error']}" for r in results.values() if r["error"]] or None,
+            "report": summary,
+        }
+    
+    @staticmethod
+    def _run_demographics_in_session(unit: RefreshUnit) -> bool:
+        """Engine work function: one brand's demographics on its own session."""
+        from app.db_connection import SessionLocal
+        
+        db = SessionLocal()
+        try:
+            return AnalyticsService(db)._refresh_demographics_unit(unit)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    def _refresh_demographics_unit(self, unit: RefreshUnit) -> bool:
+        """Fetch follower demographics for one brand and upsert its row. False if there was nothing to store."""
+        from app.models.analytics import AudienceDemographics
+        
+        url = f"{self.META_API_BASE}/{unit.payload['ig_id']}/insights"
+        params = {
+            "metric": "follower_demographics",
+            "period": "lifetime",
+            "metric_type": "total_value",
+            "access_token": unit.token,
+        }
+        resp = get_http_session().get(url, params=params, timeout=15)
+        if resp.status_code != 200:
+            # Rate limits go back to the engine, which pauses this token
+            if is_rate_limited(resp):
+                resp.raise_for_status()
+            return False
+        
+        data = resp.json().get("data", [])
+        gender_age = {}
+        top_cities = {}
+        top_countries = {}
+        
+        for metric in data:
+            name = metric.get("name", "")
+            total_value = metric.get("total_value", {}).get("breakdowns", [])
+            if not total_value:
+                continue
+            results = total_value[0].get("results", [])
+            for result in results:
+                dims = result.get("dimension_values", [])
+                val = result.get("value", 0)
+                if name == "follower_demographics" and len(dims) >= 2:
+                    gender_age[f"{dims[0]}.{dims[1]}"] = val
+        
+        for breakdown_type in ["city", "country"]:
+            params2 = {**params, "breakdown": breakdown_type}
+            resp2 = get_http_session().get(url, params=params2, timeout=15)
+            if resp2.status_code == 200:
+                for metric in resp2.json().get("data", []):
+                    tv = metric.get("total_value", {}).get("breakdowns", [])
+                    if not tv:
+                        continue
+                    for result in tv[0].get("results", []):
+                        dims = result.get("dimension_values", [])
+                        val = result.get("value", 0)
+                        if dims:
+                            if breakdown_type == "city":
+                                top_cities[dims[0]] = val
+                            else:
+                                top_countries[dims[0]] = val
+        
+        if not gender_age:
+            return False
+        
+        total_audience = sum(gender_age.values())
+        gender_totals = {}
+        age_totals = {}
+        for k, v in gender_age.items():
+            g = k.split(".")[0] if "." in k else k
+            gender_totals[g] = gender_totals.get(g, 0) + v
+            parts = k.split(".")
+            age = parts[1] if len(parts) > 1 else parts[0]
+            age_totals[age] = age_totals.get(age, 0) + v
+        
+        gender_map = {"M": "Male", "F": "Female", "U": "Undisclosed"}
+        top_g = max(gender_totals, key=gender_totals.get) if gender_totals else None
+        top_gender = gender_map.get(top_g, top_g)
+        top_age = max(age_totals, key=age_totals.get) if age_totals else None
+        top_city_name = max(top_cities, key=top_cities.get) if top_cities else None
+        
+        existing = self.db.query(AudienceDemographics).filter(
+            AudienceDemographics.user_id == unit.user_id,
+            AudienceDemographics.brand == unit.brand,
+            AudienceDemographics.platform == "instagram",
+        ).first()
+        
+        if existing:
+            existing.gender_age = gender_age
+            existing.top_cities = top_cities
+            existing.top_countries = top_countries
+            existing.top_gender = top_gender
+            existing.top_age_range = top_age
+            existing.top_city = top_city_name
+            existing.total_audience = total_audience
+            existing.fetched_at = datetime.now(timezone.utc)
+        else:
+            self.db.add(AudienceDemographics(
+                user_id=unit.user_id,
+                brand=unit.brand,
+                platform="instagram",
+                gender_age=gender_age,
+                top_cities=top_cities,
+                top_countries=top_countries,
+                top_gender=top_gender,
+                top_age_range=top_age,
+                top_city=top_city_name,
+                total_audience=total_audience,
+                fetched_at=datetime.now(timezone.utc),
+            ))
+        self.db.commit()
+        return True
+    
     def get_snapshots(
         self,
         brand: Optional[str] = None,
@@ -936,7 +1171,7 @@ class AnalyticsService:
                     current_followers = 0
                     try:
                         acct_url = f"{self.META_API_BASE}/{config.instagram_business_account_id}"
-                        acct_resp = requests.get(acct_url, params={
+                        acct_resp = get_http_session().get(acct_url, params={
                             "fields": "followers_count",
                             "access_token": config.meta_access_token,
                         })
@@ -1047,7 +1282,7 @@ class AnalyticsService:
             "access_token": access_token
         }
         
-        insights_resp = requests.get(insights_url, params=insights_params)
+        insights_resp = get_http_session().get(insights_url, params=insights_params)
         
         if insights_resp.status_code == 200:
             insights_data = insights_resp.json()
@@ -1068,7 +1303,7 @@ class AnalyticsService:
                 "until": until_ts,
                 "access_token": access_token
             }
-            reach_resp = requests.get(insights_url, params=reach_params)
+            reach_resp = get_http_session().get(insights_url, params=reach_params)
             if reach_resp.status_code == 200:
                 reach_data = reach_resp.json()
                 for metric in reach_data.get("data", []):
@@ -1088,7 +1323,7 @@ class AnalyticsService:
                 "limit": 100,  # Get last 100 posts
                 "access_token": access_token
             }
-            media_resp = requests.get(media_url, params=media_params)
+            media_resp = get_http_session().get(media_url, params=media_params)
             if media_resp.status_code == 200:
                 media_data = media_resp.json()
                 for media in media_data.get("data", []):
@@ -0,0 +1,221 @@
+"""
+Meta Graph API request batching for analytics collection.
+
+The collectors fetched every media item's fields and insights with their
+own GET — four or five requests per post, so a brand with a few hundred
+posts cost well over a thousand round-trips per collection run.
+
+GraphBatchClient packs them instead:
+  - get_ids(ids, fields)  — one GET /?ids=a,b,c&fields=... per 50 objects
+  - get_batch(urls)       — one POST / with batch=[...] per 50 GETs
+Both return one GraphResult per item (HTTP status + parsed body), so a
+deleted post or an unsupported metric fails only its own entry:
+  - A ?ids= call fails as a whole if any id is bad; that chunk is
+    re-fetched through get_batch to get per-item statuses.
+  - Items Meta didn't run (null in the batch response) are retried on
+    their own.
+  - A batch POST rejected with HTTP 400 falls back to single GETs. The
+    host is then sent single GETs for GRAPH_BATCH_RETRY_SECONDS before
+    batching is tried again, so one malformed batch doesn't turn batching
+    off for the life of the process.
+Once any response is rate limited or reports an expired token, the
+remaining items are not sent and get that same result, so callers see
+the condition on every item instead of hammering the API.
+
+Meta still meters each sub-request against the app's rate limit. What
+batching saves is HTTP round-trips and wall time.
+
+Tuning (env vars):
+    GRAPH_BATCH_SIZE           — sub-requests per batch / ids per multi-fetch (default 50, Meta's maximum)
+    GRAPH_BATCH_RETRY_SECONDS  — single GETs to a host after it rejected a batch, before batching again (default 900)
+"""
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from app.utils.http_client import get_http_session
+
+MAX_BATCH = 50
+BATCH_SIZE = max(1, min(MAX_BATCH, int(os.getenv("GRAPH_BATCH_SIZE", str(MAX_BATCH)))))
+BATCH_RETRY_SECONDS = float(os.getenv("GRAPH_BATCH_RETRY_SECONDS", "900"))
+
+# Graph error codes: app/user/page rate limits, and invalid/expired token
+RATE_LIMIT_CODES = {4, 17, 32, 613}
+TOKEN_EXPIRED_CODE = 190
+
+# Host -> monotonic time until which batch POSTs are skipped after an HTTP 400
+_batch_rejected_until: Dict[str, float] = {}
+_batch_rejected_lock = threading.Lock()
+
+
+def _batch_rejected(host: str) -> bool:
+    with _batch_rejected_lock:
+        until = _batch_rejected_until.get(host)
+        if until is not None and time.monotonic() >= until:
+            del _batch_rejected_until[host]
+            until = None
+    return until is not None
+
+
+@dataclass
+class GraphResult:
+    """Outcome of one Graph sub-request."""
+
+    status: int
+    body: dict = field(default_factory=dict)
+    retry_after: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200
+
+    @property
+    def error_code(self) -> Optional[int]:
+        err = self.body.get("error") if isinstance(self.body, dict) else None
+        return err.get("code") if isinstance(err, dict) else None
+
+    @property
+    def rate_limited(self) -> bool:
+        return self.status == 429 or self.error_code in RATE_LIMIT_CODES
+
+    @property
+    def token_expired(self) -> bool:
+        return self.status == 401 or self.error_code == TOKEN_EXPIRED_CODE
+
+
+def _result_from_response(resp: requests.Response) -> GraphResult:
+    try:
+        body = resp.json()
+    except ValueError:
+        body = {}
+    retry_after = resp.headers.get("Retry-After")
+    return GraphResult(
+        status=resp.status_code,
+        body=body if isinstance(body, dict) else {"data": body},
+        retry_after=int(retry_after) if retry_after and retry_after.isdigit() else None,
+    )
+
+
+def _result_from_batch_item(item: dict) -> GraphResult:
+    try:
+        body = json.loads(item.get("body") or "{}")
+    except ValueError:
+        body = {}
+    return GraphResult(status=int(item.get("code") or 0), body=body if isinstance(body, dict) else {"data": body})
+
+
+class GraphBatchClient:
+    """Batched GETs against one Graph API base URL with one access token."""
+
+    def __init__(self, base_url: str, access_token: str, batch_size: int = BATCH_SIZE, timeout: float = 30):
+        self.base_url = base_url.rstrip("/")
+        self.access_token = access_token
+        self.batch_size = max(1, min(MAX_BATCH, batch_size))
+        self.timeout = timeout
+        self.http_requests = 0
+        # First rate-limit / expired-token result; later items get it without a request
+        self.stopped: Optional[GraphResult] = None
+
+    @property
+    def _host(self) -> str:
+        return urlsplit(self.base_url).netloc
+
+    def _check_stop(self, result: GraphResult) -> GraphResult:
+        if self.stopped is None and (result.rate_limited or result.token_expired):
+            self.stopped = result
+        return result
+
+    def _get(self, relative_url: str, params: Optional[dict] = None) -> GraphResult:
+        if self.stopped is not None:
+            return self.stopped
+        self.http_requests += 1
+        try:
+            resp = get_http_session().get(
+                f"{self.base_url}/{relative_url.lstrip('/')}",
+                params={**(params or {}), "access_token": self.access_token},
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            return GraphResult(status=0, body={"error": {"message": str(e)}})
+        return self._check_stop(_result_from_response(resp))
+
+    def _post_batch(self, relative_urls: List[str]) -> List[GraphResult]:
+        """One batch POST; falls back to single GETs if the batch itself fails."""
+        if self.stopped is not None:
+            return [self.stopped] * len(relative_urls)
+        if _batch_rejected(self._host):
+            return [self._get(url) for url in relative_urls]
+
+        self.http_requests += 1
+        try:
+            resp = get_http_session().post(
+                f"{self.base_url}/",
+                data={
+                    "access_token": self.access_token,
+                    "include_headers": "false",
+                    "batch": json.dumps([{"method": "GET", "relative_url": url} for url in relative_urls]),
+                },
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            return [GraphResult(status=0, body={"error": {"message": str(e)}})] * len(relative_urls)
+
+        if resp.status_code != 200:
+            top = self._check_stop(_result_from_response(resp))
+            if self.stopped is not None:
+                return [top] * len(relative_urls)
+            if resp.status_code == 400:
+                with _batch_rejected_lock:
+                    _batch_rejected_until[self._host] = time.monotonic() + BATCH_RETRY_SECONDS
+                print(f"⚠️ [GRAPH] Batch request rejected by {self._host} — single requests "
+                      f"for the next {BATCH_RETRY_SECONDS:.0f}s", flush=True)
+            return [self._get(url) for url in relative_urls]
+
+        try:
+            items = resp.json()
+        except ValueError:
+            items = None
+        if not isinstance(items, list) or len(items) != len(relative_urls):
+            return [self._get(url) for url in relative_urls]
+
+        results = []
+        for url, item in zip(relative_urls, items):
+            # null = Meta didn't get to this one (batch timeout) — run it on its own
+            result = _result_from_batch_item(item) if isinstance(item, dict) else self._get(url)
+            results.append(self._check_stop(result))
+        return results
+
+    def get_batch(self, relative_urls: List[str]) -> List[GraphResult]:
+        """GET every relative URL ("{id}/insights?metric=reach"), batch_size per request."""
+        results: List[GraphResult] = []
+        for i in range(0, len(relative_urls), self.batch_size):
+            results.extend(self._post_batch(relative_urls[i:i + self.batch_size]))
+        return results
+
+    def get_ids(self, ids: List[str], fields: str) -> Dict[str, GraphResult]:
+        """Fetch ``fields`` of many objects with ?ids= multi-fetches."""
+        results: Dict[str, GraphResult] = {}
+        unique = list(dict.fromkeys(ids))
+        for i in range(0, len(unique), self.batch_size):
+            chunk = unique[i:i + self.batch_size]
+            combined = self._get("", {"ids": ",".join(chunk), "fields": fields})
+            if combined.ok:
+                for object_id in chunk:
+                    body = combined.body.get(object_id)
+                    results[object_id] = (
+                        GraphResult(status=200, body=body) if isinstance(body, dict)
+                        else GraphResult(status=404, body={"error": {"message": "missing from ?ids= response"}})
+                    )
+            elif self.stopped is not None:
+                results.update({object_id: self.stopped for object_id in chunk})
+            else:
+                # One bad id fails the whole ?ids= call — get per-item statuses
+                per_item = self.get_batch([f"{object_id}?fields={fields}" for object_id in chunk])
+                results.update(zip(chunk, per_item))
+        return results
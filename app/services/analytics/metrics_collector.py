@@ -11,18 +11,28 @@ Architecture:
     - Stores / updates PostPerformance rows
     - Computes engagement_rate and performance_score
 
+Writes are set-based: one IN query loads the existing rows of a brand's
+candidate posts, one INSERT ... ON CONFLICT (ig_media_id) DO UPDATE writes
+every fetched post, and one UPDATE with percent_rank() OVER (PARTITION BY
+brand) refreshes percentile_rank, all in a single transaction — a
+constant number of round trips per brand instead of several per post.
+
 Endpoints used (official Meta Graph API):
     GET /{media_id}?fields=like_count,comments_count,timestamp
     GET /{media_id}/insights?metric=plays,reach,saved,shares
+
+Both are batched through GraphBatchClient: the basic fields of up to 50
+media per GET /?ids=..., and their insights as up to 50 sub-requests per
+batch POST — a brand's posts are collected in a handful of requests.
 """
 
-import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 
-import requests
+from sqlalchemy import text
 
 from app.models import PostPerformance, ContentHistory
+from app.services.analytics.graph_batch import GraphBatchClient, GraphResult
 
 
 # ── Metric check windows ──
@@ -36,6 +46,16 @@ METRIC_WINDOWS = {
 RATE_LIMIT_BACKOFF_SECONDS = 60
 MAX_RATE_LIMIT_RETRIES = 3
 
+# ── Rows per post_performance upsert statement ──
+UPSERT_CHUNK_ROWS = 1000
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    """timestamptz columns come back tz-aware; compare them with utcnow()."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
 
 def _log(action: str, detail: str = "", emoji: str = "🤖", level: str = "detail"):
     """Log metrics activity."""
@@ -99,37 +119,6 @@ class MetricsCollector:
             return True
         return False
 
-    def _handle_rate_limit(self, response: requests.Response) -> bool:
-        """C2: Detect 429 responses and set backoff window. Returns True if rate limited."""
-        if response.status_code == 429:
-            retry_after = int(response.headers.get("Retry-After", RATE_LIMIT_BACKOFF_SECONDS))
-            self._rate_limited_until = datetime.utcnow() + timedelta(seconds=retry_after)
-            _log("Rate Limited", f"429 received — backing off for {retry_after}s", "🚫")
-            return True
-        # Meta Graph API also returns error code 4 for rate limits
-        if response.status_code == 400:
-            try:
-                err = response.json().get("error", {})
-                if err.get("code") == 4:  # Application-level rate limit
-                    self._rate_limited_until = datetime.utcnow() + timedelta(seconds=RATE_LIMIT_BACKOFF_SECONDS)
-                    _log("Rate Limited", f"Meta API code 4 — backing off {RATE_LIMIT_BACKOFF_SECONDS}s", "🚫")
-                    return True
-            except Exception:
-                pass
-        return False
-
-    def _is_token_expired_response(self, response: requests.Response) -> bool:
-        """Gap 1: Detect expired Instagram tokens from HTTP 401 or IG error code 190."""
-        if response.status_code == 401:
-            return True
-        try:
-            err = response.json().get("error", {})
-            if err.get("code") == 190:
-                return True
-        except Exception:
-            pass
-        return False
-
     def _get_token_for_brand(self, brand: str) -> Optional[str]:
         creds = self._brand_tokens.get(brand) or self._brand_tokens.get("default")
         return creds["token"] if creds else None
@@ -154,9 +143,20 @@ class MetricsCollector:
             _log("Deleted: Flagged", f"Flagged content tag {tag.id} for {brand} as metrics_unreliable (post deleted from IG)", "🗑️", "data")
 
     # ──────────────────────────────────────────────────────────
-    # FETCH METRICS FOR A SINGLE MEDIA
+    # FETCH METRICS (BATCHED)
     # ──────────────────────────────────────────────────────────
 
+    def _handle_rate_limit(self, result: GraphResult) -> bool:
+        """C2: Detect 429 / Meta rate-limit codes and set backoff window. Returns True if rate limited."""
+        if not result.rate_limited:
+            return False
+        if self._rate_limited_until and datetime.utcnow() < self._rate_limited_until:
+            return True  # already backing off for this run
+        backoff = result.retry_after or RATE_LIMIT_BACKOFF_SECONDS
+        self._rate_limited_until = datetime.utcnow() + timedelta(seconds=backoff)
+        _log("Rate Limited", f"HTTP {result.status} / code {result.error_code} — backing off {backoff}s", "🚫")
+        return True
+
     def fetch_media_metrics(self, ig_media_id: str, access_token: str) -> Optional[Dict]:
         """
         Fetch metrics for a single Instagram media item.
@@ -164,99 +164,115 @@ class MetricsCollector:
         Returns dict with: views, likes, comments, saves, shares, reach
         Returns {"token_expired": True} if the token is expired (HTTP 401 / code 190).
         """
-        metrics = {
-            "views": 0, "likes": 0, "comments": 0,
-            "saves": 0, "shares": 0, "reach": 0,
-        }
+        return self.fetch_media_metrics_many([ig_media_id], access_token).get(ig_media_id)
+
+    def fetch_media_metrics_many(self, ig_media_ids: List[str], access_token: str) -> Dict[str, Optional[Dict]]:
+        """
+        Fetch metrics for many media items with batched Graph API calls.
+
+        Per media id, the same results as fetch_media_metrics(): a metrics
+        dict, {"deleted": True}, {"token_expired": True}, or None on error
+        or rate limit. Basic fields come from ?ids= multi-fetches and
+        insights from batch requests (see graph_batch.py), up to 50 media
+        per HTTP request instead of 4-5 requests per media.
+        """
+        ids = list(dict.fromkeys(ig_media_ids))
+        results: Dict[str, Optional[Dict]] = {media_id: None for media_id in ids}
 
         # C2: Respect rate limit backoff
         if self._is_rate_limited():
-            _log("Rate Limited", f"Skipping {ig_media_id} — in backoff window", "🚫", "api")
-            return None
+            _log("Rate Limited", f"Skipping {len(ids)} media — in backoff window", "🚫", "api")
+            return results
 
+        client = GraphBatchClient(self.BASE_URL, access_token)
         try:
             # 1. Basic fields (likes, comments)
-            basic_url = f"{self.BASE_URL}/{ig_media_id}"
-            _log("API: IG Media", f"GET /{ig_media_id}?fields=like_count,comments_count,timestamp,media_type", "🌐", "api")
-            basic_resp = requests.get(basic_url, params={
-                "fields": "like_count,comments_count,timestamp,media_type",
-                "access_token": access_token,
-            }, timeout=15)
-
-            # Gap 1: Detect expired token (HTTP 401 or IG error code 190)
-            if self._is_token_expired_response(basic_resp):
-                _log("Token Expired", f"Token expired for media {ig_media_id} (HTTP {basic_resp.status_code})", "🔑", "api")
-                return {"token_expired": True}
-
-            if basic_resp.status_code == 200:
-                data = basic_resp.json()
-                metrics["likes"] = data.get("like_count", 0)
-                metrics["comments"] = data.get("comments_count", 0)
-                _log("API Response: Media", f"HTTP 200 — {metrics['likes']} likes, {metrics['comments']} comments", "✅", "api")
-            elif self._handle_rate_limit(basic_resp):
-                return None
-            elif basic_resp.status_code in (400, 404):
-                # Post was likely deleted from Instagram by user
-                _log("Deleted: Media", f"HTTP {basic_resp.status_code} for media {ig_media_id} — post likely deleted", "🗑️", "api")
-                return {"deleted": True}
-            else:
-                _log("API Error: Media", f"HTTP {basic_resp.status_code} for media {ig_media_id}", "❌", "api")
-                return None
-
-            # 2. Insights — fetch reach, saved, shares (works for all media types)
-            #    then try views/plays separately (plays unsupported for carousels/images)
-            insights_url = f"{self.BASE_URL}/{ig_media_id}/insights"
-            insights_resp = requests.get(insights_url, params={
-                "metric": "reach,saved,shares",
-                "access_token": access_token,
-            }, timeout=15)
-
-            if insights_resp.status_code == 200:
-                for item in insights_resp.json().get("data", []):
-                    name = item.get("name", "")
-                    values = item.get("values", [{}])
-                    value = values[0].get("value", 0) if values else 0
-                    if name == "reach":
-                        metrics["reach"] = value
-                    elif name == "saved":
-                        metrics["saves"] = value
-                    elif name == "shares":
-                        metrics["shares"] = value
-            else:
-                # Fallback: try each metric individually
-                for metric_name, key in [("reach", "reach"), ("saved", "saves"), ("shares", "shares")]:
-                    try:
-                        r = requests.get(insights_url, params={"metric": metric_name, "access_token": access_token}, timeout=15)
-                        if r.status_code == 200:
-                            for item in r.json().get("data", []):
-                                if item.get("name") == metric_name:
-                                    values = item.get("values", [{}])
-                                    metrics[key] = values[0].get("value", 0) if values else 0
-                    except Exception:
-                        pass
-
-            # 3. Try views count (plays for reels, views for newer API)
-            for view_metric in ["plays", "views"]:
-                try:
-                    vr = requests.get(insights_url, params={"metric": view_metric, "access_token": access_token}, timeout=15)
-                    if vr.status_code == 200:
-                        for item in vr.json().get("data", []):
-                            values = item.get("values", [{}])
-                            metrics["views"] = values[0].get("value", 0) if values else 0
-                            if metrics["views"] > 0:
-                                break
-                        if metrics["views"] > 0:
-                            break
-                except Exception:
-                    pass
-
-            _log("Insights", f"{metrics['views']} views, {metrics['reach']} reach, {metrics['saves']} saves, {metrics['shares']} shares", "📊", "api")
-
-            return metrics
+            _log("API: IG Media", f"GET ?ids=<{len(ids)} media>&fields=like_count,comments_count,timestamp,media_type", "🌐", "api")
+            metrics: Dict[str, Dict] = {}
+            for media_id, res in client.get_ids(ids, "like_count,comments_count,timestamp,media_type").items():
+                # Gap 1: Detect expired token (HTTP 401 or IG error code 190)
+                if res.token_expired:
+                    _log("Token Expired", f"Token expired for media {media_id} (HTTP {res.status})", "🔑", "api")
+                    results[media_id] = {"token_expired": True}
+                elif res.ok:
+                    metrics[media_id] = {
+                        "views": 0, "likes": res.body.get("like_count", 0), "comments": res.body.get("comments_count", 0),
+                        "saves": 0, "shares": 0, "reach": 0,
+                    }
+                elif self._handle_rate_limit(res):
+                    continue
+                elif res.status in (400, 404):
+                    # Post was likely deleted from Instagram by user
+                    _log("Deleted: Media", f"HTTP {res.status} for media {media_id} — post likely deleted", "🗑️", "api")
+                    results[media_id] = {"deleted": True}
+                else:
+                    _log("API Error: Media", f"HTTP {res.status} for media {media_id}", "❌", "api")
+
+            # 2. Insights — reach, saved, shares (works for all media types)
+            #    plus plays, which is unsupported for carousels/images
+            live = list(metrics)
+            insights = client.get_batch(
+                [f"{m}/insights?metric=reach,saved,shares" for m in live]
+                + [f"{m}/insights?metric=plays" for m in live]
+            )
+            combined, plays = insights[:len(live)], insights[len(live):]
+            retry_metrics = []
+            throttled = set()
+            for media_id, res in zip(live, combined):
+                if res.ok:
+                    self._apply_insights(metrics[media_id], res.body)
+                elif res.rate_limited:
+                    throttled.add(media_id)
+                else:
+                    # Fallback: try each metric individually
+                    retry_metrics.extend((media_id, name) for name in ("reach", "saved", "shares"))
+            for media_id, res in zip(live, plays):
+                if res.ok:
+                    self._apply_insights(metrics[media_id], res.body)
+                elif res.rate_limited:
+                    throttled.add(media_id)
+
+            # 3. Per-metric fallbacks, and views for media without plays (newer API)
+            need_views = [m for m in live if metrics[m]["views"] <= 0 and m not in throttled]
+            retry_metrics = [(m, name) for m, name in retry_metrics if m not in throttled]
+            extra = client.get_batch(
+                [f"{m}/insights?metric={name}" for m, name in retry_metrics]
+                + [f"{m}/insights?metric=views" for m in need_views]
+            )
+            for (media_id, _), res in zip(retry_metrics + [(m, "views") for m in need_views], extra):
+                if res.ok:
+                    self._apply_insights(metrics[media_id], res.body)
+                elif res.rate_limited:
+                    throttled.add(media_id)
+
+            if client.stopped is not None:
+                self._handle_rate_limit(client.stopped)
+            for media_id, m in metrics.items():
+                # Partial insights after a rate limit would overwrite good numbers with zeros
+                if media_id not in throttled:
+                    results[media_id] = m
+
+            done = sum(1 for r in results.values() if r and "views" in r)
+            _log("Insights", f"{done}/{len(ids)} media via {client.http_requests} Graph requests", "📊", "api")
+            return results
 
         except Exception as e:
-            _log("Error: Metrics API", f"fetch_media_metrics failed for {ig_media_id}: {e}", "❌", "api")
-            return None
+            _log("Error: Metrics API", f"fetch_media_metrics_many failed for {len(ids)} media: {e}", "❌", "api")
+            return results
+
+    @staticmethod
+    def _apply_insights(metrics: Dict, body: Dict):
+        """Copy values from an /insights response into a metrics dict."""
+        keys = {"reach": "reach", "saved": "saves", "shares": "shares", "plays": "views", "views": "views"}
+        for item in body.get("data", []):
+            key = keys.get(item.get("name", ""))
+            if not key:
+                continue
+            values = item.get("values", [{}])
+            value = values[0].get("value", 0) if values else 0
+            if key == "views" and value <= 0:
+                continue  # keep a plays count when views comes back 0
+            metrics[key] = value
 
     # ──────────────────────────────────────────────────────────
     # COMPUTE SCORES
@@ -328,6 +344,7 @@ class MetricsCollector:
         """
         from app.db_connection import SessionLocal
         from app.models import ScheduledReel
+        from app.models.scheduling import brand_key_in
 
         token = self._check_token_validity(brand)
         if not token:
@@ -348,46 +365,62 @@ class MetricsCollector:
                     return {"error": f"Brand {brand} not found in database", "updated": 0}
 
             cutoff = datetime.utcnow() - timedelta(days=days_back)
-            all_published = (
+            published = (
                 db.query(ScheduledReel)
                 .filter(
                     ScheduledReel.user_id == owner_user_id,
+                    brand_key_in([brand]),
                     ScheduledReel.status.in_(["published", "partial"]),
                     ScheduledReel.published_at >= cutoff,
                 )
                 .all()
             )
-            # Filter to only this brand's posts (brand stored in extra_data JSON)
-            published = [s for s in all_published if (s.extra_data or {}).get("brand") == brand]
-            _log("Data: Published posts", f"{len(published)} published posts found for {brand} (from {len(all_published)} total)", "📊", "data")
+            _log("Data: Published posts", f"{len(published)} published posts found for {brand}", "📊", "data")
 
             updated = 0
             errors = 0
             token_expired = False
 
+            candidates = []
             for sched in published:
                 extra = sched.extra_data or {}
                 post_ids = extra.get("post_ids", {})
                 ig_media_id = post_ids.get("instagram")
+                if ig_media_id:
+                    candidates.append((sched, extra, post_ids, ig_media_id))
+
+            # Existing rows for every candidate in one IN query
+            existing_rows = {}
+            if candidates:
+                existing_rows = {
+                    row.ig_media_id: row
+                    for row in db.query(
+                        PostPerformance.ig_media_id,
+                        PostPerformance.published_at,
+                        PostPerformance.metrics_fetched_at,
+                        PostPerformance.metrics_24h_at,
+                        PostPerformance.metrics_48h_at,
+                        PostPerformance.metrics_7d_at,
+                    ).filter(PostPerformance.ig_media_id.in_([c[3] for c in candidates]))
+                }
 
-                if not ig_media_id:
-                    continue
-
-                # Check if we already have recent metrics
-                existing = (
-                    db.query(PostPerformance)
-                    .filter(PostPerformance.ig_media_id == ig_media_id)
-                    .first()
-                )
+            due = []
+            for sched, extra, post_ids, ig_media_id in candidates:
+                existing = existing_rows.get(ig_media_id)
 
                 # Skip if metrics were fetched less than 6 hours ago
                 if existing and existing.metrics_fetched_at:
-                    age = datetime.utcnow() - existing.metrics_fetched_at
+                    age = datetime.utcnow() - _naive_utc(existing.metrics_fetched_at)
                     if age < timedelta(hours=6):
                         continue
+                due.append((sched, extra, post_ids, ig_media_id, existing))
+
+            # Fetch fresh metrics for every due post in batched Graph requests
+            fetched = self.fetch_media_metrics_many([d[3] for d in due], token) if due else {}
 
-                # Fetch fresh metrics
-                raw = self.fetch_media_metrics(ig_media_id, token)
+            rows = []
+            for sched, extra, post_ids, ig_media_id, existing in due:
+                raw = fetched.get(ig_media_id)
 
                 # Gap 1: Detect expired token from API response
                 if isinstance(raw, dict) and raw.get("token_expired"):
@@ -404,72 +437,13 @@ class MetricsCollector:
                     self._flag_deleted_post(db, sched.schedule_id, brand)
                     continue
 
-                engagement_rate = self.compute_engagement_rate(raw)
-                performance_score = self.compute_performance_score(raw)
-                now = datetime.utcnow()
-
-                if existing:
-                    # Update existing record
-                    existing.views = raw["views"]
-                    existing.likes = raw["likes"]
-                    existing.comments = raw["comments"]
-                    existing.saves = raw["saves"]
-                    existing.shares = raw["shares"]
-                    existing.reach = raw["reach"]
-                    existing.engagement_rate = engagement_rate
-                    existing.performance_score = performance_score
-                    existing.metrics_fetched_at = now
-
-                    # Track metric windows
-                    published_at = existing.published_at or sched.published_at
-                    if published_at:
-                        age = now - published_at
-                        if age >= timedelta(hours=24) and not existing.metrics_24h_at:
-                            existing.metrics_24h_at = now
-                        if age >= timedelta(hours=48) and not existing.metrics_48h_at:
-                            existing.metrics_48h_at = now
-                        if age >= timedelta(days=7) and not existing.metrics_7d_at:
-                            existing.metrics_7d_at = now
-                else:
-                    # Get title metadata from extra_data (ScheduledReel has no title column)
-                    title = ""
-                    caption = sched.caption or ""
-                    topic_bucket = None
-                    if extra.get("brand_data") and isinstance(extra["brand_data"], dict):
-                        title = extra["brand_data"].get("title", "")
-                        caption = extra["brand_data"].get("caption", caption)
-
-                    if title:
-                        topic_bucket = ContentHistory.classify_topic_bucket(title)
-
-                    new_perf = PostPerformance(
-                        ig_media_id=ig_media_id,
-                        fb_post_id=post_ids.get("facebook"),
-                        brand=brand,
-                        content_type=getattr(sched, "content_type", "reel") or "reel",
-                        schedule_id=sched.schedule_id,
-                        title=title,
-                        caption=caption,
-                        topic_bucket=topic_bucket,
-                        keyword_hash=ContentHistory.compute_keyword_hash(title) if title else None,
-                        views=raw["views"],
-                        likes=raw["likes"],
-                        comments=raw["comments"],
-                        saves=raw["saves"],
-                        shares=raw["shares"],
-                        reach=raw["reach"],
-                        engagement_rate=engagement_rate,
-                        performance_score=performance_score,
-                        published_at=sched.published_at,
-                        metrics_fetched_at=now,
-                        user_id=getattr(sched, "user_id", None),
-                    )
-                    db.add(new_perf)
-
+                rows.append(self._performance_row(brand, sched, extra, post_ids, ig_media_id, raw, existing))
                 updated += 1
-                # Respect rate limits
-                time.sleep(0.5)
 
+            # All metrics in one statement; ranks recomputed in the same transaction
+            self._upsert_performance_rows(db, rows)
+            if not token_expired:
+                self._update_percentile_ranks(db, brand)
             db.commit()
 
             # Gap 1: Emit debounced token_expired event if detected
@@ -477,8 +451,6 @@ class MetricsCollector:
                 self._emit_token_expired_event(db, brand)
                 return {"brand": brand, "updated": updated, "errors": errors, "token_expired": True}
 
-            # Update percentile ranks
-            self._update_percentile_ranks(db, brand)
             _log("Metrics: Done", f"{brand}: {updated} posts updated, {errors} errors", "📊", "data")
 
             return {"brand": brand, "updated": updated, "errors": errors}
@@ -508,29 +480,101 @@ class MetricsCollector:
         _log("Metrics complete", f"All brands done — {total_updated} total post metrics updated", "📊", "data")
         return results
 
-    def _update_percentile_ranks(self, db, brand: str):
-        """Update percentile ranks for all posts of a brand."""
-        try:
-            from sqlalchemy import func
-
-            posts = (
-                db.query(PostPerformance)
-                .filter(
-                    PostPerformance.brand == brand,
-                    PostPerformance.performance_score.isnot(None),
-                )
-                .order_by(PostPerformance.performance_score.asc())
-                .all()
-            )
+    # Columns an upsert refreshes on an existing row; title/caption/etc. are
+    # copied once at insert time
+    _METRIC_COLUMNS = (
+        "views", "likes", "comments", "saves", "shares", "reach",
+        "engagement_rate", "performance_score", "metrics_fetched_at",
+    )
+    _WINDOW_COLUMNS = tuple((f"metrics_{name}_at", window) for name, window in METRIC_WINDOWS.items())
+
+    def _performance_row(self, brand: str, sched, extra: Dict, post_ids: Dict, ig_media_id: str, raw: Dict, existing) -> Dict:
+        """Values for one post_performance upsert."""
+        now = datetime.utcnow()
+
+        # Get title metadata from extra_data (ScheduledReel has no title column)
+        title = ""
+        caption = sched.caption or ""
+        topic_bucket = None
+        if extra.get("brand_data") and isinstance(extra["brand_data"], dict):
+            title = extra["brand_data"].get("title", "")
+            caption = extra["brand_data"].get("caption", caption)
+
+        if title:
+            topic_bucket = ContentHistory.classify_topic_bucket(title)
+
+        row = {
+            "ig_media_id": ig_media_id,
+            "fb_post_id": post_ids.get("facebook"),
+            "brand": brand,
+            "content_type": getattr(sched, "content_type", "reel") or "reel",
+            "schedule_id": sched.schedule_id,
+            "title": title,
+            "caption": caption,
+            "topic_bucket": topic_bucket,
+            "keyword_hash": ContentHistory.compute_keyword_hash(title) if title else None,
+            "views": raw["views"],
+            "likes": raw["likes"],
+            "comments": raw["comments"],
+            "saves": raw["saves"],
+            "shares": raw["shares"],
+            "reach": raw["reach"],
+            "engagement_rate": self.compute_engagement_rate(raw),
+            "performance_score": self.compute_performance_score(raw),
+            "published_at": sched.published_at,
+            "metrics_fetched_at": now,
+            "user_id": getattr(sched, "user_id", None),
+            "created_at": now,
+        }
 
-            total = len(posts)
-            if total == 0:
-                return
+        # Track metric windows (on refreshes of existing rows; the upsert
+        # keeps a window that is already set)
+        published_at = (existing.published_at if existing else None) or sched.published_at
+        for column, window in self._WINDOW_COLUMNS:
+            reached = existing is not None and published_at and now - _naive_utc(published_at) >= window
+            row[column] = now if reached else None
+        return row
+
+    def _upsert_performance_rows(self, db, rows: List[Dict]):
+        """Write every fetched post with one INSERT ... ON CONFLICT (ig_media_id) DO UPDATE."""
+        if not rows:
+            return
+        from sqlalchemy import func
+        from sqlalchemy.dialects.postgresql import insert
+
+        # ON CONFLICT can't touch one row twice per statement — a media id
+        # scheduled twice keeps its last row
+        rows = list({row["ig_media_id"]: row for row in rows}.values())
+        table = PostPerformance.__table__
+        # Chunked only to stay under Postgres' 65535 bind parameters
+        for i in range(0, len(rows), UPSERT_CHUNK_ROWS):
+            stmt = insert(table).values(rows[i:i + UPSERT_CHUNK_ROWS])
+            update = {c: stmt.excluded[c] for c in self._METRIC_COLUMNS}
+            for column, _ in self._WINDOW_COLUMNS:
+                update[column] = func.coalesce(table.c[column], stmt.excluded[column])
+            db.execute(stmt.on_conflict_do_update(index_elements=["ig_media_id"], set_=update))
+
+    _PERCENTILE_SQL = text("""
+        UPDATE post_performance AS p
+        SET percentile_rank = ranked.pct
+        FROM (
+            SELECT id,
+                   round((percent_rank() OVER (PARTITION BY brand ORDER BY performance_score) * 100)::numeric, 1) AS pct
+            FROM post_performance
+            WHERE brand = :brand AND performance_score IS NOT NULL
+        ) AS ranked
+        WHERE p.id = ranked.id AND p.percentile_rank IS DISTINCT FROM ranked.pct
+    """)
 
-            for i, post in enumerate(posts):
-                post.percentile_rank = round((i / total) * 100, 1)
+    def _update_percentile_ranks(self, db, brand: str):
+        """Update percentile ranks for all posts of a brand (0 = lowest score, 100 = highest).
 
-            db.commit()
+        One UPDATE with percent_rank() in the caller's transaction; a
+        failure rolls back only the ranks (savepoint), not the metrics.
+        """
+        try:
+            with db.begin_nested():
+                db.execute(self._PERCENTILE_SQL, {"brand": brand})
         except Exception as e:
             print(f"⚠️ Percentile rank update error: {e}", flush=True)
 
@@ -0,0 +1,410 @@
+"""
+Parallel multi-tenant analytics refresh.
+
+refresh_all_users walked users one after another, and inside each user
+its brands, then Instagram, Facebook and YouTube — every Graph and Data
+API call in series. The 6-hourly job grew linearly with tenants and
+brands; audience demographics had the same shape.
+
+AnalyticsRefreshEngine runs a refresh as independent (user, brand,
+platform) units on one process-wide bounded ThreadPoolExecutor:
+  - Units are dispatched round-robin across access tokens, so a tenant
+    with 40 brands on one token interleaves with everyone else instead of
+    filling the queue ahead of them.
+  - Every access token has a rate budget (a token bucket in estimated API
+    calls, shared by all jobs of the process) and a cap on units in flight,
+    so one tenant can't starve another or burn its own Meta quota.
+  - A unit that comes back rate limited (HTTP 429 / Graph codes 4, 17,
+    32, 613) pauses its token for Retry-After (default 60s) and is
+    retried once.
+  - Progress is resumable: callers plan units stalest-first and drop units
+    refreshed within ANALYTICS_REFRESH_FRESH_MINUTES, so a run cut short by
+    a restart, a leadership change or its time budget picks up where it
+    stopped on the next run instead of starting over.
+  - Each run returns (and keeps, for GET /api/admin/analytics-refresh) a
+    summary with p50/p95/max unit time and the slowest units.
+
+Units fetch with plain requests calls (blocking), hence threads rather
+than an asyncio loop; each unit opens its own DB session for its write.
+
+Tuning (env vars):
+    ANALYTICS_REFRESH_WORKERS           — units processed concurrently (default 3,
+                                          capped at DB_POOL_CAPACITY // 2)
+    ANALYTICS_REFRESH_BUDGET_SECONDS    — how long a run dispatches units (default 4800)
+    ANALYTICS_REFRESH_FRESH_MINUTES     — skip units refreshed this recently (default 180)
+    ANALYTICS_TOKEN_CALLS_PER_MINUTE    — API-call budget per access token (default 60)
+    ANALYTICS_TOKEN_BURST               — calls a token may spend at once (default 20)
+    ANALYTICS_TOKEN_CONCURRENCY         — units in flight per access token (default 2)
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from app.services.analytics.graph_batch import RATE_LIMIT_CODES
+
+# Every unit holds its own session while it writes, and the refresh runs on
+# the leader next to the publish engine and Toby ticks — so stay at half the
+# SQLAlchemy pool at most (see DB_POOL_CAPACITY in app/db_connection.py).
+DEFAULT_REFRESH_WORKERS = 3
+RUN_BUDGET_SECONDS = float(os.getenv("ANALYTICS_REFRESH_BUDGET_SECONDS", "4800"))
+FRESH_MINUTES = float(os.getenv("ANALYTICS_REFRESH_FRESH_MINUTES", "180"))
+TOKEN_CALLS_PER_MINUTE = float(os.getenv("ANALYTICS_TOKEN_CALLS_PER_MINUTE", "60"))
+TOKEN_BURST = float(os.getenv("ANALYTICS_TOKEN_BURST", "20"))
+TOKEN_CONCURRENCY = max(1, int(os.getenv("ANALYTICS_TOKEN_CONCURRENCY", "2")))
+
+# Rough API calls per unit, charged against the token's budget up front
+UNIT_COST = {"instagram": 4, "facebook": 3, "youtube": 3, "demographics": 3}
+
+DEFAULT_RETRY_AFTER_SECONDS = 60
+MAX_ATTEMPTS = 2
+
+# How long the dispatcher sleeps at most between checks
+POLL_INTERVAL_SECONDS = 1.0
+
+# How many slow units a run summary keeps
+_SLOWEST_KEPT = 10
+
+
+def budget_key(token: str) -> str:
+    """Stable, non-reversible key for an access token."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class RefreshUnit:
+    """One (user, brand, platform) refresh. ``payload`` is for the work function only."""
+
+    user_id: Optional[str]
+    brand: str
+    platform: str
+    token: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+
+    @property
+    def label(self) -> str:
+        return f"{self.user_id or '-'}/{self.brand}/{self.platform}"
+
+    @property
+    def cost(self) -> float:
+        return UNIT_COST.get(self.platform, 1)
+
+
+class TokenBudget:
+    """Token bucket of API calls for one access token."""
+
+    def __init__(self, per_minute: float = TOKEN_CALLS_PER_MINUTE, burst: float = TOKEN_BURST):
+        self.rate = max(per_minute, 0.01) / 60.0
+        self.burst = max(burst, 1.0)
+        self.available = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.in_flight = 0
+
+    def _refill(self, now: float) -> None:
+        self.available = min(self.burst, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, cost: float) -> float:
+        """Spend ``cost`` calls and return 0, or return seconds until it could."""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        cost = min(cost, self.burst)
+        if self.available >= cost:
+            self.available -= cost
+            return 0.0
+        return (cost - self.available) / self.rate
+
+    def pause(self, seconds: float) -> None:
+        """Back off after the API said this token is rate limited."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.available = 0.0
+
+
+def is_rate_limited(response: requests.Response) -> bool:
+    """HTTP 429 or a Graph rate-limit error code."""
+    if response.status_code == 429:
+        return True
+    try:
+        error = response.json().get("error") or {}
+    except (ValueError, AttributeError):
+        error = {}
+    return isinstance(error, dict) and error.get("code") in RATE_LIMIT_CODES
+
+
+def _rate_limit_retry_after(exc: Exception) -> Optional[int]:
+    """Retry-After seconds if ``exc`` is a rate-limited API response, else None."""
+    response = getattr(exc, "response", None)
+    if not isinstance(exc, requests.RequestException) or response is None:
+        return None
+    if not is_rate_limited(response):
+        return None
+    retry_after = response.headers.get("Retry-After", "")
+    return int(retry_after) if retry_after.isdigit() else DEFAULT_RETRY_AFTER_SECONDS
+
+
+class AnalyticsRefreshEngine:
+    """Process-wide bounded pool for analytics refresh units."""
+
+    def __init__(self, workers: Optional[int] = None):
+        if workers is None:
+            from app.db_connection import DB_POOL_CAPACITY
+
+            try:
+                workers = int(os.getenv("ANALYTICS_REFRESH_WORKERS", DEFAULT_REFRESH_WORKERS))
+            except ValueError:
+                workers = DEFAULT_REFRESH_WORKERS
+            workers = min(workers, DB_POOL_CAPACITY // 2)
+        self.workers = max(1, workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analytics-refresh")
+        self._lock = threading.Lock()
+        self._budgets: Dict[str, TokenBudget] = {}
+        self._running: Dict[str, Dict[str, Any]] = {}   # job -> live progress
+        self.last_runs: Dict[str, Dict[str, Any]] = {}  # job -> last summary
+        self.draining = False
+
+    def _budget(self, key: str) -> TokenBudget:
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = self._budgets[key] = TokenBudget()
+        return budget
+
+    # ── run ──────────────────────────────────────────────────────
+    def run(
+        self,
+        job: str,
+        units: List[RefreshUnit],
+        work_fn: Callable[[RefreshUnit], Any],
+        *,
+        skipped_fresh: int = 0,
+        budget_seconds: float = RUN_BUDGET_SECONDS,
+    ) -> Dict[str, Any]:
+        """Run ``work_fn(unit)`` for every unit; returns the run summary.
+
+        ``units`` should be ordered stalest first — within a token they are
+        dispatched in that order. Units not started when the budget is
+        spent (or the engine is draining) are reported as ``deferred``;
+        the caller's staleness ordering resumes them next run.
+        ``summary["results"]`` maps unit label -> {"ms", "error", "value",
+        "unit"}, where ``value`` is what ``work_fn`` returned, and
+        ``summary["deferred_units"]`` lists the deferred units. Pop both
+        before returning the summary from an API.
+        """
+        started = time.monotonic()
+        deadline = started + budget_seconds
+        queues: "OrderedDict[str, deque]" = OrderedDict()
+        for unit in units:
+            queues.setdefault(budget_key(unit.token), deque()).append(unit)
+
+        progress = {"units": len(units), "done": 0, "started_at": datetime.now(timezone.utc).isoformat()}
+        with self._lock:
+            self._running[job] = progress
+
+        results: Dict[str, Dict[str, Any]] = {}
+        in_flight: Dict[Any, tuple] = {}
+        throttled_ms = 0
+        rate_limited = 0
+        try:
+            while queues or in_flight:
+                next_check = POLL_INTERVAL_SECONDS
+                if time.monotonic() < deadline and not self.draining:
+                    # One unit per token per pass keeps tenants interleaved
+                    submitted = True
+                    while submitted and len(in_flight) < self.workers:
+                        submitted = False
+                        for key in list(queues):
+                            if len(in_flight) >= self.workers:
+                                break
+                            with self._lock:
+                                budget = self._budget(key)
+                                if budget.in_flight >= TOKEN_CONCURRENCY:
+                                    continue
+                                wait_s = budget.try_acquire(queues[key][0].cost)
+                                if wait_s == 0:
+                                    budget.in_flight += 1
+                            if wait_s > 0:
+                                next_check = min(next_check, wait_s)
+                                continue
+                            unit = queues[key][0]
+                            try:
+                                future = self._pool.submit(self._run_unit, work_fn, unit)
+                            except RuntimeError:
+                                # Pool shut down between the draining check and here
+                                with self._lock:
+                                    budget.in_flight -= 1
+                                break
+                            queues[key].popleft()
+                            if not queues[key]:
+                                del queues[key]
+                            unit.attempts += 1
+                            in_flight[future] = (key, unit, time.monotonic())
+                            submitted = True
+                elif not in_flight:
+                    break
+
+                if not in_flight:
+                    throttled_ms += int(next_check * 1000)
+                    time.sleep(next_check)
+                    continue
+
+                done, _ = wait(list(in_flight), timeout=next_check, return_when=FIRST_COMPLETED)
+                # Futures dropped by shutdown(cancel_futures=True) never reach a
+                # "done" state wait() recognizes, so collect them explicitly
+                done |= {future for future in in_flight if future.cancelled()}
+                for future in done:
+                    key, unit, _ = in_flight.pop(future)
+                    try:
+                        outcome = future.result()
+                    except CancelledError:
+                        outcome = None
+                    with self._lock:
+                        budget = self._budget(key)
+                        budget.in_flight -= 1
+                        if outcome is not None and outcome.get("retry_after") is not None:
+                            budget.pause(outcome["retry_after"])
+                    if outcome is None:
+                        # Cancelled by shutdown before it started — deferred, not an attempt
+                        unit.attempts -= 1
+                        queues.setdefault(key, deque()).appendleft(unit)
+                        continue
+                    if outcome.get("retry_after") is not None:
+                        rate_limited += 1
+                        if unit.attempts < MAX_ATTEMPTS:
+                            print(
+                                f"⏳ [ANALYTICS] {unit.label} rate limited — token paused "
+                                f"{outcome['retry_after']}s, retrying",
+                                flush=True,
+                            )
+                            queues.setdefault(key, deque()).appendleft(unit)
+                            continue
+                    results[unit.label] = {
+                        "ms": outcome["ms"], "error": outcome["error"], "value": outcome["value"], "unit": unit,
+                    }
+                    progress["done"] += 1
+        finally:
+            # Summary below replaces it; an exception must not leave the job "running"
+            with self._lock:
+                self._running.pop(job, None)
+
+        deferred = [unit for queue in queues.values() for unit in queue]
+        if deferred:
+            reason = "shutting down" if self.draining else f"budget {budget_seconds:.0f}s spent"
+            print(
+                f"⏳ [ANALYTICS] {job}: {reason} — {len(deferred)} unit(s) deferred to the next run",
+                flush=True,
+            )
+
+        summary = _summarize(results)
+        summary.update(
+            job=job,
+            units=len(units),
+            skipped_fresh=skipped_fresh,
+            deferred=len(deferred),
+            rate_limited=rate_limited,
+            tokens=len({budget_key(u.token) for u in units}),
+            workers=self.workers,
+            throttled_ms=throttled_ms,
+            wall_ms=int((time.monotonic() - started) * 1000),
+            finished_at=datetime.now(timezone.utc).isoformat(),
+        )
+        with self._lock:
+            self.last_runs[job] = dict(summary)
+        summary["results"] = results
+        summary["deferred_units"] = deferred
+
+        slowest = summary["slowest"][0] if summary["slowest"] else None
+        tail = f", slowest {slowest['unit']} {slowest['ms']} ms" if slowest else ""
+        print(
+            f"📊 [ANALYTICS] {job}: {summary['processed']} unit(s) in {summary['wall_ms']} ms "
+            f"({summary['errors']} error(s), {skipped_fresh} fresh, {len(deferred)} deferred{tail})",
+            flush=True,
+        )
+        return summary
+
+    @staticmethod
+    def _run_unit(work_fn: Callable[[RefreshUnit], Any], unit: RefreshUnit) -> Dict[str, Any]:
+        """Run one unit and time it. Never raises."""
+        start = time.monotonic()
+        value = error = retry_after = None
+        try:
+            value = work_fn(unit)
+        except Exception as e:
+            retry_after = _rate_limit_retry_after(e)
+            error = f"{type(e).__name__}: {e}"[:500]
+        return {
+            "ms": int((time.monotonic() - start) * 1000), "value": value, "error": error, "retry_after": retry_after,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "tokens_tracked": len(self._budgets),
+                "running": {job: dict(p) for job, p in self._running.items()},
+                "last_runs": dict(self.last_runs),
+            }
+
+    def shutdown(self) -> None:
+        """Stop dispatching and wait for units in flight; the rest resume next run."""
+        self.draining = True
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _summarize(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    durations = sorted(r["ms"] for r in results.values())
+
+    def pct(q: float) -> Optional[int]:
+        if not durations:
+            return None
+        return durations[min(len(durations) - 1, int(q * len(durations)))]
+
+    slowest = sorted(results.items(), key=lambda kv: kv[1]["ms"], reverse=True)[:_SLOWEST_KEPT]
+    return {
+        "processed": len(results),
+        "errors": sum(1 for r in results.values() if r["error"]),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "max_ms": durations[-1] if durations else None,
+        "slowest": [{"unit": label, "ms": r["ms"], "error": r["error"]} for label, r in slowest],
+    }
+
+
+_engine: Optional[AnalyticsRefreshEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_refresh_engine() -> AnalyticsRefreshEngine:
+    """Get or create the process-wide AnalyticsRefreshEngine."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = AnalyticsRefreshEngine()
+    return _engine
+
+
+def shutdown_refresh_engine() -> None:
+    """Drain the pool (demotion or shutdown); the next run builds a fresh one."""
+    global _engine
+    with _engine_lock:
+        engine, _engine = _engine, None
+    if engine is not None:
+        engine.shutdown()
+
+
+def refresh_status() -> Dict[str, Any]:
+    """Live progress and last run summaries of this process's engine."""
+    engine = _engine
+    if engine is None:
+        return {"workers": None, "tokens_tracked": 0, "running": {}, "last_runs": {}}
+    return engine.status()
@@ -393,9 +393,15 @@ class BrandManager:
         slots_cancelled = 0
         try:
             from sqlalchemy import text
+            from app.models.scheduling import normalize_brand_key
             result = self.db.execute(
-                text("UPDATE scheduled_reels SET status='cancelled' WHERE user_id=:uid AND extra_data->>'brand'=:bid AND scheduled_time > NOW() AND status NOT IN ('published', 'cancelled')"),
-                {"uid": effective_user_id, "bid": brand_id},
+                text(
+                    "UPDATE scheduled_reels SET status='cancelled' WHERE user_id=:uid"
+                    # extra_data fallback for rows the brand-column backfill hasn't reached
+                    " AND (brand=:bid OR (brand IS NULL AND left(lower(trim(extra_data->>'brand')), 50)=:bid))"
+                    " AND scheduled_time > NOW() AND status NOT IN ('published', 'cancelled')"
+                ),
+                {"uid": effective_user_id, "bid": normalize_brand_key(brand_id)},
             )
             slots_cancelled = result.rowcount
         except Exception as e:
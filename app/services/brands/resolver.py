@@ -77,6 +77,9 @@ class BrandResolver:
         """Clear cache for all users (call after brand create/update/delete)."""
         with self._lock:
             self._last_refresh_by_user.clear()
+        # Logo URLs may have changed content — revalidate them on next render
+        from app.services.media.asset_cache import invalidate_brand_assets
+        invalidate_brand_assets()
 
     # ── Core lookups ──────────────────────────────────────────
 
@@ -0,0 +1,171 @@
+"""
+Shared, bounded executor for per-brand generation work.
+
+JobProcessor used to start one daemon thread per brand and join it with
+BRAND_GENERATION_TIMEOUT before starting the next, so brands ran one at a
+time and a timed-out thread kept running (holding its DB session and any
+ffmpeg child) forever.
+
+BrandExecutor runs brands on one process-wide ThreadPoolExecutor:
+  - Brands of a job run in parallel, bounded by JOB_BRAND_WORKERS across
+    all jobs, so the process never grows more than that many brand threads.
+  - Each brand gets a CancelToken (app.utils.cancellation). When the brand
+    exceeds its timeout, or the job is set to "cancelled", the token is
+    cancelled: its ffmpeg children are killed and the worker stops at its
+    next checkpoint(), returning the pool slot.
+  - The per-brand timeout counts from when the brand starts running, not
+    from when it was queued.
+
+Tuning (env vars):
+    JOB_BRAND_WORKERS                  — pool width shared by all jobs (default 4)
+    BRAND_GENERATION_TIMEOUT_SECONDS   — per-brand timeout (default 600)
+"""
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from app.utils.cancellation import Cancelled, CancelToken, bind_token
+
+# Per-brand generation timeout (in seconds). Default: 10 minutes.
+BRAND_GENERATION_TIMEOUT = int(os.getenv("BRAND_GENERATION_TIMEOUT_SECONDS", "600"))
+
+# Every DB-touching brand worker holds its own session, so keep this within
+# the engine's pool (pool_size + max_overflow) minus API headroom.
+DEFAULT_BRAND_WORKERS = 4
+
+# How often the waiting thread checks deadlines and the job's cancelled flag.
+POLL_INTERVAL_SECONDS = 2.0
+
+
+class JobInterrupted(BaseException):
+    """The process is shutting down mid-job, or this worker lost the job's lease.
+
+    A BaseException so the job's own ``except Exception`` handlers don't
+    finalize it as failed — it stays "generating" and is resumed by the
+    next worker that claims it.
+    """
+
+
+class BrandExecutor:
+    """Process-wide bounded pool for per-brand processors."""
+
+    def __init__(self, workers: Optional[int] = None):
+        try:
+            env_workers = int(os.getenv("JOB_BRAND_WORKERS", DEFAULT_BRAND_WORKERS))
+        except ValueError:
+            env_workers = DEFAULT_BRAND_WORKERS
+        self.workers = max(1, workers or env_workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="brand-gen")
+        self._lock = threading.Lock()
+        self._active: set = set()
+        self.draining = False
+
+    def run(
+        self,
+        brands: List[str],
+        work_fn: Callable[[str, int], Dict[str, Any]],
+        *,
+        is_cancelled: Callable[[], bool],
+        on_timeout: Callable[[str, str], None],
+        timeout_msg: Callable[[str], str],
+        timeout: int = BRAND_GENERATION_TIMEOUT,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run ``work_fn(brand, index)`` for every brand and collect results.
+
+        Returns as soon as every brand has finished, timed out, or the job
+        was cancelled (then only finished brands are in the result).
+        Exceptions from ``work_fn`` become ``{"success": False, "error": ...}``.
+        """
+        from app.services.logging.service import get_user_id
+        caller_user_id = get_user_id()
+
+        results: Dict[str, Dict[str, Any]] = {}
+        tokens: Dict[str, CancelToken] = {}
+        pending = {}
+
+        for index, brand in enumerate(brands):
+            token = CancelToken(label=brand)
+            tokens[brand] = token
+            with self._lock:
+                self._active.add(token)
+            # Copy contextvars (cost tracker user) per task — a Context can't
+            # be entered by two threads at once.
+            ctx = contextvars.copy_context()
+            future = self._pool.submit(ctx.run, self._run_one, token, work_fn, brand, index, caller_user_id)
+            pending[future] = brand
+
+        while pending:
+            done, _ = wait(list(pending), timeout=POLL_INTERVAL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+
+            now = time.monotonic()
+            for future, brand in list(pending.items()):
+                token = tokens[brand]
+                if token.started_at is not None and now - token.started_at > timeout:
+                    msg = timeout_msg(brand)
+                    print(f"⏱️  {msg}", flush=True)
+                    token.cancel(msg)
+                    future.cancel()
+                    del pending[future]
+                    on_timeout(brand, msg)
+                    results[brand] = {"success": False, "error": msg}
+
+            if pending and self.draining:
+                break
+
+            if pending and is_cancelled():
+                print(f"🛑 Job cancelled — stopping {len(pending)} brand(s)", flush=True)
+                for future, brand in pending.items():
+                    future.cancel()
+                    tokens[brand].cancel("Job was cancelled")
+                break
+
+        with self._lock:
+            self._active.difference_update(tokens.values())
+        return results
+
+    @staticmethod
+    def _run_one(token: CancelToken, work_fn, brand: str, index: int, user_id: Optional[str]) -> Dict[str, Any]:
+        if token.cancelled:
+            return {"success": False, "error": token.reason or "Cancelled"}
+        # Keep print() captures attributed to the job's user in the log viewer
+        from app.services.logging.service import set_user_id, clear_user_id
+        if user_id:
+            set_user_id(user_id)
+        bind_token(token)
+        try:
+            return work_fn(brand, index)
+        except Cancelled as e:
+            return {"success": False, "error": str(e)}
+        except Exception as ex:
+            return {"success": False, "error": f"{type(ex).__name__}: {ex}"}
+        finally:
+            bind_token(None)
+            clear_user_id()
+
+    def shutdown(self) -> None:
+        """Cancel queued and running brands; resume_job picks them up after restart."""
+        self.draining = True
+        with self._lock:
+            active = list(self._active)
+        for token in active:
+            token.cancel("Shutting down")
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: Optional[BrandExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_brand_executor() -> BrandExecutor:
+    """Get or create the process-wide BrandExecutor."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BrandExecutor()
+    return _executor
@@ -18,10 +18,12 @@ Key improvements:
 import os
 import json
 import random
-import requests
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+from app.utils.http_client import get_http_session
+from app.utils.llm_cache import cached_completion, completion_from_json
+
 # Layer 1: Pattern Brain
 from app.core.viral_patterns import (
     get_pattern_selector,
@@ -305,7 +307,7 @@ class ContentGeneratorV2:
                 }
             ]
 
-            response = requests.post(
+            response = get_http_session().post(
                 f"{self.base_url}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
@@ -661,7 +663,7 @@ Generate now:"""
             prompt += f"\n\n### ADDITIONAL INSTRUCTIONS:\n{posts_prompt_text}"
 
         try:
-            response = requests.post(
+            response = get_http_session().post(
                 f"{self.base_url}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
@@ -763,7 +765,7 @@ Generate now:"""
     def _call_deepseek_post(self, prompt: str) -> Optional[List[Dict]]:
         """Call DeepSeek API for carousel/post generation. Returns parsed list of posts or None."""
         try:
-            response = requests.post(
+            response = get_http_session().post(
                 f"{self.base_url}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
@@ -997,61 +999,73 @@ Given the following title, generate a DETAILED cinematic image prompt suitable f
 
 Generate now:"""
 
-        try:
-            response = requests.post(
+        request = {
+            "model": "deepseek-chat",
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.8,
+            "max_tokens": 300
+        }
+
+        def fetch() -> Dict:
+            response = get_http_session().post(
                 f"{self.base_url}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
                     "Content-Type": "application/json"
                 },
-                json={
-                    "model": "deepseek-chat",
-                    "messages": [
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.8,
-                    "max_tokens": 300
-                },
+                json=request,
                 timeout=30
             )
+            if response.status_code != 200:
+                raise RuntimeError(f"DeepSeek API error: {response.status_code}")
+            completion = completion_from_json(response.json())
+
+            # Track cost
+            try:
+                from app.services.monitoring.cost_tracker import record_deepseek_call
+                record_deepseek_call(
+                    input_tokens=completion["prompt_tokens"],
+                    output_tokens=completion["completion_tokens"],
+                )
+            except Exception:
+                pass
+            return completion
 
-            if response.status_code == 200:
-                data = response.json()
-                content_text = data["choices"][0]["message"]["content"].strip()
-
-                # Track cost
-                usage = data.get("usage", {})
-                try:
-                    from app.services.monitoring.cost_tracker import record_deepseek_call
-                    record_deepseek_call(
-                        input_tokens=usage.get("prompt_tokens", 0),
-                        output_tokens=usage.get("completion_tokens", 0),
-                    )
-                except Exception:
-                    pass
-
-                # Clean up markdown if present
-                if content_text.startswith("```"):
-                    content_text = content_text.split("```")[1]
-                    if content_text.startswith("json"):
-                        content_text = content_text[4:]
-                    content_text = content_text.strip()
-
-                try:
-                    result = json.loads(content_text)
-                    result["is_fallback"] = False
-                    return result
-                except json.JSONDecodeError as e:
-                    print(f"⚠️ JSON parse error in image prompt generation: {e}")
-                    return self._fallback_image_prompt(title)
-            else:
-                print(f"⚠️ DeepSeek API error: {response.status_code}")
-                return self._fallback_image_prompt(title)
-
+        try:
+            # The prompt depends only on the title and niche — repeat titles reuse the answer
+            completion = cached_completion(
+                "content.image_prompt", request, fetch,
+                cacheable=lambda text: self._parse_image_prompt(text) is not None,
+            )
         except Exception as e:
             print(f"⚠️ Image prompt generation error: {e}")
             return self._fallback_image_prompt(title)
 
+        result = self._parse_image_prompt(completion["content"])
+        if result is None:
+            print("⚠️ JSON parse error in image prompt generation")
+            return self._fallback_image_prompt(title)
+        result["is_fallback"] = False
+        return result
+
+    @staticmethod
+    def _parse_image_prompt(content_text: str) -> Optional[Dict]:
+        """JSON object from an image-prompt reply (markdown fences stripped), or None."""
+        content_text = content_text.strip()
+        if content_text.startswith("```"):
+            content_text = content_text.split("```")[1]
+            if content_text.startswith("json"):
+                content_text = content_text[4:]
+            content_text = content_text.strip()
+
+        try:
+            result = json.loads(content_text)
+        except json.JSONDecodeError:
+            return None
+        return result if isinstance(result, dict) else None
+
     def _fallback_image_prompt(self, title: str = "") -> Dict:
         """Generic fallback image prompt when AI fails."""
         return {
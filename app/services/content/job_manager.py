@@ -104,6 +104,16 @@ class JobManager:
             query = query.filter(GenerationJob.user_id == user_id)
         return query.first()
 
+    def _get_job_for_update(self, job_id: str) -> Optional[GenerationJob]:
+        """Lock the job row and reload it, so concurrent writers don't lose updates."""
+        return (
+            self.db.query(GenerationJob)
+            .filter_by(job_id=job_id)
+            .with_for_update()
+            .populate_existing()
+            .first()
+        )
+
     def get_user_jobs(self, user_id: str, limit: int = 50) -> List[GenerationJob]:
         """Get recent jobs for a user."""
         return (
@@ -135,10 +145,15 @@ class JobManager:
         error_message: Optional[str] = None
     ) -> Optional[GenerationJob]:
         """Update job status and progress."""
-        job = self.get_job(job_id)
+        job = self._get_job_for_update(job_id)
         if not job:
             return None
 
+        # A brand worker still reporting progress must not un-cancel the job
+        if job.status == "cancelled" and status == "generating":
+            self.db.commit()
+            return job
+
         job.status = status
         if current_step is not None:
             job.current_step = current_step
@@ -171,7 +186,8 @@ class JobManager:
         print(f"   output_data: {output_data}", flush=True)
         sys.stdout.flush()
 
-        job = self.get_job(job_id)
+        # Row lock: brands of one job run in parallel, each read-modify-writing brand_outputs
+        job = self._get_job_for_update(job_id)
         if not job:
             print(f"   ❌ Job not found!", flush=True)
             return None
@@ -15,9 +15,8 @@ from app.services.brands.resolver import brand_resolver
 from app.services.storage.supabase_storage import (
     upload_from_path, storage_path, StorageError,
 )
-
-# Per-brand generation timeout (in seconds). Default: 10 minutes.
-BRAND_GENERATION_TIMEOUT = int(os.getenv("BRAND_GENERATION_TIMEOUT_SECONDS", "600"))
+from app.services.content.brand_executor import BRAND_GENERATION_TIMEOUT, JobInterrupted, get_brand_executor
+from app.utils.cancellation import Cancelled, CancelToken, checkpoint
 
 # CTA patterns that the AI sometimes generates despite being told not to.
 # These get stripped from content_lines since the real CTA is appended by image_generator.
@@ -52,22 +51,37 @@ def _get_brand_type(brand_name: str) -> str:
 
 
 def _download_logo_safe(url: str, label: str) -> Optional[Path]:
-    """Download a logo URL to a temp file. Returns Path on success, None on failure."""
+    """Local copy of a logo URL from the brand asset cache. None on failure.
+
+    The file is shared by every job — don't delete it.
+    """
     if not url or not url.startswith("http"):
         return None
-    try:
-        import httpx
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-        tmp.close()
-        resp = httpx.get(url, timeout=15, follow_redirects=True)
-        if resp.status_code == 200:
-            with open(tmp.name, 'wb') as f:
-                f.write(resp.content)
-            print(f"   ✓ {label} downloaded: {tmp.name}", flush=True)
-            return Path(tmp.name)
-    except Exception as e:
-        print(f"   ⚠️ {label} download failed: {e}", flush=True)
-    return None
+    from app.services.media.asset_cache import get_brand_asset_cache
+    path = get_brand_asset_cache().fetch(url)
+    if path is not None:
+        print(f"   ✓ {label}: {path}", flush=True)
+    return path
+
+
+class _JobProgress:
+    """Job-level progress while brands run in parallel.
+
+    Each brand reports its own 0-100; the job shows their average and never
+    moves backwards. The write happens under the lock so a slower thread
+    can't overwrite a newer percentage with an older one.
+    """
+
+    def __init__(self, brands: List[str]):
+        self._lock = threading.Lock()
+        self._pct = {brand: 0 for brand in brands}
+        self._reported = 0
+
+    def report(self, brand: str, pct: int, write) -> None:
+        with self._lock:
+            self._pct[brand] = pct
+            self._reported = max(self._reported, int(sum(self._pct.values()) / len(self._pct)))
+            write(self._reported)
 
 
 class JobProcessor:
@@ -85,10 +99,28 @@ class JobProcessor:
         "threads": "process_threads_brand",
     }
 
-    def __init__(self, db):
+    def __init__(self, db, lease_token: Optional[CancelToken] = None, progress: Optional[_JobProgress] = None):
         from app.services.content.job_manager import JobManager
         self._manager = JobManager(db)
         self.db = db
+        # Set by the work queue; cancelled when this worker loses the job's lease
+        self.lease_token = lease_token
+        # Shared by the brand workers of one _run_brands_loop fan-out
+        self._progress = progress
+
+    def _report_job_progress(self, job_id: str, brand: str, data: dict, brand_index: int, total_brands: int) -> None:
+        """Mirror a brand's progress_percent onto the job."""
+        def _write(job_pct: int) -> None:
+            self._manager.update_job_status(job_id, "generating", data.get("progress_message"), job_pct)
+
+        if self._progress is not None:
+            self._progress.report(brand, data["progress_percent"], _write)
+        else:
+            # Called directly for one brand (no parallel siblings)
+            _write(int(
+                (brand_index / max(total_brands, 1)) * 100
+                + (data["progress_percent"] / max(total_brands, 1))
+            ))
 
     def _get_brand_processor(self, variant: str):
         """Return the bound brand-processing method for the given variant.
@@ -113,70 +145,93 @@ class JobProcessor:
         self,
         job_id: str,
         brands: list[str],
-        processor_fn,
+        processor_name: str,
         *,
         progress_label: str = "Processing",
         extra_kwargs_per_brand: Optional[Dict[str, dict]] = None,
     ) -> Dict[str, Any]:
-        """Run a brand processor for each brand with timeout, progress, and cancellation.
+        """Run a brand processor for every brand on the shared BrandExecutor.
 
-        This is the single loop used by process_job, resume_job, and regenerate.
-        It handles: progress updates, cancellation checks, per-brand timeouts,
-        and status rollup.
+        This is the single fan-out used by process_job and resume_job.
+        Brands run in parallel (bounded by JOB_BRAND_WORKERS), each worker on
+        its own JobProcessor and DB session. A brand that exceeds
+        BRAND_GENERATION_TIMEOUT — or every running brand once the job is
+        cancelled — is stopped through its cancel token, killing its ffmpeg.
 
         Args:
             job_id: The job being processed
             brands: List of brand IDs to process
-            processor_fn: Callable(job_id, brand, **kwargs) → dict with 'success' key
-            progress_label: Human-readable label for progress messages
-            extra_kwargs_per_brand: Optional dict of {brand: {kwarg: val}} passed to processor_fn
-        """
-        results = {}
-        total = len(brands)
+            processor_name: JobProcessor method name, called as fn(job_id, brand, **kwargs)
+            progress_label: Human-readable label for progress and timeout messages
+            extra_kwargs_per_brand: Optional dict of {brand: {kwarg: val}} passed to the processor
 
-        for i, brand in enumerate(brands):
-            job = self._manager.get_job(job_id)
-            if job and job.status == "cancelled":
-                return results
+        Returns:
+            {brand: result} for every brand that finished or timed out. Brands
+            stopped by a cancellation are missing — check the job status.
 
-            progress = int((i / max(total, 1)) * 100)
-            msg = f"{progress_label} {brand}..." if total > 1 else f"{progress_label}..."
-            self._manager.update_job_status(job_id, "generating", msg, progress)
+        Raises:
+            JobInterrupted: the process is shutting down; the job is left
+                "generating" for the queue to resume.
+        """
+        from app.db_connection import SessionLocal
 
-            extra = {
-                **(extra_kwargs_per_brand or {}).get(brand, {}),
-                'brand_index': i,
-                'total_brands': total,
-            }
+        total = len(brands)
+        if not total:
+            return {}
+        extra_kwargs_per_brand = extra_kwargs_per_brand or {}
+
+        msg = f"{progress_label} {total} brands..." if total > 1 else f"{progress_label}..."
+        self._manager.update_job_status(job_id, "generating", msg)
 
-            # Pre-initialize brand output so frontend shows progress immediately
+        # Pre-initialize brand outputs so frontend shows progress immediately
+        for brand in brands:
             self._manager.update_brand_output(job_id, brand, {
                 "status": "generating",
                 "progress_percent": 0,
                 "progress_message": "Starting...",
             })
 
-            result = {"success": False, "error": "Timeout"}
+        progress = _JobProgress(brands)
 
-            def _run(b=brand, kw=extra):
-                nonlocal result
-                try:
-                    result = processor_fn(job_id, b, **kw)
-                except Exception as ex:
-                    result = {"success": False, "error": f"{type(ex).__name__}: {ex}"}
-
-            t = threading.Thread(target=_run, daemon=True)
-            t.start()
-            t.join(timeout=BRAND_GENERATION_TIMEOUT)
+        def _work(brand: str, index: int) -> Dict[str, Any]:
+            db = SessionLocal()
+            try:
+                processor = JobProcessor(db, progress=progress)
+                kwargs = {
+                    **extra_kwargs_per_brand.get(brand, {}),
+                    "brand_index": index,
+                    "total_brands": total,
+                }
+                return getattr(processor, processor_name)(job_id, brand, **kwargs)
+            finally:
+                db.close()
 
-            if t.is_alive():
-                timeout_msg = f"BRAND_TIMEOUT: {brand} {progress_label.lower()} exceeded {BRAND_GENERATION_TIMEOUT}s"
-                print(f"⏱️  {timeout_msg}", flush=True)
-                self._manager.update_brand_output(job_id, brand, {"status": "failed", "error": timeout_msg})
-                result = {"success": False, "error": timeout_msg}
+        def _job_cancelled() -> bool:
+            if self.lease_token is not None and self.lease_token.cancelled:
+                return True
+            self.db.expire_all()
+            job = self._manager.get_job(job_id)
+            return job is None or job.status == "cancelled"
+
+        def _on_timeout(brand: str, timeout_msg: str) -> None:
+            self._manager.update_brand_output(job_id, brand, {"status": "failed", "error": timeout_msg})
+
+        executor = get_brand_executor()
+        results = executor.run(
+            brands,
+            _work,
+            is_cancelled=_job_cancelled,
+            on_timeout=_on_timeout,
+            timeout_msg=lambda b: f"BRAND_TIMEOUT: {b} {progress_label.lower()} exceeded {BRAND_GENERATION_TIMEOUT}s",
+        )
 
-            results[brand] = result
+        if executor.draining:
+            raise JobInterrupted(f"{job_id} interrupted by shutdown")
+        if self.lease_token is not None and self.lease_token.cancelled:
+            raise JobInterrupted(self.lease_token.reason)
 
+        # Workers committed on their own sessions — drop our stale copies
+        self.db.expire_all()
         return results
 
     def regenerate_brand(
@@ -208,15 +263,10 @@ class JobProcessor:
 
         # Helper to thread through all update_brand_output calls
         def _update_output(data: dict):
+            checkpoint()  # Stop here if this brand timed out or the job was cancelled
             self._manager.update_brand_output(job_id, brand, data)
             if "progress_percent" in data:
-                job_pct = int(
-                    (brand_index / max(total_brands, 1)) * 100
-                    + (data["progress_percent"] / max(total_brands, 1))
-                )
-                self._manager.update_job_status(
-                    job_id, "generating", data.get("progress_message"), job_pct
-                )
+                self._report_job_progress(job_id, brand, data, brand_index, total_brands)
 
         # Use provided values or fall back to per-brand title in brand_outputs, then job title
         brand_data = job.get_brand_output(brand)
@@ -522,6 +572,9 @@ class JobProcessor:
                 "video_path": video_url
             }
 
+        except Cancelled:
+            # Timed out or job cancelled — BrandExecutor records it; not a generation failure
+            raise
         except Exception as e:
             import traceback
             import sys
@@ -572,15 +625,10 @@ class JobProcessor:
 
         # Helper to thread through all update_brand_output calls
         def _update_output(data: dict):
+            checkpoint()  # Stop here if this brand timed out or the job was cancelled
             self._manager.update_brand_output(job_id, brand, data)
             if "progress_percent" in data:
-                job_pct = int(
-                    (brand_index / max(total_brands, 1)) * 100
-                    + (data["progress_percent"] / max(total_brands, 1))
-                )
-                self._manager.update_job_status(
-                    job_id, "generating", data.get("progress_message"), job_pct
-                )
+                self._report_job_progress(job_id, brand, data, brand_index, total_brands)
 
         # Get per-brand content from brand_outputs
         brand_data = job.get_brand_output(brand)
@@ -718,6 +766,8 @@ class JobProcessor:
 
             return {"success": True, "brand": brand, "reel_id": reel_id}
 
+        except Cancelled:
+            raise
         except Exception as e:
             import traceback
             error_msg = f"{type(e).__name__}: {str(e)}"
@@ -745,15 +795,10 @@ class JobProcessor:
 
         # Helper to thread through all update_brand_output calls
         def _update_output(data: dict):
+            checkpoint()  # Stop here if this brand timed out or the job was cancelled
             self._manager.update_brand_output(job_id, brand, data)
             if "progress_percent" in data:
-                job_pct = int(
-                    (brand_index / max(total_brands, 1)) * 100
-                    + (data["progress_percent"] / max(total_brands, 1))
-                )
-                self._manager.update_job_status(
-                    job_id, "generating", data.get("progress_message"), job_pct
-                )
+                self._report_job_progress(job_id, brand, data, brand_index, total_brands)
 
         tv_data = job.format_b_data or {}
         brand_data = job.get_brand_output(brand)
@@ -976,8 +1021,6 @@ class JobProcessor:
             all_tmp = list(image_paths) + [thumbnail_path, video_output]
             if music_path:
                 all_tmp.append(music_path)
-            if brand_logo_local:
-                all_tmp.append(brand_logo_local)
 
             def _cleanup():
                 for p in all_tmp:
@@ -1035,6 +1078,8 @@ class JobProcessor:
                 "video_path": video_url,
             }
 
+        except Cancelled:
+            raise
         except Exception as e:
             import traceback
             error_msg = f"{type(e).__name__}: {str(e)}"
@@ -1067,15 +1112,10 @@ class JobProcessor:
             return {"success": False, "error": f"Job not found: {job_id}"}
 
         def _update_output(data: dict):
+            checkpoint()  # Stop here if this brand timed out or the job was cancelled
             self._manager.update_brand_output(job_id, brand, data)
             if "progress_percent" in data:
-                job_pct = int(
-                    (brand_index / max(total_brands, 1)) * 100
-                    + (data["progress_percent"] / max(total_brands, 1))
-                )
-                self._manager.update_job_status(
-                    job_id, "generating", data.get("progress_message"), job_pct
-                )
+                self._report_job_progress(job_id, brand, data, brand_index, total_brands)
 
         _update_output({"status": "generating", "progress_message": "Generating thread content...", "progress_percent": 10})
 
@@ -1155,6 +1195,8 @@ class JobProcessor:
                 else:
                     raise ValueError("Thread post generation returned no results")
 
+        except Cancelled:
+            raise
         except Exception as e:
             import traceback
             error_msg = f"{type(e).__name__}: {str(e)}"
@@ -1214,42 +1256,14 @@ class JobProcessor:
         if job.variant == "threads":
             print(f"🧵 THREADS variant — generating text per brand", flush=True)
             results = {}
-            total_work = len(job.brands)
             try:
-                for wi, brand in enumerate(job.brands):
-                    job = self._manager.get_job(job_id)
-                    if job.status == "cancelled":
-                        return {"success": False, "error": "Job was cancelled", "results": results}
-
-                    progress = int((wi / max(total_work, 1)) * 100)
-                    step_msg = f"Generating thread for {brand}..."
-                    self._manager.update_job_status(job_id, "generating", step_msg, progress)
-
-                    # Pre-initialize brand output so frontend shows progress immediately
-                    self._manager.update_brand_output(job_id, brand, {
-                        "status": "generating",
-                        "progress_percent": 0,
-                        "progress_message": "Starting...",
-                    })
-                    thread_result = {"success": False, "error": "Timeout"}
-                    def _run_thread_brand(b=brand, bi=wi, tot=total_work):
-                        nonlocal thread_result
-                        try:
-                            thread_result = self.process_threads_brand(job_id, b, brand_index=bi, total_brands=tot)
-                        except Exception as ex:
-                            thread_result = {"success": False, "error": f"{type(ex).__name__}: {str(ex)}"}
-
-                    t = threading.Thread(target=_run_thread_brand, daemon=True)
-                    t.start()
-                    t.join(timeout=BRAND_GENERATION_TIMEOUT)
-
-                    if t.is_alive():
-                        timeout_msg = f"BRAND_TIMEOUT: {brand} thread generation exceeded {BRAND_GENERATION_TIMEOUT}s"
-                        print(f"⏱️  {timeout_msg}", flush=True)
-                        self._manager.update_brand_output(job_id, brand, {"status": "failed", "error": timeout_msg})
-                        thread_result = {"success": False, "error": timeout_msg}
-
-                    results[brand] = thread_result
+                results = self._run_brands_loop(
+                    job_id, job.brands, "process_threads_brand",
+                    progress_label="Thread generation",
+                )
+                job = self._manager.get_job(job_id)
+                if job.status == "cancelled":
+                    return {"success": False, "error": "Job was cancelled", "results": results}
 
                 all_ok = all(r.get("success") for r in results.values())
                 any_ok = any(r.get("success") for r in results.values())
@@ -1327,38 +1341,13 @@ class JobProcessor:
                     print(f"   ✓ Generated posts for {total_brands} brand(s)", flush=True)
 
                 # Now generate images for each brand
-                for wi, brand in enumerate(job.brands):
-                    job = self._manager.get_job(job_id)
-                    if job.status == "cancelled":
-                        return {"success": False, "error": "Job was cancelled", "results": results}
-                    progress = int(((wi + 1) / (total_brands + 1)) * 100)
-                    self._manager.update_job_status(job_id, "generating", f"Generating image for {brand}...", progress)
-
-                    # Pre-initialize brand output so frontend shows progress immediately
-                    self._manager.update_brand_output(job_id, brand, {
-                        "status": "generating",
-                        "progress_percent": 0,
-                        "progress_message": "Starting...",
-                    })
-                    post_result = {"success": False, "error": "Timeout"}
-                    def _run_post_brand(b=brand, bi=wi, tot=total_brands):
-                        nonlocal post_result
-                        try:
-                            post_result = self.process_post_brand(job_id, b, brand_index=bi, total_brands=tot)
-                        except Exception as ex:
-                            post_result = {"success": False, "error": f"{type(ex).__name__}: {str(ex)}"}
-
-                    pt = threading.Thread(target=_run_post_brand, daemon=True)
-                    pt.start()
-                    pt.join(timeout=BRAND_GENERATION_TIMEOUT)
-
-                    if pt.is_alive():
-                        timeout_msg = f"BRAND_TIMEOUT: {brand} post generation exceeded {BRAND_GENERATION_TIMEOUT}s"
-                        print(f"⏱️  POST BRAND TIMEOUT: {brand}", flush=True)
-                        self._manager.update_brand_output(job_id, brand, {"status": "failed", "error": timeout_msg})
-                        post_result = {"success": False, "error": timeout_msg}
-
-                    results[brand] = post_result
+                results = self._run_brands_loop(
+                    job_id, job.brands, "process_post_brand",
+                    progress_label="Post generation",
+                )
+                job = self._manager.get_job(job_id)
+                if job.status == "cancelled":
+                    return {"success": False, "error": "Job was cancelled", "results": results}
 
                 all_ok = all(r.get("success") for r in results.values())
                 any_ok = any(r.get("success") for r in results.values())
@@ -1375,41 +1364,14 @@ class JobProcessor:
         if job.variant == "format_b":
             print(f"📹 Format B variant — processing per brand", flush=True)
             results = {}
-            total_brands = len(job.brands)
             try:
-                for wi, brand in enumerate(job.brands):
-                    job = self._manager.get_job(job_id)
-                    if job.status == "cancelled":
-                        return {"success": False, "error": "Job was cancelled", "results": results}
-
-                    progress = int((wi / max(total_brands, 1)) * 100)
-                    self._manager.update_job_status(job_id, "generating", f"Processing format-b for {brand}...", progress)
-
-                    # Pre-initialize brand output so frontend shows progress immediately
-                    self._manager.update_brand_output(job_id, brand, {
-                        "status": "generating",
-                        "progress_percent": 0,
-                        "progress_message": "Starting...",
-                    })
-                    tv_result = {"success": False, "error": "Timeout"}
-                    def _run_tv_brand(b=brand, bi=wi, tot=total_brands):
-                        nonlocal tv_result
-                        try:
-                            tv_result = self.process_format_b_brand(job_id, b, brand_index=bi, total_brands=tot)
-                        except Exception as ex:
-                            tv_result = {"success": False, "error": f"{type(ex).__name__}: {str(ex)}"}
-
-                    tv_thread = threading.Thread(target=_run_tv_brand, daemon=True)
-                    tv_thread.start()
-                    tv_thread.join(timeout=BRAND_GENERATION_TIMEOUT)
-
-                    if tv_thread.is_alive():
-                        timeout_msg = f"BRAND_TIMEOUT: {brand} format-b exceeded {BRAND_GENERATION_TIMEOUT}s"
-                        print(f"⏱️  Format B BRAND TIMEOUT: {brand}", flush=True)
-                        self._manager.update_brand_output(job_id, brand, {"status": "failed", "error": timeout_msg})
-                        tv_result = {"success": False, "error": timeout_msg}
-
-                    results[brand] = tv_result
+                results = self._run_brands_loop(
+                    job_id, job.brands, "process_format_b_brand",
+                    progress_label="Format-b",
+                )
+                job = self._manager.get_job(job_id)
+                if job.status == "cancelled":
+                    return {"success": False, "error": "Job was cancelled", "results": results}
 
                 all_ok = all(r.get("success") for r in results.values())
                 any_ok = any(r.get("success") for r in results.values())
@@ -1479,69 +1441,30 @@ class JobProcessor:
                 print(f"   Using original content for all brands", flush=True)
 
         try:
-            for wi, brand in enumerate(job.brands):
-                print(f"\n{'='*40}", flush=True)
-                print(f"🔄 Processing {brand} ({wi+1}/{total_brands})", flush=True)
-                print(f"{'='*40}", flush=True)
-                sys.stdout.flush()
-
-                job = self._manager.get_job(job_id)
-                if job.status == "cancelled":
-                    print(f"   ⚠️ Job cancelled, stopping", flush=True)
-                    return {"success": False, "error": "Job was cancelled", "results": results}
-
-                progress = int((wi / total_brands) * 100)
-                reel_msg = "Generating reel..." if total_brands == 1 else f"Generating {brand}..."
-                self._manager.update_job_status(job_id, "generating", reel_msg, progress)
-
-                # Get per-brand content from the correct slot
-                job = self._manager.get_job(job_id)
-                brand_output_data = job.get_brand_output(brand)
-                brand_content = brand_output_data.get("content_lines") or brand_content_map.get(brand.lower())
-
+            # Per-brand content: AI content stored in brand_outputs, else differentiated lines
+            job = self._manager.get_job(job_id)
+            if job.status == "cancelled":
+                print(f"   ⚠️ Job cancelled, stopping", flush=True)
+                return {"success": False, "error": "Job was cancelled", "results": results}
+            brand_kwargs = {}
+            for brand in job.brands:
+                brand_content = job.get_brand_output(brand).get("content_lines") or brand_content_map.get(brand.lower())
                 if brand_content:
-                    print(f"   📝 Using pre-generated content ({len(brand_content)} lines)", flush=True)
-                sys.stdout.flush()
-
-                result = {"success": False, "error": "Timeout"}
-                brand_error = [None]
-
-                def _run_brand(b=brand, bc=brand_content):
-                    nonlocal result
-                    try:
-                        result = self.regenerate_brand(
-                            job_id,
-                            b,
-                            content_lines=bc,
-                        )
-                    except Exception as ex:
-                        brand_error[0] = ex
-                        result = {"success": False, "error": f"{type(ex).__name__}: {str(ex)}"}
-
-                brand_thread = threading.Thread(target=_run_brand, daemon=True)
-                brand_thread.start()
-                brand_thread.join(timeout=BRAND_GENERATION_TIMEOUT)
-
-                if brand_thread.is_alive():
-                    timeout_msg = (
-                        f"BRAND_TIMEOUT: {brand} generation exceeded {BRAND_GENERATION_TIMEOUT}s timeout. "
-                        f"Step: {(self._manager.get_job(job_id) or type('', (), {'current_step': 'unknown'})).current_step}"
-                    )
-                    print(f"\n⏱️  BRAND TIMEOUT: {brand} exceeded {BRAND_GENERATION_TIMEOUT}s", flush=True)
-                    sys.stdout.flush()
-
-                    self._manager.update_brand_output(job_id, brand, {
-                        "status": "failed",
-                        "error": timeout_msg,
-                    })
-                    result = {"success": False, "error": timeout_msg}
-
-                results[brand] = result
+                    print(f"   📝 {brand}: using pre-generated content ({len(brand_content)} lines)", flush=True)
+                brand_kwargs[brand] = {"content_lines": brand_content}
+
+            reel_label = "Generating reel" if total_brands == 1 else "Generating"
+            results = self._run_brands_loop(
+                job_id, job.brands, "regenerate_brand",
+                progress_label=reel_label,
+                extra_kwargs_per_brand=brand_kwargs,
+            )
 
-                print(f"   📋 Result: {result.get('success', False)}", flush=True)
+            for brand, result in results.items():
+                print(f"   📋 {brand}: {result.get('success', False)}", flush=True)
                 if not result.get('success'):
                     print(f"   ❌ Error: {result.get('error', 'Unknown')}", flush=True)
-                sys.stdout.flush()
+            sys.stdout.flush()
 
             # Final cancellation check
             job = self._manager.get_job(job_id)
@@ -1636,29 +1559,13 @@ class JobProcessor:
 
         # ── POST variant ─────────────────────────────────────────────
         if job.variant == "post":
-            results = {}
-            for i, brand in enumerate(incomplete_brands):
-                job = self._manager.get_job(job_id)
-                if job.status == "cancelled":
-                    return {"success": False, "error": "Cancelled", "results": results}
-
-                progress = int(((i + 1) / (len(incomplete_brands) + 1)) * 100)
-                self._manager.update_job_status(job_id, "generating", f"Resuming {brand}...", progress)
-
-                post_result = {"success": False, "error": "Timeout"}
-                def _run(b=brand):
-                    nonlocal post_result
-                    try:
-                        post_result = self.process_post_brand(job_id, b)
-                    except Exception as ex:
-                        post_result = {"success": False, "error": f"{type(ex).__name__}: {ex}"}
-                t = threading.Thread(target=_run, daemon=True)
-                t.start()
-                t.join(timeout=BRAND_GENERATION_TIMEOUT)
-                if t.is_alive():
-                    self._manager.update_brand_output(job_id, brand, {"status": "failed", "error": "Timeout on resume"})
-                    post_result = {"success": False, "error": "Timeout"}
-                results[brand] = post_result
+            results = self._run_brands_loop(
+                job_id, incomplete_brands, "process_post_brand",
+                progress_label="Resuming",
+            )
+            job = self._manager.get_job(job_id)
+            if job.status == "cancelled":
+                return {"success": False, "error": "Cancelled", "results": results}
 
             self._finalize_job(job_id, results, all_brands, brand_outputs)
             return {"success": any(r.get("success") for r in results.values()), "results": results}
@@ -1667,29 +1574,13 @@ class JobProcessor:
         if job.variant == "format_b":
             results = {}
             try:
-                for i, brand in enumerate(incomplete_brands):
-                    job = self._manager.get_job(job_id)
-                    if job.status == "cancelled":
-                        return {"success": False, "error": "Cancelled", "results": results}
-
-                    progress = int((i / len(incomplete_brands)) * 100)
-                    self._manager.update_job_status(job_id, "generating", f"Resuming format-b {brand}...", progress)
-
-                    result = {"success": False, "error": "Timeout"}
-                    def _run_tv(b=brand):
-                        nonlocal result
-                        try:
-                            result = self.process_format_b_brand(job_id, b)
-                        except Exception as ex:
-                            result = {"success": False, "error": f"{type(ex).__name__}: {ex}"}
-
-                    bt = threading.Thread(target=_run_tv, daemon=True)
-                    bt.start()
-                    bt.join(timeout=BRAND_GENERATION_TIMEOUT)
-                    if bt.is_alive():
-                        self._manager.update_brand_output(job_id, brand, {"status": "failed", "error": "Timeout on resume"})
-                        result = {"success": False, "error": "Timeout"}
-                    results[brand] = result
+                results = self._run_brands_loop(
+                    job_id, incomplete_brands, "process_format_b_brand",
+                    progress_label="Resuming format-b",
+                )
+                job = self._manager.get_job(job_id)
+                if job.status == "cancelled":
+                    return {"success": False, "error": "Cancelled", "results": results}
 
                 self._finalize_job(job_id, results, all_brands, brand_outputs)
                 return {"success": any(r.get("success") for r in results.values()), "results": results}
@@ -1716,31 +1607,16 @@ class JobProcessor:
                 print(f"   ⚠️ Differentiation failed on resume: {e}", flush=True)
 
         try:
-            for i, brand in enumerate(incomplete_brands):
-                job = self._manager.get_job(job_id)
-                if job.status == "cancelled":
-                    return {"success": False, "error": "Cancelled", "results": results}
-
-                progress = int((i / len(incomplete_brands)) * 100)
-                self._manager.update_job_status(job_id, "generating", f"Resuming {brand}...", progress)
-
-                brand_content = brand_content_map.get(brand.lower())
-
-                result = {"success": False, "error": "Timeout"}
-                def _run_brand():
-                    nonlocal result
-                    try:
-                        result = self.regenerate_brand(job_id, brand, content_lines=brand_content)
-                    except Exception as ex:
-                        result = {"success": False, "error": f"{type(ex).__name__}: {ex}"}
-
-                bt = threading.Thread(target=_run_brand, daemon=True)
-                bt.start()
-                bt.join(timeout=BRAND_GENERATION_TIMEOUT)
-                if bt.is_alive():
-                    self._manager.update_brand_output(job_id, brand, {"status": "failed", "error": "Timeout on resume"})
-                    result = {"success": False, "error": "Timeout"}
-                results[brand] = result
+            results = self._run_brands_loop(
+                job_id, incomplete_brands, "regenerate_brand",
+                progress_label="Resuming",
+                extra_kwargs_per_brand={
+                    b: {"content_lines": brand_content_map.get(b.lower())} for b in incomplete_brands
+                },
+            )
+            job = self._manager.get_job(job_id)
+            if job.status == "cancelled":
+                return {"success": False, "error": "Cancelled", "results": results}
 
             self._finalize_job(job_id, results, all_brands, brand_outputs)
             return {"success": any(r.get("success") for r in results.values()), "results": results}
@@ -0,0 +1,301 @@
+"""
+DB-backed work queue for generation jobs.
+
+Generation jobs used to run as BackgroundTasks threads inside the web
+process, so a crash or deploy left them half-done until recover_stuck_jobs
+or the startup resume noticed. The queue lives on generation_jobs itself:
+
+  enqueue_job()  — API handlers set queue_action ('process' | 'resume')
+                   and queued_at, then return immediately.
+  claim_job()    — a worker slot takes the oldest claimable row with
+                   FOR UPDATE SKIP LOCKED and writes a lease
+                   (lease_owner, leased_at, lease_expires_at).
+  heartbeat()    — extends the lease while the job runs.
+  complete()     — clears queue_action and the lease.
+
+A job whose lease expires (worker killed, container redeployed) is
+claimable again after the visibility timeout and is *resumed* — brands that
+already completed are kept. After JOB_QUEUE_MAX_ATTEMPTS claims it is
+marked failed instead.
+
+GenerationWorker runs N slots. It runs inside the web process
+(JOB_QUEUE_IN_PROCESS, on by default) and/or as separate processes via
+``python -m app.worker``; all of them share the same table.
+
+Tuning (env vars):
+    JOB_QUEUE_CONCURRENCY    — jobs per worker process (default 2)
+    JOB_LEASE_SECONDS        — visibility timeout (default 120)
+    JOB_QUEUE_POLL_SECONDS   — idle poll interval (default 3)
+    JOB_QUEUE_MAX_ATTEMPTS   — claims before a job is failed (default 3)
+"""
+import os
+import socket
+import threading
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.db_connection import engine
+from app.utils.cancellation import CancelToken
+
+LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "120"))
+HEARTBEAT_SECONDS = max(5, LEASE_SECONDS // 4)
+POLL_SECONDS = float(os.getenv("JOB_QUEUE_POLL_SECONDS", "3"))
+MAX_ATTEMPTS = int(os.getenv("JOB_QUEUE_MAX_ATTEMPTS", "3"))
+DEFAULT_CONCURRENCY = 2
+
+# Wakes in-process worker slots right after a local enqueue (no poll delay)
+_local_wakeup = threading.Event()
+
+
+def enqueue_job(job_id: str, action: str = "process") -> bool:
+    """Queue a job for a generation worker.
+
+    A job a worker currently holds a live lease on is left alone — resetting
+    the lease would make it claimable again and a second worker would run
+    it alongside the first.
+
+    Args:
+        job_id: The generation job to run
+        action: 'process' for a full run, 'resume' to redo incomplete brands only
+
+    Returns:
+        True if queued, False if the job is already running.
+    """
+    with engine.begin() as conn:
+        result = conn.execute(text("""
+            UPDATE generation_jobs
+            SET queue_action = :action, queued_at = now(), queue_attempts = 0,
+                lease_owner = NULL, leased_at = NULL, lease_expires_at = NULL
+            WHERE job_id = :job_id
+              AND (lease_owner IS NULL OR lease_expires_at IS NULL OR lease_expires_at < now())
+        """), {"job_id": job_id, "action": action})
+    if result.rowcount != 1:
+        print(f"⏭️  [JobQueue] {job_id} is already running — not re-queued", flush=True)
+        return False
+    _local_wakeup.set()
+    print(f"📥 [JobQueue] Queued {job_id} ({action})", flush=True)
+    return True
+
+
+def is_job_leased(job_id: str) -> bool:
+    """True while a worker holds a live lease on the job."""
+    with engine.connect() as conn:
+        row = conn.execute(text("""
+            SELECT 1 FROM generation_jobs
+            WHERE job_id = :job_id AND lease_owner IS NOT NULL AND lease_expires_at >= now()
+        """), {"job_id": job_id}).first()
+    return row is not None
+
+
+def claim_job(worker_id: str) -> Optional[Dict[str, Any]]:
+    """Lease the oldest claimable job, or return None if the queue is empty.
+
+    Claimable = queued and either never leased or its lease expired. A
+    re-claimed job (previous lease expired) is switched to 'resume'.
+    """
+    with engine.begin() as conn:
+        row = conn.execute(text("""
+            UPDATE generation_jobs
+            SET queue_action = CASE WHEN lease_owner IS NOT NULL THEN 'resume' ELSE queue_action END,
+                lease_owner = :worker,
+                leased_at = now(),
+                lease_expires_at = now() + (:lease * interval '1 second'),
+                queue_attempts = queue_attempts + 1
+            WHERE job_id = (
+                SELECT job_id FROM generation_jobs
+                WHERE queue_action IS NOT NULL
+                  AND (lease_expires_at IS NULL OR lease_expires_at < now())
+                ORDER BY queued_at
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING job_id, queue_action, queue_attempts
+        """), {"worker": worker_id, "lease": LEASE_SECONDS}).first()
+    if row is None:
+        return None
+    return {"job_id": row.job_id, "action": row.queue_action, "attempts": row.queue_attempts}
+
+
+def heartbeat(job_id: str, worker_id: str) -> bool:
+    """Extend our lease. Returns False if the lease was lost to another worker."""
+    with engine.begin() as conn:
+        result = conn.execute(text("""
+            UPDATE generation_jobs
+            SET lease_expires_at = now() + (:lease * interval '1 second')
+            WHERE job_id = :job_id AND lease_owner = :worker
+        """), {"job_id": job_id, "worker": worker_id, "lease": LEASE_SECONDS})
+    return result.rowcount == 1
+
+
+def complete(job_id: str, worker_id: str) -> None:
+    """Remove a finished job from the queue (only if we still hold the lease)."""
+    with engine.begin() as conn:
+        conn.execute(text("""
+            UPDATE generation_jobs
+            SET queue_action = NULL, queued_at = NULL,
+                lease_owner = NULL, leased_at = NULL, lease_expires_at = NULL
+            WHERE job_id = :job_id AND lease_owner = :worker
+        """), {"job_id": job_id, "worker": worker_id})
+
+
+def queue_metrics() -> Dict[str, Any]:
+    """Queue depth and lease ages, for the admin endpoint and worker logs."""
+    with engine.connect() as conn:
+        row = conn.execute(text("""
+            SELECT
+                count(*) FILTER (WHERE lease_expires_at IS NULL OR lease_expires_at < now()) AS depth,
+                count(*) FILTER (WHERE lease_expires_at >= now()) AS in_flight,
+                count(*) FILTER (WHERE lease_owner IS NOT NULL AND lease_expires_at < now()) AS expired_leases,
+                extract(epoch FROM now() - min(queued_at) FILTER (
+                    WHERE lease_expires_at IS NULL OR lease_expires_at < now()
+                )) AS oldest_queued_s,
+                extract(epoch FROM now() - min(leased_at) FILTER (WHERE lease_expires_at >= now())) AS max_lease_age_s,
+                count(DISTINCT lease_owner) FILTER (WHERE lease_expires_at >= now()) AS active_workers
+            FROM generation_jobs
+            WHERE queue_action IS NOT NULL
+        """)).first()
+    return {
+        "depth": row.depth,
+        "in_flight": row.in_flight,
+        "expired_leases": row.expired_leases,
+        "oldest_queued_s": round(float(row.oldest_queued_s), 1) if row.oldest_queued_s is not None else None,
+        "max_lease_age_s": round(float(row.max_lease_age_s), 1) if row.max_lease_age_s is not None else None,
+        "active_workers": row.active_workers,
+        "lease_seconds": LEASE_SECONDS,
+    }
+
+
+class GenerationWorker:
+    """Claims queued generation jobs and runs them on N slots."""
+
+    def __init__(self, concurrency: Optional[int] = None, name: Optional[str] = None):
+        try:
+            env_concurrency = int(os.getenv("JOB_QUEUE_CONCURRENCY", DEFAULT_CONCURRENCY))
+        except ValueError:
+            env_concurrency = DEFAULT_CONCURRENCY
+        self.concurrency = max(1, concurrency or env_concurrency)
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        for slot in range(self.concurrency):
+            t = threading.Thread(
+                target=self._slot_loop, args=(f"{self.name}:{slot}",),
+                name=f"gen-worker-{slot}", daemon=True,
+            )
+            t.start()
+            self._threads.append(t)
+        print(f"👷 [JobQueue] Worker {self.name} started with {self.concurrency} slot(s)", flush=True)
+
+    def stop(self) -> None:
+        """Stop claiming. Jobs still running keep their lease until it expires."""
+        self._stop.set()
+        _local_wakeup.set()
+
+    def wait(self, metrics_every: float = 60.0) -> None:
+        """Block until stop(), logging queue metrics periodically."""
+        while not self._stop.wait(metrics_every):
+            try:
+                print(f"📊 [JobQueue] {queue_metrics()}", flush=True)
+            except Exception as e:
+                print(f"⚠️ [JobQueue] metrics failed: {e}", flush=True)
+
+    # ── internals ───────────────────────────────────────────────
+    def _slot_loop(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                claimed = claim_job(worker_id)
+            except Exception as e:
+                print(f"⚠️ [JobQueue] claim failed: {e}", flush=True)
+                claimed = None
+            if claimed is None:
+                _local_wakeup.wait(POLL_SECONDS)
+                _local_wakeup.clear()
+                continue
+            self._run(worker_id, claimed)
+
+    def _run(self, worker_id: str, claimed: Dict[str, Any]) -> None:
+        from app.db_connection import get_db_session
+        from app.services.content.brand_executor import JobInterrupted
+        from app.services.content.job_manager import JobManager
+        from app.services.content.job_processor import JobProcessor
+
+        job_id, action, attempts = claimed["job_id"], claimed["action"], claimed["attempts"]
+        print(f"🎬 [JobQueue] {worker_id} claimed {job_id} ({action}, attempt {attempts})", flush=True)
+
+        if attempts > MAX_ATTEMPTS:
+            error_msg = f"Gave up after {MAX_ATTEMPTS} interrupted attempts"
+            with get_db_session() as db:
+                JobManager(db).update_job_status(job_id, "failed", error_message=error_msg)
+            complete(job_id, worker_id)
+            print(f"❌ [JobQueue] {job_id}: {error_msg}", flush=True)
+            return
+
+        beat_stop = threading.Event()
+        # Cancelled when the lease is lost, so this worker stops its brands
+        # instead of running on next to the worker that re-claimed the job
+        lease_token = CancelToken(label=job_id)
+
+        def _beat():
+            while not beat_stop.wait(HEARTBEAT_SECONDS):
+                try:
+                    if not heartbeat(job_id, worker_id):
+                        print(f"⚠️ [JobQueue] Lost lease on {job_id} — stopping it here", flush=True)
+                        lease_token.cancel(f"Lease on {job_id} lost to another worker")
+                        return
+                except Exception as e:
+                    print(f"⚠️ [JobQueue] heartbeat failed for {job_id}: {e}", flush=True)
+
+        beat = threading.Thread(target=_beat, name=f"gen-heartbeat-{job_id}", daemon=True)
+        beat.start()
+        try:
+            with get_db_session() as db:
+                processor = JobProcessor(db, lease_token=lease_token)
+                if action == "resume":
+                    result = processor.resume_job(job_id)
+                else:
+                    result = processor.process_job(job_id)
+            print(f"{'✅' if result.get('success') else '❌'} [JobQueue] {job_id}: {result}", flush=True)
+        except JobInterrupted as e:
+            # Shutting down, or the lease is gone: leave the job to whoever
+            # holds (or next claims) the lease — don't mark or complete it
+            print(f"⏸️  [JobQueue] {job_id} interrupted ({e}) — left for the lease holder", flush=True)
+            return
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            if lease_token.cancelled:
+                return
+            try:
+                with get_db_session() as db:
+                    JobManager(db).update_job_status(job_id, "failed", error_message=f"{type(e).__name__}: {e}")
+            except Exception:
+                pass
+        finally:
+            beat_stop.set()
+        if lease_token.cancelled:
+            return
+        complete(job_id, worker_id)
+
+
+_worker: Optional[GenerationWorker] = None
+
+
+def start_in_process_worker() -> Optional[GenerationWorker]:
+    """Start a queue consumer inside the web process unless JOB_QUEUE_IN_PROCESS=0."""
+    global _worker
+    if os.getenv("JOB_QUEUE_IN_PROCESS", "1") == "0":
+        return None
+    if _worker is None:
+        _worker = GenerationWorker()
+        _worker.start()
+    return _worker
+
+
+def stop_in_process_worker() -> None:
+    global _worker
+    if _worker is not None:
+        _worker.stop()
+        _worker = None
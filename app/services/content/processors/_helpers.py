@@ -46,10 +46,10 @@ def download_logo_safe(url: str, label: str) -> Optional[Path]:
     if not url or not url.startswith("http"):
         return None
     try:
-        import httpx
+        from app.utils.http_client import get_http2_client
         tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
         tmp.close()
-        resp = httpx.get(url, timeout=15, follow_redirects=True)
+        resp = get_http2_client().get(url, timeout=15, follow_redirects=True)
         if resp.status_code == 200:
             with open(tmp.name, 'wb') as f:
                 f.write(resp.content)
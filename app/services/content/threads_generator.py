@@ -279,15 +279,14 @@ You generate ONLY valid JSON. No markdown, no explanations, no extra text."""
         """Get the format_type of the most recent threads post for a brand."""
         try:
             from app.db_connection import SessionLocal
-            from app.models.scheduling import ScheduledReel
-            from sqlalchemy import func
+            from app.models.scheduling import ScheduledReel, brand_key_in, scheduled_content_type
             db = SessionLocal()
             try:
                 row = (
                     db.query(ScheduledReel)
                     .filter(
-                        func.json_extract_path_text(ScheduledReel.extra_data, "brand") == brand_id,
-                        func.json_extract_path_text(ScheduledReel.extra_data, "content_type") == "threads_post",
+                        brand_key_in([brand_id]),
+                        scheduled_content_type() == "threads_post",
                     )
                     .order_by(ScheduledReel.created_at.desc())
                     .first()
@@ -10,13 +10,12 @@ Images are generated via DeAPI or sourced from Pexels depending on config.
 """
 import hashlib
 import logging
-import os
 import random
 import re
 from dataclasses import dataclass, asdict
 from typing import Optional
 
-from openai import OpenAI
+from app.utils.llm_client import get_deepseek_client
 
 logger = logging.getLogger(__name__)
 
@@ -418,13 +417,6 @@ def _format_format_b_examples(examples: list[dict]) -> str:
     )
 
 
-def _get_deepseek_client() -> OpenAI:
-    return OpenAI(
-        api_key=os.getenv("DEEPSEEK_API_KEY", ""),
-        base_url="https://api.deepseek.com",
-    )
-
-
 class StoryPolisher:
     """Generates viral reel content + AI image prompts via DeepSeek.
 
@@ -434,7 +426,7 @@ class StoryPolisher:
     """
 
     def __init__(self):
-        self.client = _get_deepseek_client()
+        self.client = get_deepseek_client()
 
     def generate_content(
         self,
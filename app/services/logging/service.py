@@ -9,7 +9,7 @@ system events.
 Architecture:
 - DatabaseLogHandler: Python logging.Handler that writes to PostgreSQL
 - LoggingService: Central service for structured log operations
-- Thread-safe buffered writes with periodic flush
+- Bounded log queue drained by one bulk writer thread (LogBuffer)
 - Automatic cleanup of old logs (configurable retention)
 
 Design for external debugging:
@@ -71,93 +71,159 @@ def clear_user_id():
 
 
 class LogBuffer:
-    """Thread-safe buffer for batching log writes to the database."""
-    
-    def __init__(self, max_size: int = 50, flush_interval: float = 2.0):
+    """Bounded queue drained by one long-lived bulk writer thread.
+
+    add() is O(1) and never blocks or touches the DB: it appends to a
+    bounded deque and, once a full batch is waiting, wakes the writer. The
+    writer drains up to ``batch_size`` entries at a time and inserts them
+    with a single executemany on one pooled connection, so the process
+    holds at most one connection for logging no matter how hard print()
+    is hammered.
+
+    Overload policy (counters in stats()):
+    - Above half capacity, INFO/DEBUG entries are sampled: only every
+      ``sample_every``-th one is kept (``sampled_out``).
+    - At capacity, INFO/DEBUG entries are dropped (``dropped_full``);
+      WARNING and above evict the oldest queued entry instead.
+    """
+
+    _KEEP_LEVELS = frozenset({'WARNING', 'ERROR', 'CRITICAL'})
+    _COLUMNS = (
+        'timestamp', 'level', 'category', 'source', 'message', 'details',
+        'request_id', 'deployment_id', 'duration_ms', 'user_id',
+        'http_method', 'http_path', 'http_status',
+    )
+
+    def __init__(self, max_size: int = 100, flush_interval: float = 2.0,
+                 capacity: int = 10000, sample_every: int = 10):
         self.buffer: deque = deque()
-        self.max_size = max_size
+        self.max_size = max_size            # entries per INSERT batch
         self.flush_interval = flush_interval
+        self.capacity = capacity
+        self.sample_every = max(1, sample_every)
         self.lock = threading.Lock()
+        self._wakeup = threading.Condition(self.lock)
         self.last_flush = time.time()
-        self._flush_timer: Optional[threading.Timer] = None
         self._running = True
-    
+        self._writer: Optional[threading.Thread] = None
+        self._sample_counter = 0
+        self._counters = {
+            'enqueued': 0,
+            'written': 0,
+            'batches': 0,
+            'sampled_out': 0,
+            'dropped_full': 0,
+            'write_failures': 0,
+            'max_depth': 0,
+        }
+
     def add(self, entry: Dict[str, Any]):
-        """Add a log entry to the buffer."""
+        """Queue a log entry for the writer thread (never blocks on I/O)."""
+        keep = entry.get('level') in self._KEEP_LEVELS
         with self.lock:
+            depth = len(self.buffer)
+            if depth >= self.capacity:
+                if not keep:
+                    self._counters['dropped_full'] += 1
+                    return
+                self.buffer.popleft()
+                self._counters['dropped_full'] += 1
+            elif not keep and depth >= self.capacity // 2:
+                self._sample_counter += 1
+                if self._sample_counter % self.sample_every:
+                    self._counters['sampled_out'] += 1
+                    return
             self.buffer.append(entry)
-            if len(self.buffer) >= self.max_size:
-                self._do_flush()
-            elif not self._flush_timer:
-                self._schedule_flush()
-    
-    def _schedule_flush(self):
-        """Schedule a flush after the interval."""
-        if self._running:
-            self._flush_timer = threading.Timer(self.flush_interval, self._timed_flush)
-            self._flush_timer.daemon = True
-            self._flush_timer.start()
-    
-    def _timed_flush(self):
-        """Flush triggered by timer."""
+            self._counters['enqueued'] += 1
+            depth = len(self.buffer)
+            if depth > self._counters['max_depth']:
+                self._counters['max_depth'] = depth
+            if depth >= self.max_size:
+                self._wakeup.notify()
+        if self._writer is None and self._running:
+            self._start_writer()
+
+    def _start_writer(self):
         with self.lock:
-            self._flush_timer = None
-            self._do_flush()
-    
-    def _do_flush(self):
-        """Flush all buffered entries to the database. Must be called with lock held."""
-        if not self.buffer:
-            return
-        
-        entries = list(self.buffer)
-        self.buffer.clear()
-        self.last_flush = time.time()
-        
-        # Write in a separate thread to not block the caller
-        thread = threading.Thread(target=self._write_to_db, args=(entries,), daemon=True)
-        thread.start()
-    
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(target=self._writer_loop, name="log-writer", daemon=True)
+            self._writer.start()
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        """Pop up to max_size entries. Must be called with lock held."""
+        count = min(len(self.buffer), self.max_size)
+        return [self.buffer.popleft() for _ in range(count)]
+
+    def _writer_loop(self):
+        while True:
+            with self.lock:
+                if self._running and len(self.buffer) < self.max_size:
+                    self._wakeup.wait(self.flush_interval)
+                if not self._running:
+                    return
+                entries = self._take_batch()
+            if entries:
+                self._write_to_db(entries)
+
     def _write_to_db(self, entries: List[Dict[str, Any]]):
-        """Write entries to the database."""
+        """Bulk-insert entries with one executemany on one connection."""
         try:
-            from app.db_connection import SessionLocal
+            from app.db_connection import engine
             from app.models import LogEntry
-            
-            db = SessionLocal()
-            try:
-                for entry_data in entries:
-                    log_entry = LogEntry(**entry_data)
-                    db.add(log_entry)
-                db.commit()
-            except Exception as e:
-                db.rollback()
-                # Fallback: print to stderr so we don't lose logs
-                print(f"[LOG-SERVICE] Failed to write {len(entries)} log entries to DB: {e}", file=sys.stderr, flush=True)
-            finally:
-                db.close()
+
+            # executemany needs identical keys in every row
+            columns = self._COLUMNS
+            rows = [{col: entry.get(col) for col in columns} for entry in entries]
+            with engine.begin() as conn:
+                conn.execute(LogEntry.__table__.insert(), rows)
+            with self.lock:
+                self._counters['written'] += len(entries)
+                self._counters['batches'] += 1
+                self.last_flush = time.time()
         except Exception as e:
-            print(f"[LOG-SERVICE] Critical: Cannot connect to DB for logging: {e}", file=sys.stderr, flush=True)
-    
+            with self.lock:
+                self._counters['write_failures'] += 1
+            # Fallback: raw stderr (not the print capture) so we don't lose logs or loop
+            print(f"[LOG-SERVICE] Failed to write {len(entries)} log entries to DB: {e}", file=sys.__stderr__, flush=True)
+
     def flush_sync(self):
-        """Synchronously flush all buffered entries."""
-        with self.lock:
-            if not self.buffer:
+        """Synchronously write everything currently queued."""
+        while True:
+            with self.lock:
+                entries = self._take_batch()
+            if not entries:
                 return
-            entries = list(self.buffer)
-            self.buffer.clear()
-        
-        self._write_to_db(entries)
-    
+            self._write_to_db(entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and backpressure counters."""
+        with self.lock:
+            return {
+                **self._counters,
+                'depth': len(self.buffer),
+                'capacity': self.capacity,
+                'batch_size': self.max_size,
+                'last_flush_age_s': round(time.time() - self.last_flush, 1),
+            }
+
     def stop(self):
-        """Stop the buffer and flush remaining entries."""
-        self._running = False
-        if self._flush_timer:
-            self._flush_timer.cancel()
+        """Stop the writer thread and flush remaining entries."""
+        with self.lock:
+            self._running = False
+            self._wakeup.notify_all()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
         self.flush_sync()
 
 
 # Global buffer instance
-_log_buffer = LogBuffer(max_size=100, flush_interval=5.0)
+_log_buffer = LogBuffer(
+    max_size=int(os.getenv("LOG_BATCH_SIZE", "500")),
+    flush_interval=float(os.getenv("LOG_FLUSH_INTERVAL_SECONDS", "2.0")),
+    capacity=int(os.getenv("LOG_QUEUE_CAPACITY", "10000")),
+    sample_every=int(os.getenv("LOG_SAMPLE_EVERY", "10")),
+)
 
 
 class DatabaseLogHandler(logging.Handler):
@@ -523,6 +589,10 @@ class LoggingService:
     def shutdown(self):
         """Shutdown the logging service and flush remaining entries."""
         _log_buffer.stop()
+
+    def pipeline_stats(self) -> Dict[str, Any]:
+        """Log queue depth, throughput and drop/sample counters."""
+        return _log_buffer.stats()
     
     def cleanup_old_logs(self, retention_hours: int = 48):
         """Delete logs older than retention_hours (default 48h)."""
@@ -0,0 +1,285 @@
+"""
+Local cache for brand logos and static render assets.
+
+Every render used to fetch the brand logo again — _download_logo_safe in
+the job processor wrote a fresh temp file per brand per job, the carousel
+path used urlretrieve, and every compositor re-opened and re-decoded the
+logo (and the share/save/verified icons) from disk for each image.
+
+BrandAssetCache keeps two layers:
+  - disk: downloads are stored content-addressed (sha256 of the bytes) in
+    BRAND_ASSET_CACHE_DIR, with a small sidecar per URL recording the file,
+    ETag and Last-Modified. A URL checked within
+    BRAND_ASSET_REVALIDATE_SECONDS is served without any HTTP; after that
+    (or after a restart) it is revalidated with a conditional GET, so an
+    unchanged logo costs a 304 and no body. If the origin is down, the last
+    good copy is served.
+  - memory: decoded RGBA images (optionally pre-resized) in an LRU bounded
+    by BRAND_ASSET_MEMORY_MB of pixel data, keyed by (file, mtime, size).
+    Images are shared between callers — paste from them, never draw on them.
+
+Logo uploads store the URL with a ``?v=<content hash>`` (versioned_url in
+app/services/storage/supabase_storage.py), so a new logo is a new cache key
+in every process as soon as it reads the updated brand row — no
+cross-process invalidation needed. BrandResolver.invalidate_cache() (brand
+create/update/delete) additionally marks this process's URLs stale, which
+covers unversioned URLs, but other processes only notice those after
+BRAND_ASSET_REVALIDATE_SECONDS. Decoded images never go stale: new logo
+bytes land in a new content-addressed file.
+
+Tuning (env vars):
+    BRAND_ASSET_CACHE_DIR           — where downloads live (default <tmp>/brand_assets)
+    BRAND_ASSET_REVALIDATE_SECONDS  — serve a URL without HTTP for this long (default 300)
+    BRAND_ASSET_MEMORY_MB           — decoded-image LRU budget (default 64)
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from PIL import Image
+
+CACHE_DIR = Path(os.getenv("BRAND_ASSET_CACHE_DIR", str(Path(tempfile.gettempdir()) / "brand_assets")))
+REVALIDATE_SECONDS = float(os.getenv("BRAND_ASSET_REVALIDATE_SECONDS", "300"))
+MEMORY_BYTES = int(float(os.getenv("BRAND_ASSET_MEMORY_MB", "64")) * 1024 * 1024)
+DOWNLOAD_TIMEOUT = 15
+# checked_at of an entry that must be revalidated before use
+_STALE = float("-inf")
+
+
+def _sha(value: Union[str, bytes]) -> str:
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return hashlib.sha256(value).hexdigest()
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    # Write-then-rename so a concurrent reader never sees half a file
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class _UrlEntry:
+    __slots__ = ("path", "etag", "last_modified", "checked_at")
+
+    def __init__(self, path: Path, etag: Optional[str], last_modified: Optional[str], checked_at: float):
+        self.path = path
+        self.etag = etag
+        self.last_modified = last_modified
+        self.checked_at = checked_at
+
+
+class BrandAssetCache:
+    """Process-wide disk + decoded-image cache for logos and icons."""
+
+    def __init__(self, directory: Path = CACHE_DIR, memory_bytes: int = MEMORY_BYTES):
+        self._dir = Path(directory)
+        self._memory_bytes = memory_bytes
+        self._lock = threading.Lock()
+        self._urls: dict[str, _UrlEntry] = {}
+        self._fetch_locks: dict[str, threading.Lock] = {}
+        self._images: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+        self._image_bytes = 0
+        self._stats = {
+            "url_hits": 0, "revalidated": 0, "downloads": 0, "download_errors": 0, "stale_served": 0,
+            "image_hits": 0, "image_misses": 0, "image_evictions": 0,
+        }
+
+    # ── disk layer ────────────────────────────────────────────────
+
+    def _sidecar(self, url: str) -> Path:
+        return self._dir / "urls" / f"{_sha(url)[:32]}.json"
+
+    def _entry(self, url: str) -> Optional[_UrlEntry]:
+        with self._lock:
+            entry = self._urls.get(url)
+        if entry is not None:
+            return entry
+        # First use in this process: pick up what an earlier run downloaded
+        try:
+            meta = json.loads(self._sidecar(url).read_text())
+        except (OSError, ValueError):
+            return None
+        entry = _UrlEntry(self._dir / meta["file"], meta.get("etag"), meta.get("last_modified"), _STALE)
+        with self._lock:
+            return self._urls.setdefault(url, entry)
+
+    def _fetch_lock(self, url: str) -> threading.Lock:
+        with self._lock:
+            return self._fetch_locks.setdefault(url, threading.Lock())
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def fetch(self, url: str) -> Optional[Path]:
+        """Local file for ``url`` (http/https), downloading or revalidating as needed.
+
+        Returns None if it was never downloaded and the download fails.
+        """
+        entry = self._entry(url)
+        if entry and time.monotonic() - entry.checked_at < REVALIDATE_SECONDS and entry.path.is_file():
+            self._count("url_hits")
+            return entry.path
+
+        with self._fetch_lock(url):
+            # Another thread may have refreshed it while we waited
+            entry = self._entry(url)
+            if entry and time.monotonic() - entry.checked_at < REVALIDATE_SECONDS and entry.path.is_file():
+                self._count("url_hits")
+                return entry.path
+            return self._download(url, entry if entry and entry.path.is_file() else None)
+
+    def _download(self, url: str, entry: Optional[_UrlEntry]) -> Optional[Path]:
+        from app.utils.http_client import get_http_session
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        try:
+            resp = get_http_session().get(url, headers=headers, timeout=DOWNLOAD_TIMEOUT)
+            if resp.status_code == 304 and entry is not None:
+                entry.checked_at = time.monotonic()
+                self._count("revalidated")
+                return entry.path
+            resp.raise_for_status()
+            data = resp.content
+        except Exception as e:
+            self._count("download_errors")
+            if entry is not None:
+                print(f"⚠️ [ASSETS] Revalidating {url[:80]} failed, serving cached copy: {e}", flush=True)
+                self._count("stale_served")
+                return entry.path
+            print(f"⚠️ [ASSETS] Download failed for {url[:80]}: {e}", flush=True)
+            return None
+
+        ext = os.path.splitext(url.split("?")[0])[1].lower() or ".png"
+        filename = f"{_sha(data)[:32]}{ext if len(ext) <= 5 else '.png'}"
+        path = self._dir / filename
+        try:
+            (self._dir / "urls").mkdir(parents=True, exist_ok=True)
+            if not path.is_file():
+                _atomic_write(path, data)
+            meta = {
+                "url": url, "file": filename,
+                "etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified"),
+            }
+            _atomic_write(self._sidecar(url), json.dumps(meta).encode("utf-8"))
+        except OSError as e:
+            self._count("download_errors")
+            print(f"⚠️ [ASSETS] Could not store {url[:80]}: {e}", flush=True)
+            return None
+
+        with self._lock:
+            self._urls[url] = _UrlEntry(path, meta["etag"], meta["last_modified"], time.monotonic())
+            self._stats["downloads"] += 1
+        return path
+
+    # ── memory layer ──────────────────────────────────────────────
+
+    def image(self, path: Union[str, Path], size: Optional[Tuple[int, int]] = None) -> Optional[Image.Image]:
+        """Decoded RGBA image for a local file, resized (LANCZOS) to ``size`` if given.
+
+        Shared between callers — never draw on the returned image.
+        """
+        try:
+            key = (str(path), os.path.getmtime(path), size)
+        except OSError:
+            return None
+        with self._lock:
+            img = self._images.get(key)
+            if img is not None:
+                self._images.move_to_end(key)
+                self._stats["image_hits"] += 1
+                return img
+            self._stats["image_misses"] += 1
+
+        try:
+            img = Image.open(path).convert("RGBA")
+            if size is not None and img.size != tuple(size):
+                img = img.resize(tuple(size), Image.LANCZOS)
+        except Exception as e:
+            print(f"⚠️ [ASSETS] Could not decode {path}: {e}", flush=True)
+            return None
+
+        cost = img.width * img.height * 4
+        with self._lock:
+            if key not in self._images:
+                self._images[key] = img
+                self._image_bytes += cost
+            while self._image_bytes > self._memory_bytes and len(self._images) > 1:
+                _, old = self._images.popitem(last=False)
+                self._image_bytes -= old.width * old.height * 4
+                self._stats["image_evictions"] += 1
+        return img
+
+    def logo(self, source: Optional[str], size: Optional[Tuple[int, int]] = None) -> Optional[Image.Image]:
+        """Decoded logo from a URL or local path (None if missing or broken)."""
+        path = self.resolve(source)
+        return self.image(path, size) if path is not None else None
+
+    def resolve(self, source: Optional[str]) -> Optional[Path]:
+        """Local file for a logo URL or path, or None."""
+        if not source:
+            return None
+        if source.startswith(("http://", "https://")):
+            return self.fetch(source)
+        return Path(source) if os.path.isfile(source) else None
+
+    # ── maintenance ───────────────────────────────────────────────
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """Revalidate ``url`` (or every URL) on next use. Files stay for 304s."""
+        with self._lock:
+            if url is None:
+                entries = list(self._urls.values())
+            else:
+                entries = [self._urls[url]] if url in self._urls else []
+            for entry in entries:
+                entry.checked_at = _STALE
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["urls"] = len(self._urls)
+            stats["images"] = len(self._images)
+            stats["image_mb"] = round(self._image_bytes / (1024 * 1024), 2)
+        url_lookups = stats["url_hits"] + stats["revalidated"] + stats["downloads"] + stats["download_errors"]
+        stats["url_hit_rate"] = round((stats["url_hits"] + stats["revalidated"]) / url_lookups, 3) if url_lookups else None
+        image_lookups = stats["image_hits"] + stats["image_misses"]
+        stats["image_hit_rate"] = round(stats["image_hits"] / image_lookups, 3) if image_lookups else None
+        return stats
+
+
+_cache: Optional[BrandAssetCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_brand_asset_cache() -> BrandAssetCache:
+    """Get or create the process-wide BrandAssetCache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = BrandAssetCache()
+    return _cache
+
+
+def invalidate_brand_assets(url: Optional[str] = None) -> None:
+    """Force revalidation of brand asset URLs (no-op before first use)."""
+    if _cache is not None:
+        _cache.invalidate(url)
+
+
+def brand_asset_stats() -> dict:
+    """Hit/miss counters for this process."""
+    return get_brand_asset_cache().stats()
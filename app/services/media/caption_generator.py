@@ -6,6 +6,7 @@ import requests
 from typing import List, Dict, Optional
 
 from app.core.prompt_context import PromptContext
+from app.utils.llm_cache import cached_completion, completion_from_json
 
 
 class CaptionGenerator:
@@ -333,37 +334,43 @@ Create a YouTube title that:
 
 Respond with ONLY the title, nothing else."""
 
-        try:
+        request = {
+            "model": "deepseek-chat",
+            "messages": [
+                {"role": "system", "content": "You are a YouTube SEO expert. Write engaging, searchable titles."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.8,
+            "max_tokens": 100
+        }
+
+        def fetch() -> Dict:
             response = requests.post(
                 f"{self.base_url}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
                     "Content-Type": "application/json"
                 },
-                json={
-                    "model": "deepseek-chat",
-                    "messages": [
-                        {"role": "system", "content": "You are a YouTube SEO expert. Write engaging, searchable titles."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.8,
-                    "max_tokens": 100
-                },
+                json=request,
                 timeout=30
             )
+            if response.status_code != 200:
+                raise RuntimeError(f"DeepSeek API error: {response.status_code} - {response.text}")
+            return completion_from_json(response.json())
 
-            if response.status_code == 200:
-                result = response.json()
-                yt_title = result["choices"][0]["message"]["content"].strip()
-                # Clean up any quotes that might wrap the response
-                yt_title = yt_title.strip('"\'')
-                # Ensure max 100 characters
-                if len(yt_title) > 100:
-                    yt_title = yt_title[:97] + "..."
-                return yt_title
-            else:
-                print(f"⚠️ DeepSeek API error: {response.status_code} - {response.text}")
-                return self._fallback_youtube_title(title)
+        try:
+            # Same reel title + points → same YouTube title (e.g. re-uploads, per-brand variants)
+            completion = cached_completion(
+                "caption.youtube_title", request, fetch,
+                cacheable=lambda text: bool(text.strip()),
+            )
+            yt_title = completion["content"].strip()
+            # Clean up any quotes that might wrap the response
+            yt_title = yt_title.strip('"\'')
+            # Ensure max 100 characters
+            if len(yt_title) > 100:
+                yt_title = yt_title[:97] + "..."
+            return yt_title
 
         except Exception as e:
             print(f"⚠️ YouTube title generation error: {e}")
@@ -0,0 +1,289 @@
+"""
+Concurrent carousel rendering with pipelined uploads.
+
+render_carousel_images used to render the cover and every text slide one
+after another to PNG, re-open each PNG to convert it to JPEG, and only then
+upload the JPEGs one at a time — so an 8-slide carousel cost the sum of
+eight renders, eight re-encodes and eight uploads.
+
+CarouselPipeline instead:
+  - renders every slide on a process pool (Pillow drawing is CPU-bound and
+    holds the GIL for text layout), each worker encoding its canvas
+    straight to JPEG bytes in memory — no PNG intermediate, no temp files;
+  - hands each slide to an upload thread as soon as its render finishes,
+    so uploads overlap with the slides still rendering.
+End to end, a carousel takes roughly its slowest slide plus one upload
+instead of the sum of all of them (given enough workers).
+
+Workers are started with "spawn", not fork: the parent holds DB pools,
+APScheduler threads and HTTP sessions that must not be copied into a
+child. If the process pool can't start or breaks (a worker killed by the
+OOM killer), slides render on threads in this process instead.
+
+Tuning (env vars):
+    CAROUSEL_RENDER_WORKERS  — render processes (default min(4, CPUs); 0 renders on threads)
+    CAROUSEL_UPLOAD_WORKERS  — concurrent uploads across all carousels (default 4)
+    CAROUSEL_JPEG_QUALITY    — JPEG quality of uploaded slides (default 92)
+"""
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from PIL import Image
+
+JPEG_QUALITY = int(os.getenv("CAROUSEL_JPEG_QUALITY", "92"))
+DEFAULT_UPLOAD_WORKERS = 4
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+# ── worker side (runs in the render processes) ───────────────────
+
+_worker_renderer = None
+
+
+def _renderer():
+    global _worker_renderer
+    if _worker_renderer is None:
+        from app.services.media.carousel_slide_renderer import CarouselSlideRenderer
+        _worker_renderer = CarouselSlideRenderer()
+    return _worker_renderer
+
+
+def encode_jpeg(canvas: Image.Image, quality: int = JPEG_QUALITY) -> bytes:
+    """Encode an RGB canvas as JPEG bytes (what the Instagram carousel API takes)."""
+    if canvas.mode != "RGB":
+        canvas = canvas.convert("RGB")
+    buf = io.BytesIO()
+    canvas.save(buf, format="JPEG", quality=quality, optimize=True)
+    return buf.getvalue()
+
+
+def render_slide_jpeg(spec: dict) -> bytes:
+    """Render one slide described by ``spec`` and return it as JPEG bytes.
+
+    ``spec["kind"]`` is "cover" (background_image, title, brand_config,
+    logo_path) or "text" (text, brand_config, is_last, content_y, logo_path).
+    Top-level so the process pool can pickle it.
+    """
+    from app.services.media.asset_cache import get_brand_asset_cache
+    from app.services.media.carousel_slide_renderer import LOGO_SIZE
+
+    renderer = _renderer()
+    if spec["kind"] == "cover":
+        canvas = renderer.draw_cover(
+            background_image=spec["background_image"],
+            title=spec["title"],
+            brand_config=spec["brand_config"],
+            logo_path=spec.get("logo_path"),
+        )
+    else:
+        canvas = renderer.draw_text_slide(
+            slide_text=spec["text"],
+            brand_config=spec["brand_config"],
+            is_last=spec["is_last"],
+            content_y=spec["content_y"],
+            logo_img=(
+                get_brand_asset_cache().image(spec["logo_path"], (LOGO_SIZE, LOGO_SIZE))
+                if spec.get("logo_path") else None
+            ),
+        )
+    return encode_jpeg(canvas)
+
+
+# ── parent side ──────────────────────────────────────────────────
+
+class CarouselPipeline:
+    """Process-wide render pool + upload pool shared by every carousel."""
+
+    def __init__(self, render_workers: Optional[int] = None, upload_workers: Optional[int] = None):
+        if render_workers is None:
+            render_workers = _env_int("CAROUSEL_RENDER_WORKERS", min(4, os.cpu_count() or 1))
+        if upload_workers is None:
+            upload_workers = _env_int("CAROUSEL_UPLOAD_WORKERS", DEFAULT_UPLOAD_WORKERS)
+        self.render_workers = max(0, render_workers)
+        self._lock = threading.Lock()
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_failed = self.render_workers == 0
+        # Fallback renderer when the process pool is off or broken
+        self._thread_pool = ThreadPoolExecutor(
+            max_workers=max(1, self.render_workers), thread_name_prefix="carousel-render",
+        )
+        self._upload_pool = ThreadPoolExecutor(
+            max_workers=max(1, upload_workers), thread_name_prefix="carousel-upload",
+        )
+
+    def _get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._process_pool_failed:
+                return None
+            if self._process_pool is None:
+                try:
+                    self._process_pool = ProcessPoolExecutor(
+                        max_workers=self.render_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                except Exception as e:
+                    print(f"⚠️ [CAROUSEL] Render processes unavailable, using threads: {e}", flush=True)
+                    self._process_pool_failed = True
+                    return None
+            return self._process_pool
+
+    def _mark_broken(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._process_pool is pool:
+                print("⚠️ [CAROUSEL] Render process pool broke — recreating on next carousel", flush=True)
+                self._process_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_render(self, spec: dict) -> Future:
+        pool = self._get_process_pool()
+        if pool is not None:
+            try:
+                return pool.submit(render_slide_jpeg, spec)
+            except (BrokenProcessPool, RuntimeError):
+                self._mark_broken(pool)
+        return self._thread_pool.submit(render_slide_jpeg, spec)
+
+    def _render_result(self, future: Future, spec: dict) -> bytes:
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            # The worker died under this slide — render it here instead
+            with self._lock:
+                pool = self._process_pool
+            if pool is not None:
+                self._mark_broken(pool)
+            return self._thread_pool.submit(render_slide_jpeg, spec).result()
+
+    @staticmethod
+    def _discard_uploads(uploads: dict, discard: Optional[Callable[[int], None]]) -> None:
+        """Cancel queued uploads and undo the ones that went through."""
+        for f in uploads.values():
+            f.cancel()
+        for index, f in uploads.items():
+            if f.cancelled():
+                continue
+            try:
+                f.result()
+            except Exception:
+                continue  # never stored
+            if discard is None:
+                continue
+            try:
+                discard(index)
+            except Exception as e:
+                print(f"⚠️ [CAROUSEL] Could not remove uploaded slide {index}: {e}", flush=True)
+
+    def render_and_upload(
+        self,
+        brand_config: dict,
+        title: str,
+        background_image: str,
+        slide_texts: list,
+        upload: Callable[[int, bytes], str],
+        logo_path: Optional[str] = None,
+        discard: Optional[Callable[[int], None]] = None,
+    ) -> dict:
+        """Render the cover and text slides concurrently, uploading each as it finishes.
+
+        ``upload(index, jpeg_bytes)`` stores one slide and returns its URL;
+        index 0 is the cover, 1..n the text slides. Returns
+        ``{"success", "coverUrl", "slideUrls", "errors"}`` — success is
+        False if any slide failed to render. A failed upload is reported in
+        ``errors`` and left out of the URLs, as before.
+
+        If a slide fails to render, queued uploads are cancelled and
+        ``discard(index)`` is called for every slide already uploaded, so a
+        failed carousel doesn't leave orphaned files in storage.
+        """
+        from app.services.media.carousel_slide_renderer import CarouselSlideRenderer
+
+        content_y = CarouselSlideRenderer()._compute_stable_content_y(slide_texts)
+        specs = [{
+            "kind": "cover",
+            "background_image": background_image,
+            "title": title,
+            "brand_config": brand_config,
+            "logo_path": logo_path,
+        }]
+        for i, text in enumerate(slide_texts):
+            specs.append({
+                "kind": "text",
+                "text": text,
+                "brand_config": brand_config,
+                "is_last": i == len(slide_texts) - 1,
+                "content_y": content_y,
+                "logo_path": logo_path,
+            })
+
+        renders = {self._submit_render(spec): index for index, spec in enumerate(specs)}
+        uploads: dict[int, Future] = {}
+        render_error = None
+        for future in as_completed(renders):
+            index = renders[future]
+            try:
+                data = self._render_result(future, specs[index])
+            except Exception as e:
+                render_error = render_error or f"slide {index}: {type(e).__name__}: {e}"
+                continue
+            uploads[index] = self._upload_pool.submit(upload, index, data)
+
+        if render_error:
+            for f in renders:
+                f.cancel()
+            self._discard_uploads(uploads, discard)
+            return {"success": False, "error": render_error}
+
+        urls: dict[int, str] = {}
+        errors = []
+        for index in sorted(uploads):
+            try:
+                urls[index] = uploads[index].result()
+            except Exception as e:
+                errors.append(f"slide {index}: {e}")
+        return {
+            "success": True,
+            "coverUrl": urls.get(0),
+            "slideUrls": [urls[i] for i in range(1, len(specs)) if i in urls],
+            "errors": errors,
+        }
+
+    def shutdown(self) -> None:
+        """Drop queued renders/uploads; running ones finish in the background."""
+        with self._lock:
+            pool, self._process_pool = self._process_pool, None
+            self._process_pool_failed = True
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        self._upload_pool.shutdown(wait=False, cancel_futures=True)
+
+
+_pipeline: Optional[CarouselPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_carousel_pipeline() -> CarouselPipeline:
+    """Get or create the process-wide CarouselPipeline."""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = CarouselPipeline()
+    return _pipeline
+
+
+def shutdown_carousel_pipeline() -> None:
+    """Stop the render processes (no-op if no carousel was rendered)."""
+    if _pipeline is not None:
+        _pipeline.shutdown()
@@ -5,10 +5,11 @@ Extracted from app/main.py so it can be reused by:
 - Toby orchestrator (pre-render at job creation)
 - Publish flow (JIT fallback)
 - Repair scripts
+
+Slides are rendered concurrently and uploaded as they finish by
+CarouselPipeline (app/services/media/carousel_pipeline.py); the brand logo
+comes from the brand asset cache (app/services/media/asset_cache.py).
 """
-import os
-import tempfile
-from pathlib import Path
 from typing import Optional
 
 
@@ -21,7 +22,7 @@ def render_carousel_images(
     user_id: str = "system",
 ) -> Optional[dict]:
     """
-    Render cover + text slides as PNG images via Pillow.
+    Render cover + text slides as JPEG images via Pillow and upload them.
 
     Args:
         brand: Brand ID
@@ -36,13 +37,6 @@ def render_carousel_images(
     """
     uid8 = reel_id[:8] if reel_id else "unknown"
 
-    tmp_dir = tempfile.mkdtemp(prefix="slides_")
-    cover_out = os.path.join(tmp_dir, f"post_{brand}_{uid8}.png")
-    slide_outputs = [
-        os.path.join(tmp_dir, f"post_{brand}_{uid8}_slide{idx}.png")
-        for idx in range(len(slide_texts))
-    ]
-
     # Build brand config from DB
     brand_config_data = {}
     logo_local_path = None
@@ -64,88 +58,46 @@ def render_carousel_images(
                 "handle": handle,
             }
             if b.logo_path:
-                try:
-                    import urllib.request
-                    logo_url = b.logo_path
-                    if logo_url.startswith("http"):
-                        logo_ext = os.path.splitext(logo_url.split("?")[0])[1] or ".png"
-                        logo_local_path = os.path.join(tmp_dir, f"{brand}_logo{logo_ext}")
-                        urllib.request.urlretrieve(logo_url, logo_local_path)
-                    elif os.path.isfile(logo_url):
-                        logo_local_path = logo_url
-                except Exception as logo_err:
-                    print(f"[RENDER] Logo download warning: {logo_err}", flush=True)
-                    logo_local_path = None
+                from app.services.media.asset_cache import get_brand_asset_cache
+                logo_file = get_brand_asset_cache().resolve(b.logo_path)
+                logo_local_path = str(logo_file) if logo_file else None
     except Exception:
         pass
 
     try:
-        from app.services.media.carousel_slide_renderer import CarouselSlideRenderer
+        from app.services.media.carousel_pipeline import get_carousel_pipeline
+        from app.services.storage.supabase_storage import delete_file, upload_bytes, storage_path
+
+        # Instagram's carousel API requires JPEG; index 0 is the cover
+        names = [f"post_{brand}_{uid8}.jpg"] + [
+            f"post_{brand}_{uid8}_slide{idx}.jpg" for idx in range(len(slide_texts))
+        ]
+
+        def _upload(index: int, data: bytes) -> str:
+            remote = storage_path(user_id, brand, "posts", names[index])
+            return upload_bytes("media", remote, data, "image/jpeg")
+
+        def _discard(index: int) -> None:
+            delete_file("media", storage_path(user_id, brand, "posts", names[index]))
 
-        renderer = CarouselSlideRenderer()
-        output = renderer.render_all(
+        output = get_carousel_pipeline().render_and_upload(
             brand_config=brand_config_data,
             title=title,
             background_image=background_image,
             slide_texts=slide_texts,
-            cover_output=cover_out,
-            slide_outputs=slide_outputs,
+            upload=_upload,
             logo_path=logo_local_path,
+            discard=_discard,
         )
 
         if not output.get("success"):
             print(f"[RENDER] Error: {output.get('error')}", flush=True)
             return None
-
-        # Convert PNGs to JPEG (Instagram carousel API requires JPEG format)
-        # and upload rendered images to Supabase
-        try:
-            from PIL import Image as _PILImage
-            from app.services.storage.supabase_storage import upload_from_path, storage_path
-
-            def _convert_png_to_jpeg(png_path: str) -> str:
-                """Convert a PNG image to JPEG (RGB, no alpha). Returns the JPEG path."""
-                jpg_path = png_path.rsplit(".", 1)[0] + ".jpg"
-                img = _PILImage.open(png_path)
-                if img.mode == "RGBA":
-                    bg = _PILImage.new("RGB", img.size, (255, 255, 255))
-                    bg.paste(img, mask=img.split()[3])
-                    img = bg
-                elif img.mode != "RGB":
-                    img = img.convert("RGB")
-                img.save(jpg_path, format="JPEG", quality=92, optimize=True)
-                return jpg_path
-
-            cover_path = output.get("coverPath", "")
-            if cover_path and Path(cover_path).exists():
-                cover_jpg = _convert_png_to_jpeg(cover_path)
-                cover_name = Path(cover_jpg).name
-                cover_remote = storage_path(user_id, brand, "posts", cover_name)
-                output["coverUrl"] = upload_from_path("media", cover_remote, cover_jpg)
-
-            slide_urls = []
-            for sp in output.get("slidePaths", []):
-                if sp and Path(sp).exists():
-                    try:
-                        slide_jpg = _convert_png_to_jpeg(sp)
-                        slide_name = Path(slide_jpg).name
-                        slide_remote = storage_path(user_id, brand, "posts", slide_name)
-                        slide_urls.append(upload_from_path("media", slide_remote, slide_jpg))
-                    except Exception as slide_err:
-                        print(f"[RENDER] Slide upload failed for {sp}: {slide_err}", flush=True)
-            output["slideUrls"] = slide_urls
-        except Exception as upload_err:
-            print(f"[RENDER] Supabase upload warning: {upload_err}", flush=True)
-            output["slideUrls"] = output.get("slideUrls", [])  # preserve any already-set slides
+        for err in output.get("errors", []):
+            print(f"[RENDER] Upload failed for {err}", flush=True)
 
         return output
 
     except Exception as e:
         print(f"[RENDER] Exception: {e}", flush=True)
         return None
-    finally:
-        import shutil as _shutil
-        try:
-            _shutil.rmtree(tmp_dir, ignore_errors=True)
-        except Exception:
-            pass
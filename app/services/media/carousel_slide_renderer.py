@@ -15,6 +15,17 @@ from typing import Optional
 
 from PIL import Image, ImageDraw, ImageFont
 
+from app.services.media.asset_cache import get_brand_asset_cache
+from app.utils.compositing import (
+    apply_vertical_gradient,
+    circular_mask,
+    cover_fit,
+    greedy_wrap,
+    hex_to_rgb,
+    paste_centered_lines,
+)
+from app.utils.fonts import fit_largest_size, truetype_cached
+
 logger = logging.getLogger(__name__)
 
 # Canvas dimensions (Instagram carousel)
@@ -27,6 +38,14 @@ COVER_TITLE_GAP = 40
 COVER_LOGO_GAP = 36
 COVER_LOGO_HEIGHT = 40
 COVER_ABBR_GAP_WIDTH = 113
+# Cover overlay: subtle darkening over the top 30%, ramping to solid black
+# at the bottom — (end_frac, base, delta) segments, see app/utils/compositing.py
+COVER_GRADIENT = (
+    (0.30, 0.00, 0.10),   # 0 → 10%
+    (0.50, 0.10, 0.23),   # 10% → 33%
+    (0.70, 0.33, 0.45),   # 33% → 78%
+    (1.00, 0.78, 0.22),   # 78% → 100%
+)
 
 # ─── Text slide constants ─────────────────────────────────────────────────────
 BG_COLOR = (248, 245, 240)       # #f8f5f0
@@ -85,13 +104,8 @@ class CarouselSlideRenderer:
 
             content_y = self._compute_stable_content_y(slide_texts)
 
-            # Pre-load logo for text slides
-            logo_img = None
-            if logo_path and Path(logo_path).exists():
-                try:
-                    logo_img = Image.open(logo_path).convert("RGBA")
-                except Exception:
-                    pass
+            # Pre-load logo for text slides (decoded once, at header size)
+            logo_img = get_brand_asset_cache().image(logo_path, (LOGO_SIZE, LOGO_SIZE)) if logo_path else None
 
             slide_paths = []
             for i, text in enumerate(slide_texts):
@@ -125,39 +139,30 @@ class CarouselSlideRenderer:
         logo_path: Optional[str] = None,
     ):
         """Render the carousel cover slide."""
+        canvas = self.draw_cover(background_image, title, brand_config, logo_path)
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        canvas.save(output_path, "PNG")
+
+    def draw_cover(
+        self,
+        background_image: str,
+        title: str,
+        brand_config: dict,
+        logo_path: Optional[str] = None,
+    ) -> Image.Image:
+        """Draw the carousel cover slide and return the RGB canvas."""
         canvas = Image.new("RGB", (W, H), (0, 0, 0))
 
         # 1. Background image (cover-fit)
         try:
             bg = Image.open(background_image).convert("RGB")
-            bg = self._cover_fit(bg, W, H)
+            bg = cover_fit(bg, W, H)
             canvas.paste(bg, (0, 0))
         except Exception as e:
             logger.error(f"[Cover] Failed to load background: {e}")
 
         # 2. Gradient overlay — subtle from very top, strong at bottom (+30% intensity)
-        gradient = Image.new("RGBA", (W, H), (0, 0, 0, 0))
-        for y in range(H):
-            frac = y / H
-            if frac < 0.30:
-                # Top 30%: subtle darkening (0 → 10%)
-                alpha = int(255 * 0.10 * (frac / 0.30))
-            elif frac < 0.50:
-                # 30-50%: ramp (10% → 33%)
-                t = (frac - 0.30) / 0.20
-                alpha = int(255 * (0.10 + 0.23 * t))
-            elif frac < 0.70:
-                # 50-70%: moderate (33% → 78%)
-                t = (frac - 0.50) / 0.20
-                alpha = int(255 * (0.33 + 0.45 * t))
-            else:
-                # 70-100%: strong (78% → 100%)
-                t = (frac - 0.70) / 0.30
-                alpha = int(255 * (0.78 + 0.22 * t))
-            alpha = min(alpha, 255)
-            gradient.paste(Image.new("RGBA", (W, 1), (0, 0, 0, alpha)), (0, y))
-
-        canvas = Image.alpha_composite(canvas.convert("RGBA"), gradient).convert("RGB")
+        apply_vertical_gradient(canvas, COVER_GRADIENT)
         draw = ImageDraw.Draw(canvas)
 
         # 3. Auto-fit title (Format B algorithm)
@@ -182,13 +187,7 @@ class CarouselSlideRenderer:
         logo_center_y = divider_y
 
         # 5. Divider lines with centered logo
-        logo_img = None
-        if logo_path and Path(logo_path).exists():
-            try:
-                logo_img = Image.open(logo_path).convert("RGBA")
-                logo_img = logo_img.resize((logo_size, logo_size), Image.LANCZOS)
-            except Exception:
-                logo_img = None
+        logo_img = get_brand_asset_cache().image(logo_path, (logo_size, logo_size)) if logo_path else None
 
         line_gap = 20  # gap between line end and logo
         if logo_img:
@@ -206,13 +205,7 @@ class CarouselSlideRenderer:
                 fill=(255, 255, 255), width=2,
             )
             # Paste logo with circular mask
-            mask = Image.new("L", (logo_size, logo_size), 0)
-            mask_draw = ImageDraw.Draw(mask)
-            mask_draw.ellipse([0, 0, logo_size - 1, logo_size - 1], fill=255)
-            canvas_rgba = canvas.convert("RGBA")
-            canvas_rgba.paste(logo_img, (logo_x, logo_y), mask)
-            canvas = canvas_rgba.convert("RGB")
-            draw = ImageDraw.Draw(canvas)
+            canvas.paste(logo_img.convert("RGB"), (logo_x, logo_y), circular_mask(logo_size))
         else:
             # No logo — show abbreviation text between lines
             abbr = brand_config.get("abbreviation", "CO")
@@ -239,21 +232,14 @@ class CarouselSlideRenderer:
 
         # 6. Title text (centered, ALL CAPS)
         title_font = self._load_font("Anton", font_size)
-        for i, line in enumerate(title_lines):
-            text_y = title_top_y + i * line_h
-            bbox = draw.textbbox((0, 0), line, font=title_font)
-            text_w = bbox[2] - bbox[0]
-            draw.text(((W - text_w) // 2, text_y), line, fill=(255, 255, 255), font=title_font)
+        paste_centered_lines(draw, title_lines, title_font, W, title_top_y, line_h, fill=(255, 255, 255))
 
         # 7. "Swipe" label
         swipe_font = self._load_font("Inter", 24)
         swipe_bbox = draw.textbbox((0, 0), "Swipe", font=swipe_font)
         swipe_w = swipe_bbox[2] - swipe_bbox[0]
         draw.text(((W - swipe_w) // 2, swipe_y), "Swipe", fill=(230, 230, 230), font=swipe_font)
-
-        # Save
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        canvas.save(output_path, "PNG")
+        return canvas
 
     # ─── Text slide ───────────────────────────────────────────────────────────
 
@@ -267,10 +253,23 @@ class CarouselSlideRenderer:
         logo_img: Optional[Image.Image] = None,
     ):
         """Render a single text slide."""
+        canvas = self.draw_text_slide(slide_text, brand_config, is_last, content_y, logo_img)
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        canvas.save(output_path, "PNG")
+
+    def draw_text_slide(
+        self,
+        slide_text: str,
+        brand_config: dict,
+        is_last: bool,
+        content_y: int,
+        logo_img: Optional[Image.Image] = None,
+    ) -> Image.Image:
+        """Draw a single text slide and return the RGB canvas."""
         canvas = Image.new("RGB", (W, H), BG_COLOR)
         draw = ImageDraw.Draw(canvas)
 
-        brand_color = self._hex_to_rgb(brand_config.get("color", "#888888"))
+        brand_color = hex_to_rgb(brand_config.get("color", "#888888"), default=SUBTLE_COLOR)
         display_name = brand_config.get("displayName", brand_config.get("name", "Brand"))
         handle = brand_config.get("handle", "@brand")
         initial = display_name[0].upper() if display_name else "B"
@@ -280,11 +279,10 @@ class CarouselSlideRenderer:
 
         # 1. Brand header — logo circle
         if logo_img:
-            resized = logo_img.resize((LOGO_SIZE, LOGO_SIZE), Image.LANCZOS)
-            mask = Image.new("L", (LOGO_SIZE, LOGO_SIZE), 0)
-            mask_draw = ImageDraw.Draw(mask)
-            mask_draw.ellipse([0, 0, LOGO_SIZE - 1, LOGO_SIZE - 1], fill=255)
-            canvas.paste(resized.convert("RGB"), (header_x, header_y), mask)
+            resized = logo_img
+            if logo_img.size != (LOGO_SIZE, LOGO_SIZE):
+                resized = logo_img.resize((LOGO_SIZE, LOGO_SIZE), Image.LANCZOS)
+            canvas.paste(resized.convert("RGB"), (header_x, header_y), circular_mask(LOGO_SIZE))
         else:
             draw.ellipse(
                 [header_x, header_y, header_x + LOGO_SIZE, header_y + LOGO_SIZE],
@@ -326,9 +324,8 @@ class CarouselSlideRenderer:
         draw.text((PAD_X, BOTTOM_BAR_Y + 2), "SHARE", fill=TEXT_COLOR, font=bar_font)
 
         # Share icon
-        share_path = self._icon_dir / "share.png"
-        if share_path.exists():
-            share_icon = Image.open(share_path).convert("RGBA").resize((30, 30), Image.LANCZOS)
+        share_icon = get_brand_asset_cache().image(self._icon_dir / "share.png", (30, 30))
+        if share_icon is not None:
             canvas.paste(share_icon, (PAD_X + 110, BOTTOM_BAR_Y - 2), share_icon)
 
         # "SWIPE" centered (hidden on last slide)
@@ -338,15 +335,11 @@ class CarouselSlideRenderer:
             draw.text(((W - swipe_w) // 2, BOTTOM_BAR_Y + 2), "SWIPE", fill=TEXT_COLOR, font=bar_font)
 
         # Save icon + "SAVE"
-        save_path = self._icon_dir / "save.png"
-        if save_path.exists():
-            save_icon = Image.open(save_path).convert("RGBA").resize((28, 28), Image.LANCZOS)
+        save_icon = get_brand_asset_cache().image(self._icon_dir / "save.png", (28, 28))
+        if save_icon is not None:
             canvas.paste(save_icon, (W - PAD_X - 140, BOTTOM_BAR_Y - 1), save_icon)
         draw.text((W - PAD_X - 98, BOTTOM_BAR_Y + 2), "SAVE", fill=TEXT_COLOR, font=bar_font)
-
-        # Save
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        canvas.save(output_path, "PNG")
+        return canvas
 
     # ─── Auto-fit title (Format B algorithm) ──────────────────────────────────
 
@@ -362,39 +355,18 @@ class CarouselSlideRenderer:
         wrap_width = int(max_width * 0.98)
 
         # Try 3 lines first (preferred — bigger font, more balanced)
-        for size in range(300, 19, -2):
-            font = self._load_font(font_name, size)
-            lines = self._greedy_wrap(draw, title, font, wrap_width)
-            if len(lines) <= 3:
-                final = max(20, size - 2)
-                final_font = self._load_font(font_name, final)
-                return self._greedy_wrap(draw, title, final_font, wrap_width), final
+        size = fit_largest_size(
+            20, 300,
+            lambda s: len(greedy_wrap(title.upper(), self._load_font(font_name, s), wrap_width)) <= 3,
+            step=2,
+        )
+        if size is not None:
+            final = max(20, size - 2)
+            final_font = self._load_font(font_name, final)
+            return greedy_wrap(title.upper(), final_font, wrap_width), final
 
         font = self._load_font(font_name, 20)
-        return self._greedy_wrap(draw, title, font, wrap_width), 20
-
-    def _greedy_wrap(
-        self, draw: ImageDraw.ImageDraw, text: str,
-        font: ImageFont.FreeTypeFont, max_width: int,
-    ) -> list:
-        """Word-wrap text greedily (uppercase)."""
-        words = text.upper().split()
-        if not words:
-            return [""]
-        lines = []
-        current = ""
-        for word in words:
-            test = f"{current} {word}".strip()
-            bbox = draw.textbbox((0, 0), test, font=font)
-            if bbox[2] - bbox[0] <= max_width:
-                current = test
-            else:
-                if current:
-                    lines.append(current)
-                current = word
-        if current:
-            lines.append(current)
-        return lines
+        return greedy_wrap(title.upper(), font, wrap_width), 20
 
     # ─── Text slide helpers ───────────────────────────────────────────────────
 
@@ -466,16 +438,6 @@ class CarouselSlideRenderer:
 
     # ─── Shared helpers ───────────────────────────────────────────────────────
 
-    @staticmethod
-    def _cover_fit(img: Image.Image, target_w: int, target_h: int) -> Image.Image:
-        """Scale to cover target dimensions, then center-crop."""
-        ratio = max(target_w / img.width, target_h / img.height)
-        new_w, new_h = int(img.width * ratio), int(img.height * ratio)
-        img = img.resize((new_w, new_h), Image.LANCZOS)
-        left = (new_w - target_w) // 2
-        top = (new_h - target_h) // 2
-        return img.crop((left, top, left + target_w, top + target_h))
-
     def _load_font(self, name: str, size: int) -> ImageFont.FreeTypeFont:
         """Load font from assets/fonts/."""
         font_map = {
@@ -486,19 +448,11 @@ class CarouselSlideRenderer:
         filename = font_map.get(name, name)
         font_path = self._font_dir / filename
         try:
-            return ImageFont.truetype(str(font_path), size)
+            return truetype_cached(str(font_path), size)
         except Exception:
             for fallback in ["Anton-Regular.ttf", "Poppins-Bold.ttf"]:
                 try:
-                    return ImageFont.truetype(str(self._font_dir / fallback), size)
+                    return truetype_cached(str(self._font_dir / fallback), size)
                 except Exception:
                     continue
             return ImageFont.load_default()
-
-    @staticmethod
-    def _hex_to_rgb(hex_color: str) -> tuple:
-        try:
-            hc = hex_color.lstrip("#")
-            return tuple(int(hc[i:i + 2], 16) for i in (0, 2, 4))
-        except Exception:
-            return (136, 136, 136)
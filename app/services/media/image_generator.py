@@ -33,6 +33,8 @@ from app.utils.fonts import (
     get_title_font,
     get_brand_font,
     load_font,
+    fit_largest_size,
+    text_width,
 )
 from app.utils.text_layout import (
     wrap_text,
@@ -488,20 +490,16 @@ class ImageGenerator:
         if '\n' in title_upper:
             # User specified manual line breaks — auto-reduce font if any line overflows
             title_wrapped = [line.strip() for line in title_upper.split('\n') if line.strip()]
-            current_title_font_size = title_font_size
 
-            while current_title_font_size >= 30:
-                title_font = load_font(FONT_BOLD, current_title_font_size)
-                all_fit = True
-                for line in title_wrapped:
-                    bbox = title_font.getbbox(line)
-                    line_width = bbox[2] - bbox[0]
-                    if line_width > max_title_width:
-                        all_fit = False
-                        break
-                if all_fit:
-                    break
-                current_title_font_size -= 2
+            def title_fits(size):
+                font = load_font(FONT_BOLD, size)
+                return all(text_width(font, line) <= max_title_width for line in title_wrapped)
+
+            # Largest size (stepping by 2 down to 30) where every line fits;
+            # if none does, the smallest step is used
+            fitted = fit_largest_size(30, title_font_size, title_fits, step=2)
+            current_title_font_size = fitted if fitted is not None else title_font_size - 2 * max(0, (title_font_size - 30) // 2)
+            title_font = load_font(FONT_BOLD, current_title_font_size)
 
             if current_title_font_size != title_font_size:
                 print(f"📝 Auto-reduced font: {title_font_size}px → {current_title_font_size}px to fit manual line breaks")
@@ -550,8 +548,7 @@ class ImageGenerator:
                 line_width = 0
                 for segment_text, is_bold in line_segments:
                     font = test_bold_font if is_bold else test_font
-                    bbox_seg = font.getbbox(segment_text)
-                    line_width += bbox_seg[2] - bbox_seg[0]
+                    line_width += text_width(font, segment_text)
 
                 if line_width <= max_width:
                     # Single line
@@ -571,15 +568,16 @@ class ImageGenerator:
         min_font_size = 20
         max_bottom_y = self.height - BOTTOM_MARGIN
 
-        # Calculate with initial font size
-        content_height = calculate_actual_content_height(content_font_size, lines, max_content_width, content_side_margin)
-        content_bottom_y = content_start_y + content_height
+        # Largest font size (down to min_font_size) that keeps the bottom margin
+        def content_fits(font_size):
+            height = calculate_actual_content_height(font_size, lines, max_content_width, content_side_margin)
+            return content_start_y + height <= max_bottom_y
 
-        # Reduce font size if needed
-        while content_bottom_y > max_bottom_y and content_font_size > min_font_size:
-            content_font_size -= 1
-            content_height = calculate_actual_content_height(content_font_size, lines, max_content_width, content_side_margin)
-            content_bottom_y = content_start_y + content_height
+        fitted = fit_largest_size(min_font_size, content_font_size, content_fits)
+        content_font_size = fitted if fitted is not None else min_font_size
+        content_bottom_y = content_start_y + calculate_actual_content_height(
+            content_font_size, lines, max_content_width, content_side_margin
+        )
 
         if content_font_size < CONTENT_FONT_SIZE:
             print(f"📐 Reduced content font to {content_font_size}px to maintain {BOTTOM_MARGIN}px bottom margin (content ends at y={int(content_bottom_y)})")
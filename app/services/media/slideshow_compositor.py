@@ -24,6 +24,11 @@ from typing import Optional
 
 from PIL import Image, ImageDraw, ImageFont
 
+from app.utils.cancellation import Cancelled, run_subprocess
+from app.services.media.asset_cache import get_brand_asset_cache
+from app.utils.compositing import circular_mask, cover_fit, hex_to_rgb
+from app.utils.fonts import text_width, truetype_cached
+
 logger = logging.getLogger(__name__)
 
 W, H = 1080, 1920
@@ -241,30 +246,24 @@ class SlideshowCompositor:
         header_x = padding_left
         logo_bottom = cursor_y
 
-        if show_logo and logo_path and Path(logo_path).exists():
-            try:
-                logo = Image.open(logo_path).convert("RGBA")
-                logo = logo.resize((logo_size, logo_size), Image.LANCZOS)
-                # Circular mask
-                mask = Image.new("L", (logo_size, logo_size), 0)
-                mask_draw = ImageDraw.Draw(mask)
-                mask_draw.ellipse((0, 0, logo_size, logo_size), fill=255)
-                # White circle border
-                border_w = max(1, logo_size // 40)
-                draw.ellipse(
-                    (header_x - border_w, cursor_y - border_w,
-                     header_x + logo_size + border_w, cursor_y + logo_size + border_w),
-                    outline=(255, 255, 255), width=border_w
-                )
-                overlay.paste(logo, (header_x, cursor_y), mask)
-                logo_bottom = cursor_y + logo_size
-                header_x += logo_size + int(12 * header_scale)
-            except Exception as e:
-                logger.warning(f"[SlideshowCompositor] Logo load failed: {e}")
+        logo = None
+        if show_logo and logo_path:
+            logo = get_brand_asset_cache().image(logo_path, (logo_size, logo_size))
+        if logo is not None:
+            # White circle border
+            border_w = max(1, logo_size // 40)
+            draw.ellipse(
+                (header_x - border_w, cursor_y - border_w,
+                 header_x + logo_size + border_w, cursor_y + logo_size + border_w),
+                outline=(255, 255, 255), width=border_w
+            )
+            overlay.paste(logo, (header_x, cursor_y), circular_mask(logo_size, inset=0))
+            logo_bottom = cursor_y + logo_size
+            header_x += logo_size + int(12 * header_scale)
 
         # Brand name + verified badge
         if brand_name:
-            name_color = self._hex_to_rgb(brand_name_color)
+            name_color = hex_to_rgb(brand_name_color)
             name_font = self._resolve_font(font_name, brand_name_size, bold=True)
             name_bbox = draw.textbbox((0, 0), brand_name, font=name_font)
             name_h = name_bbox[3] - name_bbox[1]
@@ -277,18 +276,14 @@ class SlideshowCompositor:
             # Verified badge
             badge_size = int(brand_name_size * 0.85)
             badge_x = header_x + name_w + int(4 * header_scale)
-            if VERIFIED_BADGE_PATH.exists():
-                try:
-                    badge = Image.open(VERIFIED_BADGE_PATH).convert("RGBA")
-                    badge = badge.resize((badge_size, badge_size), Image.LANCZOS)
-                    badge_y = name_y + (name_h - badge_size) // 2
-                    overlay.paste(badge, (badge_x, badge_y), badge)
-                except Exception:
-                    pass
+            badge = get_brand_asset_cache().image(VERIFIED_BADGE_PATH, (badge_size, badge_size))
+            if badge is not None:
+                badge_y = name_y + (name_h - badge_size) // 2
+                overlay.paste(badge, (badge_x, badge_y), badge)
 
             # Handle below name
             if show_handle and handle:
-                h_color = self._hex_to_rgb(handle_color)
+                h_color = hex_to_rgb(handle_color)
                 h_font = self._resolve_font(font_name, handle_size_val, bold=False)
                 handle_text = handle if handle.startswith("@") else f"@{handle}"
                 draw.text((header_x, name_y + name_h + 4), handle_text, fill=h_color, font=h_font)
@@ -297,7 +292,7 @@ class SlideshowCompositor:
 
         # ── Text Content (word-wrapped paragraph) ─────────────
         text_font = self._resolve_font(font_name, font_size, bold=font_bold)
-        text_color = self._hex_to_rgb(self._get(design, "reel_text_color"))
+        text_color = hex_to_rgb(self._get(design, "reel_text_color"))
         line_height = int(font_size * 1.45)
 
         # Join lines into a single paragraph, then word-wrap
@@ -331,7 +326,7 @@ class SlideshowCompositor:
         canvas = Image.new("RGB", (W, H), (0, 0, 0))
         try:
             img = Image.open(image_path).convert("RGB")
-            img = self._cover_fit(img, box_width, box_height)
+            img = cover_fit(img, box_width, box_height)
             # Round corners
             img = self._round_corners(img, radius=20)
             canvas.paste(img, (box_x, box_y))
@@ -429,9 +424,7 @@ class SlideshowCompositor:
         ])
 
         try:
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=120
-            )
+            result = run_subprocess(cmd, text=True, timeout=120)
             if result.returncode != 0:
                 logger.error(
                     f"[SlideshowCompositor] FFmpeg failed: {result.stderr[-500:]}"
@@ -441,6 +434,8 @@ class SlideshowCompositor:
         except subprocess.TimeoutExpired:
             logger.error("[SlideshowCompositor] FFmpeg timed out (120s)")
             return False
+        except Cancelled:
+            raise
         except Exception as e:
             logger.error(f"[SlideshowCompositor] FFmpeg error: {e}")
             return False
@@ -453,14 +448,14 @@ class SlideshowCompositor:
         if ttf_name:
             font_path = Path("assets/fonts") / ttf_name
             try:
-                return ImageFont.truetype(str(font_path), size)
+                return truetype_cached(str(font_path), size)
             except Exception:
                 pass
 
         # Try direct filename (legacy: "Poppins-Bold.ttf")
         font_path = Path("assets/fonts") / name
         try:
-            return ImageFont.truetype(str(font_path), size)
+            return truetype_cached(str(font_path), size)
         except Exception:
             pass
 
@@ -470,7 +465,7 @@ class SlideshowCompositor:
             "assets/fonts/Poppins-Bold.ttf",
         ]:
             try:
-                return ImageFont.truetype(fallback, size)
+                return truetype_cached(fallback, size)
             except Exception:
                 continue
         return ImageFont.load_default()
@@ -483,8 +478,7 @@ class SlideshowCompositor:
 
         for word in words:
             test = f"{current_line} {word}".strip()
-            bbox = draw.textbbox((0, 0), test, font=font)
-            if bbox[2] - bbox[0] <= max_width:
+            if text_width(font, test) <= max_width:
                 current_line = test
             else:
                 if current_line:
@@ -496,18 +490,6 @@ class SlideshowCompositor:
 
         return lines
 
-    def _cover_fit(self, img: Image.Image, target_w: int, target_h: int) -> Image.Image:
-        """Scale image to cover target dimensions, then center-crop."""
-        ratio_w = target_w / img.width
-        ratio_h = target_h / img.height
-        scale = max(ratio_w, ratio_h)
-        new_w = int(img.width * scale)
-        new_h = int(img.height * scale)
-        img = img.resize((new_w, new_h), Image.LANCZOS)
-        left = (new_w - target_w) // 2
-        top = (new_h - target_h) // 2
-        return img.crop((left, top, left + target_w, top + target_h))
-
     def _round_corners(self, img: Image.Image, radius: int = 20) -> Image.Image:
         """Apply rounded corners to an image."""
         img = img.convert("RGBA")
@@ -518,15 +500,6 @@ class SlideshowCompositor:
         result.paste(img, mask=mask)
         return result.convert("RGB")
 
-    @staticmethod
-    def _hex_to_rgb(hex_color: str) -> tuple:
-        """Convert hex color string to RGB tuple."""
-        try:
-            hc = hex_color.lstrip("#")
-            return tuple(int(hc[i:i+2], 16) for i in (0, 2, 4))
-        except Exception:
-            return (255, 255, 255)
-
     def _get(self, design, key: str):
         """Get a design value with fallback to defaults."""
         if design and hasattr(design, key):
@@ -16,6 +16,18 @@ from typing import Optional
 
 from PIL import Image, ImageDraw, ImageFont
 
+from app.services.media.asset_cache import get_brand_asset_cache
+from app.utils.compositing import (
+    apply_vertical_gradient,
+    circular_mask,
+    cover_fit,
+    draw_horizontal_fade_line,
+    greedy_wrap,
+    hex_to_rgb,
+    paste_centered_lines,
+)
+from app.utils.fonts import fit_largest_size, truetype_cached
+
 logger = logging.getLogger(__name__)
 
 W, H = 1080, 1920
@@ -50,6 +62,16 @@ LINE_LOGO_GAP = 20    # px between divider line end and logo
 DIVIDER_TITLE_GAP = 24  # px between divider and title top
 
 
+def bottom_overlay_curve(intensity: float) -> tuple:
+    """Clear top 35%, fade in to 30% of ``intensity`` at 65%, then ramp to full
+    ``intensity`` at the bottom (segments as in app/utils/compositing.py)."""
+    return (
+        (0.35, 0.0, 0.0),
+        (0.65, 0.0, intensity * 0.3),
+        (1.00, intensity * 0.3, intensity * 0.7),
+    )
+
+
 class ThumbnailCompositor:
     """Composes Instagram reel thumbnails matching the design editor layout."""
 
@@ -85,31 +107,13 @@ class ThumbnailCompositor:
         canvas = Image.new("RGB", (W, H), (0, 0, 0))
         try:
             main_img = Image.open(main_image_path).convert("RGB")
-            main_img = self._cover_fit(main_img, W, H)
+            main_img = cover_fit(main_img, W, H)
             canvas.paste(main_img, (0, 0))
         except Exception as e:
             logger.error(f"[ThumbnailCompositor] Failed to load main image: {e}")
 
         # 2. Dark gradient overlay from bottom
-        overlay_alpha = (overlay_opacity + 20) / 100
-        gradient = Image.new("RGBA", (W, H), (0, 0, 0, 0))
-        for y in range(H):
-            # Progress from bottom (0.0 = top, 1.0 = bottom)
-            frac = y / H
-            if frac < 0.35:
-                alpha = 0
-            elif frac < 0.65:
-                # Fade in from 35% to 65%
-                t = (frac - 0.35) / 0.30
-                alpha = int(255 * overlay_alpha * 0.3 * t)
-            else:
-                # Solid from 65% to 100%
-                t = (frac - 0.65) / 0.35
-                alpha = int(255 * overlay_alpha * (0.3 + 0.7 * t))
-            alpha = min(alpha, 255)  # clamp for >100% intensity
-            # Draw full row at once (much faster than putpixel)
-            gradient.paste(Image.new("RGBA", (W, 1), (0, 0, 0, alpha)), (0, y))
-        canvas = Image.alpha_composite(canvas.convert("RGBA"), gradient).convert("RGB")
+        apply_vertical_gradient(canvas, bottom_overlay_curve((overlay_opacity + 20) / 100))
         draw = ImageDraw.Draw(canvas)
 
         # 3. Auto-size title to fit 2-3 lines within available width
@@ -141,15 +145,12 @@ class ThumbnailCompositor:
             )
 
         # 5. Title text (centered, ALL CAPS)
-        title_color_rgb = self._hex_to_rgb(title_color)
-        for i, line in enumerate(auto_lines):
-            text_bbox = draw.textbbox((0, 0), line, font=font)
-            text_w = text_bbox[2] - text_bbox[0]
-            x = (W - text_w) // 2
-            y = title_top_y + i * line_height
-            # Text shadow for depth
-            draw.text((x + 2, y + 2), line, fill=(0, 0, 0), font=font)
-            draw.text((x, y), line, fill=title_color_rgb, font=font)
+        title_color_rgb = hex_to_rgb(title_color, default=(255, 215, 0))
+        # Text shadow for depth
+        paste_centered_lines(
+            draw, auto_lines, font, W, title_top_y, line_height,
+            fill=title_color_rgb, shadow=(0, 0, 0),
+        )
 
         # 6. Save
         output = Path(tempfile.mktemp(suffix="_thumb.jpg"))
@@ -163,16 +164,9 @@ class ThumbnailCompositor:
         logo_shape: str = "square",
     ):
         """Draw divider line with centered logo."""
-        has_logo = logo_path and Path(logo_path).exists()
         logo_img = None
-
-        if has_logo:
-            try:
-                logo_img = Image.open(logo_path).convert("RGBA")
-                logo_img = logo_img.resize((logo_size, logo_size), Image.LANCZOS)
-            except Exception as e:
-                logger.warning(f"[ThumbnailCompositor] Logo load failed: {e}")
-                logo_img = None
+        if logo_path:
+            logo_img = get_brand_asset_cache().image(logo_path, (logo_size, logo_size))
 
         if logo_img:
             logo_x = (W - logo_size) // 2
@@ -183,8 +177,8 @@ class ThumbnailCompositor:
             right_start = logo_x + logo_size + LINE_LOGO_GAP
 
             if style == "gradient":
-                self._draw_gradient_line(draw, SIDE_PADDING, left_end, line_y, thickness, from_transparent=True)
-                self._draw_gradient_line(draw, right_start, W - SIDE_PADDING, line_y, thickness, from_transparent=False)
+                draw_horizontal_fade_line(canvas, SIDE_PADDING, left_end, line_y, thickness, from_transparent=True)
+                draw_horizontal_fade_line(canvas, right_start, W - SIDE_PADDING, line_y, thickness, from_transparent=False)
             else:
                 draw.line([(SIDE_PADDING, line_y), (left_end, line_y)], fill=(255, 255, 255), width=thickness)
                 draw.line([(right_start, line_y), (W - SIDE_PADDING, line_y)], fill=(255, 255, 255), width=thickness)
@@ -192,9 +186,7 @@ class ThumbnailCompositor:
             # Paste logo — apply circular mask if shape is circular
             canvas_rgba = canvas.convert("RGBA")
             if logo_shape == "circular":
-                mask = Image.new("L", (logo_size, logo_size), 0)
-                mask_draw = ImageDraw.Draw(mask)
-                mask_draw.ellipse((0, 0, logo_size, logo_size), fill=255)
+                mask = circular_mask(logo_size, inset=0)
                 # White circle border
                 border_w = max(1, logo_size // 40)
                 draw.ellipse(
@@ -211,29 +203,11 @@ class ThumbnailCompositor:
             line_y = center_y
             if style == "gradient":
                 half = W // 2
-                self._draw_gradient_line(draw, SIDE_PADDING, half, line_y, thickness, from_transparent=True)
-                self._draw_gradient_line(draw, half, W - SIDE_PADDING, line_y, thickness, from_transparent=False)
+                draw_horizontal_fade_line(canvas, SIDE_PADDING, half, line_y, thickness, from_transparent=True)
+                draw_horizontal_fade_line(canvas, half, W - SIDE_PADDING, line_y, thickness, from_transparent=False)
             elif style != "none":
                 draw.line([(SIDE_PADDING, line_y), (W - SIDE_PADDING, line_y)], fill=(255, 255, 255), width=thickness)
 
-    def _draw_gradient_line(
-        self, draw: ImageDraw.ImageDraw, x1: int, x2: int,
-        y: int, thickness: int, from_transparent: bool,
-    ):
-        """Draw a horizontal gradient line (transparent→white or white→transparent)."""
-        width = x2 - x1
-        if width <= 0:
-            return
-        for i in range(width):
-            t = i / max(width - 1, 1)
-            if from_transparent:
-                alpha = int(255 * 0.7 * t)
-            else:
-                alpha = int(255 * 0.7 * (1 - t))
-            x = x1 + i
-            color = (alpha, alpha, alpha)
-            draw.line([(x, y - thickness // 2), (x, y + thickness // 2)], fill=color, width=1)
-
     def _auto_fit_title(
         self, draw: ImageDraw.ImageDraw, title: str,
         font_name: str, max_width: int,
@@ -245,60 +219,24 @@ class ThumbnailCompositor:
         """
         wrap_width = int(max_width * 0.98)
 
-        # First pass: try to fit in 2 lines
-        for size in range(300, 19, -2):
-            font = self._load_font(font_name, size)
-            lines = self._greedy_wrap(draw, title, font, wrap_width)
-            if len(lines) <= 2:
-                final = max(20, size - 2)
-                final_font = self._load_font(font_name, final)
-                return self._greedy_wrap(draw, title, final_font, wrap_width), final
+        def largest_size_within(max_lines: int):
+            return fit_largest_size(
+                20, 300,
+                lambda s: len(greedy_wrap(title, self._load_font(font_name, s), wrap_width)) <= max_lines,
+                step=2,
+            )
 
-        # Second pass: text too long for 2 lines, try 3
-        for size in range(300, 19, -2):
-            font = self._load_font(font_name, size)
-            lines = self._greedy_wrap(draw, title, font, wrap_width)
-            if len(lines) <= 3:
+        # First pass: try to fit in 2 lines; second pass: text too long for 2, try 3
+        for max_lines in (2, 3):
+            size = largest_size_within(max_lines)
+            if size is not None:
                 final = max(20, size - 2)
                 final_font = self._load_font(font_name, final)
-                return self._greedy_wrap(draw, title, final_font, wrap_width), final
+                return greedy_wrap(title, final_font, wrap_width), final
 
         # Fallback: 4 lines at minimum size
         font = self._load_font(font_name, 20)
-        return self._greedy_wrap(draw, title, font, wrap_width), 20
-
-    def _greedy_wrap(
-        self, draw: ImageDraw.ImageDraw, text: str,
-        font: ImageFont.FreeTypeFont, max_width: int,
-    ) -> list[str]:
-        """Word-wrap text greedily to fit within max_width pixels."""
-        words = text.split()
-        lines = []
-        current = ""
-        for word in words:
-            test = f"{current} {word}".strip()
-            bbox = draw.textbbox((0, 0), test, font=font)
-            if bbox[2] - bbox[0] <= max_width:
-                current = test
-            else:
-                if current:
-                    lines.append(current)
-                current = word
-        if current:
-            lines.append(current)
-        return lines
-
-    def _cover_fit(self, img: Image.Image, target_w: int, target_h: int) -> Image.Image:
-        """Scale image to cover target dimensions, then center-crop."""
-        ratio_w = target_w / img.width
-        ratio_h = target_h / img.height
-        scale = max(ratio_w, ratio_h)
-        new_w = int(img.width * scale)
-        new_h = int(img.height * scale)
-        img = img.resize((new_w, new_h), Image.LANCZOS)
-        left = (new_w - target_w) // 2
-        top = (new_h - target_h) // 2
-        return img.crop((left, top, left + target_w, top + target_h))
+        return greedy_wrap(title, font, wrap_width), 20
 
     def _load_font(self, name: str, size: int) -> ImageFont.FreeTypeFont:
         """Load a font from assets/fonts/, mapping display names to TTF files."""
@@ -306,30 +244,21 @@ class ThumbnailCompositor:
         if mapped:
             font_path = Path("assets/fonts") / mapped
             try:
-                return ImageFont.truetype(str(font_path), size)
+                return truetype_cached(str(font_path), size)
             except Exception:
                 pass
         # Try direct filename
         font_path = Path("assets/fonts") / name
         try:
-            return ImageFont.truetype(str(font_path), size)
+            return truetype_cached(str(font_path), size)
         except Exception:
             for fallback in ["assets/fonts/Anton-Regular.ttf", "assets/fonts/Poppins-Bold.ttf"]:
                 try:
-                    return ImageFont.truetype(fallback, size)
+                    return truetype_cached(fallback, size)
                 except Exception:
                     continue
             return ImageFont.load_default()
 
-    @staticmethod
-    def _hex_to_rgb(hex_color: str) -> tuple:
-        """Convert hex color string to RGB tuple."""
-        try:
-            hc = hex_color.lstrip("#")
-            return tuple(int(hc[i:i+2], 16) for i in (0, 2, 4))
-        except Exception:
-            return (255, 215, 0)
-
     def _get(self, design, key: str):
         """Get a design value with fallback to defaults."""
         if design and hasattr(design, key):
@@ -6,6 +6,7 @@ import random
 import tempfile
 from pathlib import Path
 from typing import Optional
+from app.utils.cancellation import Cancelled
 from app.utils.ffmpeg import create_video_from_image, verify_ffmpeg_installation, get_audio_duration
 from app.core.constants import VIDEO_DURATION
 
@@ -116,6 +117,8 @@ class VideoGenerator:
 
             return output_path
 
+        except Cancelled:
+            raise
         except Exception as e:
             raise RuntimeError(f"Failed to generate video: {str(e)}")
         finally:
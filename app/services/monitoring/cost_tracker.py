@@ -5,14 +5,32 @@ Uses contextvars to propagate user_id through the call chain.
 Call set_current_user(user_id) at entry points (API handlers, Toby ticks).
 Then record_deepseek_call() / record_deapi_call() pick it up automatically.
 
+Recording is write-behind: record_*() only adds to an in-memory
+accumulator keyed by (user_id, date). A background flusher writes all
+pending deltas every COST_FLUSH_SECONDS (default 10) with one
+INSERT ... ON CONFLICT (user_id, date) DO UPDATE SET x = x + excluded.x,
+and flush_costs() runs again at shutdown. get_today_spend_usd() adds the
+unflushed deltas to the stored row, so budget checks stay exact.
+
 Daily records are kept for 30 days, then aggregated into monthly summaries.
+
+record_llm_cache_hit() / record_llm_cache_miss() count completions served
+by the LLM response cache (app/utils/llm_cache.py) and the DeepSeek spend
+they avoided; those counters are process-local, see get_llm_cache_stats().
 """
 
+import atexit
 import contextvars
+import os
+import threading
+import uuid
+from collections import defaultdict
 from datetime import date, datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
-from app.db_connection import get_db_session
+from sqlalchemy import text
+
+from app.db_connection import engine, get_db_session
 from app.models.user_costs import UserCostDaily, UserCostMonthly
 
 # ─── Context variable for current user ───────────────────────────────────────
@@ -47,33 +65,132 @@ FREEPIK_COST_PER_IMAGE = 0.05  # ~€0.05 per image
 PEXELS_COST_PER_SEARCH = 0.00  # Pexels API is free
 
 
-def _get_or_create_daily(db, user_id: str, target_date: date) -> UserCostDaily:
-    """Get or create a daily cost record for a user."""
-    record = (
-        db.query(UserCostDaily)
-        .filter(UserCostDaily.user_id == user_id, UserCostDaily.date == target_date)
-        .first()
-    )
-    if not record:
-        record = UserCostDaily(
-            user_id=user_id,
-            date=target_date,
-            deepseek_calls=0,
-            deepseek_input_tokens=0,
-            deepseek_output_tokens=0,
-            deepseek_cost_usd=0.0,
-            deapi_calls=0,
-            deapi_cost_usd=0.0,
-            freepik_calls=0,
-            freepik_cost_usd=0.0,
-            searchapi_calls=0,
-            searchapi_cost_usd=0.0,
-            reels_generated=0,
-            carousels_generated=0,
-        )
-        db.add(record)
-        db.flush()
-    return record
+# ─── Write-behind accumulator ────────────────────────────────────────────────
+
+COST_FLUSH_SECONDS = float(os.getenv("COST_FLUSH_SECONDS", "10"))
+
+_COUNTER_FIELDS = (
+    "deepseek_calls", "deepseek_input_tokens", "deepseek_output_tokens", "deepseek_cost_usd",
+    "deapi_calls", "deapi_cost_usd",
+    "freepik_calls", "freepik_cost_usd",
+    "searchapi_calls", "searchapi_cost_usd",
+    "reels_generated", "carousels_generated",
+)
+_COST_FIELDS = ("deepseek_cost_usd", "deapi_cost_usd", "freepik_cost_usd", "searchapi_cost_usd")
+
+_UPSERT_DAILY_SQL = text(f"""
+    INSERT INTO user_cost_daily (id, user_id, date, {", ".join(_COUNTER_FIELDS)}, created_at, updated_at)
+    VALUES (gen_random_uuid(), CAST(:user_id AS uuid), :date, {", ".join(":" + f for f in _COUNTER_FIELDS)}, now(), now())
+    ON CONFLICT (user_id, date) DO UPDATE SET
+        {", ".join(f"{f} = COALESCE(user_cost_daily.{f}, 0) + excluded.{f}" for f in _COUNTER_FIELDS)},
+        updated_at = now()
+""")
+
+_pending: Dict[Tuple[str, date], Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+_pending_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_flusher: Optional[threading.Thread] = None
+_flusher_stop = threading.Event()
+
+
+def _accumulate(user_id: str, **deltas) -> None:
+    """Add counter deltas for today's row; the flusher persists them."""
+    try:
+        uuid.UUID(str(user_id))
+    except ValueError:
+        return  # user_cost_daily.user_id is a UUID — one bad id would poison the batch
+    key = (str(user_id), date.today())
+    with _pending_lock:
+        row = _pending[key]
+        for field, delta in deltas.items():
+            row[field] += delta
+    _ensure_flusher()
+
+
+def flush_costs() -> int:
+    """Write all pending deltas in one upsert batch. Returns rows written.
+
+    On failure the deltas are merged back and retried on the next flush.
+    """
+    with _flush_lock:
+        with _pending_lock:
+            if not _pending:
+                return 0
+            batch = {key: dict(row) for key, row in _pending.items()}
+            _pending.clear()
+
+        params = [
+            {
+                "user_id": uid,
+                "date": day,
+                **{f: (row.get(f, 0.0) if f in _COST_FIELDS else int(row.get(f, 0))) for f in _COUNTER_FIELDS},
+            }
+            for (uid, day), row in batch.items()
+        ]
+        try:
+            with engine.begin() as conn:
+                conn.execute(_UPSERT_DAILY_SQL, params)
+        except Exception as e:
+            with _pending_lock:
+                for key, row in batch.items():
+                    for field, delta in row.items():
+                        _pending[key][field] += delta
+            print(f"⚠️ Cost tracking flush failed ({len(batch)} row(s) kept for retry): {e}", flush=True)
+            return 0
+        return len(params)
+
+
+def _flush_loop() -> None:
+    while not _flusher_stop.wait(COST_FLUSH_SECONDS):
+        flush_costs()
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is not None:
+        return
+    with _pending_lock:
+        if _flusher is not None:
+            return
+        _flusher = threading.Thread(target=_flush_loop, name="cost-flusher", daemon=True)
+        _flusher.start()
+
+
+def shutdown_cost_tracker() -> None:
+    """Stop the background flusher and write whatever is still pending."""
+    _flusher_stop.set()
+    flush_costs()
+
+
+atexit.register(flush_costs)
+
+
+def get_pending_costs(user_id: str, target_date: Optional[date] = None) -> Dict[str, float]:
+    """Unflushed counter deltas for a user's day (empty dict if none)."""
+    key = (str(user_id), target_date or date.today())
+    with _pending_lock:
+        row = _pending.get(key)
+        return dict(row) if row else {}
+
+
+def get_today_spend_usd(user_id: str) -> float:
+    """Today's total tracked spend: the stored daily row plus unflushed deltas."""
+    today = date.today()
+    pending = get_pending_costs(user_id, today)
+    stored = 0.0
+    try:
+        with engine.connect() as conn:
+            stored = conn.execute(
+                text(f"""
+                    SELECT COALESCE({" + ".join(f"COALESCE({f}, 0)" for f in _COST_FIELDS)}, 0)
+                    FROM user_cost_daily
+                    WHERE user_id = CAST(:user_id AS uuid) AND date = :date
+                """),
+                {"user_id": str(user_id), "date": today},
+            ).scalar() or 0.0
+    except Exception as e:
+        print(f"⚠️ Cost lookup failed: {e}", flush=True)
+    return float(stored) + sum(pending.get(f, 0.0) for f in _COST_FIELDS)
 
 
 def record_deepseek_call(
@@ -86,21 +203,68 @@ def record_deepseek_call(
     if not uid:
         return  # No user context — skip tracking
 
-    cost = (
+    _accumulate(
+        uid,
+        deepseek_calls=1,
+        deepseek_input_tokens=input_tokens,
+        deepseek_output_tokens=output_tokens,
+        deepseek_cost_usd=_deepseek_cost(input_tokens, output_tokens),
+    )
+
+
+def _deepseek_cost(input_tokens: int, output_tokens: int) -> float:
+    return (
         (input_tokens / 1_000_000) * DEEPSEEK_INPUT_COST_PER_M
         + (output_tokens / 1_000_000) * DEEPSEEK_OUTPUT_COST_PER_M
     )
 
-    try:
-        with get_db_session() as db:
-            record = _get_or_create_daily(db, uid, date.today())
-            record.deepseek_calls = (record.deepseek_calls or 0) + 1
-            record.deepseek_input_tokens = (record.deepseek_input_tokens or 0) + input_tokens
-            record.deepseek_output_tokens = (record.deepseek_output_tokens or 0) + output_tokens
-            record.deepseek_cost_usd = (record.deepseek_cost_usd or 0.0) + cost
-            record.updated_at = datetime.now(timezone.utc)
-    except Exception as e:
-        print(f"⚠️ Cost tracking (deepseek) failed: {e}", flush=True)
+
+# ─── LLM response cache counters ─────────────────────────────────────────────
+# Process-local, per callsite (app/utils/llm_cache.py). A hit is a DeepSeek
+# call that never happened, so it is not added to anyone's daily spend —
+# these counters report what it would have cost.
+
+_llm_cache_counters: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+_llm_cache_lock = threading.Lock()
+
+
+def record_llm_cache_hit(callsite: str, input_tokens: int = 0, output_tokens: int = 0) -> None:
+    """Record a completion served from the LLM cache instead of DeepSeek."""
+    with _llm_cache_lock:
+        row = _llm_cache_counters[callsite]
+        row["hits"] += 1
+        row["tokens_saved"] += input_tokens + output_tokens
+        row["cost_saved_usd"] += _deepseek_cost(input_tokens, output_tokens)
+
+
+def record_llm_cache_miss(callsite: str) -> None:
+    """Record a cacheable completion that had to go to DeepSeek."""
+    with _llm_cache_lock:
+        _llm_cache_counters[callsite]["misses"] += 1
+
+
+def get_llm_cache_stats() -> dict:
+    """Hits, misses, hit rate and tokens/USD saved per callsite and in total."""
+    def _summary(row: Dict[str, float]) -> dict:
+        hits, misses = int(row.get("hits", 0)), int(row.get("misses", 0))
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+            "tokens_saved": int(row.get("tokens_saved", 0)),
+            "cost_saved_usd": round(row.get("cost_saved_usd", 0.0), 6),
+        }
+
+    with _llm_cache_lock:
+        rows = {callsite: dict(row) for callsite, row in _llm_cache_counters.items()}
+    totals: Dict[str, float] = defaultdict(float)
+    for row in rows.values():
+        for field, value in row.items():
+            totals[field] += value
+    return {
+        "callsites": {callsite: _summary(row) for callsite, row in sorted(rows.items())},
+        "total": _summary(totals),
+    }
 
 
 def record_deapi_call(user_id: Optional[str] = None) -> None:
@@ -108,15 +272,7 @@ def record_deapi_call(user_id: Optional[str] = None) -> None:
     uid = user_id or get_current_user_id()
     if not uid:
         return
-
-    try:
-        with get_db_session() as db:
-            record = _get_or_create_daily(db, uid, date.today())
-            record.deapi_calls = (record.deapi_calls or 0) + 1
-            record.deapi_cost_usd = (record.deapi_cost_usd or 0.0) + DEAPI_COST_PER_IMAGE
-            record.updated_at = datetime.now(timezone.utc)
-    except Exception as e:
-        print(f"⚠️ Cost tracking (deapi) failed: {e}", flush=True)
+    _accumulate(uid, deapi_calls=1, deapi_cost_usd=DEAPI_COST_PER_IMAGE)
 
 
 def record_freepik_call(user_id: Optional[str] = None) -> None:
@@ -124,15 +280,7 @@ def record_freepik_call(user_id: Optional[str] = None) -> None:
     uid = user_id or get_current_user_id()
     if not uid:
         return
-
-    try:
-        with get_db_session() as db:
-            record = _get_or_create_daily(db, uid, date.today())
-            record.freepik_calls = (getattr(record, 'freepik_calls', None) or 0) + 1
-            record.freepik_cost_usd = (getattr(record, 'freepik_cost_usd', None) or 0.0) + FREEPIK_COST_PER_IMAGE
-            record.updated_at = datetime.now(timezone.utc)
-    except Exception as e:
-        print(f"⚠️ Cost tracking (freepik) failed: {e}", flush=True)
+    _accumulate(uid, freepik_calls=1, freepik_cost_usd=FREEPIK_COST_PER_IMAGE)
 
 
 def record_searchapi_call(user_id: Optional[str] = None) -> None:
@@ -154,16 +302,10 @@ def record_content_generated(
     if not uid:
         return
 
-    try:
-        with get_db_session() as db:
-            record = _get_or_create_daily(db, uid, date.today())
-            if content_type == "reel":
-                record.reels_generated = (record.reels_generated or 0) + 1
-            elif content_type in ("carousel", "post"):
-                record.carousels_generated = (record.carousels_generated or 0) + 1
-            record.updated_at = datetime.now(timezone.utc)
-    except Exception as e:
-        print(f"⚠️ Cost tracking (content) failed: {e}", flush=True)
+    if content_type == "reel":
+        _accumulate(uid, reels_generated=1)
+    elif content_type in ("carousel", "post"):
+        _accumulate(uid, carousels_generated=1)
 
 
 # ─── Query functions ──────────────────────────────────────────────────────────
@@ -175,6 +317,7 @@ def get_user_costs(user_id: str, period: str = "month") -> dict:
     period: "day", "week", "month", "all"
     Returns daily breakdown + totals.
     """
+    flush_costs()
     try:
         with get_db_session() as db:
             today = date.today()
@@ -298,6 +441,7 @@ def aggregate_old_daily_records() -> int:
 
     Returns number of daily records archived.
     """
+    flush_costs()
     cutoff = date.today() - timedelta(days=30)
     archived = 0
 
@@ -0,0 +1,180 @@
+"""
+Event-loop health for the API process.
+
+uvicorn serves every tenant from one asyncio loop, so any blocking call
+inside an ``async def`` (sync SQLAlchemy, requests, Supabase) stalls all
+in-flight requests. Route handlers that do blocking I/O are plain ``def``
+— FastAPI runs those on anyio's worker threads — and the few that must
+stay async hand blocking work to ``asyncio.to_thread``. This module bounds
+both thread pools and measures how late the loop wakes up, so a handler
+that slips back into blocking the loop shows up as lag.
+
+  configure_threadpools() — size anyio's limiter and the loop's default
+      executor (call from startup, on the loop).
+  start_loop_lag_monitor() / stop_loop_lag_monitor() — background task
+      that sleeps a fixed interval and records how late each wakeup was.
+  event_loop_stats() — lag histogram and threadpool occupancy
+      (exposed at GET /api/admin/event-loop).
+
+Tuning (env vars):
+    API_THREADPOOL_SIZE        — worker threads for sync handlers and
+                                 asyncio.to_thread (default 40)
+    LOOP_LAG_INTERVAL_SECONDS  — probe interval (default 0.5)
+    LOOP_LAG_WARN_MS           — log a warning above this lag (default 250)
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "40"))
+LAG_INTERVAL_S = float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", "0.5"))
+LAG_WARN_MS = float(os.getenv("LOOP_LAG_WARN_MS", "250"))
+# At most one lag warning per this many seconds
+_WARN_EVERY_S = 30.0
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +inf)
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_stats_lock = threading.Lock()
+_buckets = [0] * (len(LAG_BUCKETS_MS) + 1)
+_samples = 0
+_total_ms = 0.0
+_max_ms = 0.0
+_last_ms = 0.0
+_last_warn = 0.0
+
+_task: Optional[asyncio.Task] = None
+_interval_s = LAG_INTERVAL_S
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def configure_threadpools(size: int = THREADPOOL_SIZE) -> None:
+    """Bound the threads used by sync route handlers and asyncio.to_thread.
+
+    Sync ``def`` handlers run through anyio's default limiter; to_thread
+    uses the loop's default executor. Both get the same cap so a burst of
+    slow analytics queries queues instead of spawning threads that would
+    only wait on the 8-connection DB pool.
+    """
+    global _executor
+    import anyio.to_thread
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = size
+    _executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="api-offload")
+    asyncio.get_running_loop().set_default_executor(_executor)
+
+
+def _record(lag_ms: float) -> None:
+    global _samples, _total_ms, _max_ms, _last_ms
+    index = len(LAG_BUCKETS_MS)
+    for i, bound in enumerate(LAG_BUCKETS_MS):
+        if lag_ms <= bound:
+            index = i
+            break
+    with _stats_lock:
+        _buckets[index] += 1
+        _samples += 1
+        _total_ms += lag_ms
+        _max_ms = max(_max_ms, lag_ms)
+        _last_ms = lag_ms
+
+
+def _percentile(q: float) -> Optional[float]:
+    """Upper bound of the bucket holding the q-th quantile."""
+    if not _samples:
+        return None
+    target = q * _samples
+    seen = 0
+    for i, n in enumerate(_buckets):
+        seen += n
+        if seen >= target:
+            return min(float(LAG_BUCKETS_MS[i]), round(_max_ms, 1)) if i < len(LAG_BUCKETS_MS) else round(_max_ms, 1)
+    return round(_max_ms, 1)
+
+
+async def _probe_loop(interval: float) -> None:
+    global _last_warn
+    while True:
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lag_ms = max(0.0, (time.perf_counter() - expected) * 1000)
+        _record(lag_ms)
+        if lag_ms >= LAG_WARN_MS and time.monotonic() - _last_warn >= _WARN_EVERY_S:
+            _last_warn = time.monotonic()
+            logger.warning("Event loop lag %.0f ms — a coroutine is blocking the loop", lag_ms)
+
+
+def start_loop_lag_monitor(interval: float = LAG_INTERVAL_S) -> None:
+    """Start the lag probe on the running loop (idempotent)."""
+    global _task, _interval_s
+    if _task is not None and not _task.done():
+        return
+    _interval_s = interval
+    _task = asyncio.get_running_loop().create_task(_probe_loop(interval), name="loop-lag-monitor")
+
+
+def stop_loop_lag_monitor() -> None:
+    """Cancel the lag probe and release the offload executor (shutdown)."""
+    global _task, _executor
+    if _task is not None:
+        _task.cancel()
+        _task = None
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def event_loop_stats() -> Dict[str, Any]:
+    """Loop lag histogram plus how many offload threads are busy."""
+    with _stats_lock:
+        lag = {
+            "samples": _samples,
+            "last_ms": round(_last_ms, 1),
+            "avg_ms": round(_total_ms / _samples, 1) if _samples else None,
+            "p50_ms": _percentile(0.50),
+            "p99_ms": _percentile(0.99),
+            "max_ms": round(_max_ms, 1),
+            "histogram": {
+                **{f"le_{b}ms": _buckets[i] for i, b in enumerate(LAG_BUCKETS_MS)},
+                "inf": _buckets[-1],
+            },
+        }
+
+    threadpool: Dict[str, Any] = {"size": THREADPOOL_SIZE}
+    try:
+        import anyio.to_thread
+
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        threadpool.update(
+            size=int(limiter.total_tokens),
+            sync_handlers_busy=limiter.borrowed_tokens,
+            sync_handlers_waiting=limiter.statistics().tasks_waiting,
+        )
+    except Exception:
+        # Called off the loop (no anyio context) — report the configured size only
+        pass
+    if _executor is not None:
+        threadpool["to_thread_workers"] = len(_executor._threads)
+
+    return {
+        "lag": lag,
+        "threadpool": threadpool,
+        "probe_interval_s": _interval_s,
+        "warn_ms": LAG_WARN_MS,
+        "monitor_running": _task is not None and not _task.done(),
+    }
+
+
+def reset_event_loop_stats() -> None:
+    global _samples, _total_ms, _max_ms, _last_ms
+    with _stats_lock:
+        for i in range(len(_buckets)):
+            _buckets[i] = 0
+        _samples = 0
+        _total_ms = _max_ms = _last_ms = 0.0
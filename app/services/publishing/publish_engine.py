@@ -0,0 +1,250 @@
+"""
+Concurrent publish engine for the auto-publisher.
+
+check_and_publish() used to walk every due schedule one by one, and each
+schedule called Instagram, Facebook, YouTube, TikTok and Bluesky in turn.
+With 40+ brands sharing a slot hour the tail of the batch went out minutes
+late and the 5-minute tick overlapped itself.
+
+The engine fans out on two levels:
+  1. Schedules — a bounded pool runs many schedules at once.
+  2. Platforms — each platform has its own bounded worker pool, so one slow
+     YouTube upload never holds back Instagram for the same schedule.
+
+Per-account semaphores (keyed by platform + brand) cap how many publishes
+hit the same account at once, which keeps us well inside Meta/TikTok rate
+limits even when many schedules for one brand are due together. The
+schedule thread takes the semaphore before submitting, so a platform
+worker never sits blocked on an account another schedule is using.
+
+Every schedule touches the database from its own thread and again when
+each platform result is saved, so the schedule pool is capped at half of
+the SQLAlchemy pool (DB_POOL_CAPACITY) — the other half covers those
+saves and the API.
+
+Tuning (env vars):
+    PUBLISH_SCHEDULE_WORKERS     — schedules processed concurrently (default 4,
+                                   capped at DB_POOL_CAPACITY // 2)
+    PUBLISH_WORKERS_<PLATFORM>   — per-platform pool width, e.g. PUBLISH_WORKERS_YOUTUBE=2
+    PUBLISH_ACCOUNT_CONCURRENCY  — concurrent publishes per (platform, brand) (default 1)
+"""
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Default per-platform pool widths. Video uploads (YouTube/TikTok) are
+# heavier and more quota-sensitive than Graph API container calls.
+DEFAULT_PLATFORM_WORKERS = {
+    "instagram": 8,
+    "facebook": 8,
+    "youtube": 4,
+    "tiktok": 4,
+    "bluesky": 4,
+    "threads": 4,
+}
+DEFAULT_SCHEDULE_WORKERS = 4
+DEFAULT_ACCOUNT_CONCURRENCY = 1
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass
+class PublishOutcome:
+    """Result of publishing a single schedule within a batch."""
+    schedule_id: str
+    brand: str
+    status: str
+    latency_s: float
+    error: Optional[str] = None
+
+
+@dataclass
+class PublishBatchReport:
+    """Summary of one check_and_publish batch."""
+    outcomes: List[PublishOutcome] = field(default_factory=list)
+    wall_s: float = 0.0
+
+    @property
+    def slowest(self) -> List[PublishOutcome]:
+        return sorted(self.outcomes, key=lambda o: o.latency_s, reverse=True)[:5]
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = [o.latency_s for o in self.outcomes]
+        by_status: Dict[str, int] = {}
+        for o in self.outcomes:
+            by_status[o.status] = by_status.get(o.status, 0) + 1
+        return {
+            "schedules": len(self.outcomes),
+            "wall_s": round(self.wall_s, 2),
+            "sum_latency_s": round(sum(latencies), 2),
+            "max_latency_s": round(max(latencies), 2) if latencies else 0.0,
+            "by_status": by_status,
+            "slowest": [
+                {"schedule_id": o.schedule_id, "brand": o.brand, "latency_s": round(o.latency_s, 2)}
+                for o in self.slowest
+            ],
+        }
+
+
+class PublishEngine:
+    """Bounded, per-platform worker pools for publishing due schedules."""
+
+    def __init__(self):
+        from app.db_connection import DB_POOL_CAPACITY
+
+        self.schedule_workers = min(
+            _env_int("PUBLISH_SCHEDULE_WORKERS", DEFAULT_SCHEDULE_WORKERS),
+            max(1, DB_POOL_CAPACITY // 2),
+        )
+        self.account_concurrency = _env_int("PUBLISH_ACCOUNT_CONCURRENCY", DEFAULT_ACCOUNT_CONCURRENCY)
+        self._lock = threading.Lock()
+        self._platform_pools: Dict[str, ThreadPoolExecutor] = {}
+        self._account_semaphores: Dict[tuple, threading.Semaphore] = {}
+
+    def _platform_pool(self, platform: str) -> ThreadPoolExecutor:
+        with self._lock:
+            pool = self._platform_pools.get(platform)
+            if pool is None:
+                width = _env_int(
+                    f"PUBLISH_WORKERS_{platform.upper()}",
+                    DEFAULT_PLATFORM_WORKERS.get(platform, 4),
+                )
+                pool = ThreadPoolExecutor(max_workers=width, thread_name_prefix=f"publish-{platform}")
+                self._platform_pools[platform] = pool
+            return pool
+
+    def _account_semaphore(self, platform: str, account: str) -> threading.Semaphore:
+        key = (platform, (account or "").lower())
+        with self._lock:
+            sem = self._account_semaphores.get(key)
+            if sem is None:
+                sem = threading.Semaphore(self.account_concurrency)
+                self._account_semaphores[key] = sem
+            return sem
+
+    def run_platform_calls(
+        self,
+        calls: Dict[str, Callable[[], Dict[str, Any]]],
+        account: str = "",
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run one publish call per platform concurrently and collect results.
+
+        The calling (schedule) thread takes each (platform, account)
+        semaphore — in sorted platform order, so two schedules for one
+        brand can't deadlock — and only then submits the call to the
+        platform's pool; the worker releases it when the call returns.
+        Exceptions are converted into the usual
+        ``{"success": False, "error": ...}`` result shape so callers can
+        treat every platform uniformly.
+        """
+        if not calls:
+            return {}
+
+        # Run the user-context of the caller on the worker thread too, so
+        # print() captures stay attributed to the right user in the log viewer.
+        from app.services.logging.service import get_user_id, set_user_id, clear_user_id
+        caller_user_id = get_user_id()
+
+        def _wrap(platform: str, fn: Callable[[], Dict[str, Any]], sem: threading.Semaphore):
+            def _run():
+                if caller_user_id:
+                    set_user_id(caller_user_id)
+                try:
+                    return fn()
+                except Exception as e:
+                    print(f"      ❌ {platform} publish raised: {e}", flush=True)
+                    return {"success": False, "error": str(e), "platform": platform}
+                finally:
+                    sem.release()
+                    clear_user_id()
+            return _run
+
+        futures = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        for platform in sorted(calls):
+            sem = self._account_semaphore(platform, account)
+            sem.acquire()
+            try:
+                fut = self._platform_pool(platform).submit(_wrap(platform, calls[platform], sem))
+            except RuntimeError as e:
+                # Pool shut down (process stopping) — nothing will release it
+                sem.release()
+                results[platform] = {"success": False, "error": str(e), "platform": platform}
+                continue
+            futures[fut] = platform
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+        # Preserve the caller's platform order for logs and stored results
+        return {p: results[p] for p in calls if p in results}
+
+    def publish_batch(
+        self,
+        schedules: List[Dict[str, Any]],
+        handler: Callable[[Dict[str, Any]], str],
+    ) -> PublishBatchReport:
+        """Publish a batch of due schedules concurrently.
+
+        ``handler`` publishes one schedule and returns its final status
+        ("published", "partial", "failed", ...). It must handle its own
+        errors and mark the schedule accordingly; anything it raises is
+        recorded as a failed outcome.
+        """
+        report = PublishBatchReport()
+        if not schedules:
+            return report
+
+        started = time.monotonic()
+
+        def _timed(schedule: Dict[str, Any]) -> PublishOutcome:
+            t0 = time.monotonic()
+            brand = (schedule.get("metadata") or {}).get("brand", "") or ""
+            try:
+                status = handler(schedule) or "unknown"
+                error = None
+            except Exception as e:
+                status, error = "failed", str(e)
+            return PublishOutcome(
+                schedule_id=schedule.get("schedule_id", ""),
+                brand=brand,
+                status=status,
+                latency_s=time.monotonic() - t0,
+                error=error,
+            )
+
+        width = min(self.schedule_workers, len(schedules))
+        with ThreadPoolExecutor(max_workers=width, thread_name_prefix="publish-schedule") as pool:
+            for outcome in pool.map(_timed, schedules):
+                report.outcomes.append(outcome)
+
+        report.wall_s = time.monotonic() - started
+        return report
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pools = list(self._platform_pools.values())
+            self._platform_pools.clear()
+        for pool in pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_engine: Optional[PublishEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_publish_engine() -> PublishEngine:
+    """Get or create the process-wide PublishEngine."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = PublishEngine()
+    return _engine
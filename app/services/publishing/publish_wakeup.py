@@ -0,0 +1,280 @@
+"""
+Event-driven wakeups for the auto-publisher.
+
+Instead of polling scheduled_reels every 300 seconds, the publisher sleeps
+until the earliest known ``scheduled_time`` and is woken early by Postgres
+LISTEN/NOTIFY whenever a row is scheduled, rescheduled, retried or pushed
+to "publish now".
+
+Pieces:
+  notify_publish_wakeup(db, when) — called inside the writer's transaction;
+      Postgres delivers the NOTIFY only if that transaction commits.
+  PublishWakeupService — one listener thread holding a dedicated LISTEN
+      connection (never borrowed from the pool) plus one runner thread that
+      calls the publish function. The listener keeps a single "next due"
+      deadline in memory, rebuilt from ix_scheduled_reels_status_time with
+      one MIN() query after every publish run and on (re)connect. While
+      idle it only waits on the socket — no queries.
+
+If a run leaves the earliest scheduled_time in the past (rows due but not
+claimable — e.g. the claim keeps failing), the next wakeup backs off
+exponentially instead of re-firing immediately, and runs are always at
+least PUBLISH_WAKEUP_MIN_INTERVAL_SECONDS apart.
+
+The APScheduler ``auto_publish`` interval job stays as a slow safety sweep
+in case a notification is lost (e.g. while the listener reconnects).
+
+Tuning (env vars):
+    PUBLISH_WAKEUP_MAX_IDLE_SECONDS     — longest sleep without re-reading the next due time (default 900)
+    PUBLISH_WAKEUP_MIN_INTERVAL_SECONDS — minimum gap between publish runs (default 1)
+    PUBLISH_WAKEUP_MAX_BACKOFF_SECONDS  — cap on the no-progress backoff (default 300)
+"""
+import os
+import select
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import text
+
+PUBLISH_CHANNEL = "publish_wakeup"
+
+# Longest the listener sleeps without re-reading the next due time from the DB.
+# Only a backstop — notifications and the post-run rebuild keep it accurate.
+MAX_IDLE_SECONDS = int(os.getenv("PUBLISH_WAKEUP_MAX_IDLE_SECONDS", "900"))
+RECONNECT_DELAY_SECONDS = 5
+MIN_RUN_INTERVAL_SECONDS = float(os.getenv("PUBLISH_WAKEUP_MIN_INTERVAL_SECONDS", "1"))
+MAX_BACKOFF_SECONDS = float(os.getenv("PUBLISH_WAKEUP_MAX_BACKOFF_SECONDS", "300"))
+
+
+def notify_publish_wakeup(db, when: Optional[datetime] = None) -> None:
+    """Queue a publish wakeup NOTIFY on the caller's transaction.
+
+    Args:
+        db: Active SQLAlchemy session that is about to commit the change
+        when: The row's (new) scheduled_time; None means "due now"
+    """
+    when = when or datetime.now(timezone.utc)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": PUBLISH_CHANNEL, "payload": when.isoformat()},
+    )
+
+
+def _parse_payload(payload: str) -> datetime:
+    try:
+        when = datetime.fromisoformat(payload)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return when
+    except (TypeError, ValueError):
+        # Unknown payload — treat as "something changed, check now"
+        return datetime.now(timezone.utc)
+
+
+class PublishWakeupService:
+    """Sleeps until the next scheduled_time and wakes on LISTEN/NOTIFY."""
+
+    def __init__(self, publish_fn: Callable[[], None]):
+        self.publish_fn = publish_fn
+        self._lock = threading.Lock()
+        self._next_due: Optional[datetime] = None
+        self._wake_runner = threading.Event()
+        self._stop = threading.Event()
+        # Self-pipe so the runner can interrupt the listener's select()
+        self._interrupt_r, self._interrupt_w = os.pipe()
+        self._listener: Optional[threading.Thread] = None
+        self._runner: Optional[threading.Thread] = None
+        self.wakeups = 0
+        self.notifications = 0
+        self.last_latency_s: Optional[float] = None
+        # Delay before re-firing when a run left due rows behind; 0 = no backoff
+        self.backoff_s = 0.0
+
+    # ── lifecycle ───────────────────────────────────────────────
+    def start(self) -> None:
+        self._listener = threading.Thread(target=self._listen_loop, name="publish-wakeup-listener", daemon=True)
+        self._runner = threading.Thread(target=self._run_loop, name="publish-wakeup-runner", daemon=True)
+        self._listener.start()
+        self._runner.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake_runner.set()
+        self._interrupt()
+
+    def stats(self) -> dict:
+        with self._lock:
+            next_due = self._next_due
+        return {
+            "next_due": next_due.isoformat() if next_due else None,
+            "wakeups": self.wakeups,
+            "notifications": self.notifications,
+            "last_latency_s": self.last_latency_s,
+            "backoff_s": self.backoff_s,
+        }
+
+    # ── deadline bookkeeping ────────────────────────────────────
+    def _interrupt(self) -> None:
+        try:
+            os.write(self._interrupt_w, b"x")
+        except OSError:
+            pass
+
+    def _offer(self, when: datetime) -> None:
+        with self._lock:
+            if self._next_due is None or when < self._next_due:
+                self._next_due = when
+
+    def _rebuild(self, after_run: bool = False) -> None:
+        """Reload the earliest scheduled_time (index-only MIN on status+time).
+
+        After a publish run, an earliest time that is still in the past
+        means the run made no progress on it; the deadline is pushed out by
+        an exponential backoff (reset once nothing is overdue).
+        """
+        from app.db_connection import SessionLocal
+        db = SessionLocal()
+        try:
+            earliest = db.execute(text(
+                "SELECT min(scheduled_time) FROM scheduled_reels WHERE status = 'scheduled'"
+            )).scalar()
+        finally:
+            db.close()
+        if earliest is not None and earliest.tzinfo is None:
+            earliest = earliest.replace(tzinfo=timezone.utc)
+        now = datetime.now(timezone.utc)
+        if after_run:
+            if earliest is not None and earliest <= now:
+                self.backoff_s = min(max(self.backoff_s * 2, MIN_RUN_INTERVAL_SECONDS, 1.0), MAX_BACKOFF_SECONDS)
+                print(f"⚠️ [PublishWakeup] schedules due since {earliest.isoformat()} still unpublished "
+                      f"— next run in {self.backoff_s:.0f}s", flush=True)
+                earliest = now + timedelta(seconds=self.backoff_s)
+            else:
+                self.backoff_s = 0.0
+        with self._lock:
+            self._next_due = earliest
+        self._interrupt()
+
+    def _seconds_until_due(self) -> float:
+        with self._lock:
+            next_due = self._next_due
+        if next_due is None:
+            return float(MAX_IDLE_SECONDS)
+        if next_due.tzinfo is None:
+            next_due = next_due.replace(tzinfo=timezone.utc)
+        return max(0.0, min((next_due - datetime.now(timezone.utc)).total_seconds(), MAX_IDLE_SECONDS))
+
+    def _fire_if_due(self) -> None:
+        with self._lock:
+            next_due = self._next_due
+            if next_due is None:
+                return
+            if next_due.tzinfo is None:
+                next_due = next_due.replace(tzinfo=timezone.utc)
+            if next_due > datetime.now(timezone.utc):
+                return
+            self._next_due = None
+        self.last_latency_s = round((datetime.now(timezone.utc) - next_due).total_seconds(), 3)
+        self._wake_runner.set()
+
+    # ── threads ─────────────────────────────────────────────────
+    def _run_loop(self) -> None:
+        last_run = 0.0
+        while not self._stop.is_set():
+            self._wake_runner.wait()
+            # A burst of notifications for due rows coalesces into one run
+            gap = MIN_RUN_INTERVAL_SECONDS - (time.monotonic() - last_run)
+            if gap > 0 and self._stop.wait(gap):
+                return
+            self._wake_runner.clear()
+            if self._stop.is_set():
+                return
+            self.wakeups += 1
+            last_run = time.monotonic()
+            try:
+                self.publish_fn()
+            except Exception as e:
+                print(f"⚠️ [PublishWakeup] publish run failed: {e}", flush=True)
+            try:
+                self._rebuild(after_run=True)
+            except Exception as e:
+                print(f"⚠️ [PublishWakeup] rebuild failed: {e}", flush=True)
+
+    def _open_listen_connection(self):
+        """Open a dedicated autocommit connection subscribed to PUBLISH_CHANNEL."""
+        from app.db_connection import engine
+        proxied = engine.raw_connection()
+        proxied.detach()  # Never return this connection to the pool
+        conn = proxied.dbapi_connection
+        if hasattr(conn, "set_isolation_level"):  # psycopg2
+            conn.set_isolation_level(0)
+        else:  # psycopg 3
+            conn.autocommit = True
+        cur = conn.cursor()
+        cur.execute(f"LISTEN {PUBLISH_CHANNEL}")
+        cur.close()
+        return conn
+
+    @staticmethod
+    def _drain_notifications(conn) -> list:
+        if hasattr(conn, "poll"):  # psycopg2
+            conn.poll()
+            payloads = [n.payload for n in conn.notifies]
+            conn.notifies.clear()
+            return payloads
+        return [n.payload for n in conn.notifies(timeout=0)]  # psycopg 3
+
+    def _listen_loop(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._open_listen_connection()
+                self._rebuild()
+                print("✅ [PublishWakeup] Listening for publish wakeups", flush=True)
+                while not self._stop.is_set():
+                    self._fire_if_due()
+                    timeout = self._seconds_until_due()
+                    readable, _, _ = select.select([conn, self._interrupt_r], [], [], timeout)
+                    if self._interrupt_r in readable:
+                        os.read(self._interrupt_r, 1024)
+                    if conn in readable:
+                        for payload in self._drain_notifications(conn):
+                            self.notifications += 1
+                            self._offer(_parse_payload(payload))
+                    if not readable and timeout >= MAX_IDLE_SECONDS:
+                        # Backstop: nothing heard for a long time — re-read the index
+                        self._rebuild()
+            except Exception as e:
+                print(f"⚠️ [PublishWakeup] listener error: {e} — reconnecting in {RECONNECT_DELAY_SECONDS}s", flush=True)
+                time.sleep(RECONNECT_DELAY_SECONDS)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+
+_service: Optional[PublishWakeupService] = None
+
+
+def start_publish_wakeups(publish_fn: Callable[[], None]) -> Optional[PublishWakeupService]:
+    """Start the wakeup service unless disabled with PUBLISH_WAKEUPS=0."""
+    global _service
+    if os.getenv("PUBLISH_WAKEUPS", "1") == "0":
+        return None
+    if _service is None:
+        _service = PublishWakeupService(publish_fn)
+        _service.start()
+    return _service
+
+
+def stop_publish_wakeups() -> None:
+    global _service
+    if _service is not None:
+        _service.stop()
+        _service = None
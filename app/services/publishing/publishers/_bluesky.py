@@ -1,6 +1,7 @@
 """Bluesky (AT Protocol) publishing — posts and carousels."""
 import requests
 from typing import Optional, Dict, Any, List
+from app.utils.http_client import get_http_session
 
 
 class BlueskyMixin:
@@ -134,7 +135,7 @@ class BlueskyMixin:
             # Handle image upload
             if media_url and media_type == "IMAGE":
                 print(f"   🦋 Bluesky: Downloading image...", flush=True)
-                img_resp = requests.get(media_url, timeout=60)
+                img_resp = get_http_session().get(media_url, timeout=60)
                 img_resp.raise_for_status()
                 img_data = img_resp.content
 
@@ -155,7 +156,7 @@ class BlueskyMixin:
             # Handle video
             elif media_url and media_type == "VIDEO":
                 print(f"   🦋 Bluesky: Downloading video...", flush=True)
-                vid_resp = requests.get(media_url, timeout=120)
+                vid_resp = get_http_session().get(media_url, timeout=120)
                 vid_resp.raise_for_status()
                 vid_data = vid_resp.content
                 vid_size = len(vid_data)
@@ -284,7 +285,7 @@ class BlueskyMixin:
 
             for i, url in enumerate(urls):
                 print(f"   🦋 Bluesky: Uploading image {i + 1}/{len(urls)}...", flush=True)
-                img_resp = requests.get(url, timeout=60)
+                img_resp = get_http_session().get(url, timeout=60)
                 img_resp.raise_for_status()
                 img_data = img_resp.content
 
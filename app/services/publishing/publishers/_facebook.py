@@ -3,6 +3,7 @@ import re
 import time
 import requests
 from typing import Optional, Dict, Any
+from app.utils.http_client import get_http_session
 
 
 def create_facebook_caption(full_caption: str, max_length: int = 400) -> str:
@@ -72,7 +73,7 @@ class FacebookMixin:
             }
 
             print(f"🔑 Getting Page Access Token for page {page_id}...")
-            response = requests.get(url, params=params, timeout=10)
+            response = get_http_session().get(url, params=params, timeout=10)
             data = response.json()
 
             if "error" in data:
@@ -102,7 +103,7 @@ class FacebookMixin:
             }
 
             print(f"   🔍 Trying /me/accounts endpoint...")
-            response = requests.get(url, params=params, timeout=10)
+            response = get_http_session().get(url, params=params, timeout=10)
             data = response.json()
 
             if "error" in data:
@@ -173,7 +174,7 @@ class FacebookMixin:
                 "published": True,
             }
 
-            response = requests.post(photos_url, data=payload, timeout=30)
+            response = get_http_session().post(photos_url, data=payload, timeout=30)
             data = response.json()
 
             print(f"   Response: {data}")
@@ -282,7 +283,7 @@ class FacebookMixin:
                     f"{idx + 1}/{len(image_urls)}: {url}"
                 )
 
-                resp = requests.post(
+                resp = get_http_session().post(
                     photos_url,
                     data={
                         "url": url,
@@ -328,7 +329,7 @@ class FacebookMixin:
                 post_data[f"attached_media[{i}]"] = f'{{"media_fbid":"{pid}"}}'
 
             print(f"   🚀 Publishing Facebook carousel with {len(photo_ids)} photos...")
-            resp = requests.post(feed_url, data=post_data, timeout=30)
+            resp = get_http_session().post(feed_url, data=post_data, timeout=30)
             data = resp.json()
 
             if "error" in data:
@@ -411,7 +412,7 @@ class FacebookMixin:
             print(f"   Page ID: {self.fb_page_id}")
             print(f"   Video URL: {video_url}")
 
-            init_response = requests.post(
+            init_response = get_http_session().post(
                 init_url,
                 json={
                     "upload_phase": "start",
@@ -465,7 +466,7 @@ class FacebookMixin:
 
             print(f"   Headers: Authorization=OAuth [hidden], file_url={video_url}")
 
-            upload_response = requests.post(
+            upload_response = get_http_session().post(
                 actual_upload_url,
                 headers=upload_headers,
                 timeout=120
@@ -509,7 +510,7 @@ class FacebookMixin:
             last_status = ""
 
             while waited < max_wait:
-                status_response = requests.get(
+                status_response = get_http_session().get(
                     f"https://graph.facebook.com/{self.api_version}/{video_id}",
                     params={
                         "fields": "status",
@@ -560,7 +561,7 @@ class FacebookMixin:
             # Step 3: Publish the reel
             print(f"🚀 Publishing Facebook Reel...")
 
-            publish_response = requests.post(
+            publish_response = get_http_session().post(
                 init_url,
                 params={
                     "access_token": page_access_token,
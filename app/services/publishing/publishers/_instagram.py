@@ -3,6 +3,7 @@ import io
 import time
 import requests
 from typing import Optional, Dict, Any
+from app.utils.http_client import get_http_session
 
 
 class InstagramMixin:
@@ -66,7 +67,7 @@ class InstagramMixin:
                 from app.services.storage.supabase_storage import upload_file
 
                 jpeg_url_candidate = url.rsplit(".", 1)[0] + ".jpg"
-                head_resp = requests.head(jpeg_url_candidate, timeout=10)
+                head_resp = get_http_session().head(jpeg_url_candidate, timeout=10)
                 if head_resp.status_code == 200:
                     print(f"   ✅ JPEG already exists: {jpeg_url_candidate.split('/')[-1]}")
                     result.append(jpeg_url_candidate)
@@ -75,7 +76,7 @@ class InstagramMixin:
                 from PIL import Image as _PILImage
 
                 print(f"   🔄 Converting PNG→JPEG: {url.split('/')[-1]}")
-                resp = requests.get(url, timeout=60)
+                resp = get_http_session().get(url, timeout=60)
                 resp.raise_for_status()
 
                 img = _PILImage.open(io.BytesIO(resp.content))
@@ -109,7 +110,7 @@ class InstagramMixin:
         if not media_id or not self.ig_access_token:
             return None
         try:
-            resp = requests.get(
+            resp = get_http_session().get(
                 f"{self.ig_graph_base}/{self.api_version}/{media_id}",
                 params={"fields": "permalink", "access_token": self.ig_access_token},
                 timeout=10,
@@ -156,7 +157,7 @@ class InstagramMixin:
             }
 
             print(f"📸 Creating Instagram image post container...")
-            container_response = requests.post(container_url, data=container_payload, timeout=30)
+            container_response = get_http_session().post(container_url, data=container_payload, timeout=30)
             container_data = container_response.json()
 
             print(f"   Container response: {container_data}")
@@ -172,7 +173,7 @@ class InstagramMixin:
                     if refreshed:
                         container_payload["access_token"] = self.ig_access_token
                         print(f"   🔄 Retrying image post with refreshed token...")
-                        retry_resp = requests.post(container_url, data=container_payload, timeout=30)
+                        retry_resp = get_http_session().post(container_url, data=container_payload, timeout=30)
                         container_data = retry_resp.json()
                         if "error" not in container_data:
                             print(f"   ✅ Retry succeeded after token refresh")
@@ -222,7 +223,7 @@ class InstagramMixin:
 
             print(f"⏳ Waiting for Instagram to process image...")
             while waited < max_wait_seconds:
-                status_response = requests.get(
+                status_response = get_http_session().get(
                     status_url,
                     params={"fields": "status_code,status", "access_token": self.ig_access_token},
                     timeout=10
@@ -273,7 +274,7 @@ class InstagramMixin:
             }
 
             print(f"🚀 Publishing Instagram image post...")
-            publish_response = requests.post(publish_url, data=publish_payload, timeout=30)
+            publish_response = get_http_session().post(publish_url, data=publish_payload, timeout=30)
             publish_data = publish_response.json()
 
             if "error" in publish_data:
@@ -361,7 +362,7 @@ class InstagramMixin:
                 last_error_msg = ""
                 max_retries = 3
                 for attempt in range(max_retries):
-                    item_resp = requests.post(
+                    item_resp = get_http_session().post(
                         container_url,
                         data={
                             "image_url": url,
@@ -434,7 +435,7 @@ class InstagramMixin:
                 max_wait = 60
                 waited = 0
                 while waited < max_wait:
-                    sr = requests.get(
+                    sr = get_http_session().get(
                         status_url,
                         params={
                             "fields": "status_code",
@@ -469,7 +470,7 @@ class InstagramMixin:
                 f"   📚 Creating carousel container with "
                 f"{len(children_ids)} children..."
             )
-            carousel_resp = requests.post(
+            carousel_resp = get_http_session().post(
                 container_url,
                 data={
                     "media_type": "CAROUSEL",
@@ -507,7 +508,7 @@ class InstagramMixin:
             max_wait = 60
             waited = 0
             while waited < max_wait:
-                sr = requests.get(
+                sr = get_http_session().get(
                     status_url,
                     params={
                         "fields": "status_code",
@@ -534,7 +535,7 @@ class InstagramMixin:
                 f"/{self.ig_business_account_id}/media_publish"
             )
             print("   🚀 Publishing Instagram carousel...")
-            publish_resp = requests.post(
+            publish_resp = get_http_session().post(
                 publish_url,
                 data={
                     "creation_id": carousel_id,
@@ -627,7 +628,7 @@ class InstagramMixin:
                 print(f"   🖼️ Cover URL: {thumbnail_url}")
 
             print(f"📸 Creating Instagram Reel resumable container...")
-            container_response = requests.post(container_url, data=container_payload, timeout=30)
+            container_response = get_http_session().post(container_url, data=container_payload, timeout=30)
             container_data = container_response.json()
 
             print(f"   Container response: {container_data}")
@@ -643,7 +644,7 @@ class InstagramMixin:
                     if refreshed:
                         container_payload["access_token"] = self.ig_access_token
                         print(f"   🔄 Retrying with refreshed token...")
-                        retry_resp = requests.post(container_url, data=container_payload, timeout=30)
+                        retry_resp = get_http_session().post(container_url, data=container_payload, timeout=30)
                         container_data = retry_resp.json()
                         if "error" not in container_data:
                             print(f"   ✅ Retry succeeded after token refresh")
@@ -694,7 +695,7 @@ class InstagramMixin:
 
             print(f"⏳ Waiting for Instagram to process video...")
             while waited < max_wait_seconds:
-                status_response = requests.get(
+                status_response = get_http_session().get(
                     status_url,
                     params={"fields": "status_code,status", "access_token": self.ig_access_token},
                     timeout=10
@@ -754,7 +755,7 @@ class InstagramMixin:
             }
 
             print(f"🚀 Publishing Instagram Reel...")
-            publish_response = requests.post(publish_url, data=publish_payload, timeout=30)
+            publish_response = get_http_session().post(publish_url, data=publish_payload, timeout=30)
             publish_data = publish_response.json()
 
             if "error" in publish_data:
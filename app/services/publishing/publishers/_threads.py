@@ -2,6 +2,7 @@
 import requests
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
+from app.utils.http_client import get_http_session
 
 
 class ThreadsMixin:
@@ -106,7 +107,7 @@ class ThreadsMixin:
 
             print(f"   🧵 Threads: Creating container (type={container_data['media_type']})...", flush=True)
 
-            resp = requests.post(
+            resp = get_http_session().post(
                 f"{threads_api}/{self.threads_user_id}/threads",
                 data=container_data,
                 timeout=30,
@@ -126,7 +127,7 @@ class ThreadsMixin:
 
             # Step 3: Publish
             print(f"   🧵 Threads: Publishing container {creation_id}...", flush=True)
-            pub_resp = requests.post(
+            pub_resp = get_http_session().post(
                 f"{threads_api}/{self.threads_user_id}/threads_publish",
                 data={
                     "creation_id": creation_id,
@@ -165,7 +166,7 @@ class ThreadsMixin:
         import time as _time
         deadline = _time.monotonic() + timeout_s
         while _time.monotonic() < deadline:
-            resp = requests.get(
+            resp = get_http_session().get(
                 f"{api_base}/{creation_id}",
                 params={
                     "fields": "status,error_message",
@@ -217,7 +218,7 @@ class ThreadsMixin:
             child_ids = []
             for i, url in enumerate(image_urls):
                 print(f"   🧵 Threads carousel: Creating child {i+1}/{len(image_urls)}...", flush=True)
-                resp = requests.post(
+                resp = get_http_session().post(
                     f"{threads_api}/{self.threads_user_id}/threads",
                     data={
                         "media_type": "IMAGE",
@@ -239,7 +240,7 @@ class ThreadsMixin:
 
             # Step 2: Create carousel container
             print(f"   🧵 Threads carousel: Creating carousel container...", flush=True)
-            resp = requests.post(
+            resp = get_http_session().post(
                 f"{threads_api}/{self.threads_user_id}/threads",
                 data={
                     "media_type": "CAROUSEL",
@@ -254,7 +255,7 @@ class ThreadsMixin:
 
             # Step 3: Publish
             print(f"   🧵 Threads carousel: Publishing...", flush=True)
-            pub_resp = requests.post(
+            pub_resp = get_http_session().post(
                 f"{threads_api}/{self.threads_user_id}/threads_publish",
                 data={
                     "creation_id": carousel_id,
@@ -320,7 +321,7 @@ class ThreadsMixin:
                 if reply_to_id:
                     container_data["reply_to_id"] = reply_to_id
 
-                resp = requests.post(
+                resp = get_http_session().post(
                     f"{threads_api}/{self.threads_user_id}/threads",
                     data=container_data,
                     timeout=30,
@@ -334,7 +335,7 @@ class ThreadsMixin:
                         "platform": "threads",
                     }
 
-                pub_resp = requests.post(
+                pub_resp = get_http_session().post(
                     f"{threads_api}/{self.threads_user_id}/threads_publish",
                     data={
                         "creation_id": creation_id,
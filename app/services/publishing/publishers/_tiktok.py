@@ -2,6 +2,7 @@
 import requests
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
+from app.utils.http_client import get_http_session
 
 
 class TikTokMixin:
@@ -95,7 +96,7 @@ class TikTokMixin:
         try:
             # Step 1: Download video from Supabase
             print(f"   📱 TikTok: Downloading video from source URL...", flush=True)
-            dl_resp = requests.get(video_url, timeout=120)
+            dl_resp = get_http_session().get(video_url, timeout=120)
             dl_resp.raise_for_status()
             video_bytes = dl_resp.content
             video_size = len(video_bytes)
@@ -142,7 +143,7 @@ class TikTokMixin:
 
             # Step 3: Upload video bytes to TikTok's upload_url
             print(f"   📱 TikTok: Uploading {video_size} bytes to TikTok...", flush=True)
-            upload_resp = requests.put(
+            upload_resp = get_http_session().put(
                 upload_url,
                 headers={
                     "Content-Range": f"bytes 0-{video_size - 1}/{video_size}",
@@ -202,7 +203,7 @@ class TikTokMixin:
         and decide whether to retry with a different privacy_level.
         """
         print(f"   📱 TikTok: Initializing video publish (FILE_UPLOAD, privacy={privacy_level})...", flush=True)
-        init_resp = requests.post(
+        init_resp = get_http_session().post(
             f"{tiktok_api}/post/publish/video/init/",
             headers={
                 "Authorization": f"Bearer {token}",
@@ -239,7 +240,7 @@ class TikTokMixin:
         import time as _time
         deadline = _time.monotonic() + timeout_s
         while _time.monotonic() < deadline:
-            resp = requests.post(
+            resp = get_http_session().post(
                 "https://open.tiktokapis.com/v2/post/publish/status/fetch/",
                 headers={
                     "Authorization": f"Bearer {token}",
@@ -4,10 +4,12 @@ PostgreSQL-based scheduler service with multi-user support.
 import os
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, TYPE_CHECKING
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from app.models import ScheduledReel, UserProfile
+from app.models.scheduling import brand_key_in, scheduled_variant
 from app.db_connection import get_db_session
 from app.services.publishing.social_publisher import SocialPublisher
+from app.services.publishing.publish_wakeup import notify_publish_wakeup
 
 if TYPE_CHECKING:
     from app.core.config import BrandConfig
@@ -205,13 +207,13 @@ class DatabaseSchedulerService:
                     window_end = scheduled_time + _td(minutes=30)
                     existing = db.query(ScheduledReel).filter(
                         ScheduledReel.user_id == user_id,
+                        brand_key_in([brand]),
                         ScheduledReel.scheduled_time >= window_start,
                         ScheduledReel.scheduled_time <= window_end,
                         ScheduledReel.status.in_(["scheduled", "publishing", "partial", "published"]),
                     ).with_for_update(skip_locked=True).all()
                     for ex in existing:
-                        ex_brand = (ex.extra_data or {}).get("brand", "")
-                        ex_variant = (ex.extra_data or {}).get("variant", "")
+                        ex_variant = ex.variant or (ex.extra_data or {}).get("variant", "")
                         # Same brand + same variant type (reel vs post vs threads)
                         is_same_type = (
                             (variant in ("light", "dark") and ex_variant in ("light", "dark"))
@@ -219,7 +221,7 @@ class DatabaseSchedulerService:
                             or (variant == "format_b" and ex_variant == "format_b")
                             or (variant == "threads" and ex_variant == "threads")
                         )
-                        if ex_brand == brand and is_same_type:
+                        if is_same_type:
                             print(f"   ⚠️ DEDUP-L1: Slot already filled for {brand} "
                                   f"at {scheduled_time} (existing: {ex.schedule_id})")
                             return {"schedule_id": ex.schedule_id, "deduplicated": True}
@@ -230,16 +232,14 @@ class DatabaseSchedulerService:
                         title_window_end = scheduled_time + _td(days=5)
                         title_dupes = db.query(ScheduledReel).filter(
                             ScheduledReel.user_id == user_id,
+                            brand_key_in([brand]),
                             ScheduledReel.scheduled_time >= title_window_start,
                             ScheduledReel.scheduled_time <= title_window_end,
                             ScheduledReel.status.in_(["scheduled", "publishing", "partial", "published"]),
                         ).all()
                         for ex in title_dupes:
-                            ex_brand = (ex.extra_data or {}).get("brand", "")
                             ex_title = (ex.extra_data or {}).get("title", "")
-                            if (ex_brand == brand
-                                    and ex_title
-                                    and ex_title.strip().lower() == post_title.strip().lower()):
+                            if ex_title and ex_title.strip().lower() == post_title.strip().lower():
                                 print(f"   ⚠️ DEDUP-L2: Same title already scheduled for {brand}: "
                                       f"'{post_title[:60]}' (existing: {ex.schedule_id} at {ex.scheduled_time})")
                                 return {"schedule_id": ex.schedule_id, "deduplicated": True}
@@ -251,14 +251,14 @@ class DatabaseSchedulerService:
                         caption_window_end = scheduled_time + _td(days=3)
                         caption_dupes = db.query(ScheduledReel).filter(
                             ScheduledReel.user_id == user_id,
+                            brand_key_in([brand]),
                             ScheduledReel.scheduled_time >= caption_window_start,
                             ScheduledReel.scheduled_time <= caption_window_end,
                             ScheduledReel.status.in_(["scheduled", "publishing", "partial", "published"]),
                         ).all()
                         for ex in caption_dupes:
-                            ex_brand = (ex.extra_data or {}).get("brand", "")
                             ex_caption = (ex.caption or "")[:100].strip().lower()
-                            if ex_brand == brand and ex_caption == caption_prefix:
+                            if ex_caption == caption_prefix:
                                 print(f"   ⚠️ DEDUP-L3: Same caption already scheduled for {brand} "
                                       f"(existing: {ex.schedule_id} at {ex.scheduled_time})")
                                 return {"schedule_id": ex.schedule_id, "deduplicated": True}
@@ -282,6 +282,9 @@ class DatabaseSchedulerService:
                 db.add(scheduled_reel)
                 print("   ✅ Added to session")
 
+                # Wake the publisher for this slot once the row is committed
+                notify_publish_wakeup(db, scheduled_time)
+
                 print("   🔄 Committing to database...")
                 db.commit()
                 print("   ✅ COMMITTED TO DATABASE!")
@@ -299,116 +302,93 @@ class DatabaseSchedulerService:
             traceback.print_exc()
             raise
 
-    def get_pending_publications(self) -> list[Dict[str, Any]]:
+    # Max rows claimed per get_pending_publications() call
+    CLAIM_BATCH_SIZE = int(os.getenv("PUBLISH_CLAIM_BATCH_SIZE", "100"))
+    # Window for the "already published" dedup safety net
+    PUBLISH_DEDUP_DAYS = 7
+
+    def get_pending_publications(self, limit: Optional[int] = None) -> list[Dict[str, Any]]:
         """
-        Get all scheduled reels that are due for publishing.
-        Uses atomic locking to prevent duplicate publishing.
+        Claim up to ``limit`` scheduled reels that are due for publishing.
+
+        A single ``UPDATE ... WHERE schedule_id IN (SELECT ... FOR UPDATE
+        SKIP LOCKED LIMIT n) RETURNING`` flips due rows to 'publishing', so
+        concurrent callers never claim the same row. Tick cost depends on
+        the number of due rows, not on the size of scheduled_reels.
+
+        Callers should keep claiming until fewer than ``limit`` rows come back.
 
         Returns:
             List of schedules ready to publish (already marked as 'publishing')
         """
-        with get_db_session() as db:
-            now = datetime.now(timezone.utc)
+        from sqlalchemy import select, update
 
-            print(f"\n🔍 get_pending_publications() check at:")
-            print(f"   UTC now: {now}")
-
-            # Show ALL posts for debugging (any status)
-            all_posts = db.query(ScheduledReel).order_by(ScheduledReel.scheduled_time.asc()).limit(50).all()
-
-            # Group by status
-            by_status = {}
-            for post in all_posts:
-                status = post.status
-                if status not in by_status:
-                    by_status[status] = []
-                by_status[status].append(post)
-
-            print(f"   📊 Posts by status:")
-            for status, posts in by_status.items():
-                print(f"      {status}: {len(posts)} post(s)")
-                # Show details for non-scheduled posts (publishing, failed, published)
-                if status != "scheduled":
-                    for p in posts[:5]:  # Show first 5
-                        print(f"         - {p.schedule_id}: {p.reel_id} @ {p.scheduled_time}")
-                        if status == "failed":
-                            error = p.publish_error or "No error recorded"
-                            print(f"           Error: {error}")
-
-            # Get scheduled posts that are DUE
-            print(f"\n   📋 Checking for due 'scheduled' posts...")
-            all_scheduled = db.query(ScheduledReel).filter(
-                ScheduledReel.status == "scheduled"
-            ).order_by(ScheduledReel.scheduled_time.asc()).all()
-
-            print(f"   Total 'scheduled' posts: {len(all_scheduled)}")
-            due_count = 0
-            for sched in all_scheduled[:10]:  # Show first 10
-                scheduled_time = sched.scheduled_time
-                is_due = scheduled_time <= now
-                if is_due:
-                    due_count += 1
-                    print(f"      ✅ DUE: {sched.schedule_id}: {sched.reel_id} @ {scheduled_time}")
-                else:
-                    time_until = scheduled_time - now
-                    print(f"      ⏳ {sched.schedule_id}: {sched.reel_id} @ {scheduled_time} (in {time_until})")
+        limit = limit or self.CLAIM_BATCH_SIZE
 
-            if due_count == 0:
-                print(f"   ℹ️ No posts are due yet")
+        with get_db_session() as db:
+            now = datetime.now(timezone.utc)
 
-            # Use FOR UPDATE to lock rows and prevent race conditions
-            pending = db.query(ScheduledReel).filter(
-                and_(
+            due_ids = (
+                select(ScheduledReel.schedule_id)
+                .where(
                     ScheduledReel.status == "scheduled",
-                    ScheduledReel.scheduled_time <= now
+                    ScheduledReel.scheduled_time <= now,
                 )
-            ).with_for_update(skip_locked=True).all()
-
-            print(f"\n   ✅ Found {len(pending)} pending post(s) to publish NOW")
-
-            # IMMEDIATELY mark all as "publishing" to prevent duplicate picks
-            #
-            # Pre-publish safety check (2026-03-08, updated 2026-03-08):
-            # Load every (brand, title, caption_prefix) published in the last 7 days
-            # so we never publish content that already went out for the same brand.
-            # Requires BOTH title AND caption to match — title alone is not enough,
-            # because different content can legitimately share the same title.
-            from sqlalchemy import text as _text
-            already_published_rows = db.execute(_text("""
-                SELECT LOWER(COALESCE(extra_data->>'brand', '')) as brand,
-                       LOWER(COALESCE(extra_data->>'title', '')) as title,
-                       LOWER(COALESCE(LEFT(caption, 100), '')) as caption_prefix
-                FROM scheduled_reels
-                WHERE status IN ('published', 'partial', 'publishing')
-                AND scheduled_time > :cutoff
-                AND extra_data->>'title' IS NOT NULL
-            """), {"cutoff": now - timedelta(days=7)}).fetchall()
-            already_published: set[tuple] = {
-                (r.brand, r.title, r.caption_prefix) for r in already_published_rows
-                if r.brand and r.title
-            }
+                .order_by(ScheduledReel.scheduled_time.asc())
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            claimed = db.scalars(
+                update(ScheduledReel)
+                .where(ScheduledReel.schedule_id.in_(due_ids.scalar_subquery()))
+                .values(status="publishing")
+                .returning(ScheduledReel),
+                execution_options={"synchronize_session": False},
+            ).all()
+
+            if not claimed:
+                db.commit()
+                return []
+
+            print(f"\n🔍 get_pending_publications(): claimed {len(claimed)} due post(s) at {now}")
+
+            # Pre-publish safety check (2026-03-08):
+            # Never publish content whose (brand, title, caption_prefix) already
+            # went out for the same brand in the last 7 days. Requires BOTH title
+            # AND caption to match — different content can share a title.
+            # Only the claimed rows' fingerprints are looked up (indexed).
+            claimed_ids = [r.schedule_id for r in claimed]
+            fingerprints = {r.title_fingerprint for r in claimed if r.title_fingerprint}
+            already_published: set[str] = set()
+            if fingerprints:
+                already_published = set(db.scalars(
+                    select(ScheduledReel.title_fingerprint)
+                    .where(
+                        ScheduledReel.title_fingerprint.in_(fingerprints),
+                        ScheduledReel.status.in_(["published", "partial", "publishing"]),
+                        ScheduledReel.scheduled_time > now - timedelta(days=self.PUBLISH_DEDUP_DAYS),
+                        ScheduledReel.schedule_id.notin_(claimed_ids),
+                    )
+                    .distinct()
+                ).all())
 
             result = []
-            seen_brand_titles: dict[tuple, str] = {}  # (brand, title_lower) -> schedule_id
-            for reel in pending:
+            seen_fingerprints: dict[str, str] = {}  # fingerprint -> schedule_id
+            for reel in sorted(claimed, key=lambda r: r.scheduled_time):
                 ed = reel.extra_data or {}
                 brand_key = ed.get("brand", "")
                 title_key = (ed.get("title") or "").strip().lower()
-                fallback_check = title_key
+                fingerprint = reel.title_fingerprint
 
                 # Reject fallback content at publish time (last line of defense)
-                if "content generation temporarily unavailable" in fallback_check:
+                if "content generation temporarily unavailable" in title_key:
                     print(f"      🚫 REJECTED at publish: fallback content {reel.schedule_id}")
                     reel.status = "failed"
                     reel.publish_error = "Rejected: fallback/placeholder content"
                     continue
 
                 # Check against ALREADY PUBLISHED content (the real safety net)
-                # Requires both title AND caption prefix to match — same title
-                # with different content is allowed.
-                caption_key = (reel.caption or "")[:100].strip().lower()
-                dedup_key = (brand_key, title_key, caption_key)
-                if title_key and dedup_key in already_published:
+                if fingerprint and fingerprint in already_published:
                     print(f"      🚫 ALREADY PUBLISHED: {reel.schedule_id} — "
                           f"'{title_key[:50]}' + same caption already published for {brand_key}")
                     reel.status = "failed"
@@ -418,31 +398,81 @@ class DatabaseSchedulerService:
                     continue
 
                 # Check against other items in THIS batch
-                if title_key and dedup_key in seen_brand_titles:
+                if fingerprint and fingerprint in seen_fingerprints:
                     print(f"      🚫 DEDUP at publish: {reel.schedule_id} is duplicate of "
-                          f"{seen_brand_titles[dedup_key]} (same title+caption for {brand_key})")
+                          f"{seen_fingerprints[fingerprint]} (same title+caption for {brand_key})")
                     reel.status = "failed"
-                    reel.publish_error = f"Duplicate of {seen_brand_titles[dedup_key]} (same title+caption)"
+                    reel.publish_error = f"Duplicate of {seen_fingerprints[fingerprint]} (same title+caption)"
                     continue
 
-                if title_key:
-                    seen_brand_titles[dedup_key] = reel.schedule_id
+                if fingerprint:
+                    seen_fingerprints[fingerprint] = reel.schedule_id
 
-                print(f"      → Marking {reel.schedule_id} ({reel.reel_id}) as 'publishing'")
-                reel.status = "publishing"
+                print(f"      → Claimed {reel.schedule_id} ({reel.reel_id}) as 'publishing'")
                 result.append(reel.to_dict())
 
-            # Commit the status change before returning
+            # Commit the claim (and any dedup rejections) before returning
             db.commit()
 
             return result
 
+    def get_queue_diagnostics(self, sample_size: int = 10) -> Dict[str, Any]:
+        """Snapshot of the publish queue for the admin diagnostics endpoint.
+
+        This used to be printed on every auto-publish tick; it is now
+        opt-in so the tick itself stays O(due rows).
+        """
+        from sqlalchemy import func
+
+        with get_db_session() as db:
+            now = datetime.now(timezone.utc)
+
+            counts = dict(
+                db.query(ScheduledReel.status, func.count(ScheduledReel.schedule_id))
+                .group_by(ScheduledReel.status)
+                .all()
+            )
+            due_count = db.query(func.count(ScheduledReel.schedule_id)).filter(
+                ScheduledReel.status == "scheduled",
+                ScheduledReel.scheduled_time <= now,
+            ).scalar()
+            next_up = db.query(ScheduledReel).filter(
+                ScheduledReel.status == "scheduled",
+            ).order_by(ScheduledReel.scheduled_time.asc()).limit(sample_size).all()
+            stuck = db.query(ScheduledReel).filter(
+                ScheduledReel.status == "publishing",
+            ).order_by(ScheduledReel.scheduled_time.asc()).limit(sample_size).all()
+            recent_failures = db.query(ScheduledReel).filter(
+                ScheduledReel.status == "failed",
+            ).order_by(ScheduledReel.scheduled_time.desc()).limit(sample_size).all()
+
+            def _row(r: ScheduledReel) -> Dict[str, Any]:
+                return {
+                    "schedule_id": r.schedule_id,
+                    "reel_id": r.reel_id,
+                    "user_id": r.user_id,
+                    "scheduled_time": r.scheduled_time.isoformat() if r.scheduled_time else None,
+                    "publish_error": r.publish_error,
+                }
+
+            return {
+                "checked_at": now.isoformat(),
+                "counts_by_status": counts,
+                "due_now": due_count,
+                "next_scheduled": [_row(r) for r in next_up],
+                "publishing": [_row(r) for r in stuck],
+                "recent_failures": [_row(r) for r in recent_failures],
+            }
+
     def get_all_scheduled(
         self,
         user_id: Optional[str] = None,
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
         limit: int = 500,
+        statuses: Optional[list[str]] = None,
+        variant: Optional[str] = None,
+        exclude_variant: Optional[str] = None,
     ) -> list[Dict[str, Any]]:
         """
         Get scheduled reels with optional date-range filtering.
@@ -452,6 +482,9 @@ class DatabaseSchedulerService:
             from_date: ISO date string — only rows on/after this date
             to_date: ISO date string — only rows before this date
             limit: Maximum rows to return (default 500)
+            statuses: Only rows in these statuses
+            variant: Only rows with this variant
+            exclude_variant: Only rows whose variant is not this one (missing variant counts as "light")
         """
         from datetime import datetime as dt
 
@@ -461,6 +494,15 @@ class DatabaseSchedulerService:
             if user_id:
                 query = query.filter(ScheduledReel.user_id == user_id)
 
+            if statuses:
+                query = query.filter(ScheduledReel.status.in_(statuses))
+
+            if variant:
+                query = query.filter(scheduled_variant() == variant)
+
+            if exclude_variant:
+                query = query.filter(func.coalesce(scheduled_variant(), "light") != exclude_variant)
+
             if from_date:
                 try:
                     start = dt.fromisoformat(from_date)
@@ -718,19 +760,22 @@ class DatabaseSchedulerService:
         before all platforms finish.
         """
         with get_db_session() as db:
+            # Row lock: platforms publish concurrently, so two workers may
+            # save results for the same schedule at once. Without the lock
+            # the read-modify-write of extra_data would drop one of them.
             reel = db.query(ScheduledReel).filter(
                 ScheduledReel.schedule_id == schedule_id
-            ).first()
+            ).with_for_update().first()
             if not reel:
                 return
 
             metadata = dict(reel.extra_data or {})
-            publish_results = metadata.get('publish_results', {})
+            publish_results = dict(metadata.get('publish_results', {}))
             publish_results[platform] = result
             metadata['publish_results'] = publish_results
 
             if result.get('success') and result.get('post_id'):
-                post_ids = metadata.get('post_ids', {})
+                post_ids = dict(metadata.get('post_ids', {}))
                 post_ids[platform] = str(result['post_id'])
                 metadata['post_ids'] = post_ids
 
@@ -740,6 +785,22 @@ class DatabaseSchedulerService:
             db.commit()
             print(f"      💾 Saved {platform} result incrementally for {schedule_id}")
 
+    def _saving_platform_result(self, schedule_id: str, platform: str, publish_fn):
+        """Wrap a platform publish call so its result is saved as soon as it returns.
+
+        A failed save never changes the publish result: the post is live,
+        and mark_as_published writes every platform's result again once
+        the schedule finishes.
+        """
+        def _run():
+            result = publish_fn()
+            try:
+                self.save_platform_result(schedule_id, platform, result)
+            except Exception as e:
+                print(f"      ⚠️ {platform} result for {schedule_id} not saved incrementally: {e}", flush=True)
+            return result
+        return _run
+
     def reset_stuck_publishing(self, max_age_minutes: int = 10) -> int:
         """
         Reset any posts stuck in 'publishing' status for too long.
@@ -922,6 +983,7 @@ class DatabaseSchedulerService:
 
             # Update scheduled time to now so it gets picked up immediately
             scheduled_reel.scheduled_time = datetime.now(timezone.utc)
+            notify_publish_wakeup(db, scheduled_reel.scheduled_time)
 
             db.commit()
             print(f"🔄 Reset post {schedule_id} for retry")
@@ -961,6 +1023,8 @@ class DatabaseSchedulerService:
             if scheduled_reel.status in ["failed", "partial"]:
                 scheduled_reel.status = "scheduled"
                 scheduled_reel.publish_error = None
+            if scheduled_reel.status == "scheduled":
+                notify_publish_wakeup(db, new_time)
 
             db.commit()
             print(f"📅 Rescheduled post {schedule_id} to {new_time.isoformat()}")
@@ -1088,6 +1152,7 @@ class DatabaseSchedulerService:
                 print(f"[TOBY] Auto-retry #{auto_retries + 1} for {reel.schedule_id}", flush=True)
 
             if retried > 0:
+                notify_publish_wakeup(db, datetime.now(timezone.utc) + timedelta(minutes=5))
                 db.commit()
 
             return retried
@@ -1126,6 +1191,8 @@ class DatabaseSchedulerService:
             if scheduled_reel.status in ["failed", "partial"]:
                 scheduled_reel.status = "scheduled"
                 scheduled_reel.publish_error = None
+            if scheduled_reel.status == "scheduled":
+                notify_publish_wakeup(db, scheduled_reel.scheduled_time)
 
             db.commit()
             print(f"🚀 Post {schedule_id} queued for immediate publishing")
@@ -1160,7 +1227,6 @@ class DatabaseSchedulerService:
         Returns:
             Publishing results
         """
-        from app.services.publishing.social_publisher import SocialPublisher
         from app.services.brands.resolver import brand_resolver
 
         # Priority: brand_config > brand_name > user_id > default
@@ -1284,52 +1350,6 @@ class DatabaseSchedulerService:
                 "platform": "facebook",
             }
 
-        if "instagram" in effective_platforms:
-            # Proactively refresh the token if stale (>6h since last refresh or expiring soon)
-            if brand_name:
-                fresh_token = _proactive_refresh_ig_token(brand_name)
-                if fresh_token and hasattr(publisher, 'ig_access_token'):
-                    publisher.ig_access_token = fresh_token
-            print("📸 Publishing to Instagram...")
-            results["instagram"] = publisher.publish_instagram_reel(
-                video_url=video_url,
-                caption=caption,
-                thumbnail_url=thumbnail_url,
-                share_to_feed=share_to_feed
-            )
-            if schedule_id:
-                self.save_platform_result(schedule_id, "instagram", results["instagram"])
-
-        if "facebook" in effective_platforms:
-            print("📘 Publishing to Facebook...")
-            results["facebook"] = publisher.publish_facebook_reel(
-                video_url=video_url,
-                caption=caption,
-                thumbnail_url=thumbnail_url
-            )
-            if schedule_id:
-                self.save_platform_result(schedule_id, "facebook", results["facebook"])
-
-        if "youtube" in effective_platforms:
-            print("📺 Publishing to YouTube...", flush=True)
-
-            # Get yt_title from metadata if available
-            yt_title = metadata.get("yt_title") if metadata else None
-            # Get yt_thumbnail_path from metadata - clean AI image without text
-            yt_thumbnail_url = metadata.get("yt_thumbnail_path") if metadata else None
-            if not yt_thumbnail_url:
-                yt_thumbnail_url = thumbnail_url
-
-            results["youtube"] = self._publish_to_youtube(
-                video_url=video_url,
-                thumbnail_url=yt_thumbnail_url,
-                caption=caption,
-                brand_name=brand_name,
-                yt_title=yt_title
-            )
-            if schedule_id:
-                self.save_platform_result(schedule_id, "youtube", results["youtube"])
-
         # Threads is text-only — never publish video/media to Threads.
         # (Defense-in-depth: get_platforms_for_content_type already excludes
         # Threads from reels, but this catches legacy/manual paths.)
@@ -1337,24 +1357,85 @@ class DatabaseSchedulerService:
             effective_platforms.remove("threads")
             print(f"🧵 Threads removed from reel publish — text-only platform", flush=True)
 
+        # Build one call per platform; the publish engine runs them
+        # concurrently on per-platform worker pools.
+        calls = {}
+
+        if "instagram" in effective_platforms:
+            def _publish_instagram():
+                # Proactively refresh the token if stale (>6h since last refresh or expiring soon)
+                if brand_name:
+                    fresh_token = _proactive_refresh_ig_token(brand_name)
+                    if fresh_token and hasattr(publisher, 'ig_access_token'):
+                        publisher.ig_access_token = fresh_token
+                print("📸 Publishing to Instagram...")
+                return publisher.publish_instagram_reel(
+                    video_url=video_url,
+                    caption=caption,
+                    thumbnail_url=thumbnail_url,
+                    share_to_feed=share_to_feed
+                )
+            calls["instagram"] = _publish_instagram
+
+        if "facebook" in effective_platforms:
+            def _publish_facebook():
+                print("📘 Publishing to Facebook...")
+                return publisher.publish_facebook_reel(
+                    video_url=video_url,
+                    caption=caption,
+                    thumbnail_url=thumbnail_url
+                )
+            calls["facebook"] = _publish_facebook
+
+        if "youtube" in effective_platforms:
+            def _publish_youtube():
+                print("📺 Publishing to YouTube...", flush=True)
+
+                # Get yt_title from metadata if available
+                yt_title = metadata.get("yt_title") if metadata else None
+                # Get yt_thumbnail_path from metadata - clean AI image without text
+                yt_thumbnail_url = metadata.get("yt_thumbnail_path") if metadata else None
+                if not yt_thumbnail_url:
+                    yt_thumbnail_url = thumbnail_url
+
+                return self._publish_to_youtube(
+                    video_url=video_url,
+                    thumbnail_url=yt_thumbnail_url,
+                    caption=caption,
+                    brand_name=brand_name,
+                    yt_title=yt_title
+                )
+            calls["youtube"] = _publish_youtube
+
         if "tiktok" in effective_platforms:
-            print("📱 Publishing to TikTok...", flush=True)
-            results["tiktok"] = publisher.publish_tiktok_video(
-                video_url=video_url,
-                caption=caption,
-            )
-            if schedule_id:
-                self.save_platform_result(schedule_id, "tiktok", results["tiktok"])
+            def _publish_tiktok():
+                print("📱 Publishing to TikTok...", flush=True)
+                return publisher.publish_tiktok_video(
+                    video_url=video_url,
+                    caption=caption,
+                )
+            calls["tiktok"] = _publish_tiktok
 
         if "bluesky" in effective_platforms:
-            print("🦋 Publishing to Bluesky...", flush=True)
-            results["bluesky"] = publisher.publish_bsky_post(
-                caption=caption,
-                media_url=video_url,
-                media_type="VIDEO",
-            )
-            if schedule_id:
-                self.save_platform_result(schedule_id, "bluesky", results["bluesky"])
+            def _publish_bluesky():
+                print("🦋 Publishing to Bluesky...", flush=True)
+                return publisher.publish_bsky_post(
+                    caption=caption,
+                    media_url=video_url,
+                    media_type="VIDEO",
+                )
+            calls["bluesky"] = _publish_bluesky
+
+        if schedule_id:
+            # Persist each platform's result as soon as it finishes so crash
+            # recovery never re-publishes a platform that already succeeded.
+            calls = {
+                platform: self._saving_platform_result(schedule_id, platform, fn)
+                for platform, fn in calls.items()
+            }
+
+        from app.services.publishing.publish_engine import get_publish_engine
+        results.update(get_publish_engine().run_platform_calls(calls, account=brand_name or ""))
 
         return results
 
@@ -1662,36 +1743,29 @@ class DatabaseSchedulerService:
         # Use the later of start_date or now (Rule 1 & 2)
         base_date = max(start_date, now)
 
-        # Get all scheduled posts for this brand
+        # Get all scheduled posts for this brand — use CATEGORY matching so that
+        # light, dark, and format_b all share the same "reel" slots (prevents double-booking).
+        from app.services.toby.buffer_manager import variant_category_clause, variant_to_category
+        check_category = variant_to_category(slot_variant_label or variant)
+
         with get_db_session() as db:
-            sched_query = db.query(ScheduledReel).filter(
+            sched_query = db.query(ScheduledReel.scheduled_time).filter(
                 and_(
+                    brand_key_in([brand]),
+                    variant_category_clause(check_category),
                     ScheduledReel.status.in_(["scheduled", "publishing"]),
-                    ScheduledReel.scheduled_time >= start_date
+                    ScheduledReel.scheduled_time >= max(start_date, now),
                 )
             )
             if user_id:
                 sched_query = sched_query.filter(ScheduledReel.user_id == user_id)
-            schedules = sched_query.all()
-
-            # Filter by brand — use CATEGORY matching so that light, dark, and
-            # format_b all share the same "reel" slots (prevents double-booking).
-            from app.services.toby.buffer_manager import variant_to_category
-            check_category = variant_to_category(slot_variant_label or variant)
 
             occupied_slots = set()
-            for schedule in schedules:
-                metadata = schedule.extra_data or {}
-                schedule_brand = metadata.get("brand", "").lower()
-                schedule_variant = metadata.get("variant", "light")
-
-                # Match by brand name and category (not exact variant)
-                if schedule_brand == brand_lower and variant_to_category(schedule_variant) == check_category:
-                    # Store as timestamp for easy comparison
-                    ts = schedule.scheduled_time
-                    if ts.tzinfo is None:
-                        ts = ts.replace(tzinfo=timezone.utc)
-                    occupied_slots.add(ts.timestamp())
+            for (ts,) in sched_query.all():
+                # Store as timestamp for easy comparison
+                if ts.tzinfo is None:
+                    ts = ts.replace(tzinfo=timezone.utc)
+                occupied_slots.add(ts.timestamp())
 
         # Find next available slot starting from base_date
         current_day = base_date.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -1771,7 +1845,8 @@ class DatabaseSchedulerService:
         """
         with get_db_session() as db:
             query = db.query(ScheduledReel).filter(
-                ScheduledReel.status.in_(["scheduled", "publishing"])
+                ScheduledReel.status.in_(["scheduled", "publishing"]),
+                func.coalesce(scheduled_variant(), "light") == variant,
             )
 
             if start_date:
@@ -1841,27 +1916,22 @@ class DatabaseSchedulerService:
 
         # Get all scheduled posts for this brand with variant="post"
         with get_db_session() as db:
-            sched_query = db.query(ScheduledReel).filter(
+            sched_query = db.query(ScheduledReel.scheduled_time).filter(
                 and_(
+                    brand_key_in([brand]),
+                    scheduled_variant() == "post",
                     ScheduledReel.status.in_(["scheduled", "publishing"]),
-                    ScheduledReel.scheduled_time >= start_date
+                    ScheduledReel.scheduled_time >= max(start_date, now),
                 )
             )
             if user_id:
                 sched_query = sched_query.filter(ScheduledReel.user_id == user_id)
-            schedules = sched_query.all()
 
             occupied_slots = set()
-            for schedule in schedules:
-                metadata = schedule.extra_data or {}
-                schedule_brand = metadata.get("brand", "").lower()
-                schedule_variant = metadata.get("variant", "")
-
-                if schedule_brand == brand_lower and schedule_variant == "post":
-                    ts = schedule.scheduled_time
-                    if ts.tzinfo is None:
-                        ts = ts.replace(tzinfo=timezone.utc)
-                    occupied_slots.add(ts.timestamp())
+            for (ts,) in sched_query.all():
+                if ts.tzinfo is None:
+                    ts = ts.replace(tzinfo=timezone.utc)
+                occupied_slots.add(ts.timestamp())
 
         # Find next available slot
         current_day = base_date.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -0,0 +1,225 @@
+"""
+Scheduler leadership across uvicorn workers and replicas.
+
+The APScheduler jobs (check_and_publish, toby_tick, refresh_analytics,
+token refreshes, cleanups) and the publish wakeup listener must run in
+exactly one process, otherwise every extra worker duplicates them. Each
+process allowed to run them competes for a session-level Postgres
+advisory lock held on a dedicated connection (never borrowed from the
+pool); the holder is the leader. If the leader exits or its connection
+drops, Postgres releases the lock and a follower takes over on its next
+retry.
+
+The lock connection sets ``application_name`` to ``scheduler-leader:<host>:<pid>``
+so current_leader() can name the holder from any process.
+
+SCHEDULER_MODE decides what a web process does:
+    auto — compete for leadership (default; one worker behaves as before)
+    off  — API only; background jobs run in `python -m app.scheduler_process`
+           or on another replica left on ``auto``
+
+Tuning (env vars):
+    SCHEDULER_LEADER_RETRY_SECONDS     — follower lock retry interval (default 15)
+    SCHEDULER_LEADER_HEARTBEAT_SECONDS — leader connection check interval (default 10)
+"""
+import os
+import socket
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import text
+
+# Arbitrary application-wide key for pg_try_advisory_lock(bigint). Kept
+# below 2**31 so it shows up as pg_locks.objid with classid = 0.
+LEADER_LOCK_KEY = 72_600_113
+# Toby shard N (app/scheduler_process.py --toby-shard N) elects on this + N
+TOBY_SHARD_LOCK_BASE = 72_600_200
+RETRY_SECONDS = float(os.getenv("SCHEDULER_LEADER_RETRY_SECONDS", "15"))
+HEARTBEAT_SECONDS = float(os.getenv("SCHEDULER_LEADER_HEARTBEAT_SECONDS", "10"))
+
+
+def scheduler_mode() -> str:
+    """'auto' (compete for leadership) or 'off' (never run background jobs)."""
+    mode = os.getenv("SCHEDULER_MODE", "auto").strip().lower()
+    return mode if mode in ("auto", "off") else "auto"
+
+
+def _identity(role: str = "scheduler-leader") -> str:
+    return f"{role}:{socket.gethostname()}:{os.getpid()}"
+
+
+class SchedulerLeadership:
+    """Holds the leader advisory lock and starts/stops jobs on transitions."""
+
+    def __init__(
+        self,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        lock_key: int = LEADER_LOCK_KEY,
+        role: str = "scheduler-leader",
+    ):
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.lock_key = lock_key
+        self.identity = _identity(role)
+        self._conn = None
+        self._leader = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.elected_at: Optional[datetime] = None
+        self.elections = 0
+
+    # ── lifecycle ───────────────────────────────────────────────
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="scheduler-leader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop jobs (if leading) and release the lock so a follower takes over at once."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=HEARTBEAT_SECONDS + 5)
+        if self._leader:
+            self._demote("shutting down")
+        self._close()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader
+
+    def stats(self) -> dict:
+        return {
+            "identity": self.identity,
+            "is_leader": self._leader,
+            "elected_at": self.elected_at.isoformat() if self.elected_at else None,
+            "elections": self.elections,
+        }
+
+    # ── lock connection ─────────────────────────────────────────
+    def _open(self):
+        """Open a dedicated autocommit connection tagged with our identity."""
+        from app.db_connection import engine
+        proxied = engine.raw_connection()
+        proxied.detach()  # Never return this connection (or its lock) to the pool
+        conn = proxied.dbapi_connection
+        if hasattr(conn, "set_isolation_level"):  # psycopg2
+            conn.set_isolation_level(0)
+        else:  # psycopg 3
+            conn.autocommit = True
+        cur = conn.cursor()
+        cur.execute("SELECT set_config('application_name', %s, false)", (self.identity,))
+        cur.close()
+        return conn
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()  # ends the session — Postgres drops the lock
+            except Exception:
+                pass
+            self._conn = None
+
+    def _query_one(self, sql: str, params: tuple = ()):
+        cur = self._conn.cursor()
+        try:
+            cur.execute(sql, params)
+            return cur.fetchone()[0]
+        finally:
+            cur.close()
+
+    # ── transitions ─────────────────────────────────────────────
+    def _elect(self) -> None:
+        self._leader = True
+        self.elected_at = datetime.now(timezone.utc)
+        self.elections += 1
+        print(f"👑 [SchedulerLeader] {self.identity} elected — starting background jobs", flush=True)
+        try:
+            self.on_elected()
+        except Exception as e:
+            print(f"❌ [SchedulerLeader] Starting background jobs failed: {e}", flush=True)
+
+    def _demote(self, reason: str) -> None:
+        self._leader = False
+        self.elected_at = None
+        print(f"⚠️ [SchedulerLeader] {self.identity} lost leadership ({reason}) — stopping background jobs", flush=True)
+        try:
+            self.on_demoted()
+        except Exception as e:
+            print(f"⚠️ [SchedulerLeader] Stopping background jobs failed: {e}", flush=True)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self._conn is None:
+                    self._conn = self._open()
+                if not self._leader:
+                    if self._query_one("SELECT pg_try_advisory_lock(%s)", (self.lock_key,)):
+                        self._elect()
+                        continue
+                    self._stop.wait(RETRY_SECONDS)
+                else:
+                    self._stop.wait(HEARTBEAT_SECONDS)
+                    if not self._stop.is_set():
+                        # A live session keeps a session-level lock; a failed round
+                        # trip means Postgres may already have handed it to a follower.
+                        self._query_one("SELECT 1")
+            except Exception as e:
+                if self._leader:
+                    self._demote(f"lock connection failed: {e}")
+                else:
+                    print(f"⚠️ [SchedulerLeader] Lock attempt failed: {e} — retrying in {RETRY_SECONDS:.0f}s", flush=True)
+                self._close()
+                self._stop.wait(RETRY_SECONDS)
+
+
+_leadership: Optional[SchedulerLeadership] = None
+
+
+def start_scheduler_leadership(
+    on_elected: Callable[[], None],
+    on_demoted: Callable[[], None],
+) -> Optional[SchedulerLeadership]:
+    """Join the leader election unless SCHEDULER_MODE=off."""
+    global _leadership
+    if scheduler_mode() == "off":
+        return None
+    if _leadership is None:
+        _leadership = SchedulerLeadership(on_elected, on_demoted)
+        _leadership.start()
+    return _leadership
+
+
+def stop_scheduler_leadership() -> None:
+    global _leadership
+    if _leadership is not None:
+        _leadership.stop()
+        _leadership = None
+
+
+def current_leader(db) -> Optional[dict]:
+    """Who holds the leader lock right now, as seen by Postgres (any process)."""
+    row = db.execute(text("""
+        SELECT a.application_name, a.pid, a.backend_start, a.client_addr::text
+        FROM pg_locks l
+        JOIN pg_stat_activity a ON a.pid = l.pid
+        WHERE l.locktype = 'advisory' AND l.classid = 0 AND l.objid = :key
+          AND l.objsubid = 1 AND l.granted
+    """), {"key": LEADER_LOCK_KEY}).first()
+    if row is None:
+        return None
+    return {
+        "identity": row[0],
+        "backend_pid": row[1],
+        "connected_since": row[2].isoformat() if row[2] else None,
+        "client_addr": row[3],
+    }
+
+
+def leadership_status(db) -> dict:
+    """This process's role plus the cluster-wide leader."""
+    return {
+        "mode": scheduler_mode(),
+        "this_process": _leadership.stats() if _leadership else {"identity": _identity(), "is_leader": False},
+        "leader": current_leader(db),
+    }
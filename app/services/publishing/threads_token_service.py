@@ -6,7 +6,7 @@ The long-lived token lasts 60 days and must be refreshed before expiry.
 import os
 import logging
 
-import httpx
+from app.utils.http_client import get_http2_client
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,7 @@ class ThreadsTokenService:
     def exchange_code_for_token(self, code: str) -> dict:
         """Exchange authorization code for short-lived access token."""
         logger.info(f"Threads token exchange: app_id={self.app_id[:6]}..., redirect_uri={self.redirect_uri}")
-        resp = httpx.post(
+        resp = get_http2_client().post(
             f"{THREADS_API_BASE}/oauth/access_token",
             data={
                 "client_id": self.app_id,
@@ -47,7 +47,7 @@ class ThreadsTokenService:
 
     def exchange_for_long_lived_token(self, short_token: str) -> dict:
         """Exchange short-lived token for 60-day long-lived token."""
-        resp = httpx.get(
+        resp = get_http2_client().get(
             f"{THREADS_API_BASE}/access_token",
             params={
                 "grant_type": "th_exchange_token",
@@ -61,7 +61,7 @@ class ThreadsTokenService:
 
     def refresh_long_lived_token(self, long_token: str) -> dict:
         """Refresh a long-lived token (can be done once per day, up to 60 days before expiry)."""
-        resp = httpx.get(
+        resp = get_http2_client().get(
             f"{THREADS_API_BASE}/refresh_access_token",
             params={
                 "grant_type": "th_refresh_token",
@@ -74,7 +74,7 @@ class ThreadsTokenService:
 
     def get_user_profile(self, access_token: str) -> dict:
         """Get Threads user profile to store user_id and username."""
-        resp = httpx.get(
+        resp = get_http2_client().get(
             f"{THREADS_API_BASE}/{API_VERSION}/me",
             params={
                 "fields": "id,username",
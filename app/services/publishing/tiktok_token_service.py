@@ -7,7 +7,7 @@ Always refresh access token before publishing.
 import os
 import logging
 
-import httpx
+from app.utils.http_client import get_http2_client
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +30,7 @@ class TikTokTokenService:
         Exchange authorization code for access_token + refresh_token.
         TikTok uses PKCE — must pass code_verifier.
         """
-        resp = httpx.post(
+        resp = get_http2_client().post(
             TIKTOK_OAUTH_URL,
             data={
                 "client_key": self.client_key,
@@ -62,7 +62,7 @@ class TikTokTokenService:
 
     def refresh_access_token(self, refresh_token: str) -> dict:
         """Refresh access token using refresh token. Called before every publish."""
-        resp = httpx.post(
+        resp = get_http2_client().post(
             TIKTOK_OAUTH_URL,
             data={
                 "client_key": self.client_key,
@@ -89,7 +89,7 @@ class TikTokTokenService:
 
     def get_user_info(self, access_token: str) -> dict:
         """Get TikTok user info to store username."""
-        resp = httpx.get(
+        resp = get_http2_client().get(
             f"{TIKTOK_API_BASE}/v2/user/info/",
             params={"fields": "open_id,union_id,avatar_url,display_name,username"},
             headers={"Authorization": f"Bearer {access_token}"},
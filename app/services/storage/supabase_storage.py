@@ -6,6 +6,7 @@ Supabase is the SOLE storage backend – no local filesystem fallbacks.
 Thread-safe: no global mutable state; credentials are read per-call.
 """
 
+import hashlib
 import logging
 import mimetypes
 import os
@@ -13,6 +14,7 @@ from pathlib import Path
 from typing import Optional
 
 import requests
+from app.utils.http_client import get_http_session
 
 logger = logging.getLogger(__name__)
 
@@ -80,7 +82,7 @@ def _ensure_bucket(bucket: str) -> None:
 
     # Check whether the bucket already exists
     try:
-        resp = requests.get(
+        resp = get_http_session().get(
             f"{url}/storage/v1/bucket/{bucket}",
             headers=headers,
             timeout=15,
@@ -94,7 +96,7 @@ def _ensure_bucket(bucket: str) -> None:
 
     # Bucket does not exist — try to create it
     try:
-        resp = requests.post(
+        resp = get_http_session().post(
             f"{url}/storage/v1/bucket",
             headers={**headers, "Content-Type": "application/json"},
             json={"id": bucket, "name": bucket, "public": True},
@@ -156,7 +158,7 @@ def upload_file(
     endpoint = f"{url}/storage/v1/object/{bucket}/{path}"
 
     try:
-        resp = requests.post(
+        resp = get_http_session().post(
             endpoint,
             headers=_headers(key, content_type=ct, upsert=True),
             data=file_data,
@@ -208,7 +210,7 @@ def delete_file(bucket: str, path: str) -> bool:
     endpoint = f"{url}/storage/v1/object/{bucket}/{path}"
 
     try:
-        resp = requests.delete(
+        resp = get_http_session().delete(
             endpoint,
             headers=_headers(key),
             timeout=30,
@@ -229,6 +231,17 @@ def delete_file(bucket: str, path: str) -> bool:
         return False
 
 
+def versioned_url(url: str, data: bytes) -> str:
+    """``url`` with a ``v=`` content hash, for objects re-uploaded under a fixed path.
+
+    Brand logos keep the same object path across uploads; the version makes
+    a new upload a new URL, so URL-keyed caches (the brand asset cache in
+    every process, browsers, the CDN) never serve the previous image.
+    """
+    version = hashlib.sha256(data).hexdigest()[:12]
+    return f"{url}{'&' if '?' in url else '?'}v={version}"
+
+
 def get_public_url(bucket: str, path: str) -> str:
     """Build the public URL for an object (no network call)."""
     url, _ = _get_credentials()
@@ -244,7 +257,7 @@ def download_file(bucket: str, path: str) -> bytes:
     endpoint = f"{url}/storage/v1/object/{bucket}/{path}"
 
     try:
-        resp = requests.get(
+        resp = get_http_session().get(
             endpoint,
             headers=_headers(key),
             timeout=60,
@@ -267,7 +280,7 @@ def file_exists(bucket: str, path: str) -> bool:
     endpoint = f"{url}/storage/v1/object/{bucket}/{path}"
 
     try:
-        resp = requests.head(
+        resp = get_http_session().head(
             endpoint,
             headers=_headers(key),
             timeout=15,
@@ -294,7 +307,7 @@ def list_files(bucket: str, prefix: str) -> list[dict]:
     # Split prefix into the folder path and an empty search string
     # so Supabase lists everything under that folder.
     try:
-        resp = requests.post(
+        resp = get_http_session().post(
             endpoint,
             headers=_headers(key, content_type="application/json"),
             json={"prefix": prefix, "limit": 1000},
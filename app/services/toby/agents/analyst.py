@@ -9,24 +9,16 @@ Runs in Loop 2 (Analytical Loop, every 6 hours):
 5. Backfill toby_score on episodic memories
 """
 import json
-import os
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from openai import OpenAI
+from app.utils.llm_client import get_deepseek_client
 from app.models.toby import TobyStrategyScore, TobyContentTag, TobyActivityLog
 from app.services.toby.memory.episodic import backfill_toby_score
 from app.services.toby.memory.semantic import store_semantic_memory
 
 
-def _get_deepseek_client() -> OpenAI:
-    return OpenAI(
-        api_key=os.getenv("DEEPSEEK_API_KEY", ""),
-        base_url="https://api.deepseek.com",
-    )
-
-
 def analyst_loop(db: Session, user_id: str, brand_id: str) -> dict:
     """Run the full analytical loop for a user/brand.
 
@@ -190,7 +182,7 @@ Be specific and actionable — this becomes a semantic memory for future strateg
 Return a single paragraph insight (max 200 words)."""
 
     try:
-        client = _get_deepseek_client()
+        client = get_deepseek_client()
         response = client.chat.completions.create(
             model="deepseek-chat",
             messages=[{"role": "user", "content": prompt}],
@@ -5,10 +5,9 @@ Wraps the existing content generation pipeline with memory injection:
 procedural rules, episodic examples, strategy rationale, competitor context.
 """
 import json
-import os
 from typing import Optional
 from sqlalchemy.orm import Session
-from openai import OpenAI
+from app.utils.llm_client import get_deepseek_client
 
 
 CREATOR_SYSTEM_BASE = """You are a world-class social media content creator.
@@ -27,13 +26,6 @@ Never copy competitors — use their signals for inspiration only.
 Every claim must be plausible and defensible."""
 
 
-def _get_deepseek_client() -> OpenAI:
-    return OpenAI(
-        api_key=os.getenv("DEEPSEEK_API_KEY", ""),
-        base_url="https://api.deepseek.com",
-    )
-
-
 def creator_generate(
     db: Session,
     user_id: str,
@@ -66,7 +58,7 @@ def creator_generate(
     system_prompt = _build_system_prompt(strategy, prompt_context, content_type)
 
     try:
-        client = _get_deepseek_client()
+        client = get_deepseek_client()
         response = client.chat.completions.create(
             model="deepseek-chat",
             messages=[
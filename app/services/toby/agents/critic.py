@@ -7,12 +7,28 @@ Three-layer evaluation:
 3. Audience Simulator (DeepSeek Chat t=0.5) — simulated audience reaction
 
 Ensemble: 25% Rule + 45% Semantic + 30% Audience
+
+The two LLM critics are independent, so they run concurrently on a shared
+pool: the critic stage costs the slower of the two calls instead of their
+sum (paid again on every revision). A critic that hasn't answered within
+TOBY_CRITIC_BUDGET_SECONDS scores the same neutral 70 as a failed one.
+Semantic verdicts go through the LLM response cache (app/utils/llm_cache):
+an unchanged draft re-checked on a later tick doesn't pay for the call.
+
+Tuning (env vars):
+    TOBY_CRITIC_BUDGET_SECONDS  — latency budget for the LLM critics (default 60)
+    TOBY_CRITIC_WORKERS         — critic threads shared by all users (default 6)
 """
+import contextvars
 import json
 import os
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Optional
 from sqlalchemy.orm import Session
-from openai import OpenAI
+from app.utils.llm_cache import cached_completion, completion_from_sdk
+from app.utils.llm_client import get_deepseek_client
 from app.core.quality_scorer import QualityScorer, QualityScore
 
 
@@ -84,11 +100,74 @@ Return ONLY valid JSON:
 }}"""
 
 
-def _get_deepseek_client() -> OpenAI:
-    return OpenAI(
-        api_key=os.getenv("DEEPSEEK_API_KEY", ""),
-        base_url="https://api.deepseek.com",
-    )
+CRITIC_BUDGET_SECONDS = float(os.getenv("TOBY_CRITIC_BUDGET_SECONDS", "60"))
+# Two critics per evaluation × TOBY_TICK_WORKERS users ticking at once
+DEFAULT_CRITIC_WORKERS = 6
+
+_critic_pool: Optional[ThreadPoolExecutor] = None
+_critic_pool_lock = threading.Lock()
+
+
+def _get_critic_pool() -> ThreadPoolExecutor:
+    global _critic_pool
+    if _critic_pool is None:
+        with _critic_pool_lock:
+            if _critic_pool is None:
+                try:
+                    workers = int(os.getenv("TOBY_CRITIC_WORKERS", DEFAULT_CRITIC_WORKERS))
+                except ValueError:
+                    workers = DEFAULT_CRITIC_WORKERS
+                _critic_pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="toby-critic")
+    return _critic_pool
+
+
+def shutdown_critic_pool() -> None:
+    """Drop queued critiques (running ones finish in the background)."""
+    global _critic_pool
+    with _critic_pool_lock:
+        pool, _critic_pool = _critic_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _timed(fn: Callable[[], dict]) -> tuple[dict, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run_critic_ensemble(
+    critics: dict[str, Callable[[], dict]],
+    fallbacks: dict[str, dict],
+    budget_seconds: float = CRITIC_BUDGET_SECONDS,
+) -> tuple[dict[str, dict], dict[str, Optional[float]]]:
+    """Run independent critics concurrently within one latency budget.
+
+    Returns (results, timings_ms). A critic still running when the budget
+    runs out gets a copy of its fallback and a None timing.
+    """
+    pool = _get_critic_pool()
+    # Copy contextvars per task (cost tracker / log user) — a Context can't
+    # be entered by two threads at once.
+    futures = {
+        name: pool.submit(contextvars.copy_context().run, _timed, fn)
+        for name, fn in critics.items()
+    }
+    wait(list(futures.values()), timeout=budget_seconds)
+
+    results: dict[str, dict] = {}
+    timings: dict[str, Optional[float]] = {}
+    for name, future in futures.items():
+        if future.done() and not future.cancelled() and future.exception() is None:
+            results[name], elapsed = future.result()
+            timings[name] = round(elapsed, 1)
+        else:
+            future.cancel()
+            reason = "timed out" if not future.done() else f"failed: {future.exception()}"
+            print(f"[TOBY] {name.capitalize()} critique {reason} — using neutral score", flush=True)
+            results[name] = dict(fallbacks[name])
+            timings[name] = None
+    return results, timings
 
 
 def critic_evaluate(
@@ -104,8 +183,9 @@ def critic_evaluate(
     Returns:
         dict with 'ensemble_score', 'rule_score', 'semantic_score',
         'audience_score', 'issues', 'feedback', 'should_publish',
-        'should_revise', 'details'.
+        'should_revise', 'details', 'timings_ms'.
     """
+    started = time.perf_counter()
     title = content.get("title", "")
     body = content.get("body", "") or content.get("script", "") or ""
     slides = content.get("slides", [])
@@ -113,8 +193,9 @@ def critic_evaluate(
         body = "\n".join(slides)
 
     # ── Critic 1: Rule-Based (fast, free) ──
-    rule_result = _rule_based_critique(title, body, content_type, prompt_context)
+    rule_result, rule_ms = _timed(lambda: _rule_based_critique(title, body, content_type, prompt_context))
     rule_score = rule_result.total_score
+    timings = {"rule": round(rule_ms, 1)}
 
     # Early kill: if rule-based score < 50, don't spend API calls
     if rule_score < 50:
@@ -129,19 +210,24 @@ def critic_evaluate(
             "should_revise": False,
             "should_kill": True,
             "details": {"rule": rule_result.__dict__},
+            "timings_ms": {**timings, "total": round((time.perf_counter() - started) * 1000, 1)},
         }
 
-    # ── Critic 2: Semantic (AI-powered) ──
-    semantic_result = _semantic_critique(title, body, strategy, prompt_context)
+    # ── Critics 2 + 3: Semantic (AI-powered) and Audience Simulator, concurrently ──
+    critics = {"semantic": lambda: _semantic_critique(title, body, strategy, prompt_context)}
+    fallbacks = {"semantic": {"overall": 70, "issues": [], "feedback": "Semantic critique unavailable: timed out"}}
+    if run_audience:
+        critics["audience"] = lambda: _audience_critique(title, body, content_type, prompt_context)
+        fallbacks["audience"] = {"overall": 70, "issues": [], "improvement": "Audience simulation unavailable: timed out"}
+    results, llm_timings = run_critic_ensemble(critics, fallbacks)
+    timings.update(llm_timings)
+
+    semantic_result = results["semantic"]
     semantic_score = semantic_result.get("overall", 70)
 
-    # ── Critic 3: Audience Simulator ──
     audience_score = None
-    audience_result = {}
+    audience_result = results.get("audience", {})
     if run_audience:
-        audience_result = _audience_critique(
-            title, body, content_type, prompt_context
-        )
         audience_score = audience_result.get("overall", 70)
 
     # ── Ensemble Score ──
@@ -176,6 +262,7 @@ def critic_evaluate(
             "semantic": semantic_result,
             "audience": audience_result,
         },
+        "timings_ms": {**timings, "total": round((time.perf_counter() - started) * 1000, 1)},
     }
 
 
@@ -191,7 +278,7 @@ def _rule_based_critique(
     else:
         content_dict["slides"] = body.split("\n") if body else []
 
-    return scorer.score(content_dict, content_type, prompt_context)
+    return scorer.score(content_dict, ctx=prompt_context)
 
 
 def _semantic_critique(
@@ -208,17 +295,23 @@ def _semantic_critique(
         strategy=strategy_str,
     )
 
+    request = {
+        "model": "deepseek-chat",
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.2,
+        "max_tokens": 800,
+    }
     try:
-        client = _get_deepseek_client()
-        response = client.chat.completions.create(
-            model="deepseek-chat",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-            max_tokens=800,
+        # Low temperature: the same draft, strategy and constitution get the same verdict
+        result = cached_completion(
+            "toby.critic.semantic",
+            request,
+            lambda: completion_from_sdk(
+                get_deepseek_client().chat.completions.create(**request, timeout=CRITIC_BUDGET_SECONDS)
+            ),
+            cacheable=_is_json_verdict,
         )
-
-        content = response.choices[0].message.content or ""
-        return _parse_json_response(content, default_score=70)
+        return _parse_json_response(result["content"], default_score=70)
 
     except Exception as e:
         print(f"[TOBY] Semantic critique failed: {e}", flush=True)
@@ -245,12 +338,13 @@ def _audience_critique(
     )
 
     try:
-        client = _get_deepseek_client()
+        client = get_deepseek_client()
         response = client.chat.completions.create(
             model="deepseek-chat",
             messages=[{"role": "user", "content": prompt}],
             temperature=0.5,
             max_tokens=600,
+            timeout=CRITIC_BUDGET_SECONDS,
         )
 
         content = response.choices[0].message.content or ""
@@ -307,16 +401,27 @@ def _build_constitution(prompt_context) -> str:
     return "\n".join(f"Rule {i+1}: {r}" for i, r in enumerate(rules))
 
 
-def _parse_json_response(content: str, default_score: float = 70) -> dict:
-    """Parse JSON from LLM response with fallback."""
+def _strip_code_fence(content: str) -> str:
     content = content.strip()
     if content.startswith("```"):
         content = content.split("```")[1]
         if content.startswith("json"):
             content = content[4:]
         content = content.strip()
+    return content
+
 
+def _parse_json_response(content: str, default_score: float = 70) -> dict:
+    """Parse JSON from LLM response with fallback."""
     try:
-        return json.loads(content)
+        return json.loads(_strip_code_fence(content))
     except (json.JSONDecodeError, TypeError):
         return {"overall": default_score, "issues": [], "feedback": "Parse error in critique response"}
+
+
+def _is_json_verdict(content: str) -> bool:
+    """Only cache critiques that parse — a garbled reply is retried, not replayed."""
+    try:
+        return isinstance(json.loads(_strip_code_fence(content)), dict)
+    except (json.JSONDecodeError, TypeError):
+        return False
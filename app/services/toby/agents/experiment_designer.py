@@ -5,12 +5,11 @@ Part of Loop 3 (daily deliberation). Designs statistically rigorous experiments
 with specific hypotheses, using sequential testing for early stopping.
 """
 import json
-import os
 import uuid
 from datetime import datetime, timezone
 from typing import Optional
 from sqlalchemy.orm import Session
-from openai import OpenAI
+from app.utils.llm_client import get_deepseek_client
 from app.models.toby import TobyExperiment, TobyActivityLog, TobyStrategyScore, TobyContentTag
 
 
@@ -48,13 +47,6 @@ Return ONLY valid JSON:
 }}"""
 
 
-def _get_deepseek_client() -> OpenAI:
-    return OpenAI(
-        api_key=os.getenv("DEEPSEEK_API_KEY", ""),
-        base_url="https://api.deepseek.com",
-    )
-
-
 def design_experiment(
     db: Session,
     user_id: str,
@@ -69,7 +61,7 @@ def design_experiment(
     context = _build_design_context(db, user_id, brand_id, content_type, prompt_context)
 
     try:
-        client = _get_deepseek_client()
+        client = get_deepseek_client()
         response = client.chat.completions.create(
             model="deepseek-reasoner",
             messages=[{"role": "user", "content": context}],
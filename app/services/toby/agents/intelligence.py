@@ -5,11 +5,10 @@ Processes raw signals from various sources (Meta Graph API, discovery,
 competitor analysis) into structured world model entries.
 """
 import json
-import os
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from sqlalchemy.orm import Session
-from openai import OpenAI
+from app.utils.llm_client import get_deepseek_client
 from app.models.toby import TobyActivityLog
 from app.models.toby_cognitive import TobyRawSignal, TobyWorldModel
 
@@ -42,13 +41,6 @@ Return ONLY valid JSON:
 }}"""
 
 
-def _get_deepseek_client() -> OpenAI:
-    return OpenAI(
-        api_key=os.getenv("DEEPSEEK_API_KEY", ""),
-        base_url="https://api.deepseek.com",
-    )
-
-
 def store_raw_signal(
     db: Session,
     user_id: str,
@@ -100,7 +92,7 @@ def process_raw_signals(db: Session, user_id: str) -> dict:
     prompt = INTELLIGENCE_PROCESSOR_PROMPT.format(signals=signals_text)
 
     try:
-        client = _get_deepseek_client()
+        client = get_deepseek_client()
         response = client.chat.completions.create(
             model="deepseek-chat",
             messages=[{"role": "user", "content": prompt}],
@@ -187,7 +179,7 @@ Return ONLY valid JSON:
 {{"analysis": [{{"hook_strategy": "...", "engagement_driver": "...", "opportunity": "...", "relevance": 0.0-1.0}}]}}"""
 
     try:
-        client = _get_deepseek_client()
+        client = get_deepseek_client()
         response = client.chat.completions.create(
             model="deepseek-chat",
             messages=[{"role": "user", "content": prompt}],
@@ -10,12 +10,10 @@ adjusts the learning system itself:
 5. Algorithm tuning: Adjust explore ratio, decay priors, prune memory.
 """
 import json
-import os
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from openai import OpenAI
 import numpy as np
 
 from app.models.toby import (
@@ -33,13 +31,6 @@ MAX_EXPLORE_RATIO_CHANGE_PER_WEEK = 0.15
 MAX_PRIOR_DECAY_PER_WEEK = 0.20
 
 
-def _get_deepseek_client() -> OpenAI:
-    return OpenAI(
-        api_key=os.getenv("DEEPSEEK_API_KEY", ""),
-        base_url="https://api.deepseek.com",
-    )
-
-
 def meta_cognitive_loop(db: Session, user_id: str, brand_id: str) -> dict:
     """Run the weekly meta-cognitive evaluation.
 
@@ -6,12 +6,11 @@ across the last 7 days of performance data, identify strategy evolution
 opportunities, and propose experiments.
 """
 import json
-import os
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from sqlalchemy.orm import Session
-from openai import OpenAI
+from app.utils.llm_client import get_deepseek_client
 from app.models.toby import TobyStrategyScore, TobyContentTag, TobyActivityLog
 from app.services.toby.memory.semantic import store_semantic_memory, retrieve_semantic_memories
 from app.services.toby.memory.episodic import get_recent_episodic
@@ -60,13 +59,6 @@ Return ONLY valid JSON:
 }"""
 
 
-def _get_deepseek_client() -> OpenAI:
-    return OpenAI(
-        api_key=os.getenv("DEEPSEEK_API_KEY", ""),
-        base_url="https://api.deepseek.com",
-    )
-
-
 def pattern_analysis_loop(
     db: Session, user_id: str, brand_id: str, content_type: str = "reel"
 ) -> dict:
@@ -78,7 +70,7 @@ def pattern_analysis_loop(
     context = _build_pattern_context(db, user_id, brand_id, content_type)
 
     try:
-        client = _get_deepseek_client()
+        client = get_deepseek_client()
         response = client.chat.completions.create(
             model="deepseek-reasoner",
             messages=[
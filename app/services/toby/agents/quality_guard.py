@@ -36,7 +36,8 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.models.toby import TobyActivityLog
-from app.models.scheduling import ScheduledReel
+from app.models.scheduling import ScheduledReel, normalize_brand_key, scheduled_brand_key, scheduled_variant
+from app.services.toby.buffer_manager import SlotOccupancy
 
 
 # ── Forbidden patterns (content that should never be published) ──────────────
@@ -79,22 +80,23 @@ def _get_valid_hours(offset: int, type_group: str) -> list[int]:
 
 def _find_next_valid_slot(
     valid_hours: list[int],
-    occupied: dict[tuple[str, str, str], int],
+    occupied: SlotOccupancy,
     brand: str,
     type_group: str,
     after: datetime,
     max_days: int = 10,
 ) -> datetime | None:
     """Find the next valid unoccupied slot for a brand+type after a given time."""
+    brand_key = normalize_brand_key(brand) or ""
+    hours = sorted(valid_hours)
     current_day = after.replace(hour=0, minute=0, second=0, microsecond=0)
     for day_offset in range(max_days):
         check_date = current_day + timedelta(days=day_offset)
-        for hour in sorted(valid_hours):
+        for hour in hours:
             candidate = check_date.replace(hour=hour, minute=0, second=0, microsecond=0)
             if candidate <= after:
                 continue
-            hk = candidate.strftime("%Y-%m-%d %H")
-            if occupied.get((brand, type_group, hk), 0) == 0:
+            if occupied.count_in_hour(brand_key, type_group, candidate) == 0:
                 return candidate
     return None
 
@@ -161,10 +163,11 @@ def quality_guard_sweep(db: Session, user_id: str) -> dict:
     brands = db.query(Brand).filter(Brand.user_id == user_id, Brand.active == True).all()
     brand_offsets = {b.id: (b.schedule_offset or 0) for b in brands}
 
-    # Build master occupied map from ALL non-failed future reels (for repositioning)
-    # Uses counts so we correctly handle multiple items at the same slot
+    # Build master occupancy from ALL non-failed future reels (for repositioning).
+    # Sorted per (brand, type group) so "is this hour taken" is a bisect; keeps
+    # every entry so multiple items at the same slot are counted correctly.
     all_future = (
-        db.query(ScheduledReel)
+        db.query(scheduled_brand_key(), scheduled_variant(), ScheduledReel.scheduled_time)
         .filter(
             ScheduledReel.user_id == user_id,
             ScheduledReel.status.in_(["scheduled", "publishing", "partial", "published"]),
@@ -172,14 +175,10 @@ def quality_guard_sweep(db: Session, user_id: str) -> dict:
         )
         .all()
     )
-    occupied: dict[tuple[str, str, str], int] = {}
-    for r in all_future:
-        ed = r.extra_data or {}
-        b = ed.get("brand", "")
-        tg = _get_type_group(ed.get("variant", ""))
-        hk = r.scheduled_time.strftime("%Y-%m-%d %H")
-        key = (b, tg, hk)
-        occupied[key] = occupied.get(key, 0) + 1
+    occupied = SlotOccupancy.from_rows(
+        ((b or "", v, t) for b, v, t in all_future),
+        group_fn=lambda v: _get_type_group(v or ""),
+    )
 
     # ── Layer A: Fallback/placeholder content ────────────────────────────────
     for reel in scheduled:
@@ -236,9 +235,9 @@ def quality_guard_sweep(db: Session, user_id: str) -> dict:
             continue
 
         # This reel is at a wrong slot time → reposition
-        old_hk = reel.scheduled_time.strftime("%Y-%m-%d %H")
-        old_key = (brand, type_group, old_hk)
-        occupied[old_key] = max(0, occupied.get(old_key, 0) - 1)
+        brand_key = normalize_brand_key(brand) or ""
+        old_time = reel.scheduled_time
+        occupied.remove(brand_key, type_group, old_time)
 
         # Search from near the item's original time (not from now) so items
         # months in the future find slots near their original position.
@@ -255,14 +254,12 @@ def quality_guard_sweep(db: Session, user_id: str) -> dict:
                        f"(valid: {valid_hours}) — repositioned to {new_slot.strftime('%Y-%m-%d %H:%M')}",
                 layer="E"
             )
-            new_hk = new_slot.strftime("%Y-%m-%d %H")
-            occupied[(brand, type_group, new_hk)] = occupied.get((brand, type_group, new_hk), 0) + 1
+            occupied.add(brand_key, type_group, new_slot)
             summary["slots_repositioned"] += 1
         else:
             # No valid slot found — leave the item in place rather than failing it.
             # It will be retried on the next tick when slots may have freed up.
-            old_key_restore = (brand, type_group, old_hk)
-            occupied[old_key_restore] = occupied.get(old_key_restore, 0) + 1
+            occupied.add(brand_key, type_group, old_time)
             print(f"[TOBY-QG] Layer E: No valid slot for {reel.schedule_id} "
                   f"(hour {current_hour:02d}), leaving in place", flush=True)
 
@@ -286,8 +283,10 @@ def quality_guard_sweep(db: Session, user_id: str) -> dict:
             # Collision — try to reposition the duplicate to next valid slot
             offset = brand_offsets.get(brand, 0)
             valid_hours = _get_valid_hours(offset, type_group)
-            # Free the current slot in occupied map
-            occupied[key] = max(0, occupied.get(key, 0) - 1)
+            # Free the current slot in the occupancy index
+            brand_key = normalize_brand_key(brand) or ""
+            old_time = reel.scheduled_time
+            occupied.remove(brand_key, type_group, old_time)
             search_from = max(now, reel.scheduled_time - timedelta(days=1))
             new_slot = _find_next_valid_slot(
                 valid_hours, occupied, brand, type_group, search_from, max_days=90
@@ -299,12 +298,11 @@ def quality_guard_sweep(db: Session, user_id: str) -> dict:
                            f"at {hour_key} — repositioned to {new_slot.strftime('%Y-%m-%d %H:%M')}",
                     layer="C"
                 )
-                new_hk = new_slot.strftime("%Y-%m-%d %H")
-                occupied[(brand, type_group, new_hk)] = occupied.get((brand, type_group, new_hk), 0) + 1
+                occupied.add(brand_key, type_group, new_slot)
                 summary["slots_repositioned"] += 1
             else:
                 # No slot available — leave in place, retry next tick
-                occupied[key] = occupied.get(key, 0) + 1
+                occupied.add(brand_key, type_group, old_time)
                 print(f"[TOBY-QG] Layer C: No valid slot for collision {reel.schedule_id} "
                       f"at {hour_key}, leaving in place", flush=True)
         else:
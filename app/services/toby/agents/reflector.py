@@ -7,10 +7,9 @@ After every content creation, generates three types of memory:
 3. Procedural — What to do about it (concrete rule, optional)
 """
 import json
-import os
 from typing import Optional
 from sqlalchemy.orm import Session
-from openai import OpenAI
+from app.utils.llm_client import get_deepseek_client
 from app.services.toby.memory.episodic import store_episodic_memory
 from app.services.toby.memory.semantic import store_semantic_memory
 from app.services.toby.memory.procedural import store_procedural_rule
@@ -55,13 +54,6 @@ Return ONLY valid JSON:
 }"""
 
 
-def _get_deepseek_client() -> OpenAI:
-    return OpenAI(
-        api_key=os.getenv("DEEPSEEK_API_KEY", ""),
-        base_url="https://api.deepseek.com",
-    )
-
-
 def reflector_reflect(
     db: Session,
     user_id: str,
@@ -91,7 +83,7 @@ def reflector_reflect(
     )
 
     try:
-        client = _get_deepseek_client()
+        client = get_deepseek_client()
         response = client.chat.completions.create(
             model="deepseek-chat",
             messages=[
@@ -7,12 +7,11 @@ Thompson Sampling serves as the Bayesian prior — the LLM can override it with
 explicit reasoning.
 """
 import json
-import os
 import random
 from datetime import datetime, timezone
 from typing import Optional
 from sqlalchemy.orm import Session
-from openai import OpenAI
+from app.utils.llm_client import get_deepseek_client
 from app.models.toby import TobyStrategyScore
 
 
@@ -55,14 +54,6 @@ Output ONLY valid JSON (no markdown):
 }"""
 
 
-def _get_deepseek_client() -> OpenAI:
-    """Get the DeepSeek client."""
-    return OpenAI(
-        api_key=os.getenv("DEEPSEEK_API_KEY", ""),
-        base_url="https://api.deepseek.com",
-    )
-
-
 def strategist_reason(
     db: Session,
     user_id: str,
@@ -88,7 +79,7 @@ def strategist_reason(
     )
 
     try:
-        client = _get_deepseek_client()
+        client = get_deepseek_client()
         response = client.chat.completions.create(
             model="deepseek-reasoner",
             messages=[
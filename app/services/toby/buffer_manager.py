@@ -10,11 +10,16 @@ Features:
   - B4: Fuzzy ±15min slot matching (avoids overwrites from minor time diffs)
   - B5: Respects created_by flag to avoid overwriting user-created content
 """
+from bisect import bisect_left, insort
 from datetime import datetime, timedelta, timezone
 import math
+from typing import Callable, Iterable, Optional
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from app.models.toby import TobyState, TobyActivityLog, TobyBrandConfig
-from app.models.scheduling import ScheduledReel
+from app.models.scheduling import (
+    ScheduledReel, brand_key_in, normalize_brand_key, scheduled_brand_key, scheduled_variant,
+)
 from app.models.brands import Brand
 
 # B4: Fuzzy match window for slot detection
@@ -36,6 +41,17 @@ def variant_to_category(variant: str) -> str:
     return "reel"  # fallback
 
 
+def variant_category_clause(category: str):
+    """SQL filter on ScheduledReel's variant matching variant_to_category() == category."""
+    variant = scheduled_variant()
+    if category == "post":
+        return variant == "post"
+    if category == "threads":
+        return variant == "threads"
+    # "reel" is the fallback category: anything that isn't post/threads, incl. NULL
+    return or_(variant.is_(None), variant.notin_(["post", "threads"]))
+
+
 def content_type_to_category(content_type: str) -> str:
     """Map a buffer slot content_type to its slot category."""
     if content_type in ("reel", "format_b_reel"):
@@ -47,6 +63,74 @@ def content_type_to_category(content_type: str) -> str:
     return content_type
 
 
+def _epoch(when: datetime) -> float:
+    """POSIX seconds; naive datetimes from the DB are UTC."""
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.timestamp()
+
+
+class SlotOccupancy:
+    """Occupied scheduled_times per (brand_key, group) as sorted epoch seconds.
+
+    Built once from the rows of a window, then every slot lookup is a
+    bisect on one brand+group array instead of a scan over all scheduled
+    rows. ``group_fn`` maps a ScheduledReel variant to the grouping the
+    caller matches on (slot category here, type group in quality_guard).
+    """
+
+    def __init__(self):
+        self._times: dict[tuple[str, str], list[float]] = {}
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[tuple],
+        group_fn: Callable[[Optional[str]], str] = variant_to_category,
+    ) -> "SlotOccupancy":
+        """Index (brand_key, variant, scheduled_time) rows."""
+        occupancy = cls()
+        times = occupancy._times
+        for brand_key, variant, scheduled_time in rows:
+            times.setdefault((brand_key, group_fn(variant)), []).append(_epoch(scheduled_time))
+        for arr in times.values():
+            arr.sort()
+        return occupancy
+
+    def add(self, brand_key: str, group: str, when: datetime) -> None:
+        insort(self._times.setdefault((brand_key, group), []), _epoch(when))
+
+    def remove(self, brand_key: str, group: str, when: datetime) -> None:
+        arr = self._times.get((brand_key, group))
+        if not arr:
+            return
+        t = _epoch(when)
+        i = bisect_left(arr, t)
+        if i < len(arr) and arr[i] == t:
+            del arr[i]
+
+    def has_near(self, brand_key: str, group: str, when: datetime, minutes: int = SLOT_FUZZY_MINUTES) -> bool:
+        """Any entry within ±minutes of when (inclusive)."""
+        arr = self._times.get((brand_key, group))
+        if not arr:
+            return False
+        t = _epoch(when)
+        i = bisect_left(arr, t - minutes * 60)
+        return i < len(arr) and arr[i] <= t + minutes * 60
+
+    def count_in_hour(self, brand_key: str, group: str, hour_start: datetime) -> int:
+        """Entries in [hour_start, hour_start + 1h)."""
+        arr = self._times.get((brand_key, group))
+        if not arr:
+            return 0
+        t = _epoch(hour_start)
+        return bisect_left(arr, t + 3600) - bisect_left(arr, t)
+
+    def is_slot_filled(self, brand_id: str, slot_time: datetime, content_type: str) -> bool:
+        """B4: fuzzy ±SLOT_FUZZY_MINUTES, content-type aware slot check."""
+        return self.has_near(normalize_brand_key(brand_id), content_type_to_category(content_type), slot_time)
+
+
 def _brand_can_publish_type(brand: Brand, content_type: str) -> bool:
     """Check if a brand has the platform credentials to publish this content type.
 
@@ -102,10 +186,16 @@ def get_buffer_status(db: Session, user_id: str, state: TobyState) -> dict:
     # "published" = fully published (definitely counts as filled)
     # Note: We do NOT filter by created_by here because we want both Toby-created
     # and user-created content to fill slots (prevents duplicates)
+    # Only the three columns slot matching needs, and only active brands' rows.
     scheduled = (
-        db.query(ScheduledReel)
+        db.query(
+            scheduled_brand_key().label("brand"),
+            scheduled_variant().label("variant"),
+            ScheduledReel.scheduled_time,
+        )
         .filter(
             ScheduledReel.user_id == user_id,
+            brand_key_in([b.id for b in brands]),
             ScheduledReel.scheduled_time >= now,
             ScheduledReel.scheduled_time <= horizon,
             ScheduledReel.status.in_(["scheduled", "publishing", "partial", "published"]),
@@ -117,34 +207,10 @@ def get_buffer_status(db: Session, user_id: str, state: TobyState) -> dict:
     # Uses module-level variant_to_category / content_type_to_category helpers.
     # This prevents cross-masking: a thread at 4 AM must NOT mark
     # a reel slot at 4 AM as filled (or vice versa).
-
-    # Build slot map: B4 fuzzy matching ±15 minutes (content-type aware)
-    filled_set = set()
-    for s in scheduled:
-        ed = s.extra_data or {}
-        brand_id = ed.get("brand", "")
-        cat = variant_to_category(ed.get("variant", "light"))
-        filled_set.add((brand_id, s.scheduled_time.strftime("%Y-%m-%d %H:%M"), cat))
-
-    def _slot_is_filled(brand_id: str, slot_time: datetime, content_type: str) -> bool:
-        """B4: Check if a slot is filled using fuzzy ±15min matching (content-type aware)."""
-        cat = content_type_to_category(content_type)
-        key = (brand_id, slot_time.strftime("%Y-%m-%d %H:%M"), cat)
-        if key in filled_set:
-            return True
-        # Fuzzy check: look for any scheduled item within ±SLOT_FUZZY_MINUTES
-        for s in scheduled:
-            ed = s.extra_data or {}
-            s_brand = ed.get("brand", "")
-            if s_brand != brand_id:
-                continue
-            s_cat = variant_to_category(ed.get("variant", "light"))
-            if s_cat != cat:
-                continue
-            diff = abs((s.scheduled_time - slot_time).total_seconds())
-            if diff <= SLOT_FUZZY_MINUTES * 60:
-                return True
-        return False
+    # B4 fuzzy matching ±15 minutes is a bisect per slot on the
+    # (brand, category) occupancy arrays.
+    occupancy = SlotOccupancy.from_rows(scheduled)
+    _slot_is_filled = occupancy.is_slot_filled
 
     # Slot definitions — must match frontend (Home.tsx) and scheduler (scheduler.py)
     BASE_REEL_HOURS = [0, 4, 8, 12, 16, 20]   # 6 reels/day, 4h apart
@@ -280,10 +346,14 @@ def get_buffer_status(db: Session, user_id: str, state: TobyState) -> dict:
     effective_filled = filled + pipeline_pending_count
     empty = max(0, total - effective_filled)
 
+    slots_by_brand: dict[str, list[dict]] = {}
+    for s in all_slots:
+        slots_by_brand.setdefault(s["brand_id"], []).append(s)
+
     # Per-brand health: pipeline items only count for matching content-type slots
     any_brand_has_empty = False
     for brand in brands:
-        brand_slots = [s for s in all_slots if s["brand_id"] == brand.id]
+        brand_slots = slots_by_brand.get(brand.id, [])
         brand_filled_count = sum(1 for s in brand_slots if s["filled"])
         # Sum pipeline items only for categories that have empty slots for this brand
         brand_pipeline = 0
@@ -304,7 +374,7 @@ def get_buffer_status(db: Session, user_id: str, state: TobyState) -> dict:
     if any_brand_has_empty:
         total_effective_filled = 0
         for brand in brands:
-            brand_slots = [s for s in all_slots if s["brand_id"] == brand.id]
+            brand_slots = slots_by_brand.get(brand.id, [])
             brand_filled_count = sum(1 for s in brand_slots if s["filled"])
             brand_pipeline = 0
             for cat in ("reel", "post", "threads"):
@@ -332,7 +402,7 @@ def get_buffer_status(db: Session, user_id: str, state: TobyState) -> dict:
     # Per-brand breakdown
     brand_breakdown = []
     for brand in brands:
-        brand_slots = [s for s in all_slots if s["brand_id"] == brand.id]
+        brand_slots = slots_by_brand.get(brand.id, [])
         brand_filled = sum(1 for s in brand_slots if s["filled"])
         brand_total = len(brand_slots)
         brand_reels = sum(1 for s in brand_slots if s["content_type"] in ("reel", "format_b_reel"))
@@ -364,9 +434,12 @@ def get_buffer_status(db: Session, user_id: str, state: TobyState) -> dict:
     }
 
 
-def get_empty_slots(db: Session, user_id: str, state: TobyState) -> list[dict]:
+def get_empty_slots(db: Session, user_id: str, state: TobyState, status: Optional[dict] = None) -> list[dict]:
     """Get empty slots that need content.
 
+    Pass the tick's get_buffer_status() result as ``status`` to reuse its
+    slot occupancy instead of rebuilding it.
+
     Smart burst: for buffer_days > 4, only return empty slots within a
     generation window of ceil(buffer_days / 2) days.  This prevents Toby
     from trying to fill a 10-day buffer all at once — instead it fills
@@ -377,7 +450,8 @@ def get_empty_slots(db: Session, user_id: str, state: TobyState) -> list[dict]:
     pipeline items are excluded. Without this, Toby would keep generating
     content for brands that already have enough pending items.
     """
-    status = get_buffer_status(db, user_id, state)
+    if status is None:
+        status = get_buffer_status(db, user_id, state)
     empty = [s for s in status["slots"] if not s["filled"]]
 
     buffer_days = state.buffer_days or 2
@@ -60,6 +60,7 @@ def create_plans_for_empty_slots(
     user_id: str,
     state: TobyState,
     max_plans: int = 6,
+    buffer_status: Optional[dict] = None,
 ) -> list[ContentPlan]:
     """
     Create content plans for empty slots in the buffer.
@@ -74,8 +75,11 @@ def create_plans_for_empty_slots(
     - Fix 2: Topics used in the last TOPIC_COOLDOWN_DAYS are deprioritised
     - Fix 3: Strategy similarity against already-scheduled content is checked;
              if too high, a retry is attempted with a narrower topic list
+
+    ``buffer_status`` is the tick's get_buffer_status() result, if the caller
+    already has it — saves rebuilding the slot occupancy.
     """
-    empty_slots = get_empty_slots(db, user_id, state)
+    empty_slots = get_empty_slots(db, user_id, state, status=buffer_status)
     if not empty_slots:
         return []
 
@@ -112,8 +116,11 @@ def create_plans_for_empty_slots(
     brand_available_topics: dict[str, list[str]] = {}
     # Fix 1: topics already picked in this batch, per brand
     topics_picked_this_batch: dict[str, list[str]] = {}
-    # Fix 3: similarity context = scheduled + already-planned, per brand
-    brand_similarity_ctx: dict[str, list[dict]] = {}
+    # Fix 3: similarity context = scheduled + already-planned, per brand.
+    # Primed from the DB in one query for every brand in this batch.
+    brand_similarity_ctx: dict[str, list[dict]] = _load_scheduled_context(
+        db, user_id, {slot["brand_id"] for slot in interleaved}
+    )
     # Fix 4: CROSS-BRAND similarity — strategies picked by OTHER brands in this batch
     # Prevents identical topic+hook combos across brands in the same tick
     cross_brand_batch_ctx: list[dict] = []
@@ -138,15 +145,9 @@ def create_plans_for_empty_slots(
             brand_available_topics[brand_id] = _topics_with_cooldown_order(
                 db, user_id, brand_id, all_topics
             )
-        if brand_id not in brand_similarity_ctx:
-            # Fix 3: prime the context from the DB (already scheduled content)
-            brand_similarity_ctx[brand_id] = _load_scheduled_context(
-                db, user_id, brand_id
-            )
-
         available = brand_available_topics[brand_id]
         batch_picked = topics_picked_this_batch.setdefault(brand_id, [])
-        similarity_ctx = brand_similarity_ctx[brand_id]
+        similarity_ctx = brand_similarity_ctx.setdefault(brand_id, [])
 
         # Fix 1: exclude topics already chosen in this batch for this brand
         remaining = [t for t in available if t not in batch_picked]
@@ -271,16 +272,19 @@ def _topics_with_cooldown_order(
 def _load_scheduled_context(
     db: Session,
     user_id: str,
-    brand_id: str,
+    brand_ids: set[str],
     lookahead_days: int = 2,
-) -> list[dict]:
+) -> dict[str, list[dict]]:
     """
     Fix 3: Load topic/hook/title_format combos from content already scheduled
-    in the next `lookahead_days` for this brand.
+    in the next `lookahead_days`, grouped by brand.
 
-    Used as the baseline similarity context before planning starts.
-    Returns [] on any error — always safe to ignore.
+    One query for all of ``brand_ids`` (instead of one per brand) — used as
+    the baseline similarity context before planning starts.
+    Returns {} on any error — always safe to ignore.
     """
+    if not brand_ids:
+        return {}
     try:
         from app.models.scheduling import ScheduledReel
         from sqlalchemy import and_
@@ -290,6 +294,7 @@ def _load_scheduled_context(
 
         rows = (
             db.query(
+                TobyContentTag.brand_id,
                 TobyContentTag.topic_bucket,
                 TobyContentTag.hook_strategy,
                 TobyContentTag.title_format,
@@ -306,22 +311,22 @@ def _load_scheduled_context(
             )
             .filter(
                 TobyContentTag.user_id == user_id,
-                TobyContentTag.brand_id == brand_id,
+                TobyContentTag.brand_id.in_(list(brand_ids)),
             )
             .all()
         )
 
-        return [
-            {
+        by_brand: dict[str, list[dict]] = {}
+        for r in rows:
+            by_brand.setdefault(r.brand_id, []).append({
                 "topic_bucket": r.topic_bucket,
                 "hook_strategy": r.hook_strategy,
                 "title_format": r.title_format,
                 "personality": r.personality,
-            }
-            for r in rows
-        ]
+            })
+        return by_brand
     except Exception:
-        return []
+        return {}
 
 
 def _strategy_similarity(candidate: StrategyChoice, existing: dict) -> float:
@@ -4,7 +4,11 @@ StateGraph — Formalizes the agent pipeline as a typed execution graph.
 Defines the AgentState dataclass and the build_toby_graph() function that
 chains Scout → Strategist → Creator → Critic → Publisher → Reflector
 with conditional routing (revise loop on critic failure).
+
+Every trace entry carries "ms", the wall time of that stage; critic
+entries also carry the per-critic breakdown ("critic_ms").
 """
+import time
 from dataclasses import dataclass, field
 from typing import Optional
 from sqlalchemy.orm import Session
@@ -57,7 +61,7 @@ class AgentState:
     # Reflector output
     reflection_result: dict = field(default_factory=dict)
 
-    # Execution trace
+    # Execution trace (one entry per stage, with its "ms")
     trace: list = field(default_factory=list)
     error: str = ""
 
@@ -79,10 +83,12 @@ def _execute_graph(state: AgentState, db: Session) -> AgentState:
     from app.services.toby.agents.publisher import publisher_execute
     from app.services.toby.agents.reflector import reflector_reflect
     from app.services.toby.learning_engine import choose_strategy
-    import random
+    def _ms(start: float) -> float:
+        return round((time.perf_counter() - start) * 1000, 1)
 
     try:
         # ── SCOUT ──
+        stage = time.perf_counter()
         scout_context = scout_gather_context(
             db, state.user_id, state.brand_id, state.content_type
         )
@@ -90,9 +96,10 @@ def _execute_graph(state: AgentState, db: Session) -> AgentState:
         state.relevant_memories = scout_context["relevant_memories"]
         state.world_model = scout_context["world_model"]
         state.content_gaps = scout_context["content_gaps"]
-        state.trace.append({"agent": "scout", "status": "done"})
+        state.trace.append({"agent": "scout", "status": "done", "ms": _ms(stage)})
 
         # ── STRATEGIST ──
+        stage = time.perf_counter()
         from app.services.toby.feature_flags import is_enabled
 
         # Get Thompson Sampling pick as the Bayesian prior
@@ -137,6 +144,7 @@ def _execute_graph(state: AgentState, db: Session) -> AgentState:
             "status": "done",
             "is_explore": state.is_explore,
             "thompson_override": state.thompson_override,
+            "ms": _ms(stage),
         })
 
         # ── CREATOR + CRITIC LOOP ──
@@ -144,6 +152,7 @@ def _execute_graph(state: AgentState, db: Session) -> AgentState:
             state.revision_count = attempt
 
             # Creator
+            stage = time.perf_counter()
             if is_enabled("cognitive_strategist"):
                 content = creator_generate(
                     db, state.user_id, state.brand_id, state.content_type,
@@ -165,9 +174,11 @@ def _execute_graph(state: AgentState, db: Session) -> AgentState:
                 "agent": "creator",
                 "status": "done",
                 "revision": attempt,
+                "ms": _ms(stage),
             })
 
             # Critic
+            stage = time.perf_counter()
             if is_enabled("multi_critic"):
                 verdict = critic_evaluate(
                     db, state.generated_content, state.content_type,
@@ -186,6 +197,9 @@ def _execute_graph(state: AgentState, db: Session) -> AgentState:
                     "status": "done",
                     "ensemble_score": state.quality_score,
                     "should_publish": state.should_publish,
+                    "revision": attempt,
+                    "ms": _ms(stage),
+                    "critic_ms": verdict.get("timings_ms", {}),
                 })
 
                 if state.should_publish or not state.should_revise:
@@ -198,6 +212,7 @@ def _execute_graph(state: AgentState, db: Session) -> AgentState:
 
         # ── PUBLISHER ──
         if state.should_publish and state.generated_content:
+            stage = time.perf_counter()
             state.publish_result = publisher_execute(
                 db, state.user_id, state.brand_id, state.content_type,
                 content=state.generated_content,
@@ -207,10 +222,11 @@ def _execute_graph(state: AgentState, db: Session) -> AgentState:
                 is_explore=state.is_explore,
                 thompson_override=state.thompson_override,
             )
-            state.trace.append({"agent": "publisher", "status": "done"})
+            state.trace.append({"agent": "publisher", "status": "done", "ms": _ms(stage)})
 
         # ── REFLECTOR ──
         if is_enabled("memory_system"):
+            stage = time.perf_counter()
             state.reflection_result = reflector_reflect(
                 db, state.user_id, state.brand_id, state.content_type,
                 content=state.generated_content,
@@ -225,6 +241,7 @@ def _execute_graph(state: AgentState, db: Session) -> AgentState:
                 "agent": "reflector",
                 "status": "done",
                 "memories_stored": state.reflection_result.get("memories_stored", 0),
+                "ms": _ms(stage),
             })
 
         # ── IMMEDIATE SIGNAL ──
@@ -6,12 +6,11 @@ historical content to bootstrap memory and Thompson Sampling priors.
 Uses the Meta Graph API with rate-limited fetching.
 """
 import json
-import os
 import time
 from datetime import datetime, timezone
 from typing import Optional
 from sqlalchemy.orm import Session
-from openai import OpenAI
+from app.utils.llm_client import get_deepseek_client
 from app.models.toby import TobyState, TobyActivityLog, TobyStrategyScore
 from app.services.toby.memory.episodic import store_episodic_memory
 from app.services.toby.memory.semantic import store_semantic_memory
@@ -53,13 +52,6 @@ Return ONLY valid JSON:
 }}"""
 
 
-def _get_deepseek_client() -> OpenAI:
-    return OpenAI(
-        api_key=os.getenv("DEEPSEEK_API_KEY", ""),
-        base_url="https://api.deepseek.com",
-    )
-
-
 def mine_historical_content(
     db: Session,
     user_id: str,
@@ -131,7 +123,7 @@ def mine_historical_content(
     )
 
     try:
-        client = _get_deepseek_client()
+        client = get_deepseek_client()
         response = client.chat.completions.create(
             model="deepseek-reasoner",
             messages=[{"role": "user", "content": prompt}],
@@ -3,11 +3,44 @@ Embedding generation for Toby's semantic memory system.
 
 Uses OpenAI's text-embedding-3-small model (1536 dimensions)
 via the existing openai client configured for DeepSeek or OpenAI.
+
+Embeddings are content-addressed: sha256(model, dimensions, text) keys an
+in-process LRU and the shared toby_embedding_cache table, so a repeated
+retrieval query (the strategist and scout rebuild near-identical queries
+per brand every tick) never reaches the network. Single-text misses from
+concurrent callers are coalesced by a micro-batcher into one
+embeddings.create call: the first caller waits EMBEDDING_BATCH_WINDOW_MS
+for company, then embeds everything queued, and identical texts in flight
+share one result.
+
+Tuning (env vars):
+    EMBEDDING_CACHE_SIZE       — in-process LRU entries (default 2048, ~12 KB each)
+    EMBEDDING_CACHE_TTL_DAYS   — persisted entries older than this are pruned (default 30)
+    EMBEDDING_BATCH_WINDOW_MS  — how long a miss waits for others to batch with (default 25)
+    EMBEDDING_BATCH_MAX        — texts per embeddings request (default 128)
 """
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from openai import OpenAI
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 1536
+# Truncate to ~8000 tokens worth of text (rough estimate)
+MAX_INPUT_CHARS = 32000
+
+CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))
+CACHE_TTL_DAYS = int(os.getenv("EMBEDDING_CACHE_TTL_DAYS", "30"))
+BATCH_WINDOW_S = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "25")) / 1000
+BATCH_MAX = max(1, int(os.getenv("EMBEDDING_BATCH_MAX", "128")))
+# A waiter gives up (and degrades to None) if the batch never resolves
+RESULT_TIMEOUT_S = 60.0
+
 # Use OpenAI embeddings (DeepSeek doesn't have embedding endpoint)
 _embedding_client: Optional[OpenAI] = None
 
@@ -30,57 +63,248 @@ def _get_client() -> OpenAI:
     return _embedding_client
 
 
-def generate_embedding(text: str) -> Optional[list[float]]:
-    """Generate a 1536-d embedding for memory storage and retrieval.
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(
+        f"{EMBEDDING_MODEL}:{EMBEDDING_DIMENSIONS}:{text}".encode("utf-8")
+    ).hexdigest()
+
+
+# ── in-process LRU ───────────────────────────────────────────────
+
+_lru: "OrderedDict[str, list[float]]" = OrderedDict()
+_lru_lock = threading.Lock()
+_stats = {"memory_hits": 0, "db_hits": 0, "api_texts": 0, "api_calls": 0, "coalesced": 0}
+
+
+def _lru_get(key: str) -> Optional[list[float]]:
+    with _lru_lock:
+        emb = _lru.get(key)
+        if emb is not None:
+            _lru.move_to_end(key)
+            _stats["memory_hits"] += 1
+        return emb
+
+
+def _lru_put(key: str, embedding: list[float]) -> None:
+    with _lru_lock:
+        _lru[key] = embedding
+        _lru.move_to_end(key)
+        while len(_lru) > CACHE_SIZE:
+            _lru.popitem(last=False)
 
-    Returns None if embedding generation fails (graceful degradation).
-    """
-    if not text or not text.strip():
-        return None
 
+# ── persistent cache (toby_embedding_cache) ──────────────────────
+
+_last_prune: float = 0.0
+
+
+def _load_persisted(keys: list[str]) -> dict[str, list[float]]:
+    """One SELECT for every key; a DB problem just means a cache miss."""
+    if not keys:
+        return {}
+    try:
+        from app.db_connection import engine
+        from app.models.toby_cognitive import TobyEmbeddingCache
+
+        table = TobyEmbeddingCache.__table__
+        with engine.connect() as conn:
+            rows = conn.execute(
+                table.select()
+                .with_only_columns(table.c.content_hash, table.c.embedding)
+                .where(table.c.content_hash.in_(keys))
+            ).all()
+        found = {h: (e.tolist() if hasattr(e, "tolist") else list(e)) for h, e in rows}
+        with _lru_lock:
+            _stats["db_hits"] += len(found)
+        return found
+    except Exception as e:
+        print(f"[TOBY] Embedding cache lookup failed: {e}", flush=True)
+        return {}
+
+
+def _persist(embeddings: dict[str, list[float]]) -> None:
+    global _last_prune
+    if not embeddings:
+        return
+    try:
+        from sqlalchemy.dialects.postgresql import insert
+        from app.db_connection import engine
+        from app.models.toby_cognitive import TobyEmbeddingCache
+
+        table = TobyEmbeddingCache.__table__
+        now = datetime.now(timezone.utc)
+        with engine.begin() as conn:
+            conn.execute(
+                insert(table).on_conflict_do_nothing(index_elements=["content_hash"]),
+                [
+                    {"content_hash": h, "model": EMBEDDING_MODEL, "embedding": e, "created_at": now}
+                    for h, e in embeddings.items()
+                ],
+            )
+            # Age out entries once a day per process (re-embedded on next use)
+            if time.monotonic() - _last_prune > 86400:
+                _last_prune = time.monotonic()
+                conn.execute(table.delete().where(table.c.created_at < now - timedelta(days=CACHE_TTL_DAYS)))
+    except Exception as e:
+        print(f"[TOBY] Embedding cache write failed: {e}", flush=True)
+
+
+# ── network ──────────────────────────────────────────────────────
+
+def _request_embeddings(texts: list[str]) -> list[Optional[list[float]]]:
+    """One embeddings.create call for non-empty, truncated texts."""
     try:
         client = _get_client()
-        # Truncate to ~8000 tokens worth of text (rough estimate)
-        truncated = text[:32000]
         response = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=truncated,
-            dimensions=1536,
+            model=EMBEDDING_MODEL,
+            input=texts,
+            dimensions=EMBEDDING_DIMENSIONS,
         )
-        return response.data[0].embedding
+        with _lru_lock:
+            _stats["api_calls"] += 1
+            _stats["api_texts"] += len(texts)
+        embeddings = [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+        return embeddings + [None] * (len(texts) - len(embeddings))
     except Exception as e:
-        print(f"[TOBY] Embedding generation failed (degrading gracefully): {e}", flush=True)
+        print(f"[TOBY] Batch embedding failed (degrading gracefully): {e}", flush=True)
+        return [None] * len(texts)
+
+
+def _resolve(pending: dict[str, str]) -> dict[str, Optional[list[float]]]:
+    """Embed hash -> text: persisted cache first, then the API in BATCH_MAX chunks."""
+    found = _load_persisted(list(pending))
+    missing = [k for k in pending if k not in found]
+    fresh: dict[str, list[float]] = {}
+    for i in range(0, len(missing), BATCH_MAX):
+        chunk = missing[i:i + BATCH_MAX]
+        for key, emb in zip(chunk, _request_embeddings([pending[k] for k in chunk])):
+            if emb is not None:
+                fresh[key] = emb
+    _persist(fresh)
+    found.update(fresh)
+    for key, emb in found.items():
+        _lru_put(key, emb)
+    return {key: found.get(key) for key in pending}
+
+
+# ── micro-batcher ────────────────────────────────────────────────
+
+class _EmbeddingBatcher:
+    """Coalesces concurrent generate_embedding() misses into one request.
+
+    No background thread: the caller that finds the batcher idle becomes
+    the drainer, waits BATCH_WINDOW_S (or until BATCH_MAX texts queue up),
+    then resolves everything queued — repeating while more arrived during
+    the request.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._queue: "OrderedDict[str, tuple[str, Future]]" = OrderedDict()
+        self._in_flight: dict[str, Future] = {}
+        self._draining = False
+
+    def embed(self, key: str, text: str) -> Optional[list[float]]:
+        with self._cond:
+            fut = self._in_flight.get(key)
+            if fut is not None:
+                _stats["coalesced"] += 1
+            else:
+                fut = Future()
+                self._in_flight[key] = fut
+                self._queue[key] = (text, fut)
+                if len(self._queue) >= BATCH_MAX:
+                    self._cond.notify()
+            drain = not self._draining
+            if drain:
+                self._draining = True
+        if drain:
+            self._drain()
+        try:
+            return fut.result(timeout=RESULT_TIMEOUT_S)
+        except Exception:
+            return None
+
+    def _drain(self) -> None:
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + BATCH_WINDOW_S
+                while len(self._queue) < BATCH_MAX:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = [self._queue.popitem(last=False) for _ in range(min(BATCH_MAX, len(self._queue)))]
+            results = {}
+            try:
+                results = _resolve({key: text for key, (text, _) in batch})
+            except Exception as e:
+                print(f"[TOBY] Embedding batch failed (degrading gracefully): {e}", flush=True)
+            finally:
+                with self._cond:
+                    for key, (_, fut) in batch:
+                        self._in_flight.pop(key, None)
+                        fut.set_result(results.get(key))
+                    if not self._queue:
+                        self._draining = False
+                        return
+
+
+_batcher = _EmbeddingBatcher()
+
+
+def generate_embedding(text: str) -> Optional[list[float]]:
+    """Generate a 1536-d embedding for memory storage and retrieval.
+
+    Served from the LRU or toby_embedding_cache when the same text was
+    embedded before; otherwise batched with concurrent callers.
+    Returns None if embedding generation fails (graceful degradation).
+    """
+    if not text or not text.strip():
         return None
 
+    truncated = text[:MAX_INPUT_CHARS]
+    key = _content_hash(truncated)
+    cached = _lru_get(key)
+    if cached is not None:
+        return list(cached)
+    embedding = _batcher.embed(key, truncated)
+    return list(embedding) if embedding is not None else None
+
 
 def generate_embedding_batch(texts: list[str]) -> list[Optional[list[float]]]:
-    """Generate embeddings for multiple texts in a single API call."""
+    """Generate embeddings for multiple texts, embedding only uncached ones."""
     if not texts:
         return []
 
-    try:
-        client = _get_client()
-        truncated = [t[:32000] for t in texts if t and t.strip()]
-        if not truncated:
-            return [None] * len(texts)
+    keys: list[Optional[str]] = []
+    results: dict[str, Optional[list[float]]] = {}
+    pending: dict[str, str] = {}
+    for t in texts:
+        if not t or not t.strip():
+            keys.append(None)
+            continue
+        truncated = t[:MAX_INPUT_CHARS]
+        key = _content_hash(truncated)
+        keys.append(key)
+        if key in results or key in pending:
+            continue
+        cached = _lru_get(key)
+        if cached is not None:
+            results[key] = cached
+        else:
+            pending[key] = truncated
 
-        response = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=truncated,
-            dimensions=1536,
-        )
-        embeddings = [d.embedding for d in response.data]
-
-        # Map back to original list (handle empty texts)
-        result = []
-        embed_idx = 0
-        for t in texts:
-            if t and t.strip():
-                result.append(embeddings[embed_idx] if embed_idx < len(embeddings) else None)
-                embed_idx += 1
-            else:
-                result.append(None)
-        return result
-    except Exception as e:
-        print(f"[TOBY] Batch embedding failed (degrading gracefully): {e}", flush=True)
-        return [None] * len(texts)
+    if pending:
+        results.update(_resolve(pending))
+    return [list(results[k]) if k and results.get(k) is not None else None for k in keys]
+
+
+def embedding_cache_stats() -> dict:
+    """Hit/miss counters since process start."""
+    with _lru_lock:
+        stats = dict(_stats)
+        stats["memory_entries"] = len(_lru)
+    lookups = stats["memory_hits"] + stats["db_hits"] + stats["api_texts"]
+    stats["hit_rate"] = round((stats["memory_hits"] + stats["db_hits"]) / lookups, 3) if lookups else None
+    return stats
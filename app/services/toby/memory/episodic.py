@@ -7,9 +7,10 @@ for each piece of content Toby creates.
 import uuid
 from datetime import datetime, timezone
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 from app.models.toby_cognitive import TobyEpisodicMemory
-from app.services.toby.memory.embeddings import generate_embedding
+from app.services.toby.memory.embeddings import generate_embedding, generate_embedding_batch
+from app.services.toby.memory.vector_index import add_memory, record_retrievals, search_memories
 
 
 # Memory cap per brand (pruned by gardener)
@@ -55,6 +56,7 @@ def store_episodic_memory(
         created_at=now,
     )
     db.add(memory)
+    add_memory(db, "episodic", user_id, memory.id, embedding, group=brand_id)
     return memory
 
 
@@ -66,33 +68,51 @@ def retrieve_episodic_memories(
     brand_id: str = None,
 ) -> list[TobyEpisodicMemory]:
     """Retrieve the k most relevant episodic memories using cosine similarity."""
-    query_embedding = generate_embedding(query)
-    if query_embedding is None:
+    return retrieve_episodic_memories_batch(db, user_id, [query], k=k, brand_id=brand_id)[0]
+
+
+def retrieve_episodic_memories_batch(
+    db: Session,
+    user_id: str,
+    queries: list[str],
+    k: int = 5,
+    brand_id: str = None,
+) -> list[list[TobyEpisodicMemory]]:
+    """Top-k episodic memories for several queries: one embedding batch,
+    one search over the user's in-process index, one row fetch."""
+    query_embeddings = generate_embedding_batch(queries)
+    embedded = [i for i, e in enumerate(query_embeddings) if e is not None]
+    ranked = search_memories(
+        db, "episodic", user_id, [query_embeddings[i] for i in embedded], k, group=brand_id
+    )
+
+    rows = {}
+    wanted = {memory_id for ids in ranked for memory_id in ids}
+    if wanted:
+        rows = {
+            m.id: m
+            for m in db.query(TobyEpisodicMemory)
+            .options(defer(TobyEpisodicMemory.embedding))
+            .filter(TobyEpisodicMemory.id.in_(wanted))
+            .all()
+        }
+
+    results: list[list[TobyEpisodicMemory]] = [[] for _ in queries]
+    for i, ids in zip(embedded, ranked):
+        results[i] = [rows[m] for m in ids if m in rows]
+    if len(embedded) < len(queries):
         # Fallback: return most recent memories
-        q = db.query(TobyEpisodicMemory).filter(
+        q = db.query(TobyEpisodicMemory).options(defer(TobyEpisodicMemory.embedding)).filter(
             TobyEpisodicMemory.user_id == user_id
         )
         if brand_id:
             q = q.filter(TobyEpisodicMemory.brand_id == brand_id)
-        return q.order_by(TobyEpisodicMemory.created_at.desc()).limit(k).all()
-
-    q = db.query(TobyEpisodicMemory).filter(
-        TobyEpisodicMemory.user_id == user_id,
-        TobyEpisodicMemory.embedding.isnot(None),
-    )
-    if brand_id:
-        q = q.filter(TobyEpisodicMemory.brand_id == brand_id)
-
-    results = q.order_by(
-        TobyEpisodicMemory.embedding.cosine_distance(query_embedding)
-    ).limit(k).all()
-
-    # Update retrieval tracking
-    now = datetime.now(timezone.utc)
-    for r in results:
-        r.retrieval_count = (r.retrieval_count or 0) + 1
-        r.last_retrieved = now
+        fallback = q.order_by(TobyEpisodicMemory.created_at.desc()).limit(k).all()
+        for i, e in enumerate(query_embeddings):
+            if e is None:
+                results[i] = fallback
 
+    record_retrievals("episodic", [m.id for i in embedded for m in results[i]])
     return results
 
 
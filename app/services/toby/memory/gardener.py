@@ -13,6 +13,7 @@ from app.models.toby_cognitive import (
     TobyProceduralMemory,
     TobyWorldModel,
 )
+from app.services.toby.memory.vector_index import invalidate_user
 
 
 # Memory limits
@@ -85,6 +86,9 @@ def prune_memories(
                 db.delete(mem)
                 pruned["episodic"] += 1
 
+    if pruned["episodic"]:
+        invalidate_user(user_id, "episodic")
+
     # Prune expired world model signals
     pruned["world_model"] = (
         db.query(TobyWorldModel)
@@ -116,6 +120,7 @@ def consolidate_memories(db: Session, user_id: str) -> int:
         excess = memories[MAX_SEMANTIC_PER_USER:]
         for mem in excess:
             db.delete(mem)
+        invalidate_user(user_id, "semantic")
         return len(excess)
 
     return 0
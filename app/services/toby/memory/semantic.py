@@ -9,7 +9,8 @@ from datetime import datetime, timezone
 from typing import Optional
 from sqlalchemy.orm import Session, defer
 from app.models.toby_cognitive import TobySemanticMemory
-from app.services.toby.memory.embeddings import generate_embedding
+from app.services.toby.memory.embeddings import generate_embedding, generate_embedding_batch
+from app.services.toby.memory.vector_index import add_memory, record_retrievals, search_memories
 
 
 MAX_SEMANTIC_PER_USER = 200
@@ -38,6 +39,7 @@ def store_semantic_memory(
         updated_at=datetime.now(timezone.utc),
     )
     db.add(memory)
+    add_memory(db, "semantic", user_id, memory.id, embedding)
     return memory
 
 
@@ -48,9 +50,37 @@ def retrieve_semantic_memories(
     k: int = 3,
 ) -> list[TobySemanticMemory]:
     """Retrieve the k most relevant semantic memories using cosine similarity."""
-    query_embedding = generate_embedding(query)
-    if query_embedding is None:
-        return (
+    return retrieve_semantic_memories_batch(db, user_id, [query], k=k)[0]
+
+
+def retrieve_semantic_memories_batch(
+    db: Session,
+    user_id: str,
+    queries: list[str],
+    k: int = 3,
+) -> list[list[TobySemanticMemory]]:
+    """Top-k semantic memories for several queries: one embedding batch,
+    one search over the user's in-process index, one row fetch."""
+    query_embeddings = generate_embedding_batch(queries)
+    embedded = [i for i, e in enumerate(query_embeddings) if e is not None]
+    ranked = search_memories(db, "semantic", user_id, [query_embeddings[i] for i in embedded], k)
+
+    rows = {}
+    wanted = {memory_id for ids in ranked for memory_id in ids}
+    if wanted:
+        rows = {
+            m.id: m
+            for m in db.query(TobySemanticMemory)
+            .options(defer(TobySemanticMemory.embedding))
+            .filter(TobySemanticMemory.id.in_(wanted))
+            .all()
+        }
+
+    results: list[list[TobySemanticMemory]] = [[] for _ in queries]
+    for i, ids in zip(embedded, ranked):
+        results[i] = [rows[m] for m in ids if m in rows]
+    if len(embedded) < len(queries):
+        fallback = (
             db.query(TobySemanticMemory)
             .options(defer(TobySemanticMemory.embedding))
             .filter(TobySemanticMemory.user_id == user_id)
@@ -58,25 +88,11 @@ def retrieve_semantic_memories(
             .limit(k)
             .all()
         )
+        for i, e in enumerate(query_embeddings):
+            if e is None:
+                results[i] = fallback
 
-    results = (
-        db.query(TobySemanticMemory)
-        .filter(
-            TobySemanticMemory.user_id == user_id,
-            TobySemanticMemory.embedding.isnot(None),
-        )
-        .order_by(
-            TobySemanticMemory.embedding.cosine_distance(query_embedding)
-        )
-        .limit(k)
-        .all()
-    )
-
-    now = datetime.now(timezone.utc)
-    for r in results:
-        r.retrieval_count = (r.retrieval_count or 0) + 1
-        r.last_retrieved = now
-
+    record_retrievals("semantic", [m.id for i in embedded for m in results[i]])
     return results
 
 
@@ -0,0 +1,302 @@
+"""
+In-process vector index for Toby's episodic and semantic memory.
+
+retrieve_*_memories used to ORDER BY embedding <=> query in pgvector
+without an ANN index — a sequential scan of 1536-d vectors per query —
+and bumped retrieval_count on every returned row, so each read became a
+write. Here each (kind, user) gets a NumPy matrix of L2-normalized float32
+rows, loaded lazily with one query; top-k is one matrix product
+(argpartition, then a sort of the k winners) and answers several queries
+at once. A user's memories are capped (500/brand episodic, 200 semantic),
+so exact search over the matrix is cheaper than maintaining a graph.
+
+Freshness:
+  - add_memory() appends a new row to a loaded index once the storing
+    session commits (store_* calls it); a rolled-back row never gets in;
+  - invalidate_user() drops a user's indexes (gardener prune/consolidate);
+  - indexes reload after MEMORY_INDEX_TTL_SECONDS to pick up writes made
+    by other processes.
+Retrieved ids are re-read from the DB, so a row deleted elsewhere is
+simply skipped.
+
+Retrieval counters are write-behind: record_retrievals() only counts in
+memory and a background flusher applies them every
+MEMORY_RETRIEVAL_FLUSH_SECONDS with one executemany UPDATE per table.
+
+Tuning (env vars):
+    MEMORY_INDEX_MAX_USERS          — (kind, user) indexes kept, LRU (default 64)
+    MEMORY_INDEX_TTL_SECONDS        — reload an index after this long (default 600)
+    MEMORY_RETRIEVAL_FLUSH_SECONDS  — retrieval counter flush interval (default 30)
+"""
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from typing import Optional, Sequence
+
+import numpy as np
+from sqlalchemy import bindparam, event
+from sqlalchemy.orm import Session
+
+MAX_INDEXES = int(os.getenv("MEMORY_INDEX_MAX_USERS", "64"))
+INDEX_TTL_SECONDS = float(os.getenv("MEMORY_INDEX_TTL_SECONDS", "600"))
+RETRIEVAL_FLUSH_SECONDS = float(os.getenv("MEMORY_RETRIEVAL_FLUSH_SECONDS", "30"))
+
+
+def _kinds():
+    from app.models.toby_cognitive import TobyEpisodicMemory, TobySemanticMemory
+
+    # kind -> (model, column used for group filtering or None)
+    return {
+        "episodic": (TobyEpisodicMemory, TobyEpisodicMemory.brand_id),
+        "semantic": (TobySemanticMemory, None),
+    }
+
+
+def _normalize(vectors) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class UserVectorIndex:
+    """Normalized embedding matrix for one user's memories of one kind."""
+
+    def __init__(self, ids: list[str], groups: list[Optional[str]], matrix: np.ndarray):
+        # Replaced wholesale on add() so readers always see a consistent triple
+        self._data = (ids, np.asarray(groups, dtype=object), matrix)
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data[0])
+
+    def add(self, memory_id: str, embedding: Sequence[float], group: Optional[str] = None) -> None:
+        ids, groups, matrix = self._data
+        row = _normalize(embedding)
+        matrix = np.vstack([matrix, row]) if len(ids) else row
+        self._data = (ids + [memory_id], np.append(groups, np.array([group], dtype=object)), matrix)
+
+    def search(self, queries: np.ndarray, k: int, group: Optional[str] = None) -> list[list[str]]:
+        """Top-k ids by cosine similarity for each (normalized) query row."""
+        ids, groups, matrix = self._data
+        if not ids or k <= 0:
+            return [[] for _ in range(len(queries))]
+        if group is not None:
+            rows = np.nonzero(groups == group)[0]
+            if not len(rows):
+                return [[] for _ in range(len(queries))]
+            matrix = matrix[rows]
+        else:
+            rows = None
+
+        scores = queries @ matrix.T  # (queries, candidates)
+        k = min(k, scores.shape[1])
+        if k < scores.shape[1]:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(scores.shape[1]), (len(queries), 1))
+        results = []
+        for q, cand in enumerate(top):
+            ordered = cand[np.argsort(-scores[q, cand], kind="stable")]
+            if rows is not None:
+                ordered = rows[ordered]
+            results.append([ids[i] for i in ordered])
+        return results
+
+
+# ── registry ─────────────────────────────────────────────────────
+
+_indexes: "OrderedDict[tuple[str, str], UserVectorIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+_stats = {"loads": 0, "hits": 0, "queries": 0, "invalidations": 0}
+
+
+def _load(db: Session, kind: str, user_id: str) -> UserVectorIndex:
+    model, group_col = _kinds()[kind]
+    columns = [model.id, group_col if group_col is not None else model.id, model.embedding]
+    rows = (
+        db.query(*columns)
+        .filter(model.user_id == user_id, model.embedding.isnot(None))
+        .all()
+    )
+    if rows:
+        matrix = _normalize([r[2] for r in rows])
+    else:
+        matrix = np.zeros((0, 0), dtype=np.float32)
+    groups = [r[1] for r in rows] if group_col is not None else [None] * len(rows)
+    return UserVectorIndex([r[0] for r in rows], groups, matrix)
+
+
+def get_index(db: Session, kind: str, user_id: str) -> UserVectorIndex:
+    """The user's index for ``kind``, loading it (one query) when missing or stale."""
+    key = (kind, user_id)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None and time.monotonic() - index.loaded_at < INDEX_TTL_SECONDS:
+            _indexes.move_to_end(key)
+            _stats["hits"] += 1
+            return index
+
+    index = _load(db, kind, user_id)
+    with _indexes_lock:
+        _indexes[key] = index
+        _indexes.move_to_end(key)
+        _stats["loads"] += 1
+        while len(_indexes) > MAX_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def search_memories(
+    db: Session,
+    kind: str,
+    user_id: str,
+    query_embeddings: list[Sequence[float]],
+    k: int,
+    group: Optional[str] = None,
+) -> list[list[str]]:
+    """Top-k memory ids for each query embedding (batched in one matrix product)."""
+    if not query_embeddings:
+        return []
+    index = get_index(db, kind, user_id)
+    with _indexes_lock:
+        _stats["queries"] += len(query_embeddings)
+    return index.search(_normalize(query_embeddings), k, group=group)
+
+
+_PENDING_ADDS_KEY = "toby_memory_index_adds"
+
+
+def _apply_pending_adds(session: Session) -> None:
+    for kind, user_id, memory_id, embedding, group in session.info.pop(_PENDING_ADDS_KEY, []):
+        with _indexes_lock:
+            index = _indexes.get((kind, user_id))
+            if index is not None:
+                index.add(memory_id, embedding, group)
+
+
+def _drop_pending_adds(session: Session) -> None:
+    session.info.pop(_PENDING_ADDS_KEY, None)
+
+
+def add_memory(
+    db: Session, kind: str, user_id: str, memory_id: str, embedding, group: Optional[str] = None,
+) -> None:
+    """Append a freshly stored memory to the user's index (if loaded) once ``db`` commits.
+
+    Until then the row may still roll back, and an id without a row would
+    be searched and counted until the next TTL reload.
+    """
+    if embedding is None:
+        return
+    if not event.contains(db, "after_commit", _apply_pending_adds):
+        event.listen(db, "after_commit", _apply_pending_adds)
+        event.listen(db, "after_rollback", _drop_pending_adds)
+    db.info.setdefault(_PENDING_ADDS_KEY, []).append((kind, user_id, memory_id, embedding, group))
+
+
+def invalidate_user(user_id: str, kind: Optional[str] = None) -> None:
+    """Drop a user's indexes (all kinds by default); the next search reloads."""
+    with _indexes_lock:
+        for key in [k for k in _indexes if k[1] == user_id and (kind is None or k[0] == kind)]:
+            del _indexes[key]
+            _stats["invalidations"] += 1
+
+
+# ── write-behind retrieval counters ──────────────────────────────
+
+_pending: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))  # kind -> id -> hits
+_pending_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_flusher: Optional[threading.Thread] = None
+_flusher_stop = threading.Event()
+
+
+def record_retrievals(kind: str, memory_ids: list[str]) -> None:
+    """Count retrievals in memory; the flusher writes them in bulk."""
+    if not memory_ids:
+        return
+    with _pending_lock:
+        counts = _pending[kind]
+        for memory_id in memory_ids:
+            counts[memory_id] += 1
+    _ensure_flusher()
+
+
+def flush_retrievals() -> int:
+    """Apply pending retrieval counts (one executemany per table). Returns rows updated.
+
+    On failure the counts are merged back and retried on the next flush.
+    """
+    with _flush_lock:
+        with _pending_lock:
+            if not _pending:
+                return 0
+            batch = {kind: dict(counts) for kind, counts in _pending.items()}
+            _pending.clear()
+
+        from app.db_connection import engine
+
+        now = datetime.now(timezone.utc)
+        written = 0
+        kinds = _kinds()
+        for kind, counts in batch.items():
+            table = kinds[kind][0].__table__
+            stmt = (
+                table.update()
+                .where(table.c.id == bindparam("b_id"))
+                .values(
+                    retrieval_count=table.c.retrieval_count + bindparam("b_hits"),
+                    last_retrieved=bindparam("b_at"),
+                )
+            )
+            try:
+                with engine.begin() as conn:
+                    conn.execute(stmt, [{"b_id": i, "b_hits": n, "b_at": now} for i, n in counts.items()])
+                written += len(counts)
+            except Exception as e:
+                with _pending_lock:
+                    for memory_id, n in counts.items():
+                        _pending[kind][memory_id] += n
+                print(f"⚠️ [TOBY] Memory retrieval flush failed ({len(counts)} kept for retry): {e}", flush=True)
+        return written
+
+
+def _flush_loop() -> None:
+    while not _flusher_stop.wait(RETRIEVAL_FLUSH_SECONDS):
+        flush_retrievals()
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is not None:
+        return
+    with _pending_lock:
+        if _flusher is not None:
+            return
+        _flusher = threading.Thread(target=_flush_loop, name="memory-retrieval-flusher", daemon=True)
+        _flusher.start()
+
+
+def shutdown_vector_index() -> None:
+    """Stop the background flusher and write whatever is still pending."""
+    _flusher_stop.set()
+    flush_retrievals()
+
+
+atexit.register(flush_retrievals)
+
+
+def vector_index_stats() -> dict:
+    with _indexes_lock:
+        stats = dict(_stats)
+        stats["indexes"] = len(_indexes)
+        stats["vectors"] = sum(len(i) for i in _indexes.values())
+    with _pending_lock:
+        stats["pending_retrievals"] = sum(len(c) for c in _pending.values())
+    return stats
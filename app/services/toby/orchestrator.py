@@ -2,7 +2,8 @@
 Toby Orchestrator — the main coordination loop.
 
 Runs every 5 minutes via APScheduler. On each tick it checks all users
-with Toby enabled and executes whichever action is most needed.
+with Toby enabled (in parallel, see tick_executor.py) and executes
+whichever action is most needed.
 
 Decision priority (highest to lowest):
   1. BUFFER CHECK  — Are all slots for next 2 days filled?
@@ -27,6 +28,7 @@ ANALYSIS_CHECK_INTERVAL = 360    # 6 hours
 
 # D1: Error log debouncing — suppress repeated error logs for the same action
 _error_log_timestamps: dict[str, datetime] = {}
+_error_log_lock = threading.Lock()  # users tick concurrently (tick_executor.py)
 ERROR_LOG_DEBOUNCE_MINUTES = 30
 
 # Generation rate-limiting: prevent burst-posting
@@ -47,43 +49,25 @@ BOOTSTRAP_MAX_PLANS_PER_TICK = 4        # Generate up to 4 plans per tick
 
 
 
-def toby_tick():
+def toby_tick(shard_index: int = 0, shards: int = 1):
     """
     Main orchestrator tick — called by APScheduler every 5 minutes.
-    Iterates over all users with Toby enabled and runs their actions.
-    Each step is committed independently so a failure in one step
-    does not roll back earlier steps (prevents cascade-rerun bugs).
+    Runs every enabled user of the shard on the TobyTickExecutor pool,
+    each on its own session (see tick_executor.py). Each step is committed
+    independently so a failure in one step does not roll back earlier
+    steps (prevents cascade-rerun bugs).
     """
-    from app.db_connection import SessionLocal
+    from app.services.toby.tick_executor import get_tick_executor
 
-    db = SessionLocal()
     try:
-        # Find all users with Toby enabled
-        enabled_states = db.query(TobyState).filter(TobyState.enabled == True).all()
-
-        for state in enabled_states:
-            try:
-                # Billing guard: skip locked users
-                from app.models.auth import UserProfile
-                profile = db.query(UserProfile).filter_by(user_id=state.user_id).first()
-                if profile and profile.billing_status == "locked":
-                    continue
-
-                _process_user(db, state)
-            except Exception as e:
-                db.rollback()
-                print(f"[TOBY] Error processing user {state.user_id}: {e}", flush=True)
-                traceback.print_exc()
-                # D1: Debounced error logging
-                _log_debounced(db, state.user_id, "error",
-                               f"Toby tick error: {str(e)[:500]}", level="error")
+        get_tick_executor().run_tick(shard_index, shards)
     except Exception as e:
         print(f"[TOBY] Critical orchestrator error: {e}", flush=True)
         traceback.print_exc()
-    finally:
-        db.close()
 
-    # Cost aggregation: run once daily (check cheaply each tick)
+    # Cost aggregation: run once daily (check cheaply each tick; shard 0 only)
+    if shard_index != 0:
+        return
     try:
         from app.services.monitoring.cost_tracker import aggregate_old_daily_records
         from datetime import date
@@ -398,7 +382,7 @@ def _run_buffer_check(db: Session, user_id: str, state: TobyState, brands=None):
     is_aggressive = is_bootstrap or status["health"] == "critical"
     max_plans = BOOTSTRAP_MAX_PLANS_PER_TICK if is_aggressive else 1
 
-    plans = create_plans_for_empty_slots(db, user_id, state, max_plans=max_plans)
+    plans = create_plans_for_empty_slots(db, user_id, state, max_plans=max_plans, buffer_status=status)
     if not plans:
         return
 
@@ -1014,17 +998,30 @@ def _run_analysis_check(db: Session, user_id: str, state: TobyState):
             print(f"[TOBY] 7d strategy update failed for tag {tag.id}: {e}", flush=True)
 
 
-def start_toby_scheduler(scheduler):
-    """Register Toby's 5-minute tick with APScheduler."""
+def start_toby_scheduler(scheduler, shard_index: int | None = None):
+    """Register Toby's 5-minute tick with APScheduler.
+
+    The scheduler leader passes no shard: it runs every user when
+    TOBY_SHARD_COUNT is 1 and leaves Toby to the shard processes otherwise.
+    """
+    from app.services.toby.tick_executor import shard_count
+
+    shards = shard_count()
+    if shard_index is None:
+        if shards > 1:
+            print(f"🤖 Toby sharded {shards} ways — ticks run in `app.scheduler_process --toby-shard N`", flush=True)
+            return
+        shard_index = 0
     scheduler.add_job(
         toby_tick,
         'interval',
         minutes=5,
-        id='toby_orchestrator',
+        args=[shard_index, shards],
+        id='toby_orchestrator' if shards == 1 else f'toby_orchestrator_shard_{shard_index}',
         replace_existing=True,
         max_instances=1,  # F1: Prevent concurrent tick execution
     )
-    print("🤖 Toby orchestrator registered (5-minute ticks)", flush=True)
+    print(f"🤖 Toby orchestrator registered (5-minute ticks, shard {shard_index}/{shards})", flush=True)
 
 
 def _log_debounced(db: Session, user_id: str, action_type: str,
@@ -1032,12 +1029,11 @@ def _log_debounced(db: Session, user_id: str, action_type: str,
     """D1: Log an error only if it hasn't been logged recently for this action."""
     key = f"{user_id}:{action_type}"
     now = datetime.now(timezone.utc)
-    last = _error_log_timestamps.get(key)
-
-    if last and (now - last).total_seconds() < ERROR_LOG_DEBOUNCE_MINUTES * 60:
-        return  # Suppressed — already logged recently
-
-    _error_log_timestamps[key] = now
+    with _error_log_lock:
+        last = _error_log_timestamps.get(key)
+        if last and (now - last).total_seconds() < ERROR_LOG_DEBOUNCE_MINUTES * 60:
+            return  # Suppressed — already logged recently
+        _error_log_timestamps[key] = now
     try:
         db.add(TobyActivityLog(
             user_id=user_id,
@@ -1172,7 +1168,11 @@ def _check_budget_exceeded(state: TobyState) -> bool:
             state.spent_today_cents = 0
             state.budget_reset_at = now
 
-    spent = state.spent_today_cents or 0
+    # Real tracked spend (flushed row + unflushed cost-tracker deltas) wins
+    # over the flat per-generation estimate once it is higher.
+    from app.services.monitoring.cost_tracker import get_today_spend_usd
+    tracked_cents = int(get_today_spend_usd(state.user_id) * 100)
+    spent = max(state.spent_today_cents or 0, tracked_cents)
     if spent >= state.daily_budget_cents:
         return True
 
@@ -24,12 +24,16 @@ from typing import List
 from sqlalchemy.orm import Session
 from app.models.niche_config import NicheConfig
 from app.models.toby import TobyActivityLog
+from app.utils.llm_cache import cached_completion, completion_from_json
 
 logger = logging.getLogger(__name__)
 
 # Debounce: don't re-attempt seeding more than once per 24 hours
 SEED_DEBOUNCE_HOURS = 24
 
+# Identical niche prompts reuse DeepSeek's competitor list for a week
+COMPETITOR_SUGGESTION_TTL_SECONDS = 7 * 24 * 3600
+
 
 def maybe_seed_discovery(db: Session, user_id: str) -> dict:
     """
@@ -221,36 +225,34 @@ def _suggest_competitors_via_llm(cfg: NicheConfig) -> List[str]:
         'Example: ["account1", "account2", "account3"]'
     )
 
-    try:
+    request = {
+        "model": "deepseek-chat",
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.3,
+        "max_tokens": 500,
+    }
+
+    def fetch() -> dict:
         response = requests.post(
             "https://api.deepseek.com/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
             },
-            json={
-                "model": "deepseek-chat",
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.3,
-                "max_tokens": 500,
-            },
+            json=request,
             timeout=30,
         )
-
         if response.status_code != 200:
-            logger.error("DeepSeek competitor suggestion failed: HTTP %s", response.status_code)
-            return []
-
-        content_text = response.json()["choices"][0]["message"]["content"].strip()
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return completion_from_json(response.json())
 
-        # Parse JSON (handle markdown fences)
-        if content_text.startswith("```"):
-            content_text = content_text.split("```")[1]
-            if content_text.startswith("json"):
-                content_text = content_text[4:]
-            content_text = content_text.strip()
-
-        suggested = json.loads(content_text)
+    try:
+        completion = cached_completion(
+            "toby.seed_competitors", request, fetch,
+            ttl_seconds=COMPETITOR_SUGGESTION_TTL_SECONDS,
+            cacheable=lambda text: isinstance(_parse_json_array(text), list),
+        )
+        suggested = _parse_json_array(completion["content"])
         if not isinstance(suggested, list):
             return []
 
@@ -271,6 +273,20 @@ def _suggest_competitors_via_llm(cfg: NicheConfig) -> List[str]:
         return []
 
 
+def _parse_json_array(content_text: str):
+    """JSON value from an LLM reply (markdown fences stripped), or None."""
+    content_text = content_text.strip()
+    if content_text.startswith("```"):
+        content_text = content_text.split("```")[1]
+        if content_text.startswith("json"):
+            content_text = content_text[4:]
+        content_text = content_text.strip()
+    try:
+        return json.loads(content_text)
+    except json.JSONDecodeError:
+        return None
+
+
 def _validate_ig_accounts(usernames: List[str]) -> List[str]:
     """
     Validate accounts via IG Business Discovery API.
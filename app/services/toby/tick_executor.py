@@ -0,0 +1,312 @@
+"""
+Parallel per-user Toby tick.
+
+toby_tick used to walk every enabled user one after another on one DB
+session, with a separate UserProfile query per user for the billing
+guard. One slow tenant (a long generation, a hung LLM call) delayed
+everyone behind it, and the whole tick grew linearly with the user count.
+
+TobyTickExecutor runs a tick as:
+  - one query for the enabled users of this shard, joined with their
+    billing status (locked users are skipped without a per-user query);
+  - each user on a process-wide bounded ThreadPoolExecutor with its own
+    SessionLocal, so one user's failure or rollback never touches another;
+  - slowest users (by their last recorded tick) submitted first, so the
+    tail starts early instead of after everyone else;
+  - a tick budget: once it is spent the tick returns and users still
+    running keep their pool slot. The next tick skips them until they
+    finish, so a stuck tenant never blocks the others' ticks.
+
+Every user's tick duration is written to toby_state.last_tick_ms /
+last_tick_at in one batched UPDATE (GET /api/admin/toby-ticks lists the
+slowest tenants from any process).
+
+Sharding: with TOBY_SHARD_COUNT > 1 users are split by crc32(user_id) and
+each shard runs in its own `python -m app.scheduler_process --toby-shard N`
+(see app/scheduler_process.py); the scheduler leader then skips Toby.
+
+Tuning (env vars):
+    TOBY_TICK_WORKERS         — users processed concurrently (default 3)
+    TOBY_TICK_BUDGET_SECONDS  — how long a tick waits for its users (default 240)
+    TOBY_SLOW_USER_SECONDS    — log users slower than this (default 120)
+    TOBY_SHARD_COUNT          — number of Toby shards (default 1)
+"""
+import os
+import threading
+import time
+import traceback
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam
+
+# Every user holds its own session while it runs, so keep this within the
+# engine's pool (pool_size + max_overflow) minus API and publish headroom.
+DEFAULT_TICK_WORKERS = 3
+TICK_BUDGET_SECONDS = float(os.getenv("TOBY_TICK_BUDGET_SECONDS", "240"))
+SLOW_USER_SECONDS = float(os.getenv("TOBY_SLOW_USER_SECONDS", "120"))
+
+# How many slow users a tick summary keeps
+_SLOWEST_KEPT = 10
+
+
+def shard_count() -> int:
+    try:
+        return max(1, int(os.getenv("TOBY_SHARD_COUNT", "1")))
+    except ValueError:
+        return 1
+
+
+def shard_of(user_id: str, count: int) -> int:
+    """Stable shard for a user — crc32 is the same in every process and release."""
+    return zlib.crc32(user_id.encode("utf-8")) % count
+
+
+class TobyTickExecutor:
+    """Process-wide bounded pool for per-user Toby ticks."""
+
+    def __init__(self, workers: Optional[int] = None):
+        try:
+            env_workers = int(os.getenv("TOBY_TICK_WORKERS", DEFAULT_TICK_WORKERS))
+        except ValueError:
+            env_workers = DEFAULT_TICK_WORKERS
+        self.workers = max(1, workers or env_workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="toby-tick")
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, float] = {}      # user_id -> start (monotonic)
+        self._durations: List[Tuple[str, int, datetime]] = []  # not yet persisted
+        self.last_tick: Optional[Dict[str, Any]] = None
+
+    # ── tick ─────────────────────────────────────────────────────
+    def run_tick(self, shard_index: int = 0, shards: int = 1) -> Dict[str, Any]:
+        """Process every eligible user of the shard; returns the tick summary."""
+        from app.db_connection import SessionLocal
+
+        started = time.monotonic()
+        db = SessionLocal()
+        try:
+            self._flush_durations(db)
+            users, locked = _eligible_users(db, shard_index, shards)
+        finally:
+            db.close()
+
+        with self._lock:
+            busy = [u for u in users if u in self._in_flight]
+            todo = [u for u in users if u not in self._in_flight]
+            for user_id in todo:
+                self._in_flight[user_id] = time.monotonic()
+
+        futures = {self._pool.submit(self._run_user, user_id): user_id for user_id in todo}
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = set(futures)
+        deadline = started + TICK_BUDGET_SECONDS
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for fut in done:
+                results[futures[fut]] = fut.result()
+
+        carried_over = [futures[f] for f in pending]
+        if carried_over:
+            print(
+                f"⏳ [TOBY] Tick budget {TICK_BUDGET_SECONDS:.0f}s spent — {len(carried_over)} user(s) "
+                f"still running, skipped next tick until done: {', '.join(carried_over[:5])}",
+                flush=True,
+            )
+        if busy:
+            print(f"⏳ [TOBY] Skipping {len(busy)} user(s) still running from an earlier tick", flush=True)
+
+        db = SessionLocal()
+        try:
+            self._flush_durations(db)
+        finally:
+            db.close()
+
+        summary = _summarize(results)
+        summary.update(
+            shard=f"{shard_index}/{shards}",
+            users=len(users),
+            billing_locked=locked,
+            still_running=carried_over + busy,
+            workers=self.workers,
+            wall_ms=int((time.monotonic() - started) * 1000),
+            finished_at=datetime.now(timezone.utc).isoformat(),
+        )
+        self.last_tick = summary
+        if users:
+            slowest = summary["slowest"][0] if summary["slowest"] else None
+            tail = f", slowest {slowest['user_id']} {slowest['ms']} ms" if slowest else ""
+            print(
+                f"🤖 [TOBY] Tick shard {shard_index}/{shards}: {summary['processed']} user(s) in "
+                f"{summary['wall_ms']} ms ({summary['errors']} error(s){tail})",
+                flush=True,
+            )
+        return summary
+
+    def _run_user(self, user_id: str) -> Dict[str, Any]:
+        """One user's tick on its own session. Never raises."""
+        from app.db_connection import SessionLocal
+        from app.models.toby import TobyState
+        from app.services.toby.orchestrator import _log_debounced, _process_user
+
+        start = time.monotonic()
+        error = None
+        db = SessionLocal()
+        try:
+            state = db.query(TobyState).filter(TobyState.user_id == user_id).first()
+            if state is not None and state.enabled:
+                _process_user(db, state)
+        except Exception as e:
+            error = str(e)[:500]
+            db.rollback()
+            print(f"[TOBY] Error processing user {user_id}: {e}", flush=True)
+            traceback.print_exc()
+            # D1: Debounced error logging
+            _log_debounced(db, user_id, "error", f"Toby tick error: {error}", level="error")
+        finally:
+            db.close()
+            elapsed_ms = int((time.monotonic() - start) * 1000)
+            with self._lock:
+                self._in_flight.pop(user_id, None)
+                self._durations.append((user_id, elapsed_ms, datetime.now(timezone.utc)))
+
+        if elapsed_ms >= SLOW_USER_SECONDS * 1000:
+            print(f"🐢 [TOBY] User {user_id} tick took {elapsed_ms / 1000:.1f}s", flush=True)
+        return {"ms": elapsed_ms, "error": error}
+
+    def _flush_durations(self, db) -> None:
+        """Persist finished users' durations in one executemany UPDATE."""
+        from app.models.toby import TobyState
+
+        with self._lock:
+            rows, self._durations = self._durations, []
+        if not rows:
+            return
+        table = TobyState.__table__
+        stmt = (
+            table.update()
+            .where(table.c.user_id == bindparam("b_user_id"))
+            # Keep updated_at: recording a duration is not a config change
+            .values(last_tick_ms=bindparam("b_ms"), last_tick_at=bindparam("b_at"), updated_at=table.c.updated_at)
+        )
+        try:
+            db.connection().execute(stmt, [{"b_user_id": u, "b_ms": ms, "b_at": at} for u, ms, at in rows])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️ [TOBY] Could not record tick durations: {e}", flush=True)
+
+    def in_flight(self) -> Dict[str, float]:
+        """user_id -> seconds running, for users still inside a tick."""
+        now = time.monotonic()
+        with self._lock:
+            return {u: round(now - t, 1) for u, t in self._in_flight.items()}
+
+    def shutdown(self) -> None:
+        """Wait for running users so a new leader never ticks them concurrently."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _eligible_users(db, shard_index: int, shards: int) -> Tuple[List[str], int]:
+    """Enabled, non-locked users of this shard, slowest last tick first.
+
+    One query: the billing guard rides along as an outer join instead of a
+    UserProfile lookup per user.
+    """
+    from app.models.auth import UserProfile
+    from app.models.toby import TobyState
+
+    rows = (
+        db.query(TobyState.user_id, TobyState.last_tick_ms, UserProfile.billing_status)
+        .outerjoin(UserProfile, UserProfile.user_id == TobyState.user_id)
+        .filter(TobyState.enabled == True)
+        .all()
+    )
+    users, locked = [], 0
+    for user_id, last_ms, billing_status in rows:
+        if shards > 1 and shard_of(user_id, shards) != shard_index:
+            continue
+        if billing_status == "locked":
+            locked += 1
+            continue
+        users.append((last_ms or 0, user_id))
+    users.sort(reverse=True)
+    return [user_id for _, user_id in users], locked
+
+
+def _summarize(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    durations = sorted(r["ms"] for r in results.values())
+
+    def pct(q: float) -> Optional[int]:
+        if not durations:
+            return None
+        return durations[min(len(durations) - 1, int(q * len(durations)))]
+
+    slowest = sorted(results.items(), key=lambda kv: kv[1]["ms"], reverse=True)[:_SLOWEST_KEPT]
+    return {
+        "processed": len(results),
+        "errors": sum(1 for r in results.values() if r["error"]),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "max_ms": durations[-1] if durations else None,
+        "slowest": [{"user_id": u, "ms": r["ms"], "error": r["error"]} for u, r in slowest],
+    }
+
+
+_executor: Optional[TobyTickExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_tick_executor() -> TobyTickExecutor:
+    """Get or create the process-wide TobyTickExecutor."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = TobyTickExecutor()
+    return _executor
+
+
+def shutdown_tick_executor() -> None:
+    """Drain the pool (demotion or shutdown); the next tick builds a fresh one."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown()
+
+
+def tick_status(db, limit: int = 20) -> Dict[str, Any]:
+    """Slowest tenants by last recorded tick (any process) plus this process's last tick."""
+    from app.models.toby import TobyState
+
+    shards = shard_count()
+    rows = (
+        db.query(TobyState.user_id, TobyState.last_tick_ms, TobyState.last_tick_at)
+        .filter(TobyState.enabled == True, TobyState.last_tick_ms.isnot(None))
+        .order_by(TobyState.last_tick_ms.desc())
+        .limit(limit)
+        .all()
+    )
+    executor = _executor
+    return {
+        "shard_count": shards,
+        "slowest_users": [
+            {
+                "user_id": user_id,
+                "last_tick_ms": ms,
+                "last_tick_at": at.isoformat() if at else None,
+                "shard": shard_of(user_id, shards),
+            }
+            for user_id, ms, at in rows
+        ],
+        "this_process": {
+            "workers": executor.workers if executor else None,
+            "in_flight": executor.in_flight() if executor else {},
+            "last_tick": executor.last_tick if executor else None,
+        },
+    }
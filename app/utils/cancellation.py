@@ -0,0 +1,110 @@
+"""
+Cooperative cancellation for long-running brand work.
+
+Python threads can't be killed, so cancellation is cooperative: the
+worker running a brand installs a CancelToken, code calls checkpoint()
+at step boundaries, and child processes started through run_subprocess()
+are registered on the token so cancel() can kill them (an orphaned
+ffmpeg would otherwise keep burning CPU after its brand timed out).
+
+Code running outside a brand worker has no token — checkpoint() is a
+no-op and run_subprocess() behaves like subprocess.run().
+"""
+import subprocess
+import threading
+import time
+from typing import Optional
+
+
+class Cancelled(Exception):
+    """Raised at a checkpoint after the current work was cancelled."""
+
+
+class CancelToken:
+    """Cancellation flag plus the child processes it should kill."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.started_at: Optional[float] = None
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._procs: set = set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            procs = list(self._procs)
+        for proc in procs:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise Cancelled(self.reason or "Cancelled")
+
+    def _register(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._procs.add(proc)
+            cancelled = self._event.is_set()
+        if cancelled:
+            proc.kill()
+
+    def _unregister(self, proc: subprocess.Popen) -> None:
+        with self._lock:
+            self._procs.discard(proc)
+
+
+_local = threading.local()
+
+
+def current_token() -> Optional[CancelToken]:
+    return getattr(_local, "token", None)
+
+
+def bind_token(token: Optional[CancelToken]) -> None:
+    """Install (or clear, with None) the token for the calling thread."""
+    if token is not None and token.started_at is None:
+        token.started_at = time.monotonic()
+    _local.token = token
+
+
+def checkpoint() -> None:
+    """Raise Cancelled if the current thread's work has been cancelled."""
+    token = current_token()
+    if token is not None:
+        token.check()
+
+
+def run_subprocess(cmd, *, timeout: Optional[float] = None, text: bool = False,
+                   check: bool = False) -> subprocess.CompletedProcess:
+    """subprocess.run(capture_output=True) that the current token can kill."""
+    checkpoint()
+    token = current_token()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text)
+    if token is not None:
+        token._register(proc)
+    try:
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+    finally:
+        if token is not None:
+            token._unregister(proc)
+    # A killed child is reported as cancellation, not as a confusing ffmpeg error
+    checkpoint()
+    if check and proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stdout, stderr)
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
@@ -0,0 +1,142 @@
+"""
+Shared Pillow compositing primitives for the slide/thumbnail renderers.
+
+Gradient overlays used to be built one row at a time — an
+``Image.new((W, 1))`` plus ``paste`` for each of the 1350–1920 rows —
+and then blended with an RGBA round trip. Here a gradient is described by
+a hashable curve, its alpha ramp is computed once with NumPy, and the
+resulting "L" mask is cached per (width, height, curve) so every later
+render is a single masked ``paste`` of the overlay colour.
+
+Curves are tuples of ``(end_frac, base, delta)`` segments, in order. A
+row at ``frac = y / height`` falls in the first segment whose
+``end_frac`` is above it; with ``t`` its position inside that segment,
+its alpha is ``int(255 * (base + delta * t))`` clamped to 0..255.
+"""
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from app.utils.fonts import text_width
+
+GradientCurve = Tuple[Tuple[float, float, float], ...]
+
+
+def gradient_alpha(height: int, curve: GradientCurve) -> np.ndarray:
+    """Per-row alpha (uint8, shape (height,)) for a vertical gradient curve."""
+    frac = np.arange(height, dtype=np.float64) / height
+    alpha = np.zeros(height, dtype=np.float64)
+    start = 0.0
+    remaining = np.ones(height, dtype=bool)
+    for end, base, delta in curve:
+        rows = remaining & (frac < end)
+        t = (frac[rows] - start) / (end - start)
+        alpha[rows] = np.floor(255 * (base + delta * t))
+        remaining &= ~rows
+        start = end
+    return np.clip(alpha, 0, 255).astype(np.uint8)
+
+
+@lru_cache(maxsize=32)
+def vertical_gradient_mask(width: int, height: int, curve: GradientCurve) -> Image.Image:
+    """Cached "L" mask for a vertical gradient. Shared — never draw on it."""
+    column = gradient_alpha(height, curve)
+    return Image.fromarray(np.repeat(column[:, None], width, axis=1), mode="L")
+
+
+def apply_vertical_gradient(
+    canvas: Image.Image,
+    curve: GradientCurve,
+    color: Tuple[int, int, int] = (0, 0, 0),
+) -> Image.Image:
+    """Blend ``color`` over an RGB canvas following ``curve``, in place (one paste)."""
+    canvas.paste(color, (0, 0, canvas.width, canvas.height), vertical_gradient_mask(canvas.width, canvas.height, curve))
+    return canvas
+
+
+def draw_horizontal_fade_line(
+    canvas: Image.Image,
+    x1: int,
+    x2: int,
+    y: int,
+    thickness: int,
+    from_transparent: bool,
+    peak: float = 0.7,
+) -> None:
+    """Grey line fading from black to ``peak`` white (or back), as one paste."""
+    width = x2 - x1
+    if width <= 0:
+        return
+    t = np.arange(width, dtype=np.float64) / max(width - 1, 1)
+    ramp = t if from_transparent else 1 - t
+    values = np.floor(255 * peak * ramp).astype(np.uint8)
+    half = thickness // 2
+    band = Image.fromarray(np.repeat(values[None, :], 2 * half + 1, axis=0), mode="L")
+    canvas.paste(band.convert(canvas.mode), (x1, y - half))
+
+
+@lru_cache(maxsize=16)
+def circular_mask(size: int, inset: int = 1) -> Image.Image:
+    """Cached "L" ellipse mask of ``size`` px; ``inset`` 1 keeps the edge pixel
+    inside the box (ellipse to size - 1). Shared — never draw on it."""
+    mask = Image.new("L", (size, size), 0)
+    ImageDraw.Draw(mask).ellipse((0, 0, size - inset, size - inset), fill=255)
+    return mask
+
+
+def cover_fit(img: Image.Image, target_w: int, target_h: int) -> Image.Image:
+    """Scale to cover target dimensions, then center-crop."""
+    ratio = max(target_w / img.width, target_h / img.height)
+    new_w, new_h = int(img.width * ratio), int(img.height * ratio)
+    img = img.resize((new_w, new_h), Image.LANCZOS)
+    left = (new_w - target_w) // 2
+    top = (new_h - target_h) // 2
+    return img.crop((left, top, left + target_w, top + target_h))
+
+
+def hex_to_rgb(hex_color: str, default: Tuple[int, int, int] = (255, 255, 255)) -> tuple:
+    """'#rrggbb' → (r, g, b); ``default`` when it doesn't parse."""
+    try:
+        hc = hex_color.lstrip("#")
+        return tuple(int(hc[i:i + 2], 16) for i in (0, 2, 4))
+    except Exception:
+        return default
+
+
+def greedy_wrap(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> list:
+    """Word-wrap greedily to max_width px (a word wider than that gets its own line)."""
+    lines = []
+    current = ""
+    for word in text.split():
+        test = f"{current} {word}".strip()
+        if text_width(font, test) <= max_width:
+            current = test
+        else:
+            if current:
+                lines.append(current)
+            current = word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def paste_centered_lines(
+    draw: ImageDraw.ImageDraw,
+    lines: Sequence[str],
+    font: ImageFont.FreeTypeFont,
+    canvas_width: int,
+    top: int,
+    line_height: int,
+    fill: tuple,
+    shadow: Optional[tuple] = None,
+    shadow_offset: int = 2,
+) -> None:
+    """Draw each line horizontally centered, optionally with a drop shadow."""
+    for i, line in enumerate(lines):
+        x = (canvas_width - text_width(font, line)) // 2
+        y = top + i * line_height
+        if shadow is not None:
+            draw.text((x + shadow_offset, y + shadow_offset), line, fill=shadow, font=font)
+        draw.text((x, y), line, fill=fill, font=font)
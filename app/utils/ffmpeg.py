@@ -1,9 +1,27 @@
 """
 FFmpeg utilities for video generation.
+
+Encoding profiles (VIDEO_ENCODE_PROFILE, or the ``profile`` argument):
+    still    — default. Reels are a single static image, so every frame
+               after the first is identical: x264 runs with
+               ``-tune stillimage`` and one GOP spanning the whole clip
+               (no scene-cut keyframes), so only the first frame is really
+               encoded and the rest are near-free skip frames. Output stays
+               30 fps for Meta/YouTube ingest.
+    standard — the previous general-purpose settings (VIDEO_PRESET,
+               default GOP), kept for comparison and as a fallback.
+
+Thread count is sized from the CPUs this container may use (cgroup quota
+and affinity, not the host's core count) divided by the encodes currently
+running in this process, capped by FFMPEG_MAX_THREADS.
 """
+import os
 import subprocess
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional
+from app.utils.cancellation import Cancelled, run_subprocess
 from app.core.constants import (
     VIDEO_DURATION,
     VIDEO_CODEC,
@@ -20,36 +38,80 @@ _RETRYABLE_ERRORS = [
     "Generic error in an external library",
 ]
 
+VIDEO_FPS = 30
 
-def create_video_from_image(
+ENCODING_PROFILES = {
+    "still": {
+        "preset": "veryfast",
+        "tune": "stillimage",
+        "single_gop": True,
+    },
+    "standard": {
+        "preset": VIDEO_PRESET,
+        "tune": None,
+        "single_gop": False,
+    },
+}
+DEFAULT_ENCODING_PROFILE = os.getenv("VIDEO_ENCODE_PROFILE", "still")
+
+# Upper bound on threads for one encode (x264 gains little past ~8 at 1080p)
+FFMPEG_MAX_THREADS = int(os.getenv("FFMPEG_MAX_THREADS", "8"))
+
+_active_encodes = 0
+_active_lock = threading.Lock()
+
+
+def available_cpus() -> int:
+    """CPUs this process may actually use (cgroup v2 quota, then affinity)."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+@contextmanager
+def _encode_slot():
+    """Count a running encode and yield the thread budget it should use."""
+    global _active_encodes
+    with _active_lock:
+        _active_encodes += 1
+        threads = max(1, min(FFMPEG_MAX_THREADS, available_cpus() // _active_encodes))
+    try:
+        yield threads
+    finally:
+        with _active_lock:
+            _active_encodes -= 1
+
+
+def build_video_command(
     image_path: Path,
     output_path: Path,
-    duration: int = VIDEO_DURATION,
+    duration: float = VIDEO_DURATION,
     music_path: Optional[Path] = None,
-    music_start_time: float = 0
-) -> bool:
-    """
-    Create an MP4 video from a static image with optional background music.
-    
-    Uses filter_complex to handle both video format conversion (rgb24→yuv420p)
-    and audio processing in one graph. Thread-limited and retryable for
-    resource-constrained environments (Railway).
-    """
-    if not image_path.exists():
-        raise FileNotFoundError(f"Image file not found: {image_path}")
-    
-    # Ensure output directory exists
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Build FFmpeg command with filter_complex for reliable pixel format conversion
+    music_start_time: float = 0,
+    profile: Optional[str] = None,
+    threads: int = 1,
+) -> list:
+    """Build the ffmpeg argv for an image(+music) reel under an encoding profile."""
+    profile_name = profile or DEFAULT_ENCODING_PROFILE
+    settings = ENCODING_PROFILES.get(profile_name)
+    if settings is None:
+        raise ValueError(f"Unknown encoding profile '{profile_name}' (choose from {', '.join(ENCODING_PROFILES)})")
+    has_music = bool(music_path and music_path.exists())
+
     cmd = [
         "ffmpeg",
         "-y",                    # Overwrite output
         "-loop", "1",            # Loop the image
+        "-framerate", str(VIDEO_FPS),
         "-i", str(image_path),   # Input image
     ]
-    
-    if music_path and music_path.exists():
+
+    if has_music:
         # With audio: build a combined filter_complex for video + audio
         cmd.extend([
             "-ss", str(music_start_time),
@@ -68,71 +130,104 @@ def create_video_from_image(
         cmd.extend([
             "-vf", f"format=pix_fmts={VIDEO_PIXEL_FORMAT}",
         ])
-    
+
     # Video encoding settings
     cmd.extend([
         "-c:v", VIDEO_CODEC,
-        "-preset", VIDEO_PRESET,
+        "-preset", settings["preset"],
         "-crf", "23",            # Explicit quality (prevents encoder init failures)
-        "-r", "30",
-        "-threads", "1",         # Single-thread: prevents resource exhaustion on Railway
+    ])
+    if settings["tune"]:
+        cmd.extend(["-tune", settings["tune"]])
+    if settings["single_gop"]:
+        # One keyframe for the whole clip: remaining frames are skip frames
+        gop = str(int(VIDEO_FPS * duration) + 1)
+        cmd.extend(["-g", gop, "-keyint_min", gop, "-sc_threshold", "0"])
+    cmd.extend([
+        "-r", str(VIDEO_FPS),
+        "-threads", str(threads),
         "-t", str(duration),
         "-shortest",
+        "-movflags", "+faststart",
     ])
-    
+
     # Audio encoding (if audio present)
-    if music_path and music_path.exists():
+    if has_music:
         cmd.extend([
             "-c:a", "aac",
             "-b:a", "192k",
         ])
-    
+
     cmd.append(str(output_path))
+    return cmd
+
+
+def create_video_from_image(
+    image_path: Path,
+    output_path: Path,
+    duration: int = VIDEO_DURATION,
+    music_path: Optional[Path] = None,
+    music_start_time: float = 0,
+    profile: Optional[str] = None,
+) -> bool:
+    """
+    Create an MP4 video from a static image with optional background music.
+    
+    Uses filter_complex to handle both video format conversion (rgb24→yuv420p)
+    and audio processing in one graph. The thread count is sized to the free
+    CPU share; a transient encoder failure is retried single-threaded.
+    """
+    if not image_path.exists():
+        raise FileNotFoundError(f"Image file not found: {image_path}")
+    
+    # Ensure output directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     
     # Retry with backoff — transient resource and encoder errors
     import time as _time
     max_retries = 3
-    last_error = None
-    for attempt in range(max_retries):
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
+    with _encode_slot() as threads:
+        for attempt in range(max_retries):
+            # After a resource error, fall back to the old single-thread mode
+            cmd = build_video_command(
+                image_path, output_path, duration, music_path, music_start_time,
+                profile=profile, threads=threads if attempt == 0 else 1,
             )
-            
-            if not output_path.exists():
-                raise RuntimeError("FFmpeg completed but output file was not created")
-            
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr or str(e)
-            last_error = error_msg
-            
-            # Check if this is a retryable error
-            is_retryable = any(err in error_msg for err in _RETRYABLE_ERRORS)
-            
-            if is_retryable and attempt < max_retries - 1:
-                wait = (attempt + 1) * 8  # 8s, 16s
-                print(
-                    f"⚠️ FFmpeg error (attempt {attempt + 1}/{max_retries}), "
-                    f"retrying in {wait}s: {error_msg[:200]}",
-                    flush=True
-                )
-                _time.sleep(wait)
-                # Clean up partial output before retry
-                if output_path.exists():
-                    try:
-                        output_path.unlink()
-                    except Exception:
-                        pass
-                continue
-            
-            raise RuntimeError(f"Failed to generate video: FFmpeg error: {error_msg}")
-        except Exception as e:
-            raise RuntimeError(f"Failed to create video: {str(e)}")
+            try:
+                run_subprocess(cmd, text=True, check=True)
+                
+                if not output_path.exists():
+                    raise RuntimeError("FFmpeg completed but output file was not created")
+                
+                return True
+                
+            except subprocess.CalledProcessError as e:
+                error_msg = e.stderr or str(e)
+                
+                # Check if this is a retryable error
+                is_retryable = any(err in error_msg for err in _RETRYABLE_ERRORS)
+                
+                if is_retryable and attempt < max_retries - 1:
+                    wait = attempt + 1  # 1s, 2s
+                    print(
+                        f"⚠️ FFmpeg error (attempt {attempt + 1}/{max_retries}), "
+                        f"retrying single-threaded in {wait}s: {error_msg[:200]}",
+                        flush=True
+                    )
+                    _time.sleep(wait)
+                    # Clean up partial output before retry
+                    if output_path.exists():
+                        try:
+                            output_path.unlink()
+                        except Exception:
+                            pass
+                    continue
+                
+                raise RuntimeError(f"Failed to generate video: FFmpeg error: {error_msg}")
+            except Cancelled:
+                raise
+            except Exception as e:
+                raise RuntimeError(f"Failed to create video: {str(e)}")
 
 
 def verify_ffmpeg_installation() -> bool:
@@ -176,12 +271,7 @@ def get_audio_duration(audio_path: Path) -> Optional[float]:
             "-of", "csv=p=0"
         ]
         
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        result = run_subprocess(cmd, text=True, check=True)
         
         return float(result.stdout.strip())
         
@@ -252,8 +342,10 @@ def trim_or_loop_audio(
             str(output_path)
         ])
         
-        subprocess.run(cmd, capture_output=True, check=True)
+        run_subprocess(cmd, check=True)
         return output_path.exists()
         
+    except Cancelled:
+        raise
     except Exception:
         return False
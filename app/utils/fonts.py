@@ -1,9 +1,20 @@
 """
 Font management utilities for text rendering.
+
+Fonts are cached process-wide per (file, size) — ImageFont.truetype
+re-reads and re-parses the TTF on every call, and text fitting asks for
+dozens of sizes per image. Glyph-run measurements are memoized per
+(font, text) on top, and fit_largest_size() replaces the "shrink one
+step and re-measure" loops with a binary search.
+
+Tuning (env vars):
+    FONT_CACHE_SIZE     — cached (file, size) fonts (default 512)
+    TEXT_MEASURE_CACHE  — cached (font, text) measurements (default 65536)
 """
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, Tuple
 from PIL import ImageFont
 from app.core.constants import (
     FONT_BOLD,
@@ -12,6 +23,7 @@ from app.core.constants import (
 )
 
 
+@lru_cache(maxsize=64)
 def get_font_path(font_filename: Optional[str]) -> Optional[Path]:
     """
     Get the absolute path to a font file.
@@ -35,6 +47,58 @@ def get_font_path(font_filename: Optional[str]) -> Optional[Path]:
     return None
 
 
+@lru_cache(maxsize=int(os.getenv("FONT_CACHE_SIZE", "512")))
+def truetype_cached(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """ImageFont.truetype, memoized per (font file, size).
+
+    Raises the same errors as ImageFont.truetype (failures are not cached).
+    Cached fonts are shared — never mutate them (e.g. set_variation_*).
+    """
+    return ImageFont.truetype(font_path, size)
+
+
+@lru_cache(maxsize=int(os.getenv("TEXT_MEASURE_CACHE", "65536")))
+def text_bbox(font: ImageFont.FreeTypeFont, text: str) -> Tuple[int, int, int, int]:
+    """font.getbbox(text), memoized per (font object, text)."""
+    return font.getbbox(text)
+
+
+def text_width(font: ImageFont.FreeTypeFont, text: str) -> int:
+    """Rendered width of a single line of text (memoized)."""
+    bbox = text_bbox(font, text)
+    return bbox[2] - bbox[0]
+
+
+def fit_largest_size(
+    min_size: int,
+    max_size: int,
+    fits: Callable[[int], bool],
+    step: int = 1,
+) -> Optional[int]:
+    """Largest size on the grid max_size, max_size - step, ... >= min_size
+    for which ``fits(size)`` is true, or None if none fits.
+
+    Binary search: assumes that if a size fits, every smaller size fits
+    too (true for width/line-count/height limits), so it needs
+    O(log n) fits() calls instead of one per step.
+    """
+    if max_size < min_size:
+        return None
+    lo, hi = 0, (max_size - min_size) // step  # grid index; 0 = max_size
+    if fits(max_size):
+        return max_size
+    if not fits(max_size - hi * step):
+        return None
+    # Invariant: index lo does not fit, index hi fits
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if fits(max_size - mid * step):
+            hi = mid
+        else:
+            lo = mid
+    return max_size - hi * step
+
+
 def load_font(font_filename: Optional[str], size: int) -> ImageFont.FreeTypeFont:
     """
     Load a TrueType font with the specified size.
@@ -51,7 +115,7 @@ def load_font(font_filename: Optional[str], size: int) -> ImageFont.FreeTypeFont
     
     if font_path:
         try:
-            return ImageFont.truetype(str(font_path), size)
+            return truetype_cached(str(font_path), size)
         except Exception as e:
             print(f"Warning: Could not load font {font_filename}: {e}")
     
@@ -67,7 +131,7 @@ def load_font(font_filename: Optional[str], size: int) -> ImageFont.FreeTypeFont
         
         for sys_font in system_fonts:
             try:
-                return ImageFont.truetype(sys_font, size)
+                return truetype_cached(sys_font, size)
             except:
                 continue
     except:
@@ -110,19 +174,10 @@ def calculate_dynamic_font_size(
     Returns:
         Calculated font size
     """
-    size = initial_size
-    
-    while size >= min_size:
+    def _fits(size: int) -> bool:
         font = load_font(font_filename, size)
-        
-        # Get text bounding box
-        bbox = font.getbbox(text)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        
-        if text_width <= max_width and text_height <= max_height:
-            return size
-        
-        size -= 2
-    
-    return min_size
+        bbox = text_bbox(font, text)
+        return bbox[2] - bbox[0] <= max_width and bbox[3] - bbox[1] <= max_height
+
+    size = fit_largest_size(min_size, initial_size, _fits, step=2)
+    return size if size is not None else min_size
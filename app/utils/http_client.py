@@ -0,0 +1,223 @@
+"""
+Shared outbound HTTP clients.
+
+Bare ``requests.get/post`` opens a fresh TCP+TLS connection per call, so
+every DeepSeek, Supabase and graph.facebook.com request paid a full
+handshake. This module keeps one process-wide client per library instead:
+
+  get_http_session() — a requests.Session with keep-alive pools per host
+      (HTTP/1.1; requests has no HTTP/2). Drop-in for ``requests.get(...)``
+      — responses and exceptions are the usual requests ones.
+  get_http2_client() — an httpx.Client that negotiates HTTP/2 via ALPN
+      when the ``h2`` package is installed, for code already on httpx.
+
+Both apply a default timeout when the caller passes none and retry
+connection failures with backoff. The requests session also retries
+502/503/504 on idempotent methods (GET/HEAD/PUT/DELETE/OPTIONS) — never
+POST, so a publish is never sent twice. 429 is left to callers, which
+already honour the Graph API's rate-limit headers.
+
+Every request's latency is recorded in a per-host histogram
+(http_client_stats(), exposed at GET /api/admin/http-clients).
+
+Tuning (env vars):
+    HTTP_DEFAULT_TIMEOUT_SECONDS — timeout when the caller sets none (default 30)
+    HTTP_POOL_MAXSIZE            — keep-alive connections per host (default 16)
+    HTTP_MAX_RETRIES             — connect/5xx retries (default 2)
+    HTTP2_ENABLED                — set 0 to force HTTP/1.1 on the httpx client
+"""
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT_SECONDS", "30"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +inf)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class _HostStats:
+    __slots__ = ("count", "errors", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+
+_stats: Dict[str, _HostStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _record(host: str, elapsed_ms: float, error: bool) -> None:
+    index = len(LATENCY_BUCKETS_MS)
+    for i, bound in enumerate(LATENCY_BUCKETS_MS):
+        if elapsed_ms <= bound:
+            index = i
+            break
+    with _stats_lock:
+        stats = _stats.get(host)
+        if stats is None:
+            stats = _stats[host] = _HostStats()
+        stats.count += 1
+        stats.errors += int(error)
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        stats.buckets[index] += 1
+
+
+def _percentile(stats: _HostStats, q: float) -> Optional[float]:
+    """Upper bound of the bucket holding the q-th quantile."""
+    if not stats.count:
+        return None
+    target = q * stats.count
+    seen = 0
+    for i, n in enumerate(stats.buckets):
+        seen += n
+        if seen >= target:
+            return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else round(stats.max_ms, 1)
+    return round(stats.max_ms, 1)
+
+
+def http_client_stats() -> Dict[str, Any]:
+    """Per-host request counts, error counts and latency histograms."""
+    with _stats_lock:
+        hosts = {
+            host: {
+                "count": s.count,
+                "errors": s.errors,
+                "avg_ms": round(s.total_ms / s.count, 1) if s.count else None,
+                "p50_ms": _percentile(s, 0.50),
+                "p95_ms": _percentile(s, 0.95),
+                "max_ms": round(s.max_ms, 1),
+                "histogram": {
+                    **{f"le_{b}ms": s.buckets[i] for i, b in enumerate(LATENCY_BUCKETS_MS)},
+                    "inf": s.buckets[-1],
+                },
+            }
+            for host, s in _stats.items()
+        }
+    return {"hosts": hosts, "pool_maxsize": POOL_MAXSIZE, "default_timeout_s": DEFAULT_TIMEOUT}
+
+
+def reset_http_client_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+class PooledSession(requests.Session):
+    """requests.Session with a default timeout and per-host latency stats."""
+
+    def request(self, method, url, *args, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = DEFAULT_TIMEOUT
+        host = urlsplit(url).hostname or "unknown"
+        start = time.perf_counter()
+        error = True
+        try:
+            response = super().request(method, url, *args, **kwargs)
+            error = response.status_code >= 500
+            return response
+        finally:
+            _record(host, (time.perf_counter() - start) * 1000, error)
+
+
+def _build_session() -> PooledSession:
+    session = PooledSession()
+    retry = Retry(
+        total=MAX_RETRIES,
+        connect=MAX_RETRIES,
+        read=0,  # a read timeout may mean the server acted — don't replay
+        status=MAX_RETRIES,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}),
+        backoff_factor=0.5,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the final 5xx back to the caller as before
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Shared by every user's calls — never carry cookies between requests
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+_session: Optional[PooledSession] = None
+_http2_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_session() -> PooledSession:
+    """Get or create the process-wide pooled requests session."""
+    global _session
+    if _session is None:
+        with _client_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def _http2_available() -> bool:
+    if os.getenv("HTTP2_ENABLED", "1") == "0":
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_http2_client():
+    """Get or create the process-wide httpx client (HTTP/2 when h2 is installed)."""
+    global _http2_client
+    if _http2_client is None:
+        with _client_lock:
+            if _http2_client is None:
+                import httpx
+
+                def _on_request(request):
+                    request.extensions["start"] = time.perf_counter()
+
+                def _on_response(response):
+                    # Shared by every user's calls — never carry cookies between requests
+                    client.cookies.clear()
+                    start = response.request.extensions.get("start")
+                    if start is not None:
+                        _record(response.request.url.host, (time.perf_counter() - start) * 1000,
+                                response.status_code >= 500)
+
+                client = httpx.Client(
+                    timeout=DEFAULT_TIMEOUT,
+                    transport=httpx.HTTPTransport(
+                        http2=_http2_available(),
+                        retries=MAX_RETRIES,  # connect failures only
+                        limits=httpx.Limits(max_connections=POOL_MAXSIZE * 4, max_keepalive_connections=POOL_MAXSIZE),
+                    ),
+                    event_hooks={"request": [_on_request], "response": [_on_response]},
+                )
+                _http2_client = client
+    return _http2_client
+
+
+def close_http_clients() -> None:
+    """Close pooled connections (shutdown)."""
+    global _session, _http2_client
+    with _client_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+        if _http2_client is not None:
+            _http2_client.close()
+            _http2_client = None
@@ -0,0 +1,327 @@
+"""
+Content-addressed cache for deterministic DeepSeek completions.
+
+Several prompts repeat verbatim across brands and ticks — the Toby semantic
+critic at temperature 0.2, image prompts and YouTube titles for the same
+title, competitor suggestions for the same niche — and each repeat paid a
+full DeepSeek round-trip and its tokens.
+
+A callsite opts in by routing its call through cached_completion(): the
+request is keyed by sha256(model, temperature, max_tokens, normalized
+messages) and looked up in an in-process LRU, then in the shared
+llm_response_cache table (one primary-key SELECT), before fetch() goes to
+the network. Identical misses in flight at the same time share one call.
+Only successful completions are stored — fetch() raises on errors — and a
+callsite can pass ``cacheable`` to refuse output it could not parse.
+
+Entries expire after their TTL (per callsite, default LLM_CACHE_TTL_HOURS);
+once an hour per process expired rows are deleted and the table is
+trimmed to LLM_CACHE_MAX_ROWS, oldest first. A database problem is just a
+miss. Hits, misses and the tokens/USD a hit saved are counted per
+callsite by cost_tracker (GET /api/admin/llm-cache).
+
+Tuning (env vars):
+    LLM_CACHE_ENABLED         — "false" bypasses the cache everywhere (default true)
+    LLM_CACHE_DISABLED        — comma-separated callsites to bypass, e.g. "caption.youtube_title"
+    LLM_CACHE_TTL_HOURS       — default entry lifetime (default 24)
+    LLM_CACHE_MAX_ROWS        — persisted entries kept (default 50000)
+    LLM_CACHE_MEMORY_ENTRIES  — in-process LRU entries (default 512)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+DISABLED_CALLSITES = {s.strip() for s in os.getenv("LLM_CACHE_DISABLED", "").split(",") if s.strip()}
+DEFAULT_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_HOURS", "24")) * 3600
+MAX_ROWS = int(os.getenv("LLM_CACHE_MAX_ROWS", "50000"))
+MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "512"))
+PRUNE_INTERVAL_S = 3600
+# A caller waiting on an identical in-flight request gives up after this
+INFLIGHT_TIMEOUT_S = 120.0
+
+
+def normalize_messages(messages: list) -> list:
+    """Role + content with line endings and trailing whitespace normalized."""
+    normalized = []
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, str):
+            lines = content.replace("\r\n", "\n").strip().split("\n")
+            content = "\n".join(line.rstrip() for line in lines)
+        normalized.append({"role": message.get("role", "user"), "content": content})
+    return normalized
+
+
+def cache_key(model: str, temperature: Optional[float], messages: list, max_tokens: Optional[int] = None) -> str:
+    payload = json.dumps(
+        {
+            "model": model,
+            "temperature": round(float(temperature or 0.0), 3),
+            "max_tokens": max_tokens,
+            "messages": normalize_messages(messages),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def completion_from_json(data: dict) -> dict:
+    """Completion dict from a raw /chat/completions JSON response."""
+    usage = data.get("usage") or {}
+    return {
+        "content": data["choices"][0]["message"]["content"] or "",
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0),
+    }
+
+
+def completion_from_sdk(response) -> dict:
+    """Completion dict from an OpenAI SDK ChatCompletion."""
+    usage = response.usage
+    return {
+        "content": response.choices[0].message.content or "",
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+    }
+
+
+def _record(callsite: str, hit: bool, entry: Optional[dict] = None) -> None:
+    try:
+        from app.services.monitoring.cost_tracker import record_llm_cache_hit, record_llm_cache_miss
+        if hit:
+            record_llm_cache_hit(callsite, entry["prompt_tokens"], entry["completion_tokens"])
+        else:
+            record_llm_cache_miss(callsite)
+    except Exception:
+        pass
+
+
+class LLMCache:
+    """In-process LRU in front of the llm_response_cache table."""
+
+    def __init__(
+        self,
+        default_ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_rows: int = MAX_ROWS,
+        memory_entries: int = MEMORY_ENTRIES,
+        persist: bool = True,
+    ):
+        self.default_ttl_seconds = default_ttl_seconds
+        self.max_rows = max_rows
+        self.memory_entries = memory_entries
+        self.persist = persist
+        self._lru: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._last_prune = float("-inf")
+
+    # ── lookup / store ──────────────────────────────────────────
+
+    def _memory_get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            item = self._lru.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= time.time():
+                del self._lru[key]
+                return None
+            self._lru.move_to_end(key)
+            return entry
+
+    def _memory_put(self, key: str, entry: dict, expires_at: float) -> None:
+        with self._lock:
+            self._lru[key] = (expires_at, entry)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.memory_entries:
+                self._lru.popitem(last=False)
+
+    def _db_get(self, key: str) -> Optional[tuple[float, dict]]:
+        if not self.persist:
+            return None
+        try:
+            from app.db_connection import engine
+            from app.models.llm_cache import LLMResponseCache
+
+            table = LLMResponseCache.__table__
+            with engine.connect() as conn:
+                row = conn.execute(
+                    table.select()
+                    .with_only_columns(
+                        table.c.content, table.c.prompt_tokens, table.c.completion_tokens, table.c.expires_at,
+                    )
+                    .where(table.c.cache_key == key, table.c.expires_at > datetime.now(timezone.utc))
+                ).first()
+        except Exception as e:
+            print(f"⚠️ [LLM CACHE] Lookup failed: {e}", flush=True)
+            return None
+        if row is None:
+            return None
+        entry = {"content": row[0], "prompt_tokens": row[1] or 0, "completion_tokens": row[2] or 0}
+        return row[3].timestamp(), entry
+
+    def _db_put(self, key: str, callsite: str, model: str, entry: dict, expires_at: float) -> None:
+        if not self.persist:
+            return
+        try:
+            from sqlalchemy.dialects.postgresql import insert
+            from app.db_connection import engine
+            from app.models.llm_cache import LLMResponseCache
+
+            table = LLMResponseCache.__table__
+            now = datetime.now(timezone.utc)
+            values = {
+                "cache_key": key,
+                "callsite": callsite[:64],
+                "model": model[:50],
+                **entry,
+                "created_at": now,
+                "expires_at": datetime.fromtimestamp(expires_at, timezone.utc),
+            }
+            stmt = insert(table).values(**values)
+            # An expired row for the same key is simply overwritten
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["cache_key"],
+                set_={c: stmt.excluded[c] for c in values if c != "cache_key"},
+            )
+            with engine.begin() as conn:
+                conn.execute(stmt)
+                if time.monotonic() - self._last_prune > PRUNE_INTERVAL_S:
+                    self._last_prune = time.monotonic()
+                    self._prune(conn, table, now)
+        except Exception as e:
+            print(f"⚠️ [LLM CACHE] Write failed: {e}", flush=True)
+
+    def _prune(self, conn, table, now: datetime) -> None:
+        """Delete expired rows, then the oldest rows beyond max_rows."""
+        conn.execute(table.delete().where(table.c.expires_at <= now))
+        overflow = (
+            table.select()
+            .with_only_columns(table.c.cache_key)
+            .order_by(table.c.created_at.desc())
+            .offset(self.max_rows)
+            .scalar_subquery()
+        )
+        conn.execute(table.delete().where(table.c.cache_key.in_(overflow)))
+
+    # ── public API ──────────────────────────────────────────────
+
+    def completion(
+        self,
+        callsite: str,
+        request: dict,
+        fetch: Callable[[], dict],
+        ttl_seconds: Optional[float] = None,
+        cacheable: Optional[Callable[[str], bool]] = None,
+    ) -> dict:
+        """See cached_completion()."""
+        if not ENABLED or callsite in DISABLED_CALLSITES:
+            return {**fetch(), "cached": False}
+
+        key = cache_key(
+            request.get("model", ""), request.get("temperature"),
+            request.get("messages", []), request.get("max_tokens"),
+        )
+        entry = self._memory_get(key)
+        if entry is None:
+            found = self._db_get(key)
+            if found is not None:
+                expires_at, entry = found
+                self._memory_put(key, entry, expires_at)
+        if entry is not None:
+            _record(callsite, True, entry)
+            return {**entry, "cached": True}
+
+        with self._lock:
+            waiting = self._inflight.get(key)
+            if waiting is None:
+                owner = self._inflight[key] = Future()
+        if waiting is not None:
+            # Same prompt already on its way to DeepSeek — share that answer
+            entry = waiting.result(timeout=INFLIGHT_TIMEOUT_S)
+            _record(callsite, True, entry)
+            return {**entry, "cached": True}
+
+        try:
+            entry = fetch()
+        except BaseException as e:
+            owner.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        owner.set_result(entry)
+        _record(callsite, False)
+
+        if cacheable is None or cacheable(entry["content"]):
+            expires_at = time.time() + (self.default_ttl_seconds if ttl_seconds is None else ttl_seconds)
+            self._memory_put(key, entry, expires_at)
+            self._db_put(key, callsite, request.get("model", ""), entry, expires_at)
+        return {**entry, "cached": False}
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            memory_entries = len(self._lru)
+            inflight = len(self._inflight)
+        return {
+            "enabled": ENABLED,
+            "disabled_callsites": sorted(DISABLED_CALLSITES),
+            "default_ttl_hours": round(self.default_ttl_seconds / 3600, 2),
+            "max_rows": self.max_rows,
+            "memory_entries": memory_entries,
+            "memory_capacity": self.memory_entries,
+            "inflight": inflight,
+        }
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """Get or create the process-wide LLMCache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMCache()
+    return _cache
+
+
+def cached_completion(
+    callsite: str,
+    request: dict,
+    fetch: Callable[[], dict],
+    ttl_seconds: Optional[float] = None,
+    cacheable: Optional[Callable[[str], bool]] = None,
+) -> dict:
+    """Serve a chat completion from the cache, or ``fetch()`` and store it.
+
+    ``request`` is the chat-completions body (model, messages, temperature,
+    max_tokens) and only feeds the cache key; ``fetch()`` makes the real
+    call and returns {"content", "prompt_tokens", "completion_tokens"}
+    (see completion_from_json / completion_from_sdk), raising on failure.
+    ``callsite`` names the caller in counters and LLM_CACHE_DISABLED.
+    Returns the completion dict plus ``cached``.
+    """
+    return get_llm_cache().completion(callsite, request, fetch, ttl_seconds, cacheable)
+
+
+def llm_cache_stats() -> dict:
+    """Per-callsite hit/miss/savings counters plus the cache's own state."""
+    from app.services.monitoring.cost_tracker import get_llm_cache_stats
+
+    return {**get_llm_cache_stats(), "cache": get_llm_cache().stats()}
@@ -0,0 +1,46 @@
+"""
+Shared DeepSeek (OpenAI-compatible) client.
+
+Every Toby agent, the historical miner and the story polisher had its own
+``_get_deepseek_client()`` that built a new ``OpenAI`` client — and with it
+a new httpx connection pool — on every call, so each LLM request paid a
+fresh TCP+TLS handshake to api.deepseek.com and left a pool behind for
+the garbage collector.
+
+get_deepseek_client() returns one process-wide client instead. It rides
+on the shared httpx client from app.utils.http_client, so DeepSeek calls
+get keep-alive, HTTP/2 when available, and show up in the per-host latency
+stats (GET /api/admin/http-clients). OpenAI clients are thread-safe;
+concurrent agents (e.g. the critic ensemble) share it. Timeouts and
+retries are the SDK defaults, as before.
+"""
+import os
+import threading
+from typing import Optional
+
+from openai import OpenAI
+
+DEEPSEEK_BASE_URL = "https://api.deepseek.com"
+
+_client: Optional[OpenAI] = None
+_client_http = None
+_client_lock = threading.Lock()
+
+
+def get_deepseek_client() -> OpenAI:
+    """Get or create the process-wide DeepSeek client."""
+    global _client, _client_http
+    from app.utils.http_client import get_http2_client
+
+    http = get_http2_client()
+    # Rebuild if close_http_clients() replaced the underlying httpx client
+    if _client is None or _client_http is not http:
+        with _client_lock:
+            if _client is None or _client_http is not http:
+                _client = OpenAI(
+                    api_key=os.getenv("DEEPSEEK_API_KEY", ""),
+                    base_url=DEEPSEEK_BASE_URL,
+                    http_client=http,
+                )
+                _client_http = http
+    return _client
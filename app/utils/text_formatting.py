@@ -5,6 +5,8 @@ from typing import List, Tuple
 from PIL import ImageFont, ImageDraw
 import re
 
+from app.utils.fonts import text_bbox
+
 
 def draw_text_with_letter_spacing(
     draw: ImageDraw.ImageDraw,
@@ -203,7 +205,7 @@ def wrap_text_with_bold(
             needs_space = len(current_line) > 0
             test_word = (' ' + word) if needs_space else word
             
-            word_bbox = font.getbbox(test_word)
+            word_bbox = text_bbox(font, test_word)
             word_width = word_bbox[2] - word_bbox[0]
             
             if current_width + word_width <= max_width or not current_line:
@@ -222,7 +224,7 @@ def wrap_text_with_bold(
                 if current_line:
                     lines.append(current_line)
                 current_line = [(word, is_bold)]
-                word_bbox = font.getbbox(word)
+                word_bbox = text_bbox(font, word)
                 current_width = word_bbox[2] - word_bbox[0]
     
     # Add remaining line
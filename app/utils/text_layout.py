@@ -4,6 +4,8 @@ Text layout and wrapping utilities for image generation.
 from typing import List, Tuple
 from PIL import ImageFont, ImageDraw, Image
 
+from app.utils.fonts import text_bbox
+
 
 def wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> List[str]:
     """
@@ -24,7 +26,7 @@ def wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> List[s
     for word in words:
         # Try adding the word to the current line
         test_line = " ".join(current_line + [word])
-        bbox = font.getbbox(test_line)
+        bbox = text_bbox(font, test_line)
         width = bbox[2] - bbox[0]
         
         if width <= max_width:
@@ -56,7 +58,7 @@ def get_text_dimensions(text: str, font: ImageFont.FreeTypeFont) -> Tuple[int, i
     Returns:
         Tuple of (width, height) in pixels
     """
-    bbox = font.getbbox(text)
+    bbox = text_bbox(font, text)
     width = bbox[2] - bbox[0]
     height = bbox[3] - bbox[1]
     return width, height
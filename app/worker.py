@@ -0,0 +1,62 @@
+"""
+Standalone generation worker.
+
+Runs the generation work queue (app/services/content/job_queue.py) outside
+the web process, so heavy image/video generation scales on its own
+containers and never competes with API latency:
+
+    python -m app.worker                 # JOB_QUEUE_CONCURRENCY slots (default 2)
+    python -m app.worker --concurrency 4
+
+Deploy any number of these next to the web service (same DATABASE_URL and
+env) and set JOB_QUEUE_IN_PROCESS=0 on the web service. On SIGTERM the
+worker stops claiming; jobs it was running keep their lease and are
+resumed by another worker once the lease expires.
+"""
+import argparse
+import logging
+import signal
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+env_path = Path(__file__).resolve().parent.parent / ".env"
+if env_path.exists():
+    load_dotenv(env_path)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(levelname)s:%(name)s: %(message)s",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generation job worker")
+    parser.add_argument("--concurrency", type=int, default=None, help="Jobs run at once (default: JOB_QUEUE_CONCURRENCY)")
+    parser.add_argument("--metrics-every", type=float, default=60.0, help="Seconds between queue metric logs")
+    args = parser.parse_args()
+
+    from app.services.content.brand_executor import get_brand_executor
+    from app.services.content.job_queue import GenerationWorker
+
+    worker = GenerationWorker(concurrency=args.concurrency)
+
+    def _shutdown(signum, _frame):
+        print(f"👋 [Worker] Signal {signum} — draining", flush=True)
+        worker.stop()
+        get_brand_executor().shutdown()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    worker.start()
+    worker.wait(metrics_every=args.metrics_every)
+    from app.services.media.carousel_pipeline import shutdown_carousel_pipeline
+    shutdown_carousel_pipeline()
+    from app.services.monitoring.cost_tracker import shutdown_cost_tracker
+    shutdown_cost_tracker()
+    print("✅ [Worker] Stopped", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+-- DB-backed work queue for generation jobs.
+-- API handlers enqueue jobs (queue_action + queued_at); generation workers
+-- (python -m app.worker, or the in-process consumer) claim them with
+-- FOR UPDATE SKIP LOCKED and hold a heartbeat-extended lease. A job whose
+-- lease expires (worker crashed / redeployed) becomes claimable again and
+-- is resumed instead of restarted.
+
+ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS queue_action VARCHAR(20);
+ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS queued_at TIMESTAMPTZ;
+ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(100);
+ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS leased_at TIMESTAMPTZ;
+ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS queue_attempts INTEGER NOT NULL DEFAULT 0;
+
+-- Only queued/leased rows are indexed, so the claim query stays tiny.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_generation_jobs_queue
+    ON generation_jobs (queued_at)
+    WHERE queue_action IS NOT NULL;
@@ -0,0 +1,48 @@
+-- Promote brand / variant / content_type out of scheduled_reels.extra_data.
+-- Metrics collection, the Toby buffer, slot search, publish dedup and the
+-- slot cleaners used to load every row for a user and read extra_data in
+-- Python to find one brand's posts. The columns let those filters run in
+-- SQL against (user_id, brand, ...) indexes.
+--
+-- brand = lower(trim(extra_data->>'brand')) — must stay in sync with
+-- normalize_brand_key() in app/models/scheduling.py. New and updated rows
+-- are filled by the ORM listener; this file backfills existing ones.
+--
+-- Run with psql (autocommit): the backfill commits every batch so it never
+-- holds row locks on the whole table, and the indexes are built CONCURRENTLY.
+
+ALTER TABLE scheduled_reels ADD COLUMN IF NOT EXISTS brand VARCHAR(50);
+ALTER TABLE scheduled_reels ADD COLUMN IF NOT EXISTS variant VARCHAR(20);
+ALTER TABLE scheduled_reels ADD COLUMN IF NOT EXISTS content_type VARCHAR(20);
+
+-- Online backfill in batches of 5000 rows, newest first (a row is done once
+-- every key present in extra_data has its column set, so the loop ends).
+DO $$
+DECLARE
+    batch_rows INTEGER;
+BEGIN
+    LOOP
+        UPDATE scheduled_reels s
+        SET brand = left(NULLIF(lower(trim(s.extra_data->>'brand')), ''), 50),
+            variant = left(NULLIF(s.extra_data->>'variant', ''), 20),
+            content_type = left(NULLIF(s.extra_data->>'content_type', ''), 20)
+        WHERE s.schedule_id IN (
+            SELECT schedule_id FROM scheduled_reels
+            WHERE (brand IS NULL AND NULLIF(trim(extra_data->>'brand'), '') IS NOT NULL)
+               OR (variant IS NULL AND NULLIF(extra_data->>'variant', '') IS NOT NULL)
+               OR (content_type IS NULL AND NULLIF(extra_data->>'content_type', '') IS NOT NULL)
+            ORDER BY scheduled_time DESC
+            LIMIT 5000
+        );
+        GET DIAGNOSTICS batch_rows = ROW_COUNT;
+        EXIT WHEN batch_rows = 0;
+        COMMIT;
+    END LOOP;
+END $$;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scheduled_reels_user_brand_time
+    ON scheduled_reels (user_id, brand, scheduled_time);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scheduled_reels_user_brand_published
+    ON scheduled_reels (user_id, brand, published_at)
+    WHERE status IN ('published', 'partial');
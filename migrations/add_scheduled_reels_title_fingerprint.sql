@@ -0,0 +1,29 @@
+-- Publish-dedup fingerprint for scheduled_reels.
+-- get_pending_publications() used to scan every published row of the last
+-- 7 days (JSONB projection across all tenants) on each 5-minute tick.
+-- It now checks claimed rows against this indexed fingerprint instead.
+--
+-- Fingerprint = md5(lower(btrim(brand)) | lower(btrim(title)) | lower(btrim(left(caption, 100))))
+-- btrim strips space, tab, LF and CR (E' \t\n\r') — the same set
+-- compute_title_fingerprint() in app/models/scheduling.py strips. Keep them in sync.
+--
+-- Only ORM flushes maintain the column afterwards: a raw or bulk UPDATE of
+-- caption / extra_data must recompute title_fingerprint in the same statement.
+
+ALTER TABLE scheduled_reels ADD COLUMN IF NOT EXISTS title_fingerprint VARCHAR(32);
+
+-- Backfill recent rows only — older rows are outside the dedup window.
+UPDATE scheduled_reels
+SET title_fingerprint = md5(
+        lower(btrim(extra_data->>'brand', E' \t\n\r')) || '|' ||
+        lower(btrim(extra_data->>'title', E' \t\n\r')) || '|' ||
+        lower(btrim(left(COALESCE(caption, ''), 100), E' \t\n\r'))
+    )
+WHERE title_fingerprint IS NULL
+  AND COALESCE(btrim(extra_data->>'brand', E' \t\n\r'), '') <> ''
+  AND COALESCE(btrim(extra_data->>'title', E' \t\n\r'), '') <> ''
+  AND scheduled_time > now() - interval '14 days';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_scheduled_reels_fingerprint_published
+    ON scheduled_reels (title_fingerprint, scheduled_time)
+    WHERE title_fingerprint IS NOT NULL AND status IN ('published', 'partial', 'publishing');
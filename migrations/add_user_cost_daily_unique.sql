@@ -0,0 +1,51 @@
+-- One user_cost_daily row per (user_id, date).
+-- The cost tracker now buffers per-call deltas in memory and flushes them
+-- in batches with INSERT ... ON CONFLICT (user_id, date) DO UPDATE
+-- SET x = x + excluded.x, which needs a unique index on those columns.
+-- The old get-or-create path could race and insert duplicates, so merge
+-- those into the oldest row first.
+-- run_migrations() in app/db_connection.py applies the same steps at
+-- startup (non-concurrently) when the index is missing.
+
+WITH dupes AS (
+    SELECT id,
+           row_number() OVER (PARTITION BY user_id, date ORDER BY created_at, id) AS rn,
+           first_value(id) OVER (PARTITION BY user_id, date ORDER BY created_at, id) AS keep_id
+    FROM user_cost_daily
+), sums AS (
+    SELECT d.keep_id,
+           sum(COALESCE(c.deepseek_calls, 0)) AS deepseek_calls,
+           sum(COALESCE(c.deepseek_input_tokens, 0)) AS deepseek_input_tokens,
+           sum(COALESCE(c.deepseek_output_tokens, 0)) AS deepseek_output_tokens,
+           sum(COALESCE(c.deepseek_cost_usd, 0)) AS deepseek_cost_usd,
+           sum(COALESCE(c.deapi_calls, 0)) AS deapi_calls,
+           sum(COALESCE(c.deapi_cost_usd, 0)) AS deapi_cost_usd,
+           sum(COALESCE(c.freepik_calls, 0)) AS freepik_calls,
+           sum(COALESCE(c.freepik_cost_usd, 0)) AS freepik_cost_usd,
+           sum(COALESCE(c.searchapi_calls, 0)) AS searchapi_calls,
+           sum(COALESCE(c.searchapi_cost_usd, 0)) AS searchapi_cost_usd,
+           sum(COALESCE(c.reels_generated, 0)) AS reels_generated,
+           sum(COALESCE(c.carousels_generated, 0)) AS carousels_generated
+    FROM dupes d JOIN user_cost_daily c ON c.id = d.id
+    WHERE d.keep_id IN (SELECT keep_id FROM dupes WHERE rn > 1)
+    GROUP BY d.keep_id
+), merged AS (
+    UPDATE user_cost_daily u SET
+        deepseek_calls = s.deepseek_calls,
+        deepseek_input_tokens = s.deepseek_input_tokens,
+        deepseek_output_tokens = s.deepseek_output_tokens,
+        deepseek_cost_usd = s.deepseek_cost_usd,
+        deapi_calls = s.deapi_calls,
+        deapi_cost_usd = s.deapi_cost_usd,
+        freepik_calls = s.freepik_calls,
+        freepik_cost_usd = s.freepik_cost_usd,
+        searchapi_calls = s.searchapi_calls,
+        searchapi_cost_usd = s.searchapi_cost_usd,
+        reels_generated = s.reels_generated,
+        carousels_generated = s.carousels_generated
+    FROM sums s WHERE u.id = s.keep_id
+)
+DELETE FROM user_cost_daily WHERE id IN (SELECT id FROM dupes WHERE rn > 1);
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_user_cost_daily_user_date
+    ON user_cost_daily (user_id, date);
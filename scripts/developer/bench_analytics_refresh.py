@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark: analytics refresh — serial per-user loop vs AnalyticsRefreshEngine.
+
+Serves a local stub API that answers every GET after --latency-ms and
+enforces a per-access-token limit of --token-limit calls per rolling
+--window-s seconds (HTTP 400 with Graph error code 4 beyond it, like
+Meta's per-token throttling; the window is scaled down from Meta's hour
+so the run takes seconds). The engine's token budget is set to fit that
+limit. Builds units for --tenants tenants, one of which is a
+--big-brands-brand agency on a single token; every other tenant has
+--brands brands on its own token. Each unit (Instagram / Facebook) makes
+UNIT_COST[platform] GETs.
+
+  serial  — the old refresh_all_users order: user by user, brand by
+            brand, one call after another
+  engine  — AnalyticsRefreshEngine.run(): bounded pool, round-robin
+            across tokens, per-token budget and concurrency cap
+
+Prints wall time, throttled responses, and when the last small tenant
+got its first unit done (how long the agency delays everyone else),
+plus the engine's slowest-units report. No database or external
+network needed.
+
+Usage:
+    python scripts/developer/bench_analytics_refresh.py
+    python scripts/developer/bench_analytics_refresh.py --tenants 40 --big-brands 12 --latency-ms 120
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.utils.http_client import get_http_session  # noqa: E402
+
+
+def serve(latency_s: float, token_limit: int, window_s: float, counts: dict):
+    calls = defaultdict(deque)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            token = parse_qs(urlsplit(self.path).query).get("access_token", [""])[0]
+            now = time.monotonic()
+            with lock:
+                counts["requests"] += 1
+                window = calls[token]
+                while window and now - window[0] > window_s:
+                    window.popleft()
+                throttled = len(window) >= token_limit
+                if throttled:
+                    counts["throttled"] += 1
+                else:
+                    window.append(now)
+            time.sleep(latency_s)
+            status, body = (400, {"error": {"message": "User request limit reached", "code": 4}}) if throttled \
+                else (200, {"data": [{"name": "views", "values": [{"value": 1}]}]})
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_units(tenants: int, brands: int, big_brands: int) -> list:
+    from app.services.analytics.refresh_engine import RefreshUnit
+
+    units = []
+    for t in range(tenants):
+        count = big_brands if t == 0 else brands
+        for b in range(count):
+            for platform in ("instagram", "facebook"):
+                units.append(RefreshUnit(f"user{t}", f"brand{t}_{b}", platform, f"token{t}"))
+    return units
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the parallel analytics refresh")
+    parser.add_argument("--tenants", type=int, default=20)
+    parser.add_argument("--brands", type=int, default=3)
+    parser.add_argument("--big-brands", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--token-limit", type=int, default=30)
+    parser.add_argument("--window-s", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=6)
+    args = parser.parse_args()
+
+    # Burst plus refill over one window stays within the stub's limit
+    # (set before the engine module reads them)
+    burst = args.token_limit // 3
+    os.environ["ANALYTICS_TOKEN_BURST"] = str(burst)
+    os.environ["ANALYTICS_TOKEN_CALLS_PER_MINUTE"] = str((args.token_limit - burst) * 60 / args.window_s)
+    from app.services.analytics.refresh_engine import UNIT_COST, AnalyticsRefreshEngine
+
+    counts = {"requests": 0, "throttled": 0}
+    server = serve(args.latency_ms / 1000, args.token_limit, args.window_s, counts)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    first_done: dict = {}
+    started = [0.0]
+
+    def work(unit) -> None:
+        for _ in range(UNIT_COST[unit.platform]):
+            resp = get_http_session().get(f"{base}/{unit.brand}/insights", params={"access_token": unit.token})
+            resp.raise_for_status()
+        first_done.setdefault(unit.user_id, time.perf_counter() - started[0])
+
+    units = make_units(args.tenants, args.brands, args.big_brands)
+    print(f"🧪 {args.tenants} tenants ({args.big_brands}-brand agency + {args.brands} brands each), "
+          f"{len(units)} units, {args.latency_ms:.0f} ms per call, "
+          f"{args.token_limit} calls per {args.window_s:.0f}s per token")
+
+    started[0] = time.perf_counter()
+    serial_errors = 0
+    for unit in units:
+        try:
+            work(unit)
+        except Exception:
+            serial_errors += 1
+    t_serial = time.perf_counter() - started[0]
+    serial_wait = max(v for k, v in first_done.items() if k != "user0")
+    print(f"  serial  {t_serial * 1000:>8.0f} ms   {counts['requests']} requests   "
+          f"{counts['throttled']} throttled   {serial_errors} failed units   "
+          f"last small tenant's first unit at {serial_wait * 1000:.0f} ms")
+
+    # Fresh per-token windows on the stub: new token names
+    for unit in units:
+        unit.token += "-b"
+    counts.update(requests=0, throttled=0)
+    first_done.clear()
+    engine = AnalyticsRefreshEngine(workers=args.workers)
+    started[0] = time.perf_counter()
+    summary = engine.run("bench", units, work)
+    t_engine = time.perf_counter() - started[0]
+    engine_wait = max(v for k, v in first_done.items() if k != "user0")
+    print(f"  engine  {t_engine * 1000:>8.0f} ms   {counts['requests']} requests   "
+          f"{counts['throttled']} throttled   {summary['errors']} failed units   "
+          f"last small tenant's first unit at {engine_wait * 1000:.0f} ms   {t_serial / t_engine:.1f}x")
+    print(f"  p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, slowest units:")
+    for slow in summary["slowest"][:5]:
+        print(f"      🐢 {slow['unit']}: {slow['ms']} ms{' — ' + slow['error'] if slow['error'] else ''}")
+    engine.shutdown()
+    server.shutdown()
+
+    if summary["errors"] or summary["processed"] != len(units) or counts["throttled"]:
+        print("  ❌ engine run had failed units or hit a token limit")
+        sys.exit(1)
+    print("  ✅ every unit refreshed within its token's limit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: brand logos — download per render vs BrandAssetCache.
+
+Serves --brands PNG logos from a local HTTP server (with ETags, and an
+optional --latency-ms delay per response) and runs --renders rounds in
+which every brand needs its logo decoded at thumbnail size:
+
+  fetch     — the old path: GET the logo into a temp file, Image.open,
+              convert to RGBA and resize, every time
+  cache     — BrandAssetCache.logo(): disk copy reused, decoded/resized
+              image served from the in-memory LRU
+
+Then invalidates the cache (what BrandResolver.invalidate_cache does) and
+runs one more round, which should cost one 304 per brand and no bodies.
+Prints HTTP request counts, timings and the cache's hit rates. No
+database or external network needed.
+
+Usage:
+    python scripts/developer/bench_brand_assets.py
+    python scripts/developer/bench_brand_assets.py --brands 20 --renders 5 --latency-ms 40
+"""
+import argparse
+import hashlib
+import io
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from app.services.media.asset_cache import BrandAssetCache  # noqa: E402
+from app.utils.http_client import get_http_session  # noqa: E402
+
+LOGO_SIZE = (100, 100)
+
+
+def make_logos(count: int) -> dict:
+    rng = np.random.default_rng(7)
+    logos = {}
+    for i in range(count):
+        pixels = rng.integers(0, 256, (64, 64, 4), dtype=np.uint8)
+        buf = io.BytesIO()
+        Image.fromarray(pixels, "RGBA").resize((512, 512)).save(buf, "PNG")
+        logos[f"/logos/brand{i}.png"] = buf.getvalue()
+    return logos
+
+
+def serve(logos: dict, latency_s: float, counts: dict):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency_s)
+            body = logos.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            etag = '"%s"' % hashlib.md5(body).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                counts["304"] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            counts["200"] += 1
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fetch_and_decode(url: str, tmp: Path) -> Image.Image:
+    """The pre-cache path: download to a temp file, then decode + resize."""
+    resp = get_http_session().get(url, timeout=15)
+    resp.raise_for_status()
+    path = tmp / f"{time.perf_counter_ns()}.png"
+    path.write_bytes(resp.content)
+    img = Image.open(path).convert("RGBA").resize(LOGO_SIZE, Image.LANCZOS)
+    path.unlink()
+    return img
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the brand asset cache")
+    parser.add_argument("--brands", type=int, default=20)
+    parser.add_argument("--renders", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=40)
+    args = parser.parse_args()
+
+    counts = {"200": 0, "304": 0}
+    logos = make_logos(args.brands)
+    server = serve(logos, args.latency_ms / 1000, counts)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [base + path for path in logos]
+    tmp = Path(tempfile.mkdtemp(prefix="bench_assets_"))
+    print(f"🧪 {args.brands} brands × {args.renders} renders, {args.latency_ms:.0f} ms per response")
+
+    start = time.perf_counter()
+    old = [[fetch_and_decode(u, tmp) for u in urls] for _ in range(args.renders)]
+    t_fetch = time.perf_counter() - start
+    print(f"  fetch        {t_fetch * 1000:>8.0f} ms   {counts['200']} downloads")
+
+    counts.update({"200": 0, "304": 0})
+    cache = BrandAssetCache(directory=tmp / "cache")
+    start = time.perf_counter()
+    new = [[cache.logo(u, LOGO_SIZE) for u in urls] for _ in range(args.renders)]
+    t_cache = time.perf_counter() - start
+    print(f"  cache        {t_cache * 1000:>8.0f} ms   {counts['200']} downloads   {t_fetch / t_cache:.0f}x")
+
+    cache.invalidate()
+    start = time.perf_counter()
+    for u in urls:
+        cache.logo(u, LOGO_SIZE)
+    t_reval = time.perf_counter() - start
+    print(f"  invalidated  {t_reval * 1000:>8.0f} ms   {counts['200']} downloads, {counts['304']} × 304")
+    server.shutdown()
+
+    stats = cache.stats()
+    print(f"  url hit rate {stats['url_hit_rate']}, image hit rate {stats['image_hit_rate']}, "
+          f"{stats['image_mb']} MB decoded")
+    same = all(np.array_equal(np.asarray(a), np.asarray(b)) for ra, rb in zip(old, new) for a, b in zip(ra, rb))
+    if not same or counts["200"] != args.brands:
+        print("  ❌ decoded logos differ or logos were downloaded more than once")
+        sys.exit(1)
+    print("  ✅ identical logos, one download per brand")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Toby buffer slot matching — linear scan vs SlotOccupancy.
+
+Builds a synthetic user with N brands, 6 reel + 2 post + 6 thread slots
+per day over --buffer-days, and scheduled rows filling --fill of those
+slots (jittered up to ±10 min, plus a few off-slot rows). Then checks
+every expected slot with:
+
+  linear     — the old get_buffer_status._slot_is_filled: exact strftime
+               key, then a scan over every scheduled row
+  occupancy  — SlotOccupancy.is_slot_filled: one bisect on the
+               (brand, category) array
+
+Both must agree on every slot. No database needed.
+
+Usage:
+    python scripts/developer/bench_buffer_slots.py
+    python scripts/developer/bench_buffer_slots.py --brands 1000 --buffer-days 7 --fill 0.7
+"""
+import argparse
+import random
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.models.scheduling import normalize_brand_key  # noqa: E402
+from app.services.toby.buffer_manager import (  # noqa: E402
+    SLOT_FUZZY_MINUTES,
+    SlotOccupancy,
+    content_type_to_category,
+    variant_to_category,
+)
+
+Row = namedtuple("Row", "brand variant scheduled_time")
+
+REEL_HOURS = [0, 4, 8, 12, 16, 20]
+POST_HOURS = [8, 14]
+THREAD_HOURS = [0, 4, 8, 12, 16, 20]
+SLOT_KINDS = (("reel", "light", REEL_HOURS), ("post", "post", POST_HOURS), ("threads_post", "threads", THREAD_HOURS))
+
+
+def build(brands: int, buffer_days: int, fill: float, seed: int):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    slots, rows = [], []
+    for b in range(brands):
+        brand_id = f"brand{b:04d}"
+        offset = b % 4
+        for day in range(buffer_days):
+            date = now.date() + timedelta(days=day)
+            for content_type, variant, hours in SLOT_KINDS:
+                for base in hours:
+                    hour = (base + offset) % 24
+                    slot_time = datetime(date.year, date.month, date.day, hour, tzinfo=timezone.utc)
+                    if slot_time <= now:
+                        continue
+                    slots.append((brand_id, slot_time, content_type))
+                    if rng.random() < fill:
+                        jitter = timedelta(minutes=rng.randint(-10, 10))
+                        rows.append(Row(normalize_brand_key(brand_id), variant, slot_time + jitter))
+        # A few off-slot rows (manual posts) that must not fill anything
+        for _ in range(3):
+            rows.append(Row(normalize_brand_key(brand_id), "light",
+                            now + timedelta(hours=rng.randint(1, buffer_days * 24), minutes=37)))
+    rng.shuffle(rows)
+    return slots, rows
+
+
+def linear_filled(slots, scheduled):
+    """The pre-index matcher, kept here as the baseline."""
+    filled_set = set()
+    for s in scheduled:
+        cat = variant_to_category(s.variant or "light")
+        filled_set.add((s.brand, s.scheduled_time.strftime("%Y-%m-%d %H:%M"), cat))
+
+    def _slot_is_filled(brand_id, slot_time, content_type):
+        brand_key = normalize_brand_key(brand_id)
+        cat = content_type_to_category(content_type)
+        if (brand_key, slot_time.strftime("%Y-%m-%d %H:%M"), cat) in filled_set:
+            return True
+        for s in scheduled:
+            if s.brand != brand_key:
+                continue
+            if variant_to_category(s.variant or "light") != cat:
+                continue
+            if abs((s.scheduled_time - slot_time).total_seconds()) <= SLOT_FUZZY_MINUTES * 60:
+                return True
+        return False
+
+    return [_slot_is_filled(*slot) for slot in slots]
+
+
+def occupancy_filled(slots, scheduled):
+    occupancy = SlotOccupancy.from_rows(scheduled)
+    return [occupancy.is_slot_filled(*slot) for slot in slots]
+
+
+def _time(label, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<10} {elapsed * 1000:>10.1f} ms")
+    return result, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Toby buffer slot matching")
+    parser.add_argument("--brands", type=int, default=1000)
+    parser.add_argument("--buffer-days", type=int, default=7)
+    parser.add_argument("--fill", type=float, default=0.7, help="Share of slots already scheduled")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-linear", action="store_true", help="Only time the occupancy index")
+    args = parser.parse_args()
+
+    slots, rows = build(args.brands, args.buffer_days, args.fill, args.seed)
+    print(f"🧪 {args.brands} brands × {args.buffer_days} days → {len(slots)} slots, {len(rows)} scheduled rows")
+
+    fast, t_fast = _time("occupancy", occupancy_filled, slots, rows)
+    print(f"  filled {sum(fast)}/{len(slots)}")
+    if args.skip_linear:
+        return
+    slow, t_slow = _time("linear", linear_filled, slots, rows)
+    if slow != fast:
+        mismatches = sum(1 for a, b in zip(slow, fast) if a != b)
+        print(f"  ❌ {mismatches} slot(s) disagree")
+        sys.exit(1)
+    print(f"  ✅ identical results — occupancy is {t_slow / t_fast:.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: carousel render + upload — serial PNG path vs CarouselPipeline.
+
+Renders a cover plus --slides text slides on a synthetic background and
+"uploads" each JPEG to a fake store that sleeps --upload-ms per call:
+
+  serial    — the old render_carousel_images flow: render_all to PNG files,
+              re-open each PNG, save it as JPEG, upload one at a time
+  pipeline  — CarouselPipeline.render_and_upload: slides rendered on the
+              process pool straight to JPEG bytes, each uploaded as soon
+              as it is ready
+
+Checks both paths upload byte-identical JPEGs. The pool is warmed first
+(spawned workers import Pillow and the renderer once). Speedup depends on
+CPU count: with one core only the uploads overlap. No database or network.
+
+Usage:
+    python scripts/developer/bench_carousel_pipeline.py
+    python scripts/developer/bench_carousel_pipeline.py --slides 8 --upload-ms 150 --workers 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from app.services.media.carousel_pipeline import CarouselPipeline, encode_jpeg  # noqa: E402
+from app.services.media.carousel_slide_renderer import CarouselSlideRenderer  # noqa: E402
+
+TITLE = "TEN DAILY HABITS THAT QUIETLY CHANGE YOUR HEALTH"
+BRAND = {"name": "Healthy College", "displayName": "Healthy College", "color": "#2e7d32",
+         "abbreviation": "HC", "handle": "@healthycollege"}
+TEXT = ("Drinking a glass of water first thing in the morning rehydrates you after sleep "
+        "and helps your body wake up.\n\nSmall habits like this compound over months.")
+
+
+def serial(renderer, bg, texts, tmp: Path, upload) -> list:
+    cover = str(tmp / "cover.png")
+    slides = [str(tmp / f"slide{i}.png") for i in range(len(texts))]
+    out = renderer.render_all(BRAND, TITLE, bg, texts, cover, slides)
+    assert out["success"], out
+    stored = []
+    for index, path in enumerate([cover] + slides):
+        jpg = path.rsplit(".", 1)[0] + ".jpg"
+        Image.open(path).convert("RGB").save(jpg, format="JPEG", quality=92, optimize=True)
+        stored.append(upload(index, Path(jpg).read_bytes()))
+    return stored
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark carousel render + upload")
+    parser.add_argument("--slides", type=int, default=8)
+    parser.add_argument("--upload-ms", type=float, default=150)
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default min(4, CPUs))")
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_carousel_"))
+    bg = str(tmp / "bg.png")
+    noise = np.random.default_rng(7).integers(0, 256, (1350 // 8, 1080 // 8, 3), dtype=np.uint8)
+    Image.fromarray(noise, "RGB").resize((1080, 1350), Image.BICUBIC).save(bg)
+    texts = [f"{i + 1}. {TEXT}" for i in range(args.slides)]
+
+    def fake_upload(index: int, data: bytes) -> bytes:
+        time.sleep(args.upload_ms / 1000)
+        return data
+
+    renderer = CarouselSlideRenderer()
+    pipeline = CarouselPipeline(render_workers=args.workers)
+    print(f"🧪 cover + {args.slides} slides, {args.upload_ms:.0f} ms/upload, "
+          f"{pipeline.render_workers} render worker(s), {os.cpu_count()} CPU(s)")
+    try:
+        # Warm fonts here and the spawned workers' imports
+        pipeline.render_and_upload(BRAND, TITLE, bg, texts[:1], lambda i, d: "")
+        encode_jpeg(renderer.draw_cover(bg, TITLE, BRAND))
+
+        start = time.perf_counter()
+        old = serial(renderer, bg, texts, tmp, fake_upload)
+        t_serial = time.perf_counter() - start
+        print(f"  serial    {t_serial * 1000:>8.0f} ms")
+
+        start = time.perf_counter()
+        out = pipeline.render_and_upload(BRAND, TITLE, bg, texts, fake_upload)
+        t_pipe = time.perf_counter() - start
+        print(f"  pipeline  {t_pipe * 1000:>8.0f} ms   {t_serial / t_pipe:.1f}x")
+    finally:
+        pipeline.shutdown()
+
+    new = [out["coverUrl"]] + out["slideUrls"]
+    if new != old:
+        print(f"  ❌ uploaded JPEGs differ ({sum(a != b for a, b in zip(old, new))} of {len(old)})")
+        sys.exit(1)
+    print(f"  ✅ {len(new)} identical JPEGs uploaded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Toby critic stage — serial critics vs the concurrent ensemble.
+
+Starts a local stub of DeepSeek's /chat/completions (each response delayed
+--semantic-ms / --audience-ms, told apart by temperature) and points the
+shared client at it. Then evaluates one piece of content --rounds times:
+
+  serial    — the old path: _semantic_critique then _audience_critique,
+              each call building a fresh OpenAI client (new connection)
+  ensemble  — critic_evaluate(): both LLM critics on the critic pool
+              within the latency budget, over the shared pooled client
+
+Prints wall time per evaluation, the per-critic timings recorded in the
+verdict, and how many TCP connections the stub accepted. Also runs one
+evaluation with a budget shorter than the audience delay to show the
+neutral fallback. No database or external network needed.
+
+Usage:
+    python scripts/developer/bench_critic_ensemble.py
+    python scripts/developer/bench_critic_ensemble.py --rounds 5 --semantic-ms 900 --audience-ms 700
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("DEEPSEEK_API_KEY", "bench")
+
+from openai import OpenAI  # noqa: E402
+
+from app.services.toby.agents import critic  # noqa: E402
+from app.utils import llm_cache, llm_client  # noqa: E402
+
+CONTENT = {
+    "title": "Why Your Morning Coffee Hits Different After Water",
+    "slides": [
+        "Caffeine absorbs faster on an empty stomach, but dehydration blunts focus.",
+        "A glass of water first restores plasma volume after eight hours of sleep.",
+        "Then coffee 30-60 minutes after waking, when cortisol has peaked.",
+        "Small order changes, noticeably steadier energy through the morning.",
+    ],
+}
+STRATEGY = {"personality": "educator", "topic_bucket": "nutrition", "hook_strategy": "curiosity"}
+
+
+def serve(delays: dict, connections: list):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            kind = "semantic" if body.get("temperature") == 0.2 else "audience"
+            time.sleep(delays[kind])
+            answer = {"overall": 82, "issues": [], "feedback": "ok", "improvement": "tighter hook"}
+            payload = json.dumps({
+                "id": "bench", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": json.dumps(answer)}}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Toby critic ensemble")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--semantic-ms", type=float, default=800)
+    parser.add_argument("--audience-ms", type=float, default=600)
+    args = parser.parse_args()
+
+    connections: list = []
+    server = serve({"semantic": args.semantic_ms / 1000, "audience": args.audience_ms / 1000}, connections)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    llm_client.DEEPSEEK_BASE_URL = base_url
+    # Measure the critics themselves, not repeat verdicts served from the cache
+    llm_cache.DISABLED_CALLSITES.add("toby.critic.semantic")
+    body = "\n".join(CONTENT["slides"])
+    print(f"🧪 {args.rounds} evaluations, semantic {args.semantic_ms:.0f} ms, audience {args.audience_ms:.0f} ms")
+
+    # Old path: a new client (and connection pool) per call, critics one after another
+    fresh = lambda: OpenAI(api_key="bench", base_url=base_url)  # noqa: E731
+    critic.get_deepseek_client = fresh
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        critic._semantic_critique(CONTENT["title"], body, STRATEGY, None)
+        critic._audience_critique(CONTENT["title"], body, "post", None)
+    t_serial = (time.perf_counter() - start) / args.rounds
+    serial_conns = len(connections)
+    print(f"  serial    {t_serial * 1000:>7.0f} ms/eval   {serial_conns} connections")
+
+    critic.get_deepseek_client = llm_client.get_deepseek_client
+    connections.clear()
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        verdict = critic.critic_evaluate(None, CONTENT, "post", STRATEGY)
+    t_ens = (time.perf_counter() - start) / args.rounds
+    print(f"  ensemble  {t_ens * 1000:>7.0f} ms/eval   {len(connections)} connections   "
+          f"{t_serial / t_ens:.1f}x")
+    print(f"  last verdict timings_ms: {verdict['timings_ms']}")
+
+    budget = (args.audience_ms / 1000) * 0.5
+    critics = {
+        "semantic": lambda: {"overall": 90},
+        "audience": lambda: critic._audience_critique(CONTENT["title"], body, "post", None),
+    }
+    fallbacks = {"semantic": {"overall": 70}, "audience": {"overall": 70, "issues": []}}
+    results, timings = critic.run_critic_ensemble(critics, fallbacks, budget_seconds=budget)
+    print(f"  budget {budget * 1000:.0f} ms: audience -> {results['audience']['overall']} "
+          f"(timing {timings['audience']})")
+
+    critic.shutdown_critic_pool()
+    server.shutdown()
+    if verdict["semantic_score"] != 82 or verdict["audience_score"] != 82 or results["audience"]["overall"] != 70:
+        print("  ❌ unexpected critic scores")
+        sys.exit(1)
+    print("  ✅ same scores, critics overlapped, one pooled client")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: reel encoding time and size per ffmpeg encoding profile.
+
+Renders a 1080x1920 test image (or uses --image), then encodes it with
+every profile in app.utils.ffmpeg.ENCODING_PROFILES, optionally with
+several encodes running at once to exercise the per-encode thread budget.
+Records wall time per encode and output bytes.
+
+Usage:
+    python scripts/developer/bench_ffmpeg_profiles.py
+    python scripts/developer/bench_ffmpeg_profiles.py --runs 5 --parallel 3 --music assets/music/default_01.mp3
+    python scripts/developer/bench_ffmpeg_profiles.py --profiles still --json results.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.utils.ffmpeg import (  # noqa: E402
+    ENCODING_PROFILES,
+    available_cpus,
+    create_video_from_image,
+    verify_ffmpeg_installation,
+)
+
+
+def _make_test_image(path: Path) -> None:
+    """A gradient + text frame, closer to a real reel than a flat colour."""
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (1080, 1920))
+    draw = ImageDraw.Draw(img)
+    for y in range(1920):
+        shade = int(40 + 160 * y / 1920)
+        draw.line([(0, y), (1080, y)], fill=(shade, 30, 255 - shade))
+    for i in range(12):
+        draw.text((80, 300 + i * 110), f"Benchmark line {i + 1} — static reel frame", fill=(255, 255, 255))
+    img.save(path, "PNG")
+
+
+def _encode_once(image: Path, out_dir: Path, profile: str, index: int, duration: float, music) -> tuple:
+    output = out_dir / f"{profile}_{index}.mp4"
+    start = time.perf_counter()
+    create_video_from_image(image, output, duration=duration, music_path=music, profile=profile)
+    elapsed = time.perf_counter() - start
+    size = output.stat().st_size
+    output.unlink()
+    return elapsed, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark ffmpeg encoding profiles")
+    parser.add_argument("--profiles", nargs="+", default=list(ENCODING_PROFILES), help="Profiles to compare")
+    parser.add_argument("--runs", type=int, default=3, help="Encodes per profile")
+    parser.add_argument("--parallel", type=int, default=1, help="Encodes running at the same time")
+    parser.add_argument("--duration", type=float, default=7, help="Clip length in seconds")
+    parser.add_argument("--image", type=Path, default=None, help="Use this image instead of a generated one")
+    parser.add_argument("--music", type=Path, default=None, help="Optional music track to mux")
+    parser.add_argument("--json", type=Path, default=None, help="Write results as JSON here")
+    args = parser.parse_args()
+
+    if not verify_ffmpeg_installation():
+        print("ERROR: ffmpeg not found on PATH")
+        sys.exit(1)
+
+    print(f"🖥️  CPUs available: {available_cpus()} | runs={args.runs} parallel={args.parallel}")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        image = args.image or tmp_dir / "frame.png"
+        if args.image is None:
+            _make_test_image(image)
+
+        for profile in args.profiles:
+            wall_start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.parallel) as pool:
+                samples = list(pool.map(
+                    lambda i: _encode_once(image, tmp_dir, profile, i, args.duration, args.music),
+                    range(args.runs),
+                ))
+            total_wall = time.perf_counter() - wall_start
+            times = [t for t, _ in samples]
+            sizes = [b for _, b in samples]
+            results[profile] = {
+                "median_s": round(statistics.median(times), 3),
+                "min_s": round(min(times), 3),
+                "max_s": round(max(times), 3),
+                "total_wall_s": round(total_wall, 3),
+                "bytes": int(statistics.median(sizes)),
+            }
+            r = results[profile]
+            print(
+                f"  {profile:<10} median {r['median_s']:>7.3f}s  "
+                f"(min {r['min_s']:.3f} / max {r['max_s']:.3f})  "
+                f"total {r['total_wall_s']:.3f}s  {r['bytes'] / 1024:,.0f} KiB"
+            )
+
+    if len(results) > 1 and "standard" in results:
+        base = results["standard"]["median_s"]
+        for profile, r in results.items():
+            if profile != "standard" and r["median_s"]:
+                print(f"  ⚡ {profile}: {base / r['median_s']:.1f}x faster than standard")
+
+    if args.json:
+        args.json.write_text(json.dumps({
+            "cpus": available_cpus(),
+            "runs": args.runs,
+            "parallel": args.parallel,
+            "duration": args.duration,
+            "profiles": results,
+        }, indent=2))
+        print(f"📝 Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
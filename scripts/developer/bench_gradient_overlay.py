@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark: gradient overlays — per-row paste vs cached NumPy mask.
+
+Times the overlay step alone on a 1080x1350 / 1080x1920 canvas, then
+CarouselSlideRenderer.render_cover and ThumbnailCompositor.compose_thumbnail
+end to end on a synthetic background, with:
+
+  rows   — the old overlay: one Image.new((W, 1)) + paste per row into an
+           RGBA layer, then alpha_composite and convert back to RGB
+  mask   — app.utils.compositing: alpha ramp computed once with NumPy,
+           cached "L" mask, one masked paste
+
+The old overlay is re-implemented here and swapped into the renderer
+module, so both runs render the same title, logo bar and text. End to end,
+the overlay is a small share of a render (PNG/JPEG encoding dominates), so
+the per-render saving is the overlay saving. Prints the
+largest per-channel pixel difference between the two overlays on the
+same background, and checks the NumPy alpha ramp against the original
+per-row formulas (float rounding / blend rounding: at most 1).
+No database or network needed.
+
+Usage:
+    python scripts/developer/bench_gradient_overlay.py
+    python scripts/developer/bench_gradient_overlay.py --iterations 20
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from app.services.media import carousel_slide_renderer as carousel_mod  # noqa: E402
+from app.services.media import thumbnail_compositor as thumb_mod  # noqa: E402
+from app.utils import compositing  # noqa: E402
+
+TITLE = "TEN DAILY HABITS THAT QUIETLY CHANGE YOUR HEALTH"
+
+
+def legacy_cover_alpha(frac: float) -> int:
+    """CarouselSlideRenderer.render_cover's original per-row alpha."""
+    if frac < 0.30:
+        alpha = int(255 * 0.10 * (frac / 0.30))
+    elif frac < 0.50:
+        alpha = int(255 * (0.10 + 0.23 * (frac - 0.30) / 0.20))
+    elif frac < 0.70:
+        alpha = int(255 * (0.33 + 0.45 * (frac - 0.50) / 0.20))
+    else:
+        alpha = int(255 * (0.78 + 0.22 * (frac - 0.70) / 0.30))
+    return min(alpha, 255)
+
+
+def legacy_thumb_alpha(frac: float, overlay_alpha: float) -> int:
+    """ThumbnailCompositor.compose_thumbnail's original per-row alpha."""
+    if frac < 0.35:
+        alpha = 0
+    elif frac < 0.65:
+        alpha = int(255 * overlay_alpha * 0.3 * (frac - 0.35) / 0.30)
+    else:
+        alpha = int(255 * overlay_alpha * (0.3 + 0.7 * (frac - 0.65) / 0.35))
+    return min(alpha, 255)
+
+
+def rows_gradient(canvas, alpha_of):
+    """The pre-mask overlay: one 1-px row image pasted per row."""
+    W, H = canvas.size
+    gradient = Image.new("RGBA", (W, H), (0, 0, 0, 0))
+    for y in range(H):
+        gradient.paste(Image.new("RGBA", (W, 1), (0, 0, 0, alpha_of(y / H))), (0, y))
+    result = Image.alpha_composite(canvas.convert("RGBA"), gradient).convert("RGB")
+    canvas.paste(result)
+    return canvas
+
+
+def background(path: Path, w: int, h: int) -> None:
+    rng = np.random.default_rng(7)
+    noise = rng.integers(0, 256, (h // 8, w // 8, 3), dtype=np.uint8)
+    Image.fromarray(noise, "RGB").resize((w, h), Image.BICUBIC).save(path)
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def overlay_step(label, bg_path: Path, curve, alpha_of, iterations) -> None:
+    """Time just the gradient step on a fresh copy of the background."""
+    base = Image.open(bg_path).convert("RGB")
+    compositing.apply_vertical_gradient(base.copy(), curve)  # warm the mask cache
+    t_rows = timed(lambda: rows_gradient(base.copy(), alpha_of), iterations)
+    t_mask = timed(lambda: compositing.apply_vertical_gradient(base.copy(), curve), iterations)
+    print(f"  {label:<10} rows {t_rows:>8.1f} ms   mask {t_mask:>8.1f} ms   {t_rows / t_mask:>4.1f}x")
+
+
+def overlay_diff(bg_path: Path, curve, alpha_of) -> int:
+    """Largest per-channel difference between the two overlays on one image."""
+    base = Image.open(bg_path).convert("RGB")
+    a = np.asarray(rows_gradient(base.copy(), alpha_of), dtype=np.int16)
+    b = np.asarray(compositing.apply_vertical_gradient(base.copy(), curve), dtype=np.int16)
+    return int(np.abs(a - b).max())
+
+
+def alpha_diff(height: int, curve, alpha_of) -> int:
+    """Largest difference between the NumPy ramp and the original row formula."""
+    legacy = np.array([alpha_of(y / height) for y in range(height)], dtype=np.int16)
+    return int(np.abs(compositing.gradient_alpha(height, curve).astype(np.int16) - legacy).max())
+
+
+def compare(label, render, module, iterations, alpha_of, diff):
+    original = module.apply_vertical_gradient
+    try:
+        module.apply_vertical_gradient = lambda canvas, _curve: rows_gradient(canvas, alpha_of)
+        t_rows = timed(lambda: render("rows"), iterations)
+        module.apply_vertical_gradient = original
+        t_mask = timed(lambda: render("mask"), iterations)
+    finally:
+        module.apply_vertical_gradient = original
+    print(f"  {label:<10} rows {t_rows:>8.1f} ms   mask {t_mask:>8.1f} ms   "
+          f"{t_rows / t_mask:>4.1f}x   max pixel diff {diff}")
+    return diff
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark gradient overlay rendering")
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_gradient_"))
+    cover_bg, thumb_bg = tmp / "cover_bg.png", tmp / "thumb_bg.png"
+    background(cover_bg, 1080, 1350)
+    background(thumb_bg, 1080, 1920)
+
+    carousel = carousel_mod.CarouselSlideRenderer()
+    thumbnail = thumb_mod.ThumbnailCompositor()
+
+    def render_cover(tag):
+        carousel.render_cover(str(cover_bg), TITLE, {"abbreviation": "HC"}, str(tmp / f"cover_{tag}.png"))
+
+    def render_thumb(tag):
+        thumbnail.compose_thumbnail(thumb_bg, TITLE.split(), design=None).unlink()
+
+    overlay_alpha = (thumb_mod.DEFAULTS["thumbnail_overlay_opacity"] + 20) / 100
+    thumb_curve = thumb_mod.bottom_overlay_curve(overlay_alpha)
+    thumb_alpha = lambda frac: legacy_thumb_alpha(frac, overlay_alpha)  # noqa: E731
+
+    print(f"🧪 median of {args.iterations} renders (font caches warm after the first)")
+    ramp_diff = max(
+        alpha_diff(1350, carousel_mod.COVER_GRADIENT, legacy_cover_alpha),
+        alpha_diff(1920, thumb_curve, thumb_alpha),
+    )
+    print(f"  alpha ramp vs original row formulas: max diff {ramp_diff}")
+    print("overlay step only:")
+    overlay_step("cover", cover_bg, carousel_mod.COVER_GRADIENT, legacy_cover_alpha, args.iterations)
+    overlay_step("thumbnail", thumb_bg, thumb_curve, thumb_alpha, args.iterations)
+    print("full render (includes image decode/resize/encode):")
+    diffs = [
+        ramp_diff,
+        compare("cover", render_cover, carousel_mod, args.iterations, legacy_cover_alpha,
+                overlay_diff(cover_bg, carousel_mod.COVER_GRADIENT, legacy_cover_alpha)),
+        compare("thumbnail", render_thumb, thumb_mod, args.iterations, thumb_alpha,
+                overlay_diff(thumb_bg, thumb_curve, thumb_alpha)),
+    ]
+    if max(diffs) > 1:
+        print("  ❌ outputs differ by more than blend rounding")
+        sys.exit(1)
+    print("  ✅ outputs match within 1/255")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Instagram media metrics — one GET per call vs GraphBatchClient.
+
+Serves a local stub of the Graph API with --media posts: GET /{id},
+GET /{id}/insights, GET /?ids=... and POST / with batch=[...] (Meta's
+semantics: a bad id fails a whole ?ids= call, carousels reject the plays
+metric, deleted posts 404). Every response is delayed --latency-ms.
+
+  per-media  — the old fetch_media_metrics flow: fields, combined
+               insights, plays and views fetched per post
+  batched    — MetricsCollector.fetch_media_metrics_many: ?ids= for the
+               fields, batch POSTs for the insights
+
+Also runs AnalyticsService._get_ig_views_from_media over a 50-item media
+list. Prints HTTP request counts and timings, and checks both paths
+return the same metrics. No database or external network needed.
+
+Usage:
+    python scripts/developer/bench_graph_batch.py
+    python scripts/developer/bench_graph_batch.py --media 300 --latency-ms 30
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.services.analytics.analytics_service import AnalyticsService  # noqa: E402
+from app.services.analytics.metrics_collector import MetricsCollector  # noqa: E402
+from app.utils.http_client import get_http_session  # noqa: E402
+
+ACCOUNT = "17841400000000000"
+
+
+def make_media(count: int) -> dict:
+    now = datetime.now(timezone.utc)
+    media = {}
+    for i in range(count):
+        media_id = str(18000000000000000 + i)
+        media[media_id] = {
+            "deleted": i % 97 == 13,
+            "media_type": "CAROUSEL_ALBUM" if i % 5 == 0 else "VIDEO",
+            "like_count": 40 + i % 60, "comments_count": i % 9,
+            "reach": 900 + 7 * i, "saved": i % 30, "shares": i % 17, "plays": 2000 + 11 * i,
+            "timestamp": (now - timedelta(hours=3 * i)).strftime("%Y-%m-%dT%H:%M:%S+0000"),
+        }
+    return media
+
+
+def graph_get(media: dict, path: str, query: dict):
+    """(status, body) for one Graph GET, following Meta's error shapes."""
+    error = {"error": {"message": "Unsupported get request", "code": 100}}
+    parts = [p for p in path.split("/") if p and not p.startswith("v")]
+    if not parts and "ids" in query:
+        out = {}
+        for media_id in query["ids"].split(","):
+            status, body = graph_get(media, f"/{media_id}", {"fields": query.get("fields", "")})
+            if status != 200:
+                return 400, error  # one bad id fails the whole call
+            out[media_id] = body
+        return 200, out
+    if parts == [ACCOUNT, "media"]:
+        return 200, {"data": [
+            {"id": m, "timestamp": d["timestamp"], "media_type": d["media_type"]}
+            for m, d in list(media.items())[:50] if not d["deleted"]
+        ]}
+    item = media.get(parts[0]) if parts else None
+    if item is None or item["deleted"]:
+        return 404, error
+    if len(parts) == 1:
+        fields = query.get("fields", "").split(",")
+        return 200, {"id": parts[0], **{f: item[f] for f in fields if f in item}}
+    data = []
+    for name in query.get("metric", "").split(","):
+        if name in ("plays",) and item["media_type"] != "VIDEO":
+            return 400, error
+        value = item["plays"] if name == "views" and item["media_type"] == "VIDEO" else item.get(name, 0)
+        data.append({"name": name, "values": [{"value": value}]})
+    return 200, {"data": data}
+
+
+def serve(media: dict, latency_s: float, counts: dict):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            counts["requests"] += 1
+            time.sleep(latency_s)
+            url = urlsplit(self.path)
+            self._send(*graph_get(media, url.path, {k: v[0] for k, v in parse_qs(url.query).items()}))
+
+        def do_POST(self):
+            counts["requests"] += 1
+            time.sleep(latency_s)
+            form = {k: v[0] for k, v in parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode()).items()}
+            out = []
+            for sub in json.loads(form["batch"]):
+                url = urlsplit(sub["relative_url"])
+                status, body = graph_get(media, "/" + url.path, {k: v[0] for k, v in parse_qs(url.query).items()})
+                out.append({"code": status, "body": json.dumps(body)})
+            self._send(200, out)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def per_media(base: str, media_id: str) -> dict:
+    """The pre-batching fetch_media_metrics request sequence for one post."""
+    session = get_http_session()
+    m = {"views": 0, "likes": 0, "comments": 0, "saves": 0, "shares": 0, "reach": 0}
+    r = session.get(f"{base}/{media_id}", params={"fields": "like_count,comments_count,timestamp,media_type",
+                                                   "access_token": "t"}, timeout=15)
+    if r.status_code != 200:
+        return {"deleted": True}
+    m["likes"], m["comments"] = r.json().get("like_count", 0), r.json().get("comments_count", 0)
+    r = session.get(f"{base}/{media_id}/insights", params={"metric": "reach,saved,shares", "access_token": "t"})
+    for item in r.json().get("data", []) if r.status_code == 200 else []:
+        m[{"reach": "reach", "saved": "saves", "shares": "shares"}[item["name"]]] = item["values"][0]["value"]
+    for view_metric in ("plays", "views"):
+        r = session.get(f"{base}/{media_id}/insights", params={"metric": view_metric, "access_token": "t"})
+        if r.status_code == 200 and r.json()["data"][0]["values"][0]["value"] > 0:
+            m["views"] = r.json()["data"][0]["values"][0]["value"]
+            break
+    return m
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark batched Graph API metrics collection")
+    parser.add_argument("--media", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    counts = {"requests": 0}
+    media = make_media(args.media)
+    server = serve(media, args.latency_ms / 1000, counts)
+    base = f"http://127.0.0.1:{server.server_address[1]}/v21.0"
+    ids = list(media)
+    print(f"🧪 {args.media} media ({sum(d['deleted'] for d in media.values())} deleted), "
+          f"{args.latency_ms:.0f} ms per response")
+
+    start = time.perf_counter()
+    old = {m: per_media(base, m) for m in ids}
+    t_old = time.perf_counter() - start
+    old_requests = counts["requests"]
+    print(f"  per-media  {t_old * 1000:>8.0f} ms   {old_requests} requests")
+
+    collector = MetricsCollector.__new__(MetricsCollector)
+    collector._rate_limited_until = None
+    collector.BASE_URL = base
+    counts["requests"] = 0
+    start = time.perf_counter()
+    new = collector.fetch_media_metrics_many(ids, "t")
+    t_new = time.perf_counter() - start
+    new_requests = counts["requests"]
+    print(f"  batched    {t_new * 1000:>8.0f} ms   {new_requests} requests   "
+          f"{old_requests / new_requests:.0f}x fewer")
+
+    service = AnalyticsService.__new__(AnalyticsService)
+    service.META_API_BASE = base
+    counts["requests"] = 0
+    views = service._get_ig_views_from_media(ACCOUNT, "t")
+    print(f"  _get_ig_views_from_media: {views} views in {counts['requests']} requests (was 1 + 1-2 per media)")
+    server.shutdown()
+
+    if old != new:
+        diff = [m for m in ids if old[m] != new.get(m)]
+        print(f"  ❌ {len(diff)} media differ, e.g. {diff[0]}: {old[diff[0]]} vs {new.get(diff[0])}")
+        sys.exit(1)
+    print("  ✅ identical metrics for every media")
+
+
+if __name__ == "__main__":
+    main()
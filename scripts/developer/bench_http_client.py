@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bare requests calls vs the shared pooled HTTP client.
+
+Starts a local HTTPS stub server (self-signed certificate, generated with
+the cryptography package) that answers every request with a small JSON
+body, then times N sequential calls with:
+
+  bare     — requests.get(...) per call (new TCP+TLS handshake each time)
+  pooled   — app.utils.http_client.get_http_session() (keep-alive)
+  httpx    — app.utils.http_client.get_http2_client() (HTTP/2 if h2 installed)
+
+The stub's --delay-ms adds fixed server latency so the numbers resemble a
+real API; the difference between rows is the handshake + connection cost.
+
+Usage:
+    python scripts/developer/bench_http_client.py
+    python scripts/developer/bench_http_client.py --requests 500 --delay-ms 5 --plain-http
+"""
+import argparse
+import datetime
+import ssl
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+import requests  # noqa: E402
+
+from app.utils.http_client import (  # noqa: E402
+    get_http2_client,
+    get_http_session,
+    http_client_stats,
+    reset_http_client_stats,
+)
+
+BODY = b'{"ok": true, "data": [1, 2, 3]}'
+
+
+def _make_cert(directory: Path) -> tuple:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = directory / "cert.pem", directory / "key.pem"
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+    ))
+    return cert_path, key_path
+
+
+def _start_stub(delay_s: float, tls_files) -> tuple:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if delay_s:
+                time.sleep(delay_s)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    scheme = "http"
+    if tls_files:
+        ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ctx.load_cert_chain(*tls_files)
+        server.socket = ctx.wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://localhost:{server.server_address[1]}/v1/stub"
+
+
+def _time_calls(label: str, call, n: int) -> dict:
+    call()  # warm-up (first connection)
+    samples = []
+    start = time.perf_counter()
+    for _ in range(n):
+        t0 = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - t0) * 1000)
+    total = time.perf_counter() - start
+    samples.sort()
+    result = {
+        "label": label,
+        "total_s": round(total, 3),
+        "median_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+    }
+    print(f"  {label:<8} total {result['total_s']:>7.3f}s  median {result['median_ms']:>7.2f}ms  p95 {result['p95_ms']:>7.2f}ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs bare HTTP clients")
+    parser.add_argument("--requests", type=int, default=200, help="Calls per client")
+    parser.add_argument("--delay-ms", type=float, default=0, help="Fixed stub server latency")
+    parser.add_argument("--plain-http", action="store_true", help="Skip TLS (measures TCP setup only)")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")  # self-signed cert → InsecureRequestWarning
+    with tempfile.TemporaryDirectory() as tmp:
+        tls_files = None if args.plain_http else _make_cert(Path(tmp))
+        server, url = _start_stub(args.delay_ms / 1000, tls_files)
+        print(f"🧪 Stub at {url} | {args.requests} sequential calls per client")
+
+        reset_http_client_stats()
+        session = get_http_session()
+        client = get_http2_client()
+        client._transport._pool._ssl_context.check_hostname = False
+        client._transport._pool._ssl_context.verify_mode = ssl.CERT_NONE
+
+        bare = _time_calls("bare", lambda: requests.get(url, timeout=10, verify=False).json(), args.requests)
+        pooled = _time_calls("pooled", lambda: session.get(url, verify=False).json(), args.requests)
+        hx = _time_calls("httpx", lambda: client.get(url).json(), args.requests)
+        server.shutdown()
+
+    print(f"  ⚡ pooled is {bare['total_s'] / pooled['total_s']:.1f}x faster than bare, "
+          f"httpx {bare['total_s'] / hx['total_s']:.1f}x")
+    host_stats = http_client_stats()["hosts"].get("localhost", {})
+    print(f"  📊 recorded localhost: count={host_stats.get('count')} p50={host_stats.get('p50_ms')}ms "
+          f"p95={host_stats.get('p95_ms')}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Toby memory retrieval — per-query exact scan vs UserVectorIndex.
+
+Builds one user's synthetic memories (--memories random 1536-d vectors
+spread over --brands brands) and ranks --queries query vectors with:
+
+  scan    — what pgvector does without an ANN index: cosine distance to
+            every row in float64, full sort, one query at a time
+  index   — UserVectorIndex.search: float32 normalized matrix, all queries
+            in one matrix product, argpartition top-k
+
+Both must return the same top-k ids (float32 ties aside). Also times the
+brand-filtered search used by episodic retrieval. No database needed.
+
+Usage:
+    python scripts/developer/bench_memory_index.py
+    python scripts/developer/bench_memory_index.py --memories 5000 --queries 64 --k 5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.services.toby.memory.vector_index import UserVectorIndex, _normalize  # noqa: E402
+
+DIMS = 1536
+
+
+def scan(vectors: np.ndarray, ids: list[str], query: np.ndarray, k: int) -> list[str]:
+    """The pre-index path: cosine distance to every row, then sort."""
+    q = query.astype(np.float64)
+    norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(q)
+    distance = 1.0 - (vectors @ q) / norms
+    return [ids[i] for i in np.argsort(distance, kind="stable")[:k]]
+
+
+def _time(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<16} {elapsed * 1000:>10.1f} ms")
+    return result, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Toby memory vector retrieval")
+    parser.add_argument("--memories", type=int, default=5000)
+    parser.add_argument("--brands", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=32)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = rng.standard_normal((args.memories, DIMS))
+    ids = [f"mem{i:06d}" for i in range(args.memories)]
+    groups = [f"brand{i % args.brands}" for i in range(args.memories)]
+    queries = rng.standard_normal((args.queries, DIMS))
+    print(f"🧪 {args.memories} memories × {DIMS}d, {args.queries} queries, k={args.k}")
+
+    index, _ = _time("build index", lambda: UserVectorIndex(ids, groups, _normalize(vectors)))
+    slow, t_slow = _time("scan (per query)", lambda: [scan(vectors, ids, q, args.k) for q in queries])
+    fast, t_fast = _time("index (batched)", lambda: index.search(_normalize(queries), args.k))
+    _time("index (brand)", lambda: index.search(_normalize(queries), args.k, group="brand0"))
+
+    if slow != fast:
+        mismatches = sum(1 for a, b in zip(slow, fast) if a != b)
+        print(f"  ❌ {mismatches} query(ies) disagree")
+        sys.exit(1)
+    print(f"  ✅ identical top-{args.k} — index is {t_slow / t_fast:.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: publish-claim tick cost vs scheduled_reels table size.
+
+Grows scheduled_reels with filler rows (published history + future
+schedules) and times get_pending_publications() claiming a fixed number
+of due rows at each size. The claim path should stay flat as the table
+grows, because it only touches due rows and the fingerprint index.
+
+Safety: requires TEST_MODE=1 and should point DATABASE_URL at a local,
+throwaway Postgres — the claim step flips ANY due row to 'publishing'.
+All bench rows use user_id="bench-user" and are removed at the end.
+
+Usage:
+    TEST_MODE=1 DATABASE_URL=postgresql://... python scripts/developer/bench_publish_claim.py
+    TEST_MODE=1 ... python scripts/developer/bench_publish_claim.py --sizes 10000 100000 1000000 --due 50
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+if os.environ.get("TEST_MODE") != "1":
+    print("ERROR: bench_publish_claim.py requires TEST_MODE=1 (and a throwaway DATABASE_URL)")
+    sys.exit(1)
+
+from sqlalchemy import text  # noqa: E402
+from app.db_connection import engine, init_db  # noqa: E402
+from app.services.publishing.scheduler import DatabaseSchedulerService  # noqa: E402
+
+BENCH_USER = "bench-user"
+
+
+def _row_count() -> int:
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT count(*) FROM scheduled_reels")).scalar()
+
+
+def _grow_to(target: int) -> None:
+    """Insert filler rows until the table has at least ``target`` rows."""
+    missing = target - _row_count()
+    if missing <= 0:
+        return
+    # 2/3 published history (inside the 7-day dedup window), 1/3 future schedules
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO scheduled_reels
+                (schedule_id, user_id, user_name, reel_id, caption, scheduled_time,
+                 created_at, status, extra_data, created_by, title_fingerprint, brand, variant)
+            SELECT
+                'b' || substr(md5(random()::text || g::text), 1, 30),
+                :user, :user,
+                'bench-' || g,
+                'Bench caption number ' || g,
+                CASE WHEN g % 3 = 0 THEN now() + (g % 10000) * interval '1 minute'
+                     ELSE now() - (g % 9000) * interval '1 minute' END,
+                now(),
+                CASE WHEN g % 3 = 0 THEN 'scheduled' ELSE 'published' END,
+                json_build_object('brand', 'bench' || (g % 50), 'title', 'Bench title ' || g, 'variant', 'light'),
+                'toby',
+                md5('bench' || (g % 50) || '|bench title ' || g || '|bench caption number ' || g),
+                'bench' || (g % 50), 'light'
+            FROM generate_series(1, :n) AS g
+        """), {"user": BENCH_USER, "n": missing})
+        conn.execute(text("ANALYZE scheduled_reels"))
+
+
+def _seed_due(count: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO scheduled_reels
+                (schedule_id, user_id, user_name, reel_id, caption, scheduled_time,
+                 created_at, status, extra_data, created_by, title_fingerprint, brand, variant)
+            SELECT
+                'd' || substr(md5(random()::text || g::text), 1, 30),
+                :user, :user, 'bench-due-' || g, 'Due caption ' || g,
+                now() - interval '1 minute', now(), 'scheduled',
+                json_build_object('brand', 'bench-due', 'title', 'Due title ' || g, 'variant', 'light'),
+                'toby',
+                md5('bench-due|due title ' || g || '|due caption ' || g),
+                'bench-due', 'light'
+            FROM generate_series(1, :n) AS g
+        """), {"user": BENCH_USER, "n": count})
+
+
+def _cleanup() -> None:
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM scheduled_reels WHERE user_id = :user"), {"user": BENCH_USER})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--due", type=int, default=50, help="Due rows claimed per measurement")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep bench rows after the run")
+    args = parser.parse_args()
+
+    init_db()
+    service = DatabaseSchedulerService()
+
+    print(f"{'rows':>10}  {'claim ms (median)':>18}  {'empty tick ms':>14}")
+    try:
+        for size in args.sizes:
+            _grow_to(size)
+            claim_ms, empty_ms = [], []
+            for _ in range(args.repeats):
+                _seed_due(args.due)
+                t0 = time.perf_counter()
+                claimed = service.get_pending_publications(limit=args.due)
+                claim_ms.append((time.perf_counter() - t0) * 1000)
+                assert len(claimed) <= args.due
+
+                # Tick with nothing due — the common case every 5 minutes
+                t0 = time.perf_counter()
+                service.get_pending_publications(limit=args.due)
+                empty_ms.append((time.perf_counter() - t0) * 1000)
+
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        "DELETE FROM scheduled_reels WHERE user_id = :user AND reel_id LIKE 'bench-due-%'"
+                    ), {"user": BENCH_USER})
+
+            claim_ms.sort()
+            empty_ms.sort()
+            print(f"{_row_count():>10}  {claim_ms[len(claim_ms) // 2]:>18.1f}  {empty_ms[len(empty_ms) // 2]:>14.1f}")
+    finally:
+        if not args.keep:
+            _cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark: text layout/fitting with and without the font caches.
+
+Times the title auto-fit of CarouselSlideRenderer and ThumbnailCompositor
+and a full ImageGenerator reel render, in three modes:
+
+  cold     — font + measurement caches cleared before every iteration
+  warm     — caches kept between iterations (steady state in a worker)
+  linear   — cold caches and the old one-step-at-a-time size scan instead
+             of fit_largest_size() (title fit only; shows the search win)
+
+No database or network is needed for the title fit; the reel render
+falls back to default brand colours when the DB is unreachable.
+
+Usage:
+    python scripts/developer/bench_text_fit.py
+    python scripts/developer/bench_text_fit.py --iterations 20 --skip-reel
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+from app.utils import fonts  # noqa: E402
+from app.services.media.carousel_slide_renderer import CarouselSlideRenderer  # noqa: E402
+from app.services.media.thumbnail_compositor import ThumbnailCompositor  # noqa: E402
+
+TITLES = [
+    "SLEEP",
+    "TEN DAILY HABITS THAT QUIETLY CHANGE YOUR HEALTH",
+    "WHY MOST PEOPLE NEVER FIX THEIR SLEEP SCHEDULE EVEN WHEN THEY KNOW EXACTLY WHAT TO DO ABOUT IT",
+]
+CONTENT = [
+    "**Sleep** — Seven to nine hours of consistent sleep improves memory, metabolism and mood",
+    "**Hydration** — Drinking water before meals reduces appetite and keeps your energy stable",
+    "**Protein** — Spread protein intake across every meal so your muscles can use it for repair",
+    "**Walking** — A ten minute walk after dinner lowers blood sugar spikes more than supplements",
+    "**Sunlight** — Morning light exposure anchors your circadian rhythm and improves sleep",
+]
+
+
+def _clear_caches() -> None:
+    fonts.truetype_cached.cache_clear()
+    fonts.text_bbox.cache_clear()
+
+
+def _linear_fit(min_size, max_size, fits, step=1):
+    """The pre-binary-search behaviour: walk down one step at a time."""
+    for size in range(max_size, min_size - 1, -step):
+        if fits(size):
+            return size
+    return None
+
+
+def _fit_titles(draw) -> None:
+    carousel, thumbnail = CarouselSlideRenderer(), ThumbnailCompositor()
+    for title in TITLES:
+        carousel._auto_fit_title(draw, title, "Anton", 900)
+        thumbnail._auto_fit_title(draw, title, "Anton", 950)
+
+
+def _time(label, fn, iterations: int, before=None) -> float:
+    """Median milliseconds per call; prints a row unless label is None."""
+    samples = []
+    for _ in range(iterations):
+        if before:
+            before()
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    median = statistics.median(samples)
+    if label is not None:
+        print(f"  {label:<22} median {median:>8.1f}ms  min {min(samples):>8.1f}ms")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark font caching and binary-search text fitting")
+    parser.add_argument("--iterations", type=int, default=10, help="Timed iterations per mode")
+    parser.add_argument("--skip-reel", action="store_true", help="Only time the title auto-fit")
+    args = parser.parse_args()
+
+    draw = ImageDraw.Draw(Image.new("RGB", (10, 10)))
+    print(f"🔤 Title auto-fit ({len(TITLES)} titles × carousel + thumbnail)")
+    cold = _time("cold caches", lambda: _fit_titles(draw), args.iterations, before=_clear_caches)
+    warm = _time("warm caches", lambda: _fit_titles(draw), args.iterations)
+
+    import app.services.media.carousel_slide_renderer as carousel_mod
+    import app.services.media.thumbnail_compositor as thumbnail_mod
+    originals = (carousel_mod.fit_largest_size, thumbnail_mod.fit_largest_size)
+    carousel_mod.fit_largest_size = thumbnail_mod.fit_largest_size = _linear_fit
+    try:
+        linear = _time("cold + linear scan", lambda: _fit_titles(draw), args.iterations, before=_clear_caches)
+    finally:
+        carousel_mod.fit_largest_size, thumbnail_mod.fit_largest_size = originals
+    print(f"  ⚡ binary search {linear / cold:.1f}x faster than linear scan (both cold), "
+          f"warm caches {cold / warm:.1f}x faster than cold")
+
+    if args.skip_reel:
+        return
+
+    from app.services.media.image_generator import ImageGenerator
+
+    print("🖼️  ImageGenerator reel image (1080x1920, light mode)")
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        generator = ImageGenerator("bench", variant="light", brand_name="bench")
+        output = Path(tmp) / "reel.png"
+
+        def render():
+            generator.generate_reel_image(TITLES[1], CONTENT, output, cta_type="Follow for more")
+
+        render()  # warm-up (brand colour lookup)
+        results = {
+            "cold": _time(None, render, args.iterations, before=_clear_caches),
+            "warm": _time(None, render, args.iterations),
+        }
+    for label, median in results.items():
+        print(f"  {label + ' caches':<22} median {median:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Load test: p50/p95/p99 latency under a mix of heavy and light endpoints.
+
+The point is to catch handlers that block the event loop: while heavy
+requests (analytics, scheduled-post listings) are in flight, light ones
+(/health, brand ids) should stay fast. If a heavy handler does blocking
+I/O inside ``async def``, every light request queues behind it and its
+p99 climbs to the heavy handler's duration.
+
+Two modes:
+
+  demo (default) — starts an in-process uvicorn app with a heavy endpoint
+      that blocks for --heavy-ms (time.sleep, standing in for a slow sync
+      query) defined both as ``async def`` and as plain ``def``, plus a
+      light endpoint. Runs the same mix against each and prints the light
+      endpoint's percentiles side by side.
+
+  --base-url — drives a running API with real endpoints. Pass a Supabase
+      access token with --token; add or replace endpoints with
+      --heavy/--light.
+
+Usage:
+    python scripts/developer/load_test_api.py
+    python scripts/developer/load_test_api.py --concurrency 64 --duration 15 --heavy-ms 300
+    python scripts/developer/load_test_api.py --base-url http://localhost:8000 --token $JWT
+"""
+import argparse
+import asyncio
+import random
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+
+DEFAULT_HEAVY = [
+    "/api/analytics/v2/overview?days=30",
+    "/reels/scheduled",
+    "/api/analytics/snapshots",
+]
+DEFAULT_LIGHT = [
+    "/health",
+    "/api/v2/brands/ids",
+]
+
+
+def _percentiles(samples: list) -> dict:
+    if not samples:
+        return {"n": 0, "p50": None, "p95": None, "p99": None, "max": None}
+    samples = sorted(samples)
+
+    def pick(q):
+        return round(samples[min(len(samples) - 1, int(len(samples) * q))], 1)
+
+    return {"n": len(samples), "p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(samples[-1], 1)}
+
+
+async def run_mix(base_url: str, heavy: list, light: list, *, concurrency: int, duration: float,
+                  heavy_ratio: float, headers: dict) -> dict:
+    """Closed-loop workers pick heavy or light paths at random; returns ms samples per kind."""
+    results = {"heavy": [], "light": [], "errors": 0}
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=60, limits=limits) as client:
+        async def worker():
+            while time.perf_counter() < deadline:
+                kind = "heavy" if random.random() < heavy_ratio else "light"
+                path = random.choice(heavy if kind == "heavy" else light)
+                t0 = time.perf_counter()
+                try:
+                    resp = await client.get(path)
+                    if resp.status_code >= 500:
+                        results["errors"] += 1
+                        continue
+                except httpx.HTTPError:
+                    results["errors"] += 1
+                    continue
+                results[kind].append((time.perf_counter() - t0) * 1000)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+
+def _print_row(label: str, stats: dict) -> None:
+    if not stats["n"]:
+        print(f"  {label:<22} no samples")
+        return
+    print(f"  {label:<22} n={stats['n']:>6}  p50 {stats['p50']:>8.1f}ms  p95 {stats['p95']:>8.1f}ms  "
+          f"p99 {stats['p99']:>8.1f}ms  max {stats['max']:>8.1f}ms")
+
+
+def _build_demo_app(heavy_s: float):
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    @app.get("/blocking/heavy")
+    async def heavy_async():
+        time.sleep(heavy_s)  # sync DB call inside async def — blocks the loop
+        return {"ok": True}
+
+    @app.get("/threaded/heavy")
+    def heavy_sync():
+        time.sleep(heavy_s)  # same call in a plain def — runs on the threadpool
+        return {"ok": True}
+
+    @app.get("/light")
+    async def light():
+        return {"ok": True}
+
+    return app
+
+
+def _start_demo_server(heavy_s: float) -> tuple:
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = uvicorn.Config(_build_demo_app(heavy_s), host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="p99 latency under a heavy/light endpoint mix")
+    parser.add_argument("--base-url", help="Drive a running API instead of the in-process demo")
+    parser.add_argument("--token", help="Bearer token for --base-url")
+    parser.add_argument("--heavy", action="append", help="Heavy endpoint path (repeatable)")
+    parser.add_argument("--light", action="append", help="Light endpoint path (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent closed-loop clients")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per run")
+    parser.add_argument("--heavy-ratio", type=float, default=0.2, help="Share of requests that are heavy")
+    parser.add_argument("--heavy-ms", type=float, default=200, help="Demo: blocking time of the heavy endpoint")
+    args = parser.parse_args()
+
+    opts = dict(concurrency=args.concurrency, duration=args.duration, heavy_ratio=args.heavy_ratio)
+
+    if args.base_url:
+        headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+        heavy = args.heavy or DEFAULT_HEAVY
+        light = args.light or DEFAULT_LIGHT
+        print(f"🧪 {args.base_url} | {args.concurrency} clients × {args.duration}s | heavy {args.heavy_ratio:.0%}")
+        res = asyncio.run(run_mix(args.base_url, heavy, light, headers=headers, **opts))
+        _print_row("heavy", _percentiles(res["heavy"]))
+        _print_row("light", _percentiles(res["light"]))
+        print(f"  errors: {res['errors']}")
+        return
+
+    server, url = _start_demo_server(args.heavy_ms / 1000)
+    print(f"🧪 Demo app at {url} | {args.concurrency} clients × {args.duration}s | "
+          f"heavy {args.heavy_ratio:.0%} blocking {args.heavy_ms:.0f}ms")
+    try:
+        rows = {}
+        for label, heavy_path in (("async def (blocking)", "/blocking/heavy"), ("def (threadpool)", "/threaded/heavy")):
+            res = asyncio.run(run_mix(url, [heavy_path], ["/light"], headers={}, **opts))
+            rows[label] = _percentiles(res["light"])
+            print(f" {label}")
+            _print_row("heavy", _percentiles(res["heavy"]))
+            _print_row("light", rows[label])
+        blocked, threaded = rows["async def (blocking)"], rows["def (threadpool)"]
+        if blocked["p99"] and threaded["p99"]:
+            print(f"  ⚡ light p99 {blocked['p99']:.1f}ms → {threaded['p99']:.1f}ms "
+                  f"({blocked['p99'] / threaded['p99']:.0f}x lower with the heavy handler off the loop)")
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -178,7 +178,7 @@ def check_04_carousel_render():
             "slideUrls": ["mock://s1", "mock://s2", "mock://s3"],
         }
 
-        with patch("app.services.storage.supabase_storage.upload_from_path",
+        with patch("app.services.storage.supabase_storage.upload_bytes",
                     return_value="mock://uploaded"):
             result = render_carousel_images(
                 brand="test_brand",